@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Precomputed access index of the records readable by roles.
+
+Checking the access of the current user record by record makes filtering
+listings slow, in particular for users with many roles.  This module keeps
+a compressed bitmap of the readable record identifiers (``recid``) of every
+role in the ``accessindex_bitmaps`` table, in chunks of
+``2 ** ACCESS_INDEX_CHUNK_BITS`` identifiers.  The chunks are changed record
+by record whenever records are written or bulk loaded, using the role names
+listed in ``ACCESS_INDEX_KEY`` (default ``_access.read``); records without
+roles are public.  Writers only lock the chunks they change.
+
+Filtering is then an intersection of bitmaps:
+
+.. code-block:: python
+
+   from flask_login import current_user
+   from invenio.accessindex.proxies import current_access_index
+
+   readable = current_access_index.readable_by(current_user)
+   hits = readable.filter(recids)
+   total = len(readable & Bitmap.from_values(recids))
+
+Chunks and the union of the bitmaps of a set of roles are cached in
+process memory together with the versions of the chunks, which are checked
+on every read: changes committed by any process and changed role
+assignments take effect on the next request.  The index is rebuilt from
+the records with ``python manage.py access-index rebuild``, e.g. after
+changing ``ACCESS_INDEX_CHUNK_BITS``.
+"""
+
+from __future__ import absolute_import, print_function
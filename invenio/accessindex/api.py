@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index of the records readable by roles."""
+
+from __future__ import absolute_import, print_function
+
+from collections import defaultdict
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from ..cache.lru import LRUCache
+from .bitmap import Bitmap
+from .changes import PUBLIC, bit_changes, record_keys
+from .models import AccessBitmap, AccessRecord
+
+
+def _size(bitmap):
+    return (bitmap.bits.bit_length() >> 3) + 1
+
+
+def _chunks_clause(columns, chunks):
+    """Return the condition selecting the ``(key, chunk)`` pairs."""
+    return or_(*[and_(columns.key == key, columns.chunk == chunk)
+                 for key, chunk in sorted(chunks)])
+
+
+class AccessIndex(object):
+    """Bitmaps of the records readable by every role.
+
+    The bitmap of a role is stored in chunks of ``2 ** chunk_bits``
+    positions, which are changed record by record when records are
+    written.  The readable records of a set of roles are the union of their
+    bitmaps and of the public records; unions are cached by role set, so
+    changed role assignments of users take effect immediately.
+
+    Every chunk has a version incremented by each change.  Cached chunks
+    and unions are checked against the committed versions on every read, so
+    changes committed by any process are seen by the next read.
+    """
+
+    def __init__(self, key='_access.read', id_key='recid', ttl=60,
+                 max_size=None, batch_size=1000, chunk_bits=16):
+        """Initialize the index.
+
+        :param key: Dotted path of the roles allowed to read a record.
+        :param id_key: Key of the integer identifier of a record.
+        :param ttl: Seconds bitmaps are kept in memory.
+        :param max_size: Maximum size in bytes of the bitmaps kept in
+            memory (``None`` for no limit).
+        :param batch_size: Number of records read at once by
+            :meth:`rebuild`.
+        :param chunk_bits: Number of low bits of the positions within a
+            chunk, at least 3.
+        """
+        if chunk_bits < 3:
+            raise ValueError('Chunks must have at least 3 bits.')
+        self.key = key
+        self.id_key = id_key
+        self.batch_size = batch_size
+        self.chunk_bits = chunk_bits
+        self.bitmaps = LRUCache(max_size=max_size, ttl=ttl)
+        self.unions = LRUCache(max_size=max_size, ttl=ttl)
+
+    def keys(self, data):
+        """Return the bitmap position and keys of a record."""
+        return record_keys(data, key=self.key, id_key=self.id_key)
+
+    def update(self, session, records):
+        """Index changed records.
+
+        The changed chunks are locked with ``SELECT ... FOR UPDATE`` while
+        they are changed, so concurrent transactions do not lose bits but
+        only wait for each other when they change the same chunks.
+
+        :param session: Database session of the changes.
+        :param records: List of ``(record_id, data)`` pairs, with ``None``
+            as data of deleted records.
+        """
+        if not records:
+            return
+        with session.no_autoflush:
+            rows = dict((row.record_id, row) for row in session.query(
+                AccessRecord).filter(AccessRecord.record_id.in_(
+                    [record_id for record_id, data in records])))
+            changes = []
+            for record_id, data in records:
+                row = rows.get(record_id)
+                old = (row.position, set(row.keys)) if row else (None, set())
+                new = self.keys(data)
+                if old == new:
+                    continue
+                changes.append((old, new))
+                if row is None:
+                    row = rows[record_id] = AccessRecord(record_id=record_id)
+                    session.add(row)
+                if new[1]:
+                    row.position, row.keys = new[0], sorted(new[1])
+                else:
+                    session.delete(row)
+                    del rows[record_id]
+            self._apply(session, bit_changes(changes))
+
+    def _apply(self, session, changes):
+        if not changes:
+            return
+        mask = (1 << self.chunk_bits) - 1
+        chunks = defaultdict(lambda: (set(), set()))
+        for key, (added, removed) in changes.items():
+            for position in added:
+                chunks[key, position >> self.chunk_bits][0].add(
+                    position & mask)
+            for position in removed:
+                chunks[key, position >> self.chunk_bits][1].add(
+                    position & mask)
+
+        table = AccessBitmap.__table__
+        connection = session.connection()
+        query = select([table.c.key, table.c.chunk, table.c.bitmap]).where(
+            _chunks_clause(table.c, chunks)).order_by(
+                table.c.key, table.c.chunk).with_for_update()
+        rows = dict(((key, chunk), data) for key, chunk, data in
+                    connection.execute(query))
+        missing = set(chunks) - set(rows)
+        for key, chunk in sorted(missing):
+            # A concurrent transaction may create the same chunk first.
+            try:
+                with connection.begin_nested():
+                    connection.execute(table.insert().values(
+                        key=key, chunk=chunk, bitmap=Bitmap().dumps(),
+                        count=0, version=0, updated=datetime.utcnow()))
+            except IntegrityError:
+                pass
+        if missing:
+            rows = dict(((key, chunk), data) for key, chunk, data in
+                        connection.execute(query))
+
+        for (key, chunk), (added, removed) in sorted(chunks.items()):
+            bitmap = Bitmap.loads(rows[key, chunk])
+            for position in removed:
+                bitmap.discard(position)
+            for position in added:
+                bitmap.add(position)
+            connection.execute(table.update().where(and_(
+                table.c.key == key, table.c.chunk == chunk)).values(
+                    bitmap=bitmap.dumps(), count=len(bitmap),
+                    version=table.c.version + 1, updated=datetime.utcnow()))
+
+    def _load(self, keys):
+        """Return the chunks of the bitmaps of ``keys``.
+
+        :returns: List of ``(key, chunk, version, bitmap)`` tuples; the
+            bitmaps hold the low bits of the positions of the records.
+        """
+        versions = db.session.query(
+            AccessBitmap.key, AccessBitmap.chunk, AccessBitmap.version).filter(
+                AccessBitmap.key.in_(keys)).order_by(
+                    AccessBitmap.key, AccessBitmap.chunk).all()
+        chunks = dict(((key, chunk), self.bitmaps.get((key, chunk)))
+                      for key, chunk, version in versions)
+        stale = set((key, chunk) for key, chunk, version in versions
+                    if chunks[key, chunk] is None or
+                    chunks[key, chunk][0] != version)
+        if stale:
+            for key, chunk, version, data in db.session.query(
+                    AccessBitmap.key, AccessBitmap.chunk,
+                    AccessBitmap.version, AccessBitmap.bitmap).filter(
+                        _chunks_clause(AccessBitmap, stale)):
+                bitmap = Bitmap.loads(data)
+                chunks[key, chunk] = (version, bitmap)
+                self.bitmaps.set((key, chunk), (version, bitmap),
+                                 size=_size(bitmap))
+        return [(key, chunk) + chunks[key, chunk]
+                for key, chunk, version in versions
+                if chunks[key, chunk] is not None]
+
+    def bitmap(self, key):
+        """Return the bitmap of a role (or of :data:`.changes.PUBLIC`).
+
+        Bitmaps are shared and must not be changed.
+        """
+        return self.readable_keys((key, ))
+
+    def readable(self, roles):
+        """Return the bitmap of the records readable with any of ``roles``.
+
+        Public records are included.  Bitmaps are shared and must not be
+        changed.
+        """
+        return self.readable_keys((PUBLIC, ) + tuple(sorted(set(roles))))
+
+    def readable_keys(self, keys):
+        """Return the union of the bitmaps of ``keys``.
+
+        The union is cached with the versions of its chunks and computed
+        again once any of them changed.  Bitmaps are shared and must not be
+        changed.
+        """
+        chunks = self._load(keys)
+        versions = tuple((key, chunk, version)
+                         for key, chunk, version, bitmap in chunks)
+        cached = self.unions.get(keys)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        parts = defaultdict(Bitmap)
+        for key, chunk, version, bitmap in chunks:
+            parts[chunk] = parts[chunk] | bitmap
+        bitmap = Bitmap.from_chunks(parts, self.chunk_bits)
+        self.unions.set(keys, (versions, bitmap), size=_size(bitmap))
+        return bitmap
+
+    def filter(self, positions, roles):
+        """Return the record identifiers readable with any of ``roles``.
+
+        :param positions: Integer identifiers of records, e.g. the hits of
+            a search; their order is kept.
+        """
+        return self.readable(roles).filter(positions)
+
+    def rebuild(self, callback=None):
+        """Index all records again.
+
+        Existing chunks are overwritten, and emptied when no record is
+        left in them, with incremented versions, so that the chunks cached
+        by other processes are never mistaken for current ones.
+
+        :param callback: Function called with the statistics after every
+            batch of records.
+        :returns: Dictionary with the number of ``records``, of ``indexed``
+            records and of ``bitmaps`` (chunks).
+        """
+        from ..export.query import record_pages
+
+        mask = (1 << self.chunk_bits) - 1
+        positions = defaultdict(list)
+        stats = dict(records=0, indexed=0, bitmaps=0)
+        AccessRecord.query.delete()
+        for page in record_pages(page_size=self.batch_size):
+            mappings = []
+            for row in page:
+                position, keys = self.keys(row[-1])
+                if keys:
+                    mappings.append(dict(record_id=row[0], position=position,
+                                         keys=sorted(keys)))
+                    for key in keys:
+                        positions[key, position >> self.chunk_bits].append(
+                            position & mask)
+            db.session.bulk_insert_mappings(AccessRecord, mappings)
+            stats['records'] += len(page)
+            stats['indexed'] += len(mappings)
+            if callback:
+                callback(stats)
+
+        table = AccessBitmap.__table__
+        existing = set(db.session.query(AccessBitmap.key, AccessBitmap.chunk))
+        for key, chunk in sorted(existing | set(positions)):
+            bitmap = Bitmap.from_values(positions.get((key, chunk), ()))
+            if (key, chunk) in existing:
+                db.session.execute(table.update().where(and_(
+                    table.c.key == key, table.c.chunk == chunk)).values(
+                        bitmap=bitmap.dumps(), count=len(bitmap),
+                        version=table.c.version + 1,
+                        updated=datetime.utcnow()))
+            else:
+                db.session.add(AccessBitmap(key=key, chunk=chunk,
+                                            bitmap=bitmap.dumps(),
+                                            count=len(bitmap)))
+        stats['bitmaps'] = len(positions)
+        db.session.commit()
+        self.bitmaps.clear()
+        self.unions.clear()
+        return stats
+
+    def stats(self):
+        """Return the number and size of the bitmap chunks."""
+        bitmaps, size = db.session.query(
+            func.count(AccessBitmap.key),
+            func.sum(func.length(AccessBitmap.bitmap))).one()
+        return dict(bitmaps=bitmaps, size=size or 0,
+                    records=AccessRecord.query.count())
+
+
+def user_roles(user):
+    """Return the names of the roles of a user."""
+    return [role.name for role in getattr(user, 'roles', None) or ()]
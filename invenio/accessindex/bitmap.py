@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Compressed bitmaps of record identifiers."""
+
+from __future__ import absolute_import, print_function
+
+import binascii
+import zlib
+
+
+def _from_bytes(data):
+    """Return the integer of little-endian ``data``."""
+    try:
+        return int.from_bytes(data, 'little')
+    except AttributeError:  # pragma: no cover
+        return int(binascii.hexlify(bytes(data[::-1])) or b'0', 16)
+
+
+def _to_bytes(number):
+    """Return the little-endian bytes of a non-negative integer."""
+    length = (number.bit_length() + 7) // 8
+    try:
+        return number.to_bytes(length, 'little')
+    except AttributeError:  # pragma: no cover
+        digits = ('%x' % number).rstrip('L').zfill(length * 2)
+        return binascii.unhexlify(digits)[::-1] if length else b''
+
+
+class Bitmap(object):
+    """Set of non-negative integers kept as the bits of an integer.
+
+    Set operations between bitmaps (``&``, ``|``, ``-``) run in C over the
+    machine words of the integers, which makes intersecting the readable
+    records of many roles with a result set cheap.  Bitmaps are stored
+    zlib-compressed, so sparse and dense runs take little space.
+    """
+
+    __slots__ = ('bits', '_lookup')
+
+    def __init__(self, bits=0):
+        """Initialize the bitmap from the integer of its bits."""
+        self.bits = bits
+        self._lookup = None
+
+    @classmethod
+    def from_values(cls, values):
+        """Return the bitmap of an iterable of integers."""
+        values = list(values)
+        if not values:
+            return cls()
+        data = bytearray((max(values) >> 3) + 1)
+        for value in values:
+            data[value >> 3] |= 1 << (value & 7)
+        return cls(_from_bytes(bytes(data)))
+
+    @classmethod
+    def union(cls, bitmaps):
+        """Return the union of bitmaps."""
+        bits = 0
+        for bitmap in bitmaps:
+            bits |= bitmap.bits
+        return cls(bits)
+
+    @classmethod
+    def from_chunks(cls, chunks, chunk_bits):
+        """Return the bitmap of chunks of ``2 ** chunk_bits`` integers.
+
+        :param chunks: Dictionary mapping chunk numbers (the integers
+            shifted right by ``chunk_bits``) to the bitmaps of the low bits
+            of their integers.
+        :param chunk_bits: Number of low bits, at least 3.
+        """
+        if not chunks:
+            return cls()
+        width = 1 << chunk_bits >> 3
+        data = bytearray(width * (max(chunks) + 1))
+        for chunk, bitmap in chunks.items():
+            part = _to_bytes(bitmap.bits)
+            data[chunk * width:chunk * width + len(part)] = part
+        return cls(_from_bytes(bytes(data)))
+
+    @classmethod
+    def loads(cls, data):
+        """Return the bitmap of data returned by :meth:`dumps`."""
+        return cls(_from_bytes(zlib.decompress(data)) if data else 0)
+
+    def dumps(self, level=6):
+        """Return the compressed bitmap."""
+        return zlib.compress(_to_bytes(self.bits), level)
+
+    def add(self, value):
+        """Add an integer."""
+        self.bits |= 1 << value
+        self._lookup = None
+
+    def discard(self, value):
+        """Remove an integer if present."""
+        if value in self:
+            self.bits ^= 1 << value
+            self._lookup = None
+
+    def filter(self, values):
+        """Return the integers of ``values`` in the bitmap, in order.
+
+        The bitmap is converted to bytes once (and kept until it changes),
+        so that every value is looked up in constant time.
+        """
+        data = self._lookup
+        if data is None:
+            data = self._lookup = bytearray(_to_bytes(self.bits))
+        size = len(data)
+        return [value for value in values if value >> 3 < size and
+                data[value >> 3] >> (value & 7) & 1]
+
+    def __contains__(self, value):
+        """Check if an integer is in the bitmap."""
+        return value >= 0 and bool(self.bits >> value & 1)
+
+    def __iter__(self):
+        """Yield the integers in ascending order."""
+        for index, byte in enumerate(bytearray(_to_bytes(self.bits))):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield (index << 3) + bit
+
+    def __len__(self):
+        """Return the number of integers."""
+        try:
+            return self.bits.bit_count()
+        except AttributeError:  # pragma: no cover
+            return bin(self.bits).count('1')
+
+    def __bool__(self):
+        """Check if the bitmap is not empty."""
+        return bool(self.bits)
+
+    __nonzero__ = __bool__
+
+    def __and__(self, other):
+        """Return the intersection."""
+        return Bitmap(self.bits & other.bits)
+
+    def __or__(self, other):
+        """Return the union."""
+        return Bitmap(self.bits | other.bits)
+
+    def __sub__(self, other):
+        """Return the difference."""
+        return Bitmap(self.bits & ~other.bits)
+
+    def __eq__(self, other):
+        """Compare the integers of two bitmaps."""
+        return isinstance(other, Bitmap) and self.bits == other.bits
+
+    def __ne__(self, other):
+        """Compare the integers of two bitmaps."""
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the representation with the number of integers."""
+        return '<Bitmap of {0} values>'.format(len(self))
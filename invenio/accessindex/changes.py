@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bitmap keys of records and their changes."""
+
+from __future__ import absolute_import, print_function
+
+from collections import defaultdict
+from numbers import Integral
+
+from ..facets.counts import field_values, text_type
+
+PUBLIC = '*'
+"""Key of the bitmap of the records without roles."""
+
+
+def record_keys(data, key='_access.read', id_key='recid'):
+    """Return the bitmap position and the bitmap keys of a record.
+
+    Records without roles are indexed under :data:`PUBLIC`.  Deleted
+    records and records without a non-negative integer identifier are not
+    indexed, i.e. ``(None, set())`` is returned.
+    """
+    if not isinstance(data, dict):
+        return None, set()
+    position = data.get(id_key)
+    if not isinstance(position, Integral) or isinstance(position, bool) or \
+            position < 0:
+        return None, set()
+    return position, set(text_type(role) for role in
+                         field_values(data, key)) or set([PUBLIC])
+
+
+def bit_changes(changes):
+    """Return the bits to set and clear in every bitmap.
+
+    :param changes: Iterable of ``(old, new)`` pairs of records, each being
+        a ``(position, keys)`` pair as returned by :func:`record_keys`.
+    :returns: Dictionary mapping bitmap keys to pairs of the sets of added
+        and removed positions.
+    """
+    result = defaultdict(lambda: (set(), set()))
+    for (old_position, old_keys), (new_position, new_keys) in changes:
+        old = set((key, old_position) for key in old_keys)
+        new = set((key, new_position) for key in new_keys)
+        for key, position in new - old:
+            result[key][0].add(position)
+        for key, position in old - new:
+            result[key][1].add(position)
+    return dict(result)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_access_index
+
+
+def _print_stats():
+    stats = current_access_index.index.stats()
+    click.echo('{records} records in {bitmaps} bitmaps, {size} bytes'.format(
+        **stats))
+
+
+@click.group('access-index')
+def access_index():
+    """Access index commands."""
+
+
+@access_index.command()
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def rebuild(verbose):
+    """Index all records again."""
+    def progress(stats):
+        if verbose:
+            click.echo('{records} records, {indexed} indexed'.format(
+                **stats), err=True)
+
+    current_access_index.index.rebuild(callback=progress)
+    _print_stats()
+
+
+@access_index.command()
+@with_appcontext
+def stats():
+    """Print the number and size of the bitmaps."""
+    _print_stats()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index configuration."""
+
+ACCESS_INDEX_ENABLED = True
+"""Update the access index whenever records are written."""
+
+ACCESS_INDEX_KEY = '_access.read'
+"""Dotted path of the names of the roles allowed to read a record.
+
+Records without roles are public.
+"""
+
+ACCESS_INDEX_ID_KEY = 'recid'
+"""Key of the integer identifier of a record used as bitmap position."""
+
+ACCESS_INDEX_CHUNK_BITS = 16
+"""Bitmaps are stored in chunks of ``2 ** ACCESS_INDEX_CHUNK_BITS`` records.
+
+Writers lock the chunks they change, so smaller chunks let more records be
+written concurrently at the cost of more rows.  At least 3; rebuild the
+index after changing it.
+"""
+
+ACCESS_INDEX_CACHE_TTL = 60
+"""Seconds unused bitmap chunks are kept in process memory.
+
+Cached chunks are checked against the stored versions on every read.
+"""
+
+ACCESS_INDEX_CACHE_SIZE = 64 * 1024 * 1024
+"""Maximum bytes of bitmaps kept in process memory."""
+
+ACCESS_INDEX_BATCH_SIZE = 1000
+"""Number of records read at once when the index is rebuilt."""
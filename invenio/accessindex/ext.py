@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property
+
+from . import config
+
+
+class _AccessIndexState(object):
+    """Access index state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def index(self):
+        """The :class:`~invenio.accessindex.api.AccessIndex`."""
+        from .api import AccessIndex
+
+        return AccessIndex(
+            key=self.app.config['ACCESS_INDEX_KEY'],
+            id_key=self.app.config['ACCESS_INDEX_ID_KEY'],
+            ttl=self.app.config['ACCESS_INDEX_CACHE_TTL'],
+            max_size=self.app.config['ACCESS_INDEX_CACHE_SIZE'],
+            batch_size=self.app.config['ACCESS_INDEX_BATCH_SIZE'],
+            chunk_bits=self.app.config['ACCESS_INDEX_CHUNK_BITS'],
+        )
+
+    def readable_by(self, user):
+        """Return the bitmap of the records readable by a user."""
+        from .api import user_roles
+
+        return self.index.readable(user_roles(user))
+
+
+class InvenioAccessIndex(object):
+    """Invenio access index extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-access-index'] = _AccessIndexState(app)
+        if app.config['ACCESS_INDEX_ENABLED']:
+            from . import receivers
+            receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('ACCESS_INDEX_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index database models."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy_utils.types import JSONType, UUIDType
+
+
+class AccessBitmap(db.Model):
+    """Compressed chunk of the bitmap of the records readable by a role."""
+
+    __tablename__ = 'accessindex_bitmaps'
+
+    key = db.Column(db.String(255), primary_key=True)
+    """Role name (or ``*`` for the public records)."""
+
+    chunk = db.Column(db.Integer, primary_key=True, default=0)
+    """Record identifiers of the chunk shifted right by the chunk bits."""
+
+    bitmap = db.Column(db.LargeBinary, nullable=False)
+    """Compressed bitmap of the low bits of the record identifiers."""
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+    """Number of records in the chunk."""
+
+    version = db.Column(db.Integer, nullable=False, default=0)
+    """Number of changes of the chunk, to validate cached copies."""
+
+    updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                        onupdate=datetime.utcnow)
+    """Time of the last change."""
+
+
+class AccessRecord(db.Model):
+    """Bitmaps a record is indexed in."""
+
+    __tablename__ = 'accessindex_records'
+
+    record_id = db.Column(UUIDType, primary_key=True)
+    """Identifier of the record."""
+
+    position = db.Column(db.Integer, nullable=False)
+    """Integer identifier of the record in the bitmaps."""
+
+    keys = db.Column(JSONType, nullable=False)
+    """List of the bitmap keys of the record."""
+
+
+__all__ = ('AccessBitmap', 'AccessRecord')
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers indexing the records written in a flush or bulk loaded."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+
+def _index():
+    state = current_app.extensions.get('invenio-access-index') \
+        if current_app else None
+    if state is None or not current_app.config['ACCESS_INDEX_ENABLED']:
+        return None
+    return state.index
+
+
+def index_records(session, flush_context, instances):
+    """Update the access index of the records changed by the flush."""
+    index = _index()
+    if index is None:
+        return
+    records = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, RecordMetadata) or obj.id is None:
+            continue
+        if obj in session.new or \
+                attributes.get_history(obj, 'json').has_changes():
+            records.append((obj.id, obj.json))
+    for obj in session.deleted:
+        if isinstance(obj, RecordMetadata):
+            records.append((obj.id, None))
+    index.update(session, records)
+
+
+def index_loaded(sender, records=None):
+    """Index bulk loaded records in the transaction of the loader."""
+    from invenio_db import db
+
+    index = _index()
+    if index is not None:
+        index.update(db.session, records)
+
+
+def connect():
+    """Listen to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    if not event.contains(Session, 'before_flush', index_records):
+        event.listen(Session, 'before_flush', index_records)
+    records_loaded.connect(index_loaded)
+
+
+def disconnect():
+    """Stop listening to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    if event.contains(Session, 'before_flush', index_records):
+        event.remove(Session, 'before_flush', index_records)
+    records_loaded.disconnect(index_loaded)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Coalescing of per-record tasks into chunked Celery tasks.
+
+Sending one Celery task per record costs a broker round trip per record,
+which often outweighs the work itself.  A batched task is written for one
+item, but its calls are collected for up to ``BATCHING_WINDOW`` seconds or
+``BATCHING_MAX_ITEMS`` items and sent as a single task:
+
+.. code-block:: python
+
+   from invenio.batching.api import batched_task
+
+   @batched_task()
+   def check_record(record_id):
+       ...
+
+   results = [check_record.delay(record_id) for record_id in record_ids]
+   check_record.flush()
+
+Every call returns an :class:`~invenio.batching.api.ItemResult`, whose
+``get()`` returns the result of the item or raises
+:class:`~invenio.batching.api.BatchItemError` if the task failed for it.
+Items of a chunk are processed independently, so a failing item does not
+affect the others.  In eager mode (``CELERY_ALWAYS_EAGER``) chunks run in
+place.  The throughput with batching on and off is compared with:
+
+.. code-block:: console
+
+   $ python manage.py batching benchmark -n 10000
+"""
+
+from __future__ import absolute_import, print_function
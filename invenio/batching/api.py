@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Coalescing of per-item task calls into chunked tasks."""
+
+from __future__ import absolute_import, print_function
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+class BatchItemError(Exception):
+    """Error raised by the task function for a single item."""
+
+
+def run_batch(func, items):
+    """Call ``func`` for every item and collect the per-item outcome.
+
+    :returns: A list with a ``[True, result]`` or ``[False, error]`` pair per
+        item, in the order of ``items``.
+    """
+    results = []
+    for item in items:
+        try:
+            results.append([True, func(item)])
+        except Exception as e:
+            logger.exception('Batched task failed for %r.', item)
+            results.append([False, '{0}: {1}'.format(type(e).__name__, e)])
+    return results
+
+
+class _Batch(object):
+    """Items collected for one chunked task."""
+
+    def __init__(self):
+        self.items = []
+        self.result = None
+        self.error = None
+        self.dispatched = threading.Event()
+
+
+class ItemResult(object):
+    """Result of one item of a chunked task."""
+
+    def __init__(self, batcher, batch, index):
+        """Initialize the result of the ``index``-th item of ``batch``."""
+        self.batcher = batcher
+        self.batch = batch
+        self.index = index
+
+    def ready(self):
+        """Check if the chunk containing the item has been processed."""
+        return self.batch.dispatched.is_set() and (
+            self.batch.result is None or self.batch.result.ready())
+
+    def get(self, timeout=None):
+        """Return the result of the item.
+
+        The chunk is dispatched first if it is still being collected.
+
+        :raises BatchItemError: If the task function failed for the item.
+        """
+        if not self.batch.dispatched.is_set():
+            self.batcher.flush()
+        self.batch.dispatched.wait()
+        if self.batch.error is not None:
+            raise self.batch.error
+        ok, value = self.batch.result.get(timeout=timeout)[self.index]
+        if not ok:
+            raise BatchItemError(value)
+        return value
+
+
+class Batcher(object):
+    """Collect items and dispatch them in chunks.
+
+    A chunk is dispatched as soon as it holds ``max_items`` items or
+    ``window`` seconds after its first item was added, whichever comes
+    first.  With ``enabled`` false every item is dispatched on its own, which
+    is useful to compare the throughput with and without batching.
+    """
+
+    def __init__(self, dispatch, max_items=100, window=0.5, enabled=True):
+        """Initialize the batcher.
+
+        :param dispatch: Function sending a list of items (e.g. as one Celery
+            task) and returning an object whose ``get()`` returns the list of
+            per-item outcomes (see :func:`run_batch`).
+        """
+        self.dispatch = dispatch
+        self.max_items = max_items if enabled else 1
+        self.window = window
+        self.stats = dict(items=0, chunks=0, dispatch_time=0.0)
+        self._batch = None
+        self._lock = threading.Lock()
+        _batchers.add(self)
+
+    def add(self, item):
+        """Add an item and return its :class:`ItemResult`."""
+        with self._lock:
+            batch = self._batch
+            if batch is None:
+                batch = self._batch = _Batch()
+                if self.max_items > 1 and self.window:
+                    timer = threading.Timer(
+                        self.window, self._flush_batch, (batch, ))
+                    timer.daemon = True
+                    timer.start()
+            batch.items.append(item)
+            result = ItemResult(self, batch, len(batch.items) - 1)
+            full = len(batch.items) >= self.max_items
+            if full:
+                self._batch = None
+        if full:
+            self._send(batch)
+        return result
+
+    def flush(self):
+        """Dispatch the items collected so far."""
+        with self._lock:
+            batch, self._batch = self._batch, None
+        if batch is not None:
+            self._send(batch)
+
+    def _flush_batch(self, batch):
+        with self._lock:
+            if self._batch is not batch:
+                return
+            self._batch = None
+        try:
+            self._send(batch)
+        except Exception:
+            logger.exception('Dispatching %d item(s) failed.',
+                             len(batch.items))
+
+    def _send(self, batch):
+        start = time.time()
+        try:
+            batch.result = self.dispatch(batch.items)
+        except Exception as e:
+            batch.error = e
+            raise
+        finally:
+            batch.dispatched.set()
+            with self._lock:
+                self.stats['items'] += len(batch.items)
+                self.stats['chunks'] += 1
+                self.stats['dispatch_time'] += time.time() - start
+
+
+_batchers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    """Dispatch the items still collected when the process exits."""
+    for batcher in list(_batchers):
+        try:
+            batcher.flush()
+        except Exception:
+            logger.exception('Dispatching batched items at exit failed.')
+
+
+class BatchedTask(object):
+    """Per-item task whose calls are dispatched as chunked Celery tasks.
+
+    Created with :func:`batched_task`.  The chunk size, window and whether
+    batching is enabled default to the ``BATCHING_*`` configuration of the
+    current application.
+    """
+
+    def __init__(self, func, max_items=None, window=None, **options):
+        """Initialize the task and register its chunked Celery task."""
+        from celery import shared_task
+
+        self.func = func
+        self.max_items = max_items
+        self.window = window
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+        options.setdefault(
+            'name', '{0}.{1}'.format(func.__module__, func.__name__))
+
+        def run(items):
+            return run_batch(func, items)
+        self.task = shared_task(**options)(run)
+        self._batcher = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __call__(self, item):
+        """Run the task function synchronously."""
+        return self.func(item)
+
+    @property
+    def batcher(self):
+        """:class:`Batcher` of the current process."""
+        with self._lock:
+            # Threads and pending items do not survive a fork.
+            if self._batcher is None or self._pid != os.getpid():
+                self._batcher = self._create_batcher()
+                self._pid = os.getpid()
+            return self._batcher
+
+    def _create_batcher(self):
+        from flask import current_app, has_app_context
+
+        config = current_app.config if has_app_context() else {}
+        return Batcher(
+            lambda items: self.task.apply_async(args=(items, )),
+            max_items=self.max_items or config.get('BATCHING_MAX_ITEMS', 100),
+            window=self.window if self.window is not None else config.get(
+                'BATCHING_WINDOW', 0.5),
+            enabled=config.get('BATCHING_ENABLED', True),
+        )
+
+    def delay(self, item):
+        """Queue a call for ``item`` and return its :class:`ItemResult`."""
+        return self.batcher.add(item)
+
+    def flush(self):
+        """Dispatch the calls collected by the current process."""
+        if self._batcher is not None and self._pid == os.getpid():
+            self._batcher.flush()
+
+
+def batched_task(max_items=None, window=None, **options):
+    """Decorate a per-item function as a :class:`BatchedTask`.
+
+    .. code-block:: python
+
+       @batched_task(max_items=500)
+       def check_record(record_id):
+           ...
+
+       result = check_record.delay(record_id)
+       result.get()
+
+    Further keyword arguments are passed to :func:`celery.shared_task`.
+    """
+    def decorator(func):
+        return BatchedTask(func, max_items=max_items, window=window,
+                           **options)
+    return decorator
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Task batching command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+
+@click.group()
+def batching():
+    """Task batching commands."""
+
+
+@batching.command()
+@click.option('-n', '--items', type=int, default=1000,
+              help='Number of items sent.')
+@click.option('-m', '--max-items', type=int, default=None,
+              help='Maximum number of items per chunked task.')
+@with_appcontext
+def benchmark(items, max_items):
+    """Measure the task throughput with and without batching.
+
+    Items are sent to a trivial task through the configured broker (or
+    executed in place with ``CELERY_ALWAYS_EAGER``) and the throughput is
+    measured until all results are received.  Workers must import the
+    benchmark task with ``-I invenio.benchmarks.tasks``.
+    """
+    from ..benchmarks.tasks import echo
+    from .api import Batcher
+
+    max_items = max_items or current_app.config['BATCHING_MAX_ITEMS']
+    for enabled in (False, True):
+        batcher = Batcher(
+            lambda chunk: echo.task.apply_async(args=(chunk, )),
+            max_items=max_items, window=None, enabled=enabled)
+        start = time.time()
+        results = [batcher.add(i) for i in range(items)]
+        batcher.flush()
+        for result in results:
+            result.get()
+        elapsed = time.time() - start
+        click.echo('batching {0:3}: {1} tasks, {2:.1f} items/s'.format(
+            'on' if enabled else 'off', batcher.stats['chunks'],
+            items / elapsed if elapsed else 0.0))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Reproducible performance benchmarks.
+
+The suite runs offline on an in-memory SQLite database with a set of sample
+records and times record creation and reading, persistent identifier
+resolution, ``GET /records/<pid>`` through the test client, JSON schema
+validation, template rendering, packed record decoding and bulk ingestion.
+For each case the throughput and the p50 and p99 latencies are written to a
+JSON report:
+
+.. code-block:: console
+
+   $ python -m invenio.benchmarks --list
+   $ python -m invenio.benchmarks -o baseline.json
+   $ python -m invenio.benchmarks records rest -b baseline.json -t 0.2
+
+When a baseline is given, the command exits with a non-zero status if the
+throughput of any case dropped, or its latency grew, by more than the
+tolerance.  Set ``BENCHMARK_DATABASE_URI`` to benchmark another database.
+
+Without ``--baseline`` reports are compared with the reference baseline
+``invenio/benchmarks/baseline.json``.  Timings depend on the machine, hence
+the reference baseline is produced on the machine running the comparisons
+(e.g. the CI runner) from the commit performance is measured against, and
+committed together with the change which is expected to alter it:
+
+.. code-block:: console
+
+   $ git checkout master
+   $ python -m invenio.benchmarks --update-baseline
+   $ git checkout my-branch
+   $ python -m invenio.benchmarks
+
+A warning is printed when the report and the baseline come from different
+Python versions or platforms.
+
+New cases are registered with :func:`~invenio.benchmarks.runner.benchmark`.
+"""
+
+from __future__ import absolute_import, print_function
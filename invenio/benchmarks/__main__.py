@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Command line interface of the benchmark suite."""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import os
+import sys
+from functools import partial
+
+from . import cases  # noqa: registers the cases
+from .env import environment
+from .runner import DEFAULT_BASELINE, compare, dump_report, load_report, \
+    mismatches, registry, run
+
+
+def main(argv=None):
+    """Run the benchmarks, write the report and compare it to a baseline."""
+    parser = argparse.ArgumentParser(
+        prog='python -m invenio.benchmarks',
+        description='Run the Invenio performance benchmarks.')
+    parser.add_argument(
+        'names', nargs='*',
+        help='cases or case prefixes to run, e.g. "records" (default all)')
+    parser.add_argument(
+        '-o', '--output', help='write the JSON report to this file')
+    parser.add_argument(
+        '-b', '--baseline',
+        help='compare the report with this JSON report (default: the '
+             'reference baseline, if it exists)')
+    parser.add_argument(
+        '--no-baseline', action='store_true',
+        help='do not compare the report with the reference baseline')
+    parser.add_argument(
+        '--update-baseline', action='store_true',
+        help='write the report as the new reference baseline')
+    parser.add_argument(
+        '-t', '--tolerance', type=float, default=0.1,
+        help='allowed relative regression (default: 0.1)')
+    parser.add_argument(
+        '-n', '--iterations', type=int, default=None,
+        help='number of timed operations per case')
+    parser.add_argument(
+        '-r', '--records', type=int, default=1000,
+        help='number of sample records (default: 1000)')
+    parser.add_argument(
+        '-l', '--list', action='store_true', help='list the cases and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in registry.values():
+            print('{0:<24} {1}'.format(case.name, case.func.__doc__))
+        return 0
+
+    def progress(name, results):
+        print('{0:<24} {1:>12.1f}/s  p50 {2:>8.3f}ms  p99 {3:>8.3f}ms'.format(
+            name, results['throughput'], results['p50'] * 1000,
+            results['p99'] * 1000), file=sys.stderr)
+
+    report = run(partial(environment, records=args.records),
+                 names=args.names, iterations=args.iterations,
+                 callback=progress)
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            dump_report(report, fp)
+    else:
+        dump_report(report)
+
+    if args.update_baseline:
+        with open(DEFAULT_BASELINE, 'w') as fp:
+            dump_report(report, fp)
+        return 0
+
+    baseline = args.baseline
+    if baseline is None and not args.no_baseline:
+        if os.path.exists(DEFAULT_BASELINE):
+            baseline = DEFAULT_BASELINE
+        else:
+            print('WARNING reference baseline {0} not found, the report is '
+                  'not compared'.format(DEFAULT_BASELINE), file=sys.stderr)
+    if baseline:
+        baseline = load_report(baseline)
+        for key in mismatches(report, baseline):
+            print('WARNING baseline {0} {1} differs from {2}, timings may not '
+                  'be comparable'.format(key, baseline.get(key), report[key]),
+                  file=sys.stderr)
+        for name in report['benchmarks']:
+            if name not in baseline['benchmarks']:
+                print('WARNING baseline has no results for {0}'.format(name),
+                      file=sys.stderr)
+        regressions = compare(report, baseline, tolerance=args.tolerance)
+        for r in regressions:
+            print('REGRESSION {0} {1}: {2:.6g} -> {3:.6g} ({4:+.1%})'.format(
+                *r), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark cases of the record stack."""
+
+from __future__ import absolute_import, print_function
+
+import atexit
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+
+from .env import sample_marcxml, sample_record
+from .runner import benchmark
+
+RECORD_SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'type': 'object',
+    'properties': {
+        'title': {'type': 'string'},
+        'authors': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'name': {'type': 'string'}},
+                'required': ['name'],
+            },
+        },
+        'abstract': {'type': 'string'},
+        'keywords': {'type': 'array', 'items': {'type': 'string'}},
+        'year': {'type': 'integer', 'minimum': 0},
+        'recid': {'type': 'integer'},
+    },
+    'required': ['title'],
+}
+"""JSON schema of the sample records."""
+
+RECORD_TEMPLATE = u"""
+<article>
+  <h1>{{ record.title }}</h1>
+  <ul>{% for author in record.authors %}
+    <li>{{ author.name }}</li>{% endfor %}
+  </ul>
+  <p>{{ record.abstract|truncate(200) }}</p>
+  <p>{{ record.keywords|join(', ') }} ({{ record.year }})</p>
+</article>
+"""
+"""Template rendering a record detail page."""
+
+PAGE_TEMPLATES = {
+    'page.html': u"""<!DOCTYPE html>
+{% import 'macros.html' as macros %}
+<html>
+  <head><title>{% block title %}{% endblock %}</title></head>
+  <body>
+    {{ macros.navigation(['Home', 'Search', 'Deposit', 'Account']) }}
+    {% block body %}{% endblock %}
+  </body>
+</html>
+""",
+    'macros.html': u"""
+{% macro navigation(items) %}
+<ul>{% for item in items %}
+  <li class="{{ loop.cycle('odd', 'even') }}">{{ item|e }}</li>{% endfor %}
+</ul>
+{% endmacro %}
+""",
+    'record.html': u"{% extends 'page.html' %}"
+                   u"{% block title %}{{ record.title }}{% endblock %}"
+                   u"{% block body %}" + RECORD_TEMPLATE + u"{% endblock %}",
+}
+"""Templates of a record page which extends a layout and imports macros."""
+
+
+@benchmark('records.create', iterations=500)
+def records_create(env):
+    """Create and commit one record."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    counter = itertools.count()
+
+    def operation():
+        Record.create(sample_record(next(counter)))
+        db.session.commit()
+    return operation
+
+
+@benchmark('records.read')
+def records_read(env):
+    """Load a record by its UUID."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    uuids = itertools.cycle([uuid for recid, uuid in env.records])
+
+    def operation():
+        Record.get_record(next(uuids))
+        db.session.expunge_all()
+    return operation
+
+
+@benchmark('pidstore.resolve')
+def pidstore_resolve(env):
+    """Resolve a record identifier to its record."""
+    from invenio_db import db
+    from invenio_pidstore.resolver import Resolver
+    from invenio_records.api import Record
+
+    resolver = Resolver(pid_type='recid', object_type='rec',
+                        getter=Record.get_record)
+    recids = itertools.cycle([recid for recid, uuid in env.records])
+
+    def operation():
+        resolver.resolve(next(recids))
+        db.session.expunge_all()
+    return operation
+
+
+@benchmark('pidstore.resolve_cached')
+def pidstore_resolve_cached(env):
+    """Resolve a record identifier through the record read cache."""
+    from ..cache.api import CachedResolver
+
+    resolver = CachedResolver(pid_type='recid')
+    recids = itertools.cycle([recid for recid, uuid in env.records])
+
+    def operation():
+        resolver.resolve(next(recids))
+    return operation
+
+
+@benchmark('rest.get_record')
+def rest_get_record(env):
+    """Fetch ``GET /records/<pid>`` through the test client."""
+    urls = itertools.cycle(
+        ['/records/{0}'.format(recid) for recid, uuid in env.records])
+    headers = [('Accept', 'application/json')]
+
+    def operation():
+        response = env.client.get(next(urls), headers=headers)
+        assert response.status_code == 200
+    return operation
+
+
+@benchmark('jsonschema.validate', iterations=2000)
+def jsonschema_validate(env):
+    """Validate a record against its JSON schema."""
+    from jsonschema import validate
+
+    records = itertools.cycle([sample_record(i) for i in range(100)])
+
+    def operation():
+        validate(next(records), RECORD_SCHEMA)
+    return operation
+
+
+@benchmark('jsonschema.validate_cached', iterations=2000)
+def jsonschema_validate_cached(env):
+    """Validate a record against its JSON schema compiled once."""
+    from ..validation.api import ValidatorCache
+
+    cache = ValidatorCache()
+    records = itertools.cycle([sample_record(i) for i in range(100)])
+
+    def operation():
+        cache.validate(next(records), RECORD_SCHEMA)
+    return operation
+
+
+@benchmark('templates.render', iterations=2000)
+def templates_render(env):
+    """Render a record detail template."""
+    template = env.app.jinja_env.from_string(RECORD_TEMPLATE)
+    records = itertools.cycle([sample_record(i) for i in range(100)])
+
+    def operation():
+        template.render(record=next(records))
+    return operation
+
+
+def _first_render(env, bytecode):
+    from jinja2 import DictLoader
+
+    cache = None
+    if bytecode:
+        from ..templating.api import precompile
+        from ..templating.bytecode import SharedBytecodeCache
+
+        directory = tempfile.mkdtemp(prefix='invenio-benchmarks-')
+        atexit.register(shutil.rmtree, directory, True)
+        cache = SharedBytecodeCache(directory)
+    # Without a template cache every render loads the templates like the
+    # first request of a new worker does.
+    jinja_env = env.app.jinja_env.overlay(
+        loader=DictLoader(PAGE_TEMPLATES), cache_size=0,
+        bytecode_cache=cache)
+    if bytecode:
+        precompile(jinja_env)
+    records = itertools.cycle([sample_record(i) for i in range(100)])
+
+    def operation():
+        jinja_env.get_template('record.html').render(record=next(records))
+    return operation
+
+
+@benchmark('templates.first_render', iterations=200)
+def templates_first_render(env):
+    """Compile and render a record page in a fresh worker."""
+    return _first_render(env, bytecode=False)
+
+
+@benchmark('templates.first_render_bytecode', iterations=200)
+def templates_first_render_bytecode(env):
+    """Render a record page in a fresh worker from the bytecode cache."""
+    return _first_render(env, bytecode=True)
+
+
+def _packing_codec():
+    from ..packing.codec import get_codec
+
+    try:
+        return get_codec('msgpack+zstd')
+    except ImportError:
+        return get_codec('json+zlib')
+
+
+def _storage_metrics(codec, records):
+    json_size = sum(len(json.dumps(r, separators=(',', ':')))
+                    for r in records)
+    packed_size = sum(len(codec.pack(r)) for r in records)
+    return dict(codec=codec.name, json_size=json_size,
+                packed_size=packed_size)
+
+
+@benchmark('packing.decode_json', iterations=2000)
+def packing_decode_json(env):
+    """Decode the JSON of a record to read its title."""
+    records = [sample_record(i) for i in range(100)]
+    documents = itertools.cycle([json.dumps(r) for r in records])
+
+    def operation():
+        json.loads(next(documents))['title']
+    operation.metrics = _storage_metrics(_packing_codec(), records)
+    return operation
+
+
+@benchmark('packing.decode_lazy', iterations=2000)
+def packing_decode_lazy(env):
+    """Unpack a packed record and decode only its title."""
+    codec = _packing_codec()
+    records = [sample_record(i) for i in range(100)]
+    blobs = itertools.cycle([codec.pack(r) for r in records])
+
+    def operation():
+        codec.unpack(next(blobs))['title']
+    operation.metrics = _storage_metrics(codec, records)
+    return operation
+
+
+def _list_page(env, packed):
+    from invenio_db import db
+    from invenio_records.models import RecordMetadata
+
+    from ..packing.api import load_records, migrate
+
+    uuids = [uuid for recid, uuid in env.records]
+    pages = itertools.cycle(
+        [uuids[i:i + 20] for i in range(0, len(uuids) - 19, 20)])
+    if packed:
+        migrate(_packing_codec().name)
+
+        def operation():
+            [r['title'] for r in load_records(next(pages))]
+    else:
+        def operation():
+            query = db.session.query(RecordMetadata.json).filter(
+                RecordMetadata.id.in_(next(pages)))
+            [data['title'] for data, in query]
+    return operation
+
+
+@benchmark('packing.list_json', iterations=500, items=20)
+def packing_list_json(env):
+    """Read the titles of a page of 20 records from the JSON column."""
+    return _list_page(env, packed=False)
+
+
+@benchmark('packing.list_packed', iterations=500, items=20)
+def packing_list_packed(env):
+    """Read the titles of a page of 20 packed records."""
+    return _list_page(env, packed=True)
+
+
+@benchmark('ingest.bulk', iterations=10, items=1000)
+def ingest_bulk(env):
+    """Bulk load 1000 records in batches of 500."""
+    loader = env.app.extensions['invenio-ingest'].loader(
+        batch_size=500, workers=0)
+    counter = itertools.count()
+
+    def operation():
+        loader.load(sample_record(next(counter)) for dummy in range(1000))
+    return operation
+
+
+def _ingest_marcxml(env, workers):
+    from ..ingest.marcxml import iter_marcxml, marc21_to_json
+
+    loader = env.app.extensions['invenio-ingest'].loader(
+        batch_size=500, workers=workers, converter=marc21_to_json)
+    dump = sample_marcxml(1000)
+
+    def operation():
+        loader.load(iter_marcxml(io.BytesIO(dump)))
+    return operation
+
+
+@benchmark('ingest.marcxml', iterations=10, items=1000)
+def ingest_marcxml(env):
+    """Bulk load 1000 MARCXML records converted in the loading process."""
+    return _ingest_marcxml(env, workers=0)
+
+
+@benchmark('ingest.marcxml_parallel', iterations=10, items=1000)
+def ingest_marcxml_parallel(env):
+    """Bulk load 1000 MARCXML records converted in one process per CPU."""
+    return _ingest_marcxml(env, workers=None)
+
+
+_access_data = {}
+
+
+def _access_index(records=1000000, roles=300, user_roles=50, hits=10000):
+    """Return sample bitmaps, record roles, user roles and search hits.
+
+    Every record is readable by two random roles; one in ten is public
+    (role ``0``).
+    """
+    if not _access_data:
+        from array import array
+
+        from ..accessindex.bitmap import Bitmap
+
+        rnd = random.Random(0)
+        first = array('H', (rnd.randrange(roles) if rnd.random() > 0.1
+                            else 0 for dummy in range(records)))
+        second = array('H', (rnd.randrange(1, roles)
+                             for dummy in range(records)))
+        positions = [[] for dummy in range(roles)]
+        for recid in range(records):
+            positions[first[recid]].append(recid)
+            positions[second[recid]].append(recid)
+        _access_data.update(
+            bitmaps=[Bitmap.from_values(values) for values in positions],
+            first=first, second=second,
+            roles=[0] + rnd.sample(range(1, roles), user_roles),
+            hits=rnd.sample(range(records), hits),
+        )
+    return _access_data
+
+
+@benchmark('access.filter_per_record', iterations=20, items=10000)
+def access_filter_per_record(env):
+    """Filter 10000 hits of 1M records by checking the roles of each."""
+    data = _access_index()
+    first, second, hits = data['first'], data['second'], data['hits']
+
+    def operation():
+        roles = set(data['roles'])
+        [recid for recid in hits
+         if first[recid] in roles or second[recid] in roles]
+    return operation
+
+
+@benchmark('access.filter_bitmap', iterations=20, items=10000)
+def access_filter_bitmap(env):
+    """Filter 10000 hits of 1M records with the cached bitmap of 50 roles."""
+    from ..accessindex.bitmap import Bitmap
+
+    data = _access_index()
+    bitmaps, hits = data['bitmaps'], data['hits']
+    readable = Bitmap.union(bitmaps[role] for role in data['roles'])
+
+    def operation():
+        readable.filter(hits)
+    operation.metrics = dict(
+        bitmaps=len(bitmaps), size=sum(len(b.dumps()) for b in bitmaps))
+    return operation
+
+
+@benchmark('access.union', iterations=20)
+def access_union(env):
+    """Compute the readable records of 50 roles out of 300 for 1M records."""
+    from ..accessindex.bitmap import Bitmap
+
+    data = _access_index()
+    bitmaps = data['bitmaps']
+
+    def operation():
+        Bitmap.union(bitmaps[role] for role in data['roles'])
+    return operation
+
+
+@benchmark('access.count_bitmap', iterations=20, items=1000000)
+def access_count_bitmap(env):
+    """Count the readable records of a 1M records result set."""
+    from ..accessindex.bitmap import Bitmap
+
+    data = _access_index()
+    readable = Bitmap.union(data['bitmaps'][role] for role in data['roles'])
+    everything = Bitmap((1 << 1000000) - 1)
+
+    def operation():
+        len(readable & everything)
+    return operation
+
+
+_files_data = {}
+
+
+def _large_file(megabytes=64):
+    """Return the folder and path of a sample file of 64 MiB."""
+    if not _files_data:
+        directory = tempfile.mkdtemp(prefix='invenio-benchmarks-')
+        atexit.register(shutil.rmtree, directory, True)
+        path = os.path.join(directory, 'large.bin')
+        block = os.urandom(1 << 20)
+        with open(path, 'wb') as fp:
+            for dummy in range(megabytes):
+                fp.write(block)
+        _files_data.update(directory=directory, path=path,
+                           size=megabytes << 20)
+    return _files_data
+
+
+def _socket_sink():
+    """Return a socket whose peer discards everything it receives."""
+    out, sink = socket.socketpair()
+
+    def drain():
+        while sink.recv(1 << 20):
+            pass
+    thread = threading.Thread(target=drain)
+    thread.daemon = True
+    thread.start()
+    atexit.register(out.close)
+    return out
+
+
+@benchmark('files.download_read', iterations=10, items=64)
+def files_download_read(env):
+    """Send a 64 MiB file to a socket in 64 KiB reads (MiB/s)."""
+    data = _large_file()
+    out = _socket_sink()
+
+    def operation():
+        with open(data['path'], 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 16), b''):
+                out.sendall(chunk)
+    return operation
+
+
+@benchmark('files.download_sendfile', iterations=10, items=64)
+def files_download_sendfile(env):
+    """Send a 64 MiB file to a socket with ``sendfile`` (MiB/s)."""
+    data = _large_file()
+    out = _socket_sink()
+
+    def operation():
+        with open(data['path'], 'rb') as fp:
+            offset = 0
+            while offset < data['size']:
+                offset += os.sendfile(out.fileno(), fp.fileno(), offset,
+                                      data['size'] - offset)
+    return operation
+
+
+@benchmark('files.upload_two_pass', iterations=10, items=64)
+def files_upload_two_pass(env):
+    """Store a 64 MiB upload, then read it again for its checksum."""
+    from ..files.storage import checksum_file
+
+    data = _large_file()
+    target = os.path.join(data['directory'], 'two-pass.bin')
+
+    def operation():
+        with open(data['path'], 'rb') as source:
+            with open(target, 'wb') as fp:
+                shutil.copyfileobj(source, fp, 1 << 20)
+                fp.flush()
+                os.fsync(fp.fileno())
+        with open(target, 'rb') as fp:
+            checksum_file(fp)
+    return operation
+
+
+@benchmark('files.upload_streaming', iterations=10, items=64)
+def files_upload_streaming(env):
+    """Store a 64 MiB upload computing its checksum while writing it."""
+    from ..files.storage import LocalFileStorage
+
+    data = _large_file()
+    storage = LocalFileStorage(os.path.join(data['directory'], 'storage'))
+
+    def operation():
+        with open(data['path'], 'rb') as source:
+            storage.delete(storage.save(source).key)
+    return operation
+
+
+_duplicates_data = {}
+
+
+def _duplicate_signatures(records=10000):
+    """Return signatures of records with random titles and authors."""
+    if not _duplicates_data:
+        from ..duplicates.minhash import MinHasher, band_keys, features
+
+        rnd = random.Random(0)
+        words = ['word{0}'.format(i) for i in range(5000)]
+        hasher = MinHasher(128)
+        signatures = [hasher.signature(features({
+            'title': ' '.join(rnd.sample(words, 8)),
+            'authors': [{'name': 'Author{0}, A.'.format(rnd.randrange(1000))}
+                        for dummy in range(3)],
+        })) for dummy in range(records)]
+        buckets = {}
+        for number, signature in enumerate(signatures):
+            for key in band_keys(signature, 32):
+                buckets.setdefault(key, []).append(number)
+        _duplicates_data.update(signatures=signatures, buckets=buckets,
+                                queries=rnd.sample(range(records), 10))
+    return _duplicates_data
+
+
+@benchmark('duplicates.candidates_pairwise', iterations=3, items=10)
+def duplicates_candidates_pairwise(env):
+    """Find the duplicates of 10 records among 10000 by comparing all."""
+    from ..duplicates.minhash import similarity
+
+    data = _duplicate_signatures()
+    signatures = data['signatures']
+
+    def operation():
+        for query in data['queries']:
+            [number for number, other in enumerate(signatures)
+             if similarity(signatures[query], other) >= 0.8]
+    return operation
+
+
+@benchmark('duplicates.candidates_lsh', iterations=50, items=10)
+def duplicates_candidates_lsh(env):
+    """Find the duplicates of 10 records among 10000 with LSH buckets."""
+    from ..duplicates.minhash import band_keys, similarity
+
+    data = _duplicate_signatures()
+    signatures, buckets = data['signatures'], data['buckets']
+
+    def operation():
+        for query in data['queries']:
+            signature = signatures[query]
+            found = set()
+            for key in band_keys(signature, 32):
+                found.update(buckets.get(key, ()))
+            [number for number in found
+             if similarity(signature, signatures[number]) >= 0.8]
+    return operation
+
+
+@benchmark('duplicates.signature', iterations=20, items=100)
+def duplicates_signature(env):
+    """Compute the MinHash signatures of 100 sample records."""
+    from ..duplicates.minhash import MinHasher, features
+
+    hasher = MinHasher(128)
+    records = [sample_record(i) for i in range(100)]
+
+    def operation():
+        for data in records:
+            hasher.signature(features(data))
+    return operation
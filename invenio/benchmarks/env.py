@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Offline benchmark environment on SQLite and an in-memory cache."""
+
+from __future__ import absolute_import, print_function
+
+import os
+from contextlib import contextmanager
+
+
+class Environment(object):
+    """Application and sample data shared by the benchmark cases."""
+
+    def __init__(self, app, records):
+        """Initialize the environment.
+
+        :param app: Application with an active application context.
+        :param records: List of ``(recid, record uuid)`` of the sample
+            records.
+        """
+        self.app = app
+        self.records = records
+        self.client = app.test_client()
+
+
+def create_app(**config):
+    """Create the benchmark application.
+
+    The database defaults to an in-memory SQLite database and can be changed
+    with the ``BENCHMARK_DATABASE_URI`` environment variable.
+    """
+    from flask import Flask
+    from flask_cli import FlaskCLI
+    from invenio_db import InvenioDB
+    from invenio_pidstore import InvenioPIDStore
+    from invenio_records import InvenioRecords
+    from invenio_records_rest import InvenioRecordsREST
+
+    from ..cache.ext import InvenioRecordsCache
+    from ..ingest.ext import InvenioIngest
+
+    app = Flask('invenio.benchmarks')
+    app.config.update(
+        CACHE_TYPE='simple',
+        RECORDS_CACHE_SHARED_URL='memory://',
+        SECRET_KEY='benchmarks',
+        SQLALCHEMY_DATABASE_URI=os.environ.get(
+            'BENCHMARK_DATABASE_URI', 'sqlite://'),
+        TESTING=True,
+    )
+    app.config.update(config)
+    FlaskCLI(app)
+    InvenioDB(app)
+    InvenioPIDStore(app)
+    InvenioRecords(app)
+    InvenioRecordsREST(app)
+    InvenioIngest(app)
+    InvenioRecordsCache(app)
+    return app
+
+
+def sample_record(i):
+    """Return the ``i``-th sample record."""
+    return {
+        'title': 'Sample record {0}'.format(i),
+        'authors': [{'name': 'Author {0}'.format(j)} for j in range(5)],
+        'abstract': 'Lorem ipsum dolor sit amet. ' * 20,
+        'keywords': ['keyword {0}'.format(j) for j in range(10)],
+        'year': 1990 + i % 30,
+    }
+
+
+def sample_marcxml(count, start=0):
+    """Return a MARCXML collection of ``count`` sample records as bytes."""
+    from xml.sax.saxutils import escape
+
+    def datafield(tag, value, code='a'):
+        return (u'<datafield tag="{0}" ind1=" " ind2=" ">'
+                u'<subfield code="{1}">{2}</subfield></datafield>').format(
+                    tag, code, escape(value))
+
+    parts = [u'<collection xmlns="http://www.loc.gov/MARC21/slim">']
+    for i in range(start, start + count):
+        data = sample_record(i)
+        parts.append(u'<record>')
+        parts.append(datafield('245', data['title']))
+        parts.extend(datafield('700', author['name'])
+                     for author in data['authors'])
+        parts.append(datafield('520', data['abstract']))
+        parts.extend(datafield('653', keyword)
+                     for keyword in data['keywords'])
+        parts.append(datafield('260', str(data['year']), code='c'))
+        parts.append(u'</record>')
+    parts.append(u'</collection>')
+    return u''.join(parts).encode('utf-8')
+
+
+@contextmanager
+def environment(records=1000, **config):
+    """Yield an :class:`Environment` with ``records`` sample records."""
+    from invenio_db import db
+    from invenio_pidstore.models import PersistentIdentifier
+
+    app = create_app(**config)
+    with app.app_context():
+        db.create_all()
+        try:
+            current_ingest = app.extensions['invenio-ingest']
+            current_ingest.loader(workers=0).load(
+                sample_record(i) for i in range(records))
+            pids = PersistentIdentifier.query.filter_by(
+                pid_type='recid').all()
+            yield Environment(
+                app, [(pid.pid_value, pid.object_uuid) for pid in pids])
+        finally:
+            db.session.remove()
+            db.drop_all()
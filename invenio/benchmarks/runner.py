@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark registry, runner and report comparison."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+from ..version import __version__
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))), 'benchmarks', 'baseline.json')
+"""Reference report reports are compared with when no baseline is given.
+
+It is kept in the ``benchmarks`` directory of the source tree.
+"""
+
+Case = namedtuple('Case', ['name', 'func', 'iterations', 'items'])
+"""Registered benchmark case."""
+
+registry = OrderedDict()
+"""Registered benchmark cases by name."""
+
+
+def benchmark(name, iterations=1000, items=1):
+    """Register a benchmark case.
+
+    The decorated function is called with the benchmark environment and
+    returns the operation to time; everything done before returning is
+    excluded from the measurement.  Values of an optional ``metrics``
+    dictionary attribute of the operation (e.g. storage sizes) are added to
+    the results of the case.
+
+    :param name: Unique name of the case, e.g. ``records.create``.
+    :param iterations: Default number of timed operations.
+    :param items: Number of items processed by one operation, used to
+        compute the throughput.
+    """
+    def decorator(func):
+        registry[name] = Case(name, func, iterations, items)
+        return func
+    return decorator
+
+
+def percentile(samples, p):
+    """Return the ``p``-th percentile of sorted ``samples`` (nearest rank)."""
+    if not samples:
+        return None
+    rank = int(math.ceil(p / 100.0 * len(samples))) - 1
+    return samples[min(max(rank, 0), len(samples) - 1)]
+
+
+def summarize(samples, items=1):
+    """Return throughput and latency statistics of timing ``samples``."""
+    samples = sorted(samples)
+    total = sum(samples)
+    return OrderedDict([
+        ('iterations', len(samples)),
+        ('items', items),
+        ('total', total),
+        ('throughput', items * len(samples) / total if total else None),
+        ('mean', total / len(samples) if samples else None),
+        ('min', samples[0] if samples else None),
+        ('p50', percentile(samples, 50)),
+        ('p99', percentile(samples, 99)),
+        ('max', samples[-1] if samples else None),
+    ])
+
+
+def run_case(case, env, iterations=None, warmup=10):
+    """Time ``iterations`` operations of ``case`` in ``env``."""
+    timer = timeit.default_timer
+    operation = case.func(env)
+    for dummy in range(warmup):
+        operation()
+
+    samples = []
+    for dummy in range(iterations or case.iterations):
+        start = timer()
+        operation()
+        samples.append(timer() - start)
+    results = summarize(samples, items=case.items)
+    results.update(getattr(operation, 'metrics', {}))
+    return results
+
+
+def run(env_factory, names=None, iterations=None, warmup=10,
+        callback=None):
+    """Run benchmark cases and return the report.
+
+    :param env_factory: Function returning a context manager which yields a
+        fresh environment for each case.
+    :param names: Names or name prefixes of the cases to run (default all).
+    :param callback: Function called with the name and the results of each
+        finished case.
+    """
+    results = OrderedDict()
+    for case in registry.values():
+        if names and not any(case.name == n or case.name.startswith(n + '.')
+                             for n in names):
+            continue
+        with env_factory() as env:
+            results[case.name] = run_case(
+                case, env, iterations=iterations, warmup=warmup)
+        if callback:
+            callback(case.name, results[case.name])
+
+    return OrderedDict([
+        ('invenio', __version__),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('created', datetime.utcnow().isoformat()),
+        ('benchmarks', results),
+    ])
+
+
+Regression = namedtuple(
+    'Regression', ['name', 'metric', 'baseline', 'current', 'change'])
+"""Metric which got worse than the tolerance allows."""
+
+
+def compare(report, baseline, tolerance=0.1):
+    """Compare a report with a baseline report.
+
+    A case regresses when its throughput dropped, or its p50 or p99 latency
+    grew, by more than ``tolerance`` (relative).  Cases missing from either
+    report are ignored.
+
+    :returns: List of :class:`Regression`.
+    """
+    regressions = []
+    for name, current in report['benchmarks'].items():
+        previous = baseline['benchmarks'].get(name)
+        if not previous:
+            continue
+        for metric, sign in (('throughput', -1), ('p50', 1), ('p99', 1)):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / float(old)
+            if sign * change > tolerance:
+                regressions.append(
+                    Regression(name, metric, old, new, change))
+    return regressions
+
+
+def mismatches(report, baseline):
+    """Return the environment keys in which two reports differ.
+
+    Timings are only comparable between reports of the same Python version
+    on the same platform.
+    """
+    return [key for key in ('python', 'platform')
+            if report.get(key) != baseline.get(key)]
+
+
+def load_report(path):
+    """Load a JSON report."""
+    with open(path) as fp:
+        return json.load(fp, object_pairs_hook=OrderedDict)
+
+
+def dump_report(report, fp=None):
+    """Write a JSON report (to standard output by default)."""
+    fp = fp or sys.stdout
+    json.dump(report, fp, indent=2)
+    fp.write('\n')
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Two-tier read cache of resolved records.
+
+Resolving ``GET /records/<pid>`` takes two database queries: one for the
+persistent identifier and one for the record.  The record read cache keeps
+both results in an in-process LRU tier, bounded by the number and the size
+of the entries, and in a shared Redis tier:
+
+.. code-block:: python
+
+   RECORDS_CACHE_SHARED_URL = 'redis://localhost:6379/2'
+
+Without a shared tier the cache is disabled, as invalidations would not
+reach the other processes.  The records REST and UI endpoints read their
+records through the cache with the
+:class:`~invenio.cache.records.CachedRecord` record class, and
+:class:`~invenio.cache.api.CachedResolver` is a drop-in replacement of the
+persistent identifier resolver which also caches the identifier:
+
+.. code-block:: python
+
+   from invenio.cache.api import CachedResolver
+
+   pid, record = CachedResolver(pid_type='recid').resolve('1')
+
+Cached entries are invalidated when the database session which changed the
+record or identifier commits.  The hit and miss counters of the current
+process are available in ``current_records_cache.stats``.
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Two-tier read-through cache of resolved records."""
+
+from __future__ import absolute_import, print_function
+
+import json
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from uuid import UUID
+
+from ..profiling.api import phase
+
+
+class TieredCache(object):
+    """Read-through cache with an in-process and a shared tier.
+
+    Each key has a generation number, kept in the shared tier, which is
+    incremented whenever the key is invalidated.  Cached values carry the
+    generation they were loaded under and are only served while it is still
+    current, so neither a local copy in another process nor a value loaded
+    concurrently with an invalidation is ever served stale.
+
+    Without a shared tier the generations are kept in the process, hence
+    invalidations only reach this process; applications running several
+    processes must then not use a local tier either.  Generations in the
+    shared tier expire after twice the ``ttl``, so local values (which must
+    expire after ``ttl``) never outlive the generation they were loaded
+    under.
+    """
+
+    def __init__(self, local=None, shared=None, prefix='cache:', ttl=3600):
+        """Initialize the cache.
+
+        :param local: :class:`~invenio.cache.lru.LRUCache` or ``None``.
+        :param shared: Redis compatible client or ``None``.
+        :param prefix: Prefix of the keys in the shared tier.
+        :param ttl: Seconds after which shared values expire.
+        """
+        self.local = local
+        self.shared = shared
+        self.prefix = prefix
+        self.ttl = ttl
+        self.stats = defaultdict(int)
+        self._generations = defaultdict(int)
+
+    def _data_key(self, key):
+        return '{0}data:{1}'.format(self.prefix, key)
+
+    def _gen_key(self, key):
+        return '{0}gen:{1}'.format(self.prefix, key)
+
+    @phase('cache')
+    def get(self, key, loader):
+        """Return the value of ``key``, calling ``loader`` on a miss.
+
+        Values must be JSON serializable; ``None`` is not cached.  Values
+        served from the in-process tier are shared between callers and must
+        not be modified.
+        """
+        cached = self.local.get(key) if self.local is not None else None
+
+        if self.shared is None:
+            generation = self._generations[key]
+            if cached is not None and cached[0] == generation:
+                self.stats['local_hits'] += 1
+                return cached[1]
+            data = None
+        elif cached is not None:
+            generation = int(self.shared.get(self._gen_key(key)) or 0)
+            if cached[0] == generation:
+                self.stats['local_hits'] += 1
+                return cached[1]
+            data = self.shared.get(self._data_key(key))
+        else:
+            generation, data = self.shared.mget(
+                [self._gen_key(key), self._data_key(key)])
+            generation = int(generation or 0)
+
+        if data is not None:
+            entry = json.loads(data.decode('utf-8'))
+            if entry['gen'] == generation:
+                self.stats['shared_hits'] += 1
+                self._set_local(key, generation, entry['value'], len(data))
+                return entry['value']
+
+        self.stats['misses'] += 1
+        value = loader()
+        if value is not None:
+            data = json.dumps({'gen': generation, 'value': value})
+            if self.shared is not None:
+                self.shared.set(self._data_key(key), data, ex=self.ttl)
+            self._set_local(key, generation, value, len(data))
+        return value
+
+    def _set_local(self, key, generation, value, size):
+        if self.local is not None:
+            self.local.set(key, (generation, value), size=size)
+
+    def invalidate(self, keys):
+        """Invalidate ``keys`` in both tiers."""
+        keys = list(keys)
+        if not keys:
+            return
+        for key in keys:
+            if self.shared is not None:
+                self.shared.incr(self._gen_key(key))
+                self.shared.expire(self._gen_key(key), 2 * self.ttl)
+            else:
+                self._generations[key] += 1
+            if self.local is not None:
+                self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(*[self._data_key(key) for key in keys])
+        self.stats['invalidations'] += len(keys)
+
+    def clear(self):
+        """Drop the in-process tier and reset the counters."""
+        if self.local is not None:
+            self.local.clear()
+        self.stats.clear()
+
+
+def pid_key(pid_type, pid_value):
+    """Return the cache key of a persistent identifier."""
+    return 'pid:{0}:{1}'.format(pid_type, pid_value)
+
+
+def record_key(uuid):
+    """Return the cache key of a record."""
+    return 'rec:{0}'.format(uuid)
+
+
+def _load_object_uuid(pid_type, pid_value, object_type):
+    """Return the object of a registered identifier from the database."""
+    from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+    pid = PersistentIdentifier.query.filter_by(
+        pid_type=pid_type, pid_value=pid_value, object_type=object_type,
+        status=PIDStatus.REGISTERED).first()
+    return str(pid.object_uuid) if pid is not None else None
+
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def _load_record(uuid):
+    """Return the JSON and the metadata of a record from the database."""
+    from invenio_records.models import RecordMetadata
+
+    model = RecordMetadata.query.get(uuid)
+    if model is None or model.json is None:
+        return None
+    return dict(
+        json=model.json, version_id=model.version_id,
+        created=model.created.strftime(_DATETIME_FORMAT),
+        updated=model.updated.strftime(_DATETIME_FORMAT),
+    )
+
+
+def record_from_cache(uuid, value, record_class=None):
+    """Build a record with its model from a cached record value.
+
+    The model is not attached to a database session.  Committing the record
+    merges it into the session, where its ``version_id`` protects against
+    overwriting concurrent changes.
+    """
+    from invenio_records.api import Record
+    from invenio_records.models import RecordMetadata
+
+    model = RecordMetadata(
+        id=UUID(str(uuid)), json=value['json'], version_id=value['version_id'],
+        created=datetime.strptime(value['created'], _DATETIME_FORMAT),
+        updated=datetime.strptime(value['updated'], _DATETIME_FORMAT))
+    return (record_class or Record)(value['json'], model=model)
+
+
+class RecordCache(TieredCache):
+    """Cache of persistent identifier to record resolutions.
+
+    Identifier to object mappings and record contents are cached under
+    separate keys (see :func:`pid_key` and :func:`record_key`), so changing
+    a record does not touch its identifiers and vice versa.  Only registered
+    identifiers are cached.
+    """
+
+    def resolve(self, pid_type, pid_value, object_type='rec'):
+        """Return ``(record uuid, record value)`` or ``(None, None)``.
+
+        The record value is the dictionary turned into a record by
+        :func:`record_from_cache`.
+        """
+        uuid = self.get(pid_key(pid_type, pid_value), partial(
+            _load_object_uuid, pid_type, pid_value, object_type))
+        if uuid is None:
+            return None, None
+        return uuid, self.record(uuid)
+
+    def record(self, uuid):
+        """Return the cached value of the record ``uuid`` or ``None``."""
+        return self.get(record_key(uuid), partial(_load_record, str(uuid)))
+
+
+class CachedResolver(object):
+    """Drop-in replacement of :class:`invenio_pidstore.resolver.Resolver`.
+
+    Registered identifiers are resolved through a :class:`RecordCache`.
+    Everything else (unknown, deleted or redirected identifiers) is passed to
+    the regular resolver, which raises the appropriate exception.  Resolved
+    records share their content with the cache and are meant for reading.
+    """
+
+    def __init__(self, pid_type=None, object_type='rec', cache=None,
+                 record_class=None):
+        """Initialize the resolver.
+
+        :param cache: :class:`RecordCache` (defaults to the cache of the
+            current application).
+        :param record_class: Class of the resolved records (defaults to
+            :class:`invenio_records.api.Record`).
+        """
+        self.pid_type = pid_type
+        self.object_type = object_type
+        self.record_class = record_class
+        self._cache = cache
+
+    @property
+    def cache(self):
+        """Record cache used by the resolver."""
+        if self._cache is None:
+            from .proxies import current_records_cache
+            return current_records_cache.cache
+        return self._cache
+
+    def resolve(self, pid_value):
+        """Return ``(pid, record)`` of ``pid_value``."""
+        from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+        from invenio_pidstore.resolver import Resolver
+        from invenio_records.api import Record
+
+        uuid, value = self.cache.resolve(
+            self.pid_type, pid_value, object_type=self.object_type)
+        if uuid is None or value is None:
+            return Resolver(
+                pid_type=self.pid_type, object_type=self.object_type,
+                getter=(self.record_class or Record).get_record,
+            ).resolve(pid_value)
+
+        pid = PersistentIdentifier(
+            pid_type=self.pid_type, pid_value=pid_value,
+            status=PIDStatus.REGISTERED, object_type=self.object_type,
+            object_uuid=uuid)
+        return pid, record_from_cache(uuid, value, self.record_class)
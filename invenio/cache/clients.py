@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Shared cache clients.
+
+The shared tier talks to a Redis server through the subset of the
+``redis.StrictRedis`` API implemented by :class:`MemoryClient`, which keeps
+the data in the current process and serves tests and single process
+deployments.
+"""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+
+
+def create_client(url):
+    """Create a shared cache client from a URL.
+
+    ``memory://`` creates a :class:`MemoryClient`, any other URL is passed
+    to :meth:`redis.StrictRedis.from_url`.
+    """
+    if url.startswith('memory://'):
+        return MemoryClient()
+    from redis import StrictRedis
+    return StrictRedis.from_url(url)
+
+
+class MemoryClient(object):
+    """In-process stand-in for a Redis client."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name):
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and expires < time.time():
+            del self._data[name]
+            return None
+        return value
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        if not isinstance(value, type(u'')):
+            value = str(value)
+        return value.encode('utf-8')
+
+    def get(self, name):
+        """Return the value of ``name`` or ``None``."""
+        with self._lock:
+            return self._get(name)
+
+    def mget(self, keys, *args):
+        """Return the values of all ``keys``."""
+        keys = list(keys) if isinstance(keys, (list, tuple)) else [keys]
+        keys.extend(args)
+        with self._lock:
+            return [self._get(name) for name in keys]
+
+    def set(self, name, value, ex=None):
+        """Set ``name`` to ``value``, expiring after ``ex`` seconds."""
+        with self._lock:
+            self._data[name] = (
+                self._encode(value), time.time() + ex if ex else None)
+        return True
+
+    def setex(self, name, time_, value):
+        """Set ``name`` to ``value`` expiring after ``time_`` seconds."""
+        return self.set(name, value, ex=time_)
+
+    def incr(self, name, amount=1):
+        """Increment the integer value of ``name``."""
+        with self._lock:
+            value = int(self._get(name) or 0) + amount
+            expires = self._data.get(name, (None, None))[1]
+            self._data[name] = (self._encode(value), expires)
+            return value
+
+    def expire(self, name, time_):
+        """Let ``name`` expire after ``time_`` seconds."""
+        with self._lock:
+            value = self._get(name)
+            if value is None:
+                return False
+            self._data[name] = (value, time.time() + time_)
+            return True
+
+    def delete(self, *names):
+        """Delete keys and return the number of deleted keys."""
+        with self._lock:
+            return sum(1 for name in names
+                       if self._data.pop(name, None) is not None)
+
+    def flushdb(self):
+        """Delete all keys."""
+        with self._lock:
+            self._data.clear()
+        return True
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record read cache configuration."""
+
+from __future__ import absolute_import, print_function
+
+RECORDS_CACHE_LOCAL_MAX_ITEMS = 10000
+"""Maximum number of entries in the in-process tier (``0`` disables it)."""
+
+RECORDS_CACHE_LOCAL_MAX_SIZE = 64 * 1024 * 1024
+"""Maximum size in bytes of the serialized entries in the in-process tier."""
+
+RECORDS_CACHE_SHARED_URL = None
+"""URL of the shared tier, e.g. ``redis://localhost:6379/2``.
+
+The shared tier also holds the generations used to invalidate the entries of
+all processes, hence ``None`` disables the cache altogether.  ``memory://``
+keeps the shared tier in the process and is only correct when a single
+process serves requests.
+"""
+
+RECORDS_CACHE_PREFIX = 'records:'
+"""Prefix of the keys in the shared tier."""
+
+RECORDS_CACHE_TTL = 3600
+"""Seconds after which cached entries expire."""
+
+RECORDS_CACHE_ENDPOINTS = ('RECORDS_REST_ENDPOINTS', 'RECORDS_UI_ENDPOINTS')
+"""Endpoint configurations whose records are read through the cache.
+
+Endpoints without a ``record_class`` get
+:class:`~invenio.cache.records.CachedRecord`.  Only endpoints configured
+before the extension is initialized (e.g. in the instance configuration)
+are changed.
+"""
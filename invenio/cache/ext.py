@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record read cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property
+
+from . import config
+
+
+class _RecordsCacheState(object):
+    """Record read cache state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def cache(self):
+        """The :class:`~invenio.cache.api.RecordCache` of the application."""
+        from .api import RecordCache
+        from .clients import create_client
+        from .lru import LRUCache
+
+        url = self.app.config['RECORDS_CACHE_SHARED_URL']
+        max_items = self.app.config['RECORDS_CACHE_LOCAL_MAX_ITEMS'] \
+            if url else 0
+        return RecordCache(
+            local=LRUCache(
+                max_items=max_items,
+                max_size=self.app.config['RECORDS_CACHE_LOCAL_MAX_SIZE'],
+                ttl=self.app.config['RECORDS_CACHE_TTL'],
+            ) if max_items else None,
+            shared=create_client(url) if url else None,
+            prefix=self.app.config['RECORDS_CACHE_PREFIX'],
+            ttl=self.app.config['RECORDS_CACHE_TTL'],
+        )
+
+    @property
+    def stats(self):
+        """Hit, miss and invalidation counters of this process."""
+        stats = dict(self.cache.stats)
+        if self.cache.local is not None:
+            stats.update(local_size=self.cache.local.size,
+                         local_items=len(self.cache.local),
+                         local_evictions=self.cache.local.evictions)
+        return stats
+
+
+class InvenioRecordsCache(object):
+    """Invenio record read cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        from . import receivers
+
+        self.init_config(app)
+        self.init_endpoints(app)
+        receivers.connect()
+        app.extensions['invenio-records-cache'] = _RecordsCacheState(app)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('RECORDS_CACHE_'):
+                app.config.setdefault(k, getattr(config, k))
+
+    def init_endpoints(self, app):
+        """Read the records of the configured endpoints through the cache."""
+        if not app.config['RECORDS_CACHE_SHARED_URL']:
+            return
+        names = [name for name in app.config['RECORDS_CACHE_ENDPOINTS']
+                 if app.config.get(name)]
+        if not names:
+            return
+
+        from .records import CachedRecord
+
+        for name in names:
+            app.config[name] = dict(
+                (endpoint, dict(options, record_class=options.get(
+                    'record_class', CachedRecord)))
+                for endpoint, options in app.config[name].items())
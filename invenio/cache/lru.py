@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Thread-safe in-process LRU cache with size based eviction."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Least recently used cache bounded by item count and total size.
+
+    Every item has a size (e.g. the length of its serialized form) given
+    when it is stored.  Items are evicted in least recently used order as
+    soon as either bound is exceeded.  Optionally items expire after
+    ``ttl`` seconds.
+    """
+
+    def __init__(self, max_items=10000, max_size=None, ttl=None):
+        """Initialize the cache.
+
+        :param max_items: Maximum number of items.
+        :param max_size: Maximum sum of item sizes (``None`` for no limit).
+        :param ttl: Seconds after which items expire (``None`` for never).
+        """
+        self.max_items = max_items
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self._items)
+
+    def __contains__(self, key):
+        """Check if ``key`` is cached (without updating its recency)."""
+        return key in self._items
+
+    def get(self, key, default=None):
+        """Return the value of ``key`` and mark it as recently used."""
+        with self._lock:
+            try:
+                value, size, expires = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires < time.time():
+                self.size -= size
+                self.misses += 1
+                return default
+            self._items[key] = (value, size, expires)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=1):
+        """Store ``value`` of the given ``size`` under ``key``."""
+        if self.max_size is not None and size > self.max_size:
+            self.delete(key)
+            return
+        expires = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._items[key] = (value, size, expires)
+            self.size += size
+            while len(self._items) > self.max_items or (
+                    self.max_size is not None and self.size > self.max_size):
+                dummy, (dummy, evicted, dummy) = self._items.popitem(
+                    last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove ``key`` from the cache."""
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+
+    def clear(self):
+        """Remove all items."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
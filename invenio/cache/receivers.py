@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Invalidation of cached records from database session events.
+
+Records and persistent identifiers changed through the ORM are collected
+after each flush and invalidated once the transaction is committed.  Changes
+written with bulk statements bypass the session and must be invalidated
+explicitly with :meth:`~invenio.cache.api.TieredCache.invalidate`.
+"""
+
+from __future__ import absolute_import, print_function
+
+import itertools
+
+from flask import current_app, has_app_context
+from invenio_pidstore.models import PersistentIdentifier
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .api import pid_key, record_key
+
+_INFO_KEY = 'invenio-records-cache'
+
+
+def collect_changes(session, flush_context):
+    """Remember the cache keys of flushed records and identifiers."""
+    keys = session.info.setdefault(_INFO_KEY, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, RecordMetadata):
+            keys.add(record_key(obj.id))
+        elif isinstance(obj, PersistentIdentifier):
+            keys.add(pid_key(obj.pid_type, obj.pid_value))
+
+
+def invalidate_changes(session):
+    """Invalidate the keys changed by the committed transaction."""
+    keys = session.info.pop(_INFO_KEY, None)
+    if keys and has_app_context():
+        state = current_app.extensions.get('invenio-records-cache')
+        if state is not None:
+            state.cache.invalidate(keys)
+
+
+def discard_changes(session):
+    """Forget the keys changed by a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners = (
+    ('after_flush', collect_changes),
+    ('after_commit', invalidate_changes),
+    ('after_rollback', discard_changes),
+)
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    for name, func in _listeners:
+        if not event.contains(Session, name, func):
+            event.listen(Session, name, func)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    for name, func in _listeners:
+        if event.contains(Session, name, func):
+            event.remove(Session, name, func)
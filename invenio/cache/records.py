@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record class reading through the record read cache."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_records.api import Record
+
+from .api import record_from_cache
+from .proxies import current_records_cache
+
+
+class CachedRecord(Record):
+    """Record fetched through the record read cache.
+
+    Used as the ``record_class`` of the records REST and UI endpoints (see
+    :data:`~invenio.cache.config.RECORDS_CACHE_ENDPOINTS`), so that their
+    resolvers take the record from the cache.  Records missing from the
+    database are looked up by :meth:`invenio_records.api.Record.get_record`,
+    which raises the usual exception.
+    """
+
+    @classmethod
+    def get_record(cls, id_, *args, **kwargs):
+        """Return the record ``id_`` from the cache."""
+        value = current_records_cache.cache.record(id_)
+        if value is None:
+            return super(CachedRecord, cls).get_record(id_, *args, **kwargs)
+        return record_from_cache(id_, value, record_class=cls)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pool settings and instrumentation.
+
+Web, worker and command line processes need differently sized connection
+pools.  ``DB_POOL_ROLES`` holds the pool settings of each role; the role of
+a process is detected from its command line or set in ``DB_POOL_ROLE``:
+
+.. code-block:: python
+
+   DB_POOL_ROLES = {
+       'web': dict(pool_size=10, max_overflow=10, pool_timeout=10),
+       'worker': dict(pool_size=2, max_overflow=4, pool_timeout=30),
+       'cli': dict(pool_size=1, max_overflow=4, pool_timeout=60),
+   }
+
+Every engine is instrumented on its first connection.  The number of
+checked out and overflow connections, the time spent waiting for a
+connection and checkout timeouts (of connections opened through the monitor,
+as by ``dbpool load``) and queries slower than
+``DB_POOL_SLOW_QUERY_THRESHOLD`` are counted per process and served as JSON
+under ``DB_POOL_METRICS_URL`` to clients sending the bearer token set in
+``DB_POOL_METRICS_TOKEN``.  The same metrics are available on the command
+line, together with a concurrent load simulation:
+
+.. code-block:: console
+
+   $ python manage.py dbpool show
+   $ python manage.py dbpool stats --url http://localhost:5000/metrics/db-pool
+   $ python manage.py dbpool load --concurrency 40
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Connection pool command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import threading
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+from .ext import InvenioDBPool, pool_options
+
+
+def _print_metrics(metrics):
+    for engine in metrics:
+        click.echo('{name} ({pool})'.format(**engine))
+        for key in sorted(engine):
+            if key not in ('name', 'pool', 'slow_queries'):
+                click.echo('  {0}: {1}'.format(key, engine[key]))
+        for duration, statement in engine['slow_queries']:
+            click.echo('  slow {0:.3f}s: {1}'.format(duration, statement))
+
+
+@click.group()
+def dbpool():
+    """Database connection pool commands."""
+
+
+@dbpool.command()
+@with_appcontext
+def show():
+    """Show the pool settings of every process role."""
+    current = current_app.config['DB_POOL_ROLE']
+    for role in sorted(current_app.config['DB_POOL_ROLES']):
+        options = pool_options(current_app, role)
+        click.echo('{0}{1}: {2}'.format(
+            role, ' (current)' if role == current else '', ', '.join(
+                '{0}={1}'.format(k, v) for k, v in sorted(options.items()))))
+
+
+@dbpool.command()
+@click.option('-c', '--concurrency', type=int, default=20,
+              help='Number of concurrent threads.')
+@click.option('-n', '--requests', type=int, default=50,
+              help='Number of transactions per thread.')
+@click.option('-s', '--statement', default='SELECT 1',
+              help='Statement executed in every transaction.')
+@click.option('--json', 'as_json', is_flag=True, default=False,
+              help='Print the metrics as JSON.')
+@with_appcontext
+def load(concurrency, requests, statement, as_json):
+    """Run concurrent transactions and print the pool metrics.
+
+    Simulates concurrent web or worker requests against the pool settings of
+    the current role, to see how often and how long callers wait for a
+    connection.
+    """
+    from invenio_db import db
+    from sqlalchemy import text
+
+    from .monitor import monitor
+
+    mon = monitor(db.engine)
+    errors = []
+
+    def run():
+        for dummy in range(requests):
+            try:
+                with mon.connect() as conn, conn.begin():
+                    conn.execute(text(statement))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=run) for dummy in range(concurrency)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    metrics = InvenioDBPool.metrics()
+    if as_json:
+        click.echo(json.dumps(dict(elapsed=elapsed, errors=len(errors),
+                                   engines=metrics), indent=2))
+    else:
+        click.echo('{0} transactions in {1:.2f}s, {2} failed'.format(
+            concurrency * requests, elapsed, len(errors)))
+        _print_metrics(metrics)
+
+
+@dbpool.command()
+@click.option('-u', '--url', default=None,
+              help='Metrics endpoint of a running process to read.')
+@click.option('--json', 'as_json', is_flag=True, default=False,
+              help='Print the metrics as JSON.')
+@with_appcontext
+def stats(url, as_json):
+    """Show the pool metrics of a running process.
+
+    Without ``--url`` the metrics of this process are shown after running a
+    single query.
+    """
+    if url:
+        try:
+            from urllib.request import Request, urlopen
+        except ImportError:  # pragma: no cover
+            from urllib2 import Request, urlopen
+        request = Request(url, headers={'Authorization': 'Bearer {0}'.format(
+            current_app.config['DB_POOL_METRICS_TOKEN'])})
+        metrics = json.loads(
+            urlopen(request).read().decode('utf-8'))['engines']
+    else:
+        from invenio_db import db
+
+        db.session.execute('SELECT 1')
+        db.session.commit()
+        metrics = InvenioDBPool.metrics()
+    if as_json:
+        click.echo(json.dumps(metrics, indent=2))
+    else:
+        _print_metrics(metrics)
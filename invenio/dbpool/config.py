@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pool configuration."""
+
+from __future__ import absolute_import, print_function
+
+DB_POOL_ROLE = None
+"""Role of the process: ``web``, ``worker`` or ``cli``.
+
+If ``None`` the role is detected from the command line of the process (see
+:func:`invenio.dbpool.ext.detect_role`).
+"""
+
+DB_POOL_ROLES = {
+    'web': dict(pool_size=10, max_overflow=10, pool_timeout=10,
+                pool_recycle=3600),
+    'worker': dict(pool_size=2, max_overflow=4, pool_timeout=30,
+                   pool_recycle=3600),
+    'cli': dict(pool_size=1, max_overflow=4, pool_timeout=60,
+                pool_recycle=3600),
+}
+"""Connection pool settings by process role.
+
+The settings are applied to the ``SQLALCHEMY_POOL_SIZE``,
+``SQLALCHEMY_MAX_OVERFLOW``, ``SQLALCHEMY_POOL_TIMEOUT`` and
+``SQLALCHEMY_POOL_RECYCLE`` options, unless those are set explicitly or the
+database is SQLite, whose engines do not use a ``QueuePool``.  Size
+the pools so that the sum over all web and worker processes stays below the
+connection limit of the database server.
+"""
+
+DB_POOL_SLOW_QUERY_THRESHOLD = 0.5
+"""Seconds after which a query is recorded as slow (``None`` to disable)."""
+
+DB_POOL_METRICS_URL = '/metrics/db-pool'
+"""URL of the pool metrics endpoint (``None`` to disable the endpoint)."""
+
+DB_POOL_METRICS_TOKEN = None
+"""Bearer token required to read the pool metrics endpoint.
+
+The endpoint is disabled while no token is set.  Clients send it in the
+``Authorization: Bearer <token>`` header.
+"""
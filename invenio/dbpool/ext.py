@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Database connection pool extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+
+from . import config
+
+POOL_OPTIONS = {
+    'pool_size': 'SQLALCHEMY_POOL_SIZE',
+    'max_overflow': 'SQLALCHEMY_MAX_OVERFLOW',
+    'pool_timeout': 'SQLALCHEMY_POOL_TIMEOUT',
+    'pool_recycle': 'SQLALCHEMY_POOL_RECYCLE',
+}
+"""Configuration variables of the pool settings."""
+
+WEB_SERVERS = ('gunicorn', 'uwsgi', 'mod_wsgi', 'waitress-serve')
+"""Executables of WSGI servers."""
+
+
+def detect_role(argv=None):
+    """Return the role of the process from its command line.
+
+    Celery processes are ``worker`` processes, WSGI servers and the
+    development server are ``web`` processes and any other command is a
+    ``cli`` process.  Processes without a command line (e.g. embedded WSGI
+    interpreters) are ``web`` processes.
+    """
+    argv = sys.argv if argv is None else argv
+    if not argv or not argv[0]:
+        return 'web'
+    executable = os.path.basename(argv[0])
+    if 'celery' in executable or 'celery' in argv[1:2]:
+        return 'worker'
+    if executable.startswith(WEB_SERVERS) or 'runserver' in argv or \
+            'run' in argv[1:2]:
+        return 'web'
+    return 'cli'
+
+
+def uses_queue_pool(uri):
+    """Check if engines of the database ``uri`` use a ``QueuePool``.
+
+    SQLite engines use a ``SingletonThreadPool``, ``StaticPool`` or
+    ``NullPool``, which reject the pool size and timeout settings.  Without
+    a URI Flask-SQLAlchemy connects to an in-memory SQLite database.
+    """
+    backend = (uri or 'sqlite://').split(':', 1)[0].split('+', 1)[0]
+    return backend != 'sqlite'
+
+
+def pool_options(app, role=None):
+    """Return the pool settings of ``role`` (defaults to the app's role)."""
+    role = role or app.config['DB_POOL_ROLE']
+    return dict(app.config['DB_POOL_ROLES'].get(role, {}))
+
+
+class InvenioDBPool(object):
+    """Invenio database connection pool extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        from . import monitor
+
+        self.init_config(app)
+        if uses_queue_pool(app.config.get('SQLALCHEMY_DATABASE_URI')):
+            for name, value in pool_options(app).items():
+                if name in POOL_OPTIONS:
+                    app.config.setdefault(POOL_OPTIONS[name], value)
+        monitor.connect(
+            slow_query_threshold=app.config['DB_POOL_SLOW_QUERY_THRESHOLD'])
+        app.extensions['invenio-dbpool'] = self
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('DB_POOL_'):
+                app.config.setdefault(k, getattr(config, k))
+        if app.config['DB_POOL_ROLE'] is None:
+            app.config['DB_POOL_ROLE'] = detect_role()
+
+    @staticmethod
+    def metrics():
+        """Return the pool metrics of the engines of this process."""
+        from .monitor import monitors
+        return [mon.snapshot() for mon in monitors()]
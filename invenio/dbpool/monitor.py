@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Instrumentation of database connection pools.
+
+A :class:`PoolMonitor` counts the connections of one engine's pool through
+the pool events and records slow queries.  The time spent waiting for a
+connection is measured for connections opened with
+:meth:`PoolMonitor.connect`.  Monitors are attached automatically to every
+engine the first time it is connected to once :func:`connect` has been
+called.
+"""
+
+from __future__ import absolute_import, print_function
+
+import threading
+import time
+import weakref
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+
+class PoolMonitor(object):
+    """Connection pool and query metrics of an engine."""
+
+    def __init__(self, engine, slow_query_threshold=0.5, max_slow_queries=50):
+        """Instrument ``engine``.
+
+        :param slow_query_threshold: Seconds after which a query is recorded
+            as slow (``None`` disables recording).
+        :param max_slow_queries: Number of slow queries kept.
+        """
+        self._engine = weakref.ref(engine)
+        self.name = repr(engine.url)
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_queries = deque(maxlen=max_slow_queries)
+        self.counters = dict(connects=0, checkouts=0, checkins=0, waits=0,
+                             timeouts=0, queries=0, slow=0)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.checked_out = 0
+        self._pool = None
+        self._lock = threading.Lock()
+        self.instrument_pool()
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+    @property
+    def engine(self):
+        """The instrumented engine.
+
+        Monitors only keep a weak reference to it, so that they are dropped
+        together with their engine.
+        """
+        return self._engine()
+
+    def instrument_pool(self):
+        """Instrument the current pool of the engine.
+
+        Engines replace their pool when they are disposed, hence this is
+        called again whenever the pool changed.
+        """
+        pool = self.engine.pool
+        if self._pool is not None and self._pool() is pool:
+            return
+        self._pool = weakref.ref(pool)
+        # Monitors are attached from the first connection, which is already
+        # checked out.
+        checkedout = getattr(pool, 'checkedout', None)
+        self.checked_out = checkedout() if checkedout else 0
+        event.listen(pool, 'connect', lambda *args: self._add(connects=1))
+        event.listen(pool, 'checkout', self._checkout)
+        event.listen(pool, 'checkin', self._checkin)
+
+    def connect(self):
+        """Return a new connection of the engine, timing the pool checkout.
+
+        The time until the connection is checked out is added to the wait
+        metrics, and checkout timeouts are counted.
+        """
+        start = time.time()
+        try:
+            return self.engine.connect()
+        except exc.TimeoutError:
+            self._add(timeouts=1)
+            raise
+        finally:
+            wait = time.time() - start
+            with self._lock:
+                self.counters['waits'] += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+
+    def _add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] += value
+
+    def _checkout(self, dbapi_connection, record, proxy):
+        with self._lock:
+            self.counters['checkouts'] += 1
+            self.checked_out += 1
+
+    def _checkin(self, dbapi_connection, record):
+        with self._lock:
+            self.counters['checkins'] += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context,
+                        executemany):
+        conn.info.setdefault('dbpool_query_start', []).append(time.time())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context,
+                       executemany):
+        duration = time.time() - conn.info['dbpool_query_start'].pop()
+        threshold = self.slow_query_threshold
+        slow = threshold is not None and duration >= threshold
+        with self._lock:
+            self.counters['queries'] += 1
+            if slow:
+                self.counters['slow'] += 1
+                self.slow_queries.append(
+                    (round(duration, 6), ' '.join(statement.split())[:500]))
+
+    def snapshot(self):
+        """Return the current metrics as a dictionary."""
+        pool = self.engine.pool
+        with self._lock:
+            waits = self.counters['waits']
+            metrics = dict(
+                self.counters,
+                name=self.name,
+                pool=type(pool).__name__,
+                checked_out=self.checked_out,
+                wait_total=self.wait_total,
+                wait_max=self.wait_max,
+                wait_avg=self.wait_total / waits if waits else 0.0,
+                slow_queries=list(self.slow_queries),
+            )
+        for name in ('size', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            if method is not None:
+                metrics['pool_' + name] = method()
+        return metrics
+
+
+_monitors = weakref.WeakKeyDictionary()
+_monitors_lock = threading.Lock()
+_options = dict(slow_query_threshold=0.5)
+
+
+def monitor(engine):
+    """Return the :class:`PoolMonitor` of ``engine``, creating it if needed."""
+    with _monitors_lock:
+        mon = _monitors.get(engine)
+        if mon is None:
+            mon = _monitors[engine] = PoolMonitor(engine, **_options)
+        else:
+            mon.instrument_pool()
+        return mon
+
+
+def monitors():
+    """Return the monitors of the engines of this process."""
+    return list(_monitors.values())
+
+
+def _engine_connect(conn, branch):
+    if not branch:
+        monitor(conn.engine)
+
+
+def connect(**options):
+    """Attach a monitor to every engine when it is first connected to.
+
+    :param options: Options of the created :class:`PoolMonitor` instances.
+    """
+    _options.update(options)
+    if not event.contains(Engine, 'engine_connect', _engine_connect):
+        event.listen(Engine, 'engine_connect', _engine_connect)
+
+
+def disconnect():
+    """Stop attaching monitors to engines."""
+    if event.contains(Engine, 'engine_connect', _engine_connect):
+        event.remove(Engine, 'engine_connect', _engine_connect)
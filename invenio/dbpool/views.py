@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Connection pool metrics endpoint."""
+
+from __future__ import absolute_import, print_function
+
+import hmac
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from .ext import InvenioDBPool
+
+blueprint = Blueprint('invenio_dbpool', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``DB_POOL_METRICS_URL``."""
+    url = state.app.config.get('DB_POOL_METRICS_URL')
+    if url and state.app.config.get('DB_POOL_METRICS_TOKEN'):
+        state.app.add_url_rule(url, 'invenio_dbpool.metrics', metrics)
+
+
+def metrics():
+    """Return the pool metrics of this process as JSON."""
+    expected = 'Bearer {0}'.format(
+        current_app.config['DB_POOL_METRICS_TOKEN'])
+    if not hmac.compare_digest(
+            request.headers.get('Authorization', '').encode('utf-8'),
+            expected.encode('utf-8')):
+        abort(403)
+    return jsonify(role=current_app.config['DB_POOL_ROLE'],
+                   engines=InvenioDBPool.metrics())
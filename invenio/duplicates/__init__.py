@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate detection of records with MinHash and LSH.
+
+Comparing every record with every other is quadratic.  Instead, each record
+is reduced to a MinHash signature of its features (character shingles of
+the title, normalized author names and identifiers such as DOIs), stored in
+``duplicates_signatures``.  The signature is cut into bands and every band
+is hashed into a bucket of ``duplicates_buckets``; records sharing a bucket
+are candidates, and only candidates are compared.
+
+The index is updated in the transaction writing a record, including bulk
+loads of :mod:`invenio.ingest`.  Candidates of a record, or of metadata
+being submitted, are found with a few primary key lookups:
+
+.. code-block:: python
+
+   from invenio.duplicates.proxies import current_duplicates
+
+   current_duplicates.index.candidates(data={'title': 'Higgs boson'})
+   # [(UUID('...'), 0.86), ...]
+
+The fields are configured with ``DUPLICATES_TITLE``, ``DUPLICATES_AUTHORS``
+and ``DUPLICATES_IDENTIFIERS``.  With the default 128 hash functions in 32
+bands of 4 rows, pairs of similarity 0.8 are found with a probability above
+99.9 %, pairs of similarity 0.3 with less than 25 %.
+
+``python manage.py duplicates report`` lists all clusters of duplicates of
+the collection, comparing the candidate pairs in one process per CPU;
+``duplicates rebuild`` recomputes the index after the configuration
+changed.
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index API."""
+
+from __future__ import absolute_import, print_function
+
+import itertools
+import multiprocessing
+import uuid
+from collections import deque
+
+from invenio_db import db
+from sqlalchemy import and_, func, or_, select
+
+from .minhash import MinHasher, band_keys, clusters, dumps, features, loads, \
+    similar_pairs, similarity
+from .models import DuplicateBucket, DuplicateSignature
+
+_hashers = {}
+
+
+def compute_signatures(fields, num_perm, records):
+    """Return the ``(record_id, signature)`` pairs of records.
+
+    Executed in the worker processes of the rebuild.  Deleted records and
+    records without features have the signature ``None``.
+
+    :param fields: Keyword arguments of
+        :func:`~invenio.duplicates.minhash.features`.
+    :param records: List of ``(record_id, data)`` pairs.
+    """
+    if num_perm not in _hashers:
+        _hashers[num_perm] = MinHasher(num_perm)
+    hasher = _hashers[num_perm]
+    return [(record_id, None if data is None else
+             hasher.signature(features(data, **fields)))
+            for record_id, data in records]
+
+
+def _signature_chunk(args):
+    return compute_signatures(*args)
+
+
+def _verify_chunk(args):
+    return similar_pairs(*args)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _buckets_clause(table, keys):
+    """Return the condition selecting the ``(band, bucket)`` pairs."""
+    return or_(*[and_(table.c.band == band, table.c.bucket == bucket)
+                 for band, bucket in keys])
+
+
+class DuplicateIndex(object):
+    """Index of MinHash signatures and LSH buckets of records."""
+
+    def __init__(self, fields=None, num_perm=128, bands=32, threshold=0.8,
+                 max_bucket=1000, batch_size=1000, workers=None):
+        """Initialize the index.
+
+        :param fields: Keyword arguments of
+            :func:`~invenio.duplicates.minhash.features`.
+        :param num_perm: Length of the signatures (a multiple of
+            ``bands``).
+        :param bands: Number of LSH bands.
+        :param threshold: Default minimum similarity of duplicates.
+        :param max_bucket: Larger buckets are ignored by :meth:`candidates`
+            and :meth:`report`.
+        :param batch_size: Number of records per transaction of
+            :meth:`rebuild`.
+        :param workers: Number of processes of :meth:`rebuild` and
+            :meth:`report` (``None`` uses all CPUs, ``0`` none).
+        """
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands.')
+        self.fields = fields or {}
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.max_bucket = max_bucket
+        self.batch_size = batch_size
+        self.workers = multiprocessing.cpu_count() if workers is None \
+            else workers
+
+    def signature(self, data):
+        """Return the signature of a record (``None`` without features)."""
+        return compute_signatures(
+            self.fields, self.num_perm, [(None, data)])[0][1]
+
+    def update(self, session, records):
+        """Index records in the transaction of a session.
+
+        :param records: List of ``(record_id, data)`` pairs; ``data`` is
+            ``None`` for deleted records.
+        """
+        self.store(session, compute_signatures(
+            self.fields, self.num_perm, records))
+
+    def store(self, session, signatures):
+        """Replace the signatures and buckets of records."""
+        if not signatures:
+            return
+        record_ids = [record_id for record_id, signature in signatures]
+        for table in (DuplicateBucket.__table__, DuplicateSignature.__table__):
+            session.execute(table.delete().where(
+                table.c.record_id.in_(record_ids)))
+        signatures = [(record_id, signature)
+                      for record_id, signature in signatures if signature]
+        if not signatures:
+            return
+        session.execute(DuplicateSignature.__table__.insert(), [
+            dict(record_id=record_id, signature=dumps(signature))
+            for record_id, signature in signatures])
+        session.execute(DuplicateBucket.__table__.insert(), [
+            dict(band=band, bucket=bucket, record_id=record_id)
+            for record_id, signature in signatures
+            for band, bucket in band_keys(signature, self.bands)])
+
+    def _signatures(self, record_ids):
+        """Return the stored signatures of records by identifier."""
+        table = DuplicateSignature.__table__
+        result = {}
+        for chunk in _chunks(record_ids, self.batch_size):
+            for record_id, data in db.session.execute(select(
+                    [table.c.record_id, table.c.signature]).where(
+                    table.c.record_id.in_(chunk))):
+                result[record_id] = loads(data)
+        return result
+
+    def candidates(self, data=None, record_id=None, threshold=None,
+                   limit=None):
+        """Return the records similar to a record, most similar first.
+
+        Only the records sharing a bucket with the record are compared, so
+        the cost does not grow with the size of the collection.  Buckets of
+        more than ``max_bucket`` records are skipped, as by
+        :meth:`candidate_pairs`.
+
+        :param data: Record metadata (e.g. of a record being submitted).
+        :param record_id: Identifier of an indexed record, used when
+            ``data`` is not given; the record itself is excluded.
+        :param threshold: Minimum similarity (default the configured one).
+        :returns: List of ``(record_id, similarity)`` pairs.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if record_id is not None and not isinstance(record_id, uuid.UUID):
+            record_id = uuid.UUID(str(record_id))
+        if data is not None:
+            signature = self.signature(data)
+        else:
+            signature = self._signatures([record_id]).get(record_id)
+        if not signature:
+            return []
+        table = DuplicateBucket.__table__
+        keys = band_keys(signature, self.bands)
+        if self.max_bucket:
+            keys = [tuple(row) for row in db.session.execute(select(
+                [table.c.band, table.c.bucket]).where(
+                    _buckets_clause(table, keys)).group_by(
+                        table.c.band, table.c.bucket).having(
+                            func.count() <= self.max_bucket))]
+            if not keys:
+                return []
+        query = select([table.c.record_id]).where(
+            _buckets_clause(table, keys)).distinct()
+        found = [row[0] for row in db.session.execute(query)
+                 if row[0] != record_id]
+        result = [(found_id, similarity(signature, other))
+                  for found_id, other in self._signatures(found).items()]
+        result = sorted((r for r in result if r[1] >= threshold),
+                        key=lambda r: (-r[1], str(r[0])))
+        return result[:limit] if limit else result
+
+    def _pool(self):
+        return multiprocessing.Pool(self.workers) if self.workers else None
+
+    def rebuild(self, callback=None):
+        """Compute the signatures of all records again.
+
+        Records are read in pages of ``batch_size``; signatures are
+        computed in a pool of worker processes and each page is written in
+        its own transaction.
+
+        :param callback: Function called with the number of indexed
+            records after every page.
+        :returns: Number of indexed records.
+        """
+        from ..export.query import record_pages
+
+        table = DuplicateSignature.__table__
+        stats = dict(records=0)
+
+        def write(signatures):
+            self.store(db.session, signatures)
+            db.session.commit()
+            stats['records'] += len(signatures)
+            if callback:
+                callback(stats['records'])
+
+        db.session.execute(DuplicateBucket.__table__.delete())
+        db.session.execute(table.delete())
+        db.session.commit()
+        chunks = ((self.fields, self.num_perm,
+                   [(row[0], row[-1]) for row in page])
+                  for page in record_pages(page_size=self.batch_size))
+        pool = self._pool()
+        if pool is None:
+            for chunk in chunks:
+                write(compute_signatures(*chunk))
+            return stats['records']
+        try:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_signature_chunk, (chunk, )))
+                if len(pending) >= 2 * self.workers:
+                    write(pending.popleft().get())
+            while pending:
+                write(pending.popleft().get())
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+        return stats['records']
+
+    def candidate_pairs(self):
+        """Return the pairs of records sharing a bucket.
+
+        Buckets of more than ``max_bucket`` records (e.g. of records
+        without title) are skipped.
+
+        :returns: Set of ``(first, second)`` pairs and the number of
+            skipped buckets.
+        """
+        table = DuplicateBucket.__table__
+        shared = select([table.c.band, table.c.bucket]).group_by(
+            table.c.band, table.c.bucket).having(
+            func.count() > 1).alias('shared')
+        query = select([table.c.band, table.c.bucket, table.c.record_id]) \
+            .select_from(table.join(shared, and_(
+                table.c.band == shared.c.band,
+                table.c.bucket == shared.c.bucket))) \
+            .order_by(table.c.band, table.c.bucket)
+        pairs = set()
+        skipped = 0
+        rows = db.session.execute(query)
+        for key, group in itertools.groupby(rows, lambda row: row[:2]):
+            record_ids = sorted(row[2] for row in group)
+            if self.max_bucket and len(record_ids) > self.max_bucket:
+                skipped += 1
+                continue
+            pairs.update(itertools.combinations(record_ids, 2))
+        return pairs, skipped
+
+    def report(self, threshold=None, callback=None):
+        """Find all clusters of near-duplicate records.
+
+        Candidate pairs are read from the buckets; their signatures are
+        compared in a pool of worker processes.
+
+        :param threshold: Minimum similarity (default the configured one).
+        :param callback: Function called with the number of compared pairs
+            after every chunk.
+        :returns: Dictionary with the ``clusters`` (see
+            :func:`~invenio.duplicates.minhash.clusters`) and the numbers
+            of ``candidates`` and ``skipped`` buckets.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        pairs, skipped = self.candidate_pairs()
+        signatures = self._signatures(
+            sorted(set(itertools.chain.from_iterable(pairs))))
+        pairs = [(a, b) for a, b in sorted(pairs)
+                 if a in signatures and b in signatures]
+        chunks = (([(a, b, signatures[a], signatures[b]) for a, b in chunk],
+                   threshold)
+                  for chunk in _chunks(pairs, 10000))
+        stats = dict(compared=0, similar=[])
+
+        def collect(results):
+            for result in results:
+                stats['similar'].extend(result)
+                stats['compared'] = min(stats['compared'] + 10000,
+                                        len(pairs))
+                if callback:
+                    callback(stats['compared'])
+
+        pool = self._pool()
+        if pool is None:
+            collect(map(_verify_chunk, chunks))
+        else:
+            try:
+                collect(pool.imap_unordered(_verify_chunk, chunks))
+            except BaseException:
+                pool.terminate()
+                raise
+            else:
+                pool.close()
+            finally:
+                pool.join()
+        return dict(clusters=clusters(stats['similar']), candidates=len(pairs),
+                    skipped=skipped)
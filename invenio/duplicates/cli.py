@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_duplicates
+
+
+@click.group()
+def duplicates():
+    """Near-duplicate record commands."""
+
+
+@duplicates.command()
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def rebuild(verbose):
+    """Compute the signatures of all records again."""
+    def progress(count):
+        if verbose:
+            click.echo('{0} records'.format(count), err=True)
+
+    count = current_duplicates.index.rebuild(callback=progress)
+    click.echo('{0} records indexed'.format(count))
+
+
+@duplicates.command()
+@click.argument('record_id')
+@click.option('-t', '--threshold', type=float, default=None,
+              help='Minimum similarity (default DUPLICATES_THRESHOLD).')
+@click.option('-n', '--limit', type=int, default=20,
+              help='Maximum number of printed records.')
+@with_appcontext
+def candidates(record_id, threshold, limit):
+    """Print the records similar to a record."""
+    for found, value in current_duplicates.index.candidates(
+            record_id=record_id, threshold=threshold, limit=limit):
+        click.echo('{0}\t{1:.2f}'.format(found, value))
+
+
+@duplicates.command()
+@click.option('-t', '--threshold', type=float, default=None,
+              help='Minimum similarity (default DUPLICATES_THRESHOLD).')
+@click.option('--json', 'as_json', is_flag=True, default=False,
+              help='Print the clusters as JSON lines.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress while comparing.')
+@with_appcontext
+def report(threshold, as_json, verbose):
+    """Print all clusters of near-duplicate records."""
+    def progress(count):
+        if verbose:
+            click.echo('{0} pairs compared'.format(count), err=True)
+
+    result = current_duplicates.index.report(
+        threshold=threshold, callback=progress)
+    for members, pairs in result['clusters']:
+        if as_json:
+            click.echo(json.dumps(dict(
+                records=[str(m) for m in members],
+                pairs=[[str(a), str(b), value] for a, b, value in pairs])))
+        else:
+            click.echo(' '.join(str(m) for m in members))
+    click.echo('{0} clusters, {1} candidate pairs, {2} buckets '
+               'skipped'.format(len(result['clusters']),
+                                result['candidates'], result['skipped']),
+               err=True)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index configuration."""
+
+from __future__ import absolute_import, print_function
+
+DUPLICATES_ENABLED = True
+"""Update the index when records are written."""
+
+DUPLICATES_TITLE = 'title'
+"""Dotted path of the record title."""
+
+DUPLICATES_AUTHORS = 'authors.name'
+"""Dotted path of the author names."""
+
+DUPLICATES_IDENTIFIERS = ('doi', 'isbn', 'arxiv_eprints.value')
+"""Dotted paths of the persistent identifiers."""
+
+DUPLICATES_NUM_PERM = 128
+"""Number of hash functions of the MinHash signatures.
+
+Changing it (or ``DUPLICATES_BANDS``) requires ``duplicates rebuild``.
+"""
+
+DUPLICATES_BANDS = 32
+"""Number of LSH bands (of ``NUM_PERM / BANDS`` rows each)."""
+
+DUPLICATES_THRESHOLD = 0.8
+"""Minimum estimated similarity of duplicates."""
+
+DUPLICATES_MAX_BUCKET = 1000
+"""Buckets with more records are ignored by the duplicate report.
+
+They are also skipped when looking up the candidates of a record.
+"""
+
+DUPLICATES_BATCH_SIZE = 1000
+"""Number of records indexed per transaction by ``duplicates rebuild``."""
+
+DUPLICATES_WORKERS = None
+"""Number of processes of the rebuild and the report (``None`` uses all
+CPUs, ``0`` works in the current process)."""
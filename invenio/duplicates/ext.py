@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property
+
+from . import config
+
+
+class _DuplicatesState(object):
+    """Near-duplicate index state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def index(self):
+        """The :class:`~invenio.duplicates.api.DuplicateIndex`."""
+        from .api import DuplicateIndex
+
+        return DuplicateIndex(
+            fields=dict(
+                title=self.app.config['DUPLICATES_TITLE'],
+                authors=self.app.config['DUPLICATES_AUTHORS'],
+                identifiers=tuple(self.app.config['DUPLICATES_IDENTIFIERS']),
+            ),
+            num_perm=self.app.config['DUPLICATES_NUM_PERM'],
+            bands=self.app.config['DUPLICATES_BANDS'],
+            threshold=self.app.config['DUPLICATES_THRESHOLD'],
+            max_bucket=self.app.config['DUPLICATES_MAX_BUCKET'],
+            batch_size=self.app.config['DUPLICATES_BATCH_SIZE'],
+            workers=self.app.config['DUPLICATES_WORKERS'],
+        )
+
+
+class InvenioDuplicates(object):
+    """Invenio near-duplicate index extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-duplicates'] = _DuplicatesState(app)
+        if app.config['DUPLICATES_ENABLED']:
+            from . import receivers
+            receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('DUPLICATES_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""MinHash signatures and locality sensitive hashing of records.
+
+The similarity of two records is the Jaccard similarity of their feature
+sets (character shingles of the title, normalized author names and
+identifiers).  A MinHash signature keeps, for each of ``num_perm`` random
+hash functions, the smallest hash of the features; two signatures agree at
+a position with a probability equal to the similarity of the records.
+
+Signatures are cut into ``bands``; records whose signatures are identical
+in at least one band share a bucket of that band and become candidates.
+With ``r`` rows per band a pair of similarity ``s`` is found with the
+probability ``1 - (1 - s ** r) ** bands``.
+"""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import re
+import struct
+import unicodedata
+from array import array
+
+from ..facets.counts import field_values, text_type
+
+_shake = getattr(hashlib, 'shake_256', None)
+
+_NON_ALPHANUMERIC = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize(value):
+    """Return lower case text without accents and punctuation."""
+    text = unicodedata.normalize('NFKD', text_type(value))
+    text = u''.join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALPHANUMERIC.sub(u' ', text.lower()).strip()
+
+
+def author_key(name):
+    """Return the family name and first initial of an author name."""
+    name = text_type(name)
+    if ',' in name:
+        family, given = name.split(',', 1)
+    else:
+        parts = name.split()
+        family, given = (parts[-1], u' '.join(parts[:-1])) if parts \
+            else (u'', u'')
+    return u'{0} {1}'.format(normalize(family), normalize(given)[:1]).strip()
+
+
+def features(data, title='title', authors='authors.name',
+             identifiers=('doi', ), shingle_size=4):
+    """Return the feature set of a record.
+
+    :param title: Dotted path of the title.
+    :param authors: Dotted path of the author names.
+    :param identifiers: Dotted paths of persistent identifiers.
+    :param shingle_size: Length of the character shingles of the title.
+    """
+    result = set()
+    for value in field_values(data, title) if title else ():
+        text = normalize(value)
+        for start in range(max(len(text) - shingle_size + 1, 1)):
+            result.add(u't:' + text[start:start + shingle_size])
+    for value in field_values(data, authors) if authors else ():
+        key = author_key(value)
+        if key:
+            result.add(u'a:' + key)
+    for path in identifiers:
+        for value in field_values(data, path):
+            result.add(u'i:' + text_type(value).strip().lower())
+    return result
+
+
+class MinHasher(object):
+    """Computes MinHash signatures with fixed random hash functions.
+
+    The values of all hash functions for a feature are read from a single
+    SHAKE-256 digest of the feature salted with the seed (from SHA-512
+    digests before Python 3.6), so no Python loop runs per hash function.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        """Initialize the hash functions.
+
+        Signatures are only comparable when computed with the same
+        ``num_perm`` (a multiple of 16) and ``seed``, and the same
+        Python digest algorithm.
+        """
+        if num_perm % 16:
+            raise ValueError('num_perm must be a multiple of 16.')
+        self.num_perm = num_perm
+        self.salt = struct.pack('<I', seed)
+        self.salts = [struct.pack('<II', seed, block)
+                      for block in range(num_perm // 16)]
+        self._unpack = struct.Struct('<{0}I'.format(num_perm)).unpack
+
+    def hashes(self, feature):
+        """Return the values of all hash functions for a feature."""
+        data = feature.encode('utf-8')
+        if _shake is not None:
+            return self._unpack(_shake(self.salt + data).digest(
+                4 * self.num_perm))
+        return self._unpack(b''.join(hashlib.sha512(salt + data).digest()
+                                     for salt in self.salts))
+
+    def signature(self, features):
+        """Return the signature of a feature set (``None`` if empty)."""
+        if not features:
+            return None
+        return list(map(min, zip(*[self.hashes(f) for f in features])))
+
+
+def dumps(signature):
+    """Serialize a signature to bytes."""
+    values = array('I', signature)
+    return values.tobytes() if hasattr(values, 'tobytes') \
+        else values.tostring()
+
+
+def loads(data):
+    """Deserialize a signature."""
+    values = array('I')
+    if hasattr(values, 'frombytes'):
+        values.frombytes(bytes(data))
+    else:
+        values.fromstring(bytes(data))
+    return values.tolist()
+
+
+def band_keys(signature, bands=32):
+    """Return the ``(band, bucket)`` keys of a signature.
+
+    Buckets are signed 64 bit hashes of the rows of the band.
+    """
+    rows = len(signature) // bands
+    return [(band, struct.unpack('<q', hashlib.md5(dumps(
+        signature[band * rows:(band + 1) * rows])).digest()[:8])[0])
+        for band in range(bands)]
+
+
+def similarity(first, second):
+    """Estimate the Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(first, second) if a == b) / \
+        float(len(first))
+
+
+def similar_pairs(pairs, threshold):
+    """Return the ``(first, second, similarity)`` of the similar pairs.
+
+    :param pairs: Iterable of ``(first, second, first signature, second
+        signature)``.
+    """
+    result = []
+    for first, second, a, b in pairs:
+        value = similarity(a, b)
+        if value >= threshold:
+            result.append((first, second, value))
+    return result
+
+
+def clusters(pairs):
+    """Group similar pairs into clusters of duplicates (union-find).
+
+    :param pairs: Iterable of ``(first, second, similarity)``.
+    :returns: List of ``(members, pairs)``, largest cluster first; members
+        and pairs are sorted.
+    """
+    parent = {}
+
+    def find(item):
+        root = item
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while item != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    pairs = list(pairs)
+    for first, second, value in pairs:
+        a, b = find(first), find(second)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+    groups = {}
+    for first, second, value in pairs:
+        groups.setdefault(find(first), []).append((first, second, value))
+    result = []
+    for root, members in groups.items():
+        ids = sorted(set(m[0] for m in members) | set(m[1] for m in members))
+        result.append((ids, sorted(members)))
+    result.sort(key=lambda c: (-len(c[0]), c[0]))
+    return result
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index database models."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from sqlalchemy_utils.types import UUIDType
+
+
+class DuplicateSignature(db.Model):
+    """MinHash signature of a record.
+
+    Rows are written in the flush inserting the record, hence the record
+    identifiers are not foreign keys.
+    """
+
+    __tablename__ = 'duplicates_signatures'
+
+    record_id = db.Column(UUIDType, primary_key=True)
+    """Identifier of the record."""
+
+    signature = db.Column(db.LargeBinary, nullable=False)
+    """Signature as an array of unsigned 32 bit integers."""
+
+
+class DuplicateBucket(db.Model):
+    """LSH bucket of a band of a record signature."""
+
+    __tablename__ = 'duplicates_buckets'
+    __table_args__ = (
+        db.Index('ix_duplicates_buckets_record_id', 'record_id'),
+    )
+
+    band = db.Column(db.SmallInteger, primary_key=True, autoincrement=False)
+    """Number of the band."""
+
+    bucket = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    """Hash of the rows of the band."""
+
+    record_id = db.Column(UUIDType, primary_key=True)
+    """Identifier of the record."""
+
+
+__all__ = ('DuplicateBucket', 'DuplicateSignature')
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming NDJSON export of all records.
+
+Records are read in pages ordered by their UUID and every page continues
+after the last identifier of the previous one (keyset pagination).  Unlike
+``OFFSET`` based paging, the database never skips over the exported rows,
+so every page takes the same time however deep into the export it is, and
+only one page is held in memory.
+
+The export is available from the command line:
+
+.. code-block:: console
+
+   $ python manage.py export records records.ndjson.gz
+
+and, to clients sending the bearer token set in ``EXPORT_TOKEN``, over HTTP
+under ``EXPORT_URL``.  Responses are compressed on the fly for clients
+accepting ``gzip``.  The ``size`` parameter limits the number of records of a
+response; the URL of the next part is then sent in the ``Link`` header.
+
+Each line holds one record with its ``id``.  An interrupted export is
+resumed with the cursor token of the last received record:
+
+.. code-block:: console
+
+   $ python manage.py export records records.ndjson.gz --cursor <token>
+   $ curl -H 'Authorization: Bearer <secret>' \
+       'http://localhost:5000/export/records?cursor=<token>'
+"""
+
+from __future__ import absolute_import, print_function
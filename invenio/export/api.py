@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cursor tokens, NDJSON serialization and on-the-fly compression."""
+
+from __future__ import absolute_import, print_function
+
+import base64
+import binascii
+import json
+import uuid
+import zlib
+
+
+class InvalidCursor(ValueError):
+    """Cursor token which cannot be decoded."""
+
+
+def encode_cursor(record_id):
+    """Return the cursor token resuming an export after ``record_id``."""
+    data = json.dumps({'v': 1, 'after': str(record_id)})
+    return base64.urlsafe_b64encode(
+        data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return the record UUID a cursor token resumes after.
+
+    :raises InvalidCursor: If the token is malformed.
+    """
+    try:
+        token = str(token)
+        data = json.loads(base64.urlsafe_b64decode(
+            (token + '=' * (-len(token) % 4)).encode('ascii')).decode(
+                'utf-8'))
+        if data.get('v') != 1:
+            raise ValueError('Unknown cursor version.')
+        return uuid.UUID(data['after'])
+    except (AttributeError, KeyError, TypeError, ValueError,
+            binascii.Error, UnicodeError) as e:
+        raise InvalidCursor('Invalid cursor: {0}'.format(e))
+
+
+def _default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError('{0!r} is not JSON serializable'.format(value))
+
+
+def serialize_page(page):
+    """Return the NDJSON lines of a page of record rows as bytes.
+
+    :param page: List of ``(id, revision, created, updated, json)`` rows.
+    """
+    lines = []
+    for record_id, revision, created, updated, metadata in page:
+        lines.append(json.dumps(
+            dict(id=str(record_id), revision=revision, created=created,
+                 updated=updated, metadata=metadata),
+            default=_default, separators=(',', ':'), sort_keys=True))
+        lines.append('\n')
+    return ''.join(lines).encode('utf-8')
+
+
+def ndjson(pages):
+    """Yield one chunk of NDJSON lines per page of record rows."""
+    for page in pages:
+        yield serialize_page(page)
+
+
+def gzip_stream(chunks, level=6):
+    """Compress a stream of byte chunks into a gzip stream.
+
+    Every input chunk is compressed as soon as it is received, so the
+    memory use does not depend on the length of the stream.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
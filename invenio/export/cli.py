@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record export command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import gzip
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+from .api import InvalidCursor, decode_cursor, encode_cursor, serialize_page
+
+
+@click.group()
+def export():
+    """Record export commands."""
+
+
+@export.command()
+@click.argument('output', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--cursor', default=None,
+              help='Resume after the record of a cursor token.')
+@click.option('--gzip/--no-gzip', 'compress', default=None,
+              help='Compress the output (default for ".gz" files).')
+@click.option('-p', '--page-size', type=int, default=None,
+              help='Number of records read per query.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each page.')
+@with_appcontext
+def records(output, cursor, compress, page_size, verbose):
+    """Export all records as NDJSON to OUTPUT ("-" for stdout).
+
+    With ``--cursor`` the export is appended to OUTPUT.
+    """
+    from .query import record_pages
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise click.BadParameter(str(e), param_hint='--cursor')
+    if compress is None:
+        compress = output.endswith('.gz')
+
+    if output == '-':
+        stream = click.get_binary_stream('stdout')
+        fp = gzip.GzipFile(fileobj=stream, mode='wb') if compress else stream
+    else:
+        mode = 'ab' if cursor else 'wb'
+        fp = gzip.open(output, mode) if compress else open(output, mode)
+
+    start = time.time()
+    count = 0
+    try:
+        for page in record_pages(after, page_size=page_size or
+                                 current_app.config['EXPORT_PAGE_SIZE']):
+            fp.write(serialize_page(page))
+            after = page[-1][0]
+            count += len(page)
+            if verbose:
+                click.echo('{0} records, {1:.1f} records/s'.format(
+                    count, count / (time.time() - start)), err=True)
+    except BaseException:
+        if after is not None:
+            click.secho('Interrupted; resume with --cursor {0}'.format(
+                encode_cursor(after)), fg='red', err=True)
+        raise
+    finally:
+        if fp is not click.get_binary_stream('stdout'):
+            fp.close()
+    click.echo('{0} records exported in {1:.1f}s'.format(
+        count, time.time() - start), err=True)
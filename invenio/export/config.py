@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record export configuration."""
+
+from __future__ import absolute_import, print_function
+
+EXPORT_PAGE_SIZE = 1000
+"""Number of records read from the database per query."""
+
+EXPORT_GZIP_LEVEL = 6
+"""Compression level of gzip encoded exports."""
+
+EXPORT_URL = '/export/records'
+"""URL of the export endpoint (``None`` to disable the endpoint)."""
+
+EXPORT_TOKEN = None
+"""Bearer token required to export the records over HTTP.
+
+The endpoint is disabled while no token is set.  Clients send it in the
+``Authorization: Bearer <token>`` header.
+"""
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Keyset pagination over the records table."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+
+
+def _query(after=None, until=None):
+    model = RecordMetadata
+    query = db.session.query(model.id).filter(model.json.isnot(None))
+    if after is not None:
+        query = query.filter(model.id > after)
+    if until is not None:
+        query = query.filter(model.id <= until)
+    return query.order_by(model.id)
+
+
+def record_pages(after=None, page_size=1000, limit=None, until=None):
+    """Yield pages of ``(id, revision, created, updated, json)`` rows.
+
+    Deleted records are skipped.  Every page is read with one query
+    continuing after the last identifier of the previous page.
+
+    :param after: UUID of the record to start after.
+    :param page_size: Maximum number of rows per page.
+    :param limit: Maximum number of rows in total.
+    :param until: UUID of the last record to include.
+    """
+    model = RecordMetadata
+    while limit is None or limit > 0:
+        size = page_size if limit is None else min(page_size, limit)
+        page = _query(after, until).with_entities(
+            model.id, model.version_id, model.created, model.updated,
+            model.json).limit(size).all()
+        if not page:
+            return
+        yield page
+        after = page[-1][0]
+        if limit is not None:
+            limit -= len(page)
+        if len(page) < size:
+            return
+
+
+def page_boundary(after=None, size=1):
+    """Return the UUID of the ``size``-th record after ``after``.
+
+    Only the primary key index is read.  ``None`` is returned unless more
+    records follow it.  Records inserted before the boundary afterwards are
+    only exported if the boundary is passed as ``until`` to
+    :func:`record_pages`, instead of a ``limit``.
+    """
+    rows = _query(after).offset(size - 1).limit(2).all()
+    return rows[0][0] if len(rows) == 2 else None
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming record export endpoint."""
+
+from __future__ import absolute_import, print_function
+
+import hmac
+
+from flask import Blueprint, Response, abort, current_app, request, \
+    stream_with_context, url_for
+
+from .api import InvalidCursor, decode_cursor, encode_cursor, gzip_stream, \
+    ndjson
+
+blueprint = Blueprint('invenio_export', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``EXPORT_URL``."""
+    url = state.app.config.get('EXPORT_URL')
+    if url and state.app.config.get('EXPORT_TOKEN'):
+        state.app.add_url_rule(url, 'invenio_export.records', records)
+
+
+def records():
+    """Stream all records as NDJSON.
+
+    Query parameters: ``cursor`` to resume after a record and ``size`` to
+    limit the number of records.  The response ends with the record of the
+    next cursor, so records created meanwhile before it are part of the
+    response rather than skipped.
+    """
+    from .query import page_boundary, record_pages
+
+    expected = 'Bearer {0}'.format(current_app.config['EXPORT_TOKEN'])
+    if not hmac.compare_digest(
+            request.headers.get('Authorization', ''), expected):
+        abort(403)
+    try:
+        after = decode_cursor(request.args['cursor']) \
+            if request.args.get('cursor') else None
+    except InvalidCursor:
+        abort(400)
+    size = request.args.get('size', type=int)
+    if size is not None and size < 1:
+        abort(400)
+
+    headers = [('Vary', 'Accept-Encoding')]
+    boundary = None
+    if size is not None:
+        boundary = page_boundary(after, size)
+        if boundary is not None:
+            cursor = encode_cursor(boundary)
+            headers.append(('Link', '<{0}>; rel="next"'.format(url_for(
+                'invenio_export.records', cursor=cursor, size=size,
+                _external=True))))
+            headers.append(('X-Export-Cursor', cursor))
+
+    stream = ndjson(record_pages(
+        after, page_size=current_app.config['EXPORT_PAGE_SIZE'],
+        until=boundary))
+    if request.accept_encodings['gzip']:
+        stream = gzip_stream(
+            stream, level=current_app.config['EXPORT_GZIP_LEVEL'])
+        headers.append(('Content-Encoding', 'gzip'))
+    return Response(stream_with_context(stream), headers=headers,
+                    mimetype='application/x-ndjson')
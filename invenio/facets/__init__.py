@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incrementally maintained facet counts of collections.
+
+Counting the records of a collection by year, type or author with an
+aggregation query on every request of a collection page is expensive.  This
+module keeps the counts materialized in the ``facets_counts`` table and
+updates them whenever records are created, changed, deleted or bulk
+loaded (:data:`~invenio.ingest.signals.records_loaded`): for every
+record the ``(collection, facet, value)`` triples it contributes are stored
+in ``facets_records``, so a change only increments and decrements the
+counters of the triples that differ.
+
+The facets are configured with ``FACETS_FIELDS``:
+
+.. code-block:: python
+
+   FACETS_FIELDS = {
+       'year': 'year',
+       'type': 'resource_type.type',
+       'author': 'authors.name',
+       'decade': 'mysite.facets:decade',
+   }
+
+Values are read from dotted paths (lists are traversed) or returned by an
+importable function of the record.  The collections of a record are listed
+in ``FACETS_COLLECTIONS_KEY``.  Counts are kept in process memory for
+``FACETS_CACHE_TTL`` seconds together with the version of their collection
+in ``facets_collections``.  Every transaction changing the counts of a
+collection increments its version, so cached counts are only served while
+no process changed them:
+
+.. code-block:: python
+
+   from invenio.facets.proxies import current_facets
+
+   current_facets.counter.counts('articles')
+   # {'year': [('2015', 120), ('2014', 97)], ...}
+
+Counters can drift, e.g. when records are written with the extension
+disabled or directly with SQL.  ``python manage.py facets check`` recounts
+all records and reports the differences, ``--fix`` also corrects them.
+"""
+
+from __future__ import absolute_import, print_function
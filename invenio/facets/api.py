@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incrementally maintained facet counters."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+
+from ..cache.lru import LRUCache
+from .counts import deltas, drift, facet_keys, top
+from .models import FacetCollection, FacetCount, FacetRecord
+
+_INFO_KEY = 'invenio-facets'
+
+
+class FacetCounter(object):
+    """Facet counts of collections, updated record by record."""
+
+    def __init__(self, fields, collections_key='_collections',
+                 default_collection=None, max_values=50, ttl=60,
+                 batch_size=1000):
+        """Initialize the counter.
+
+        :param fields: Dictionary mapping facet names to dotted paths or to
+            functions returning the values of a record.
+        :param collections_key: Dotted path of the collections of a record.
+        :param default_collection: Collection every record belongs to.
+        :param max_values: Maximum number of values returned per facet.
+        :param ttl: Seconds the counts of a collection are kept in memory,
+            they are only served while the version of the collection is
+            unchanged.
+        :param batch_size: Number of records read at once by :meth:`check`.
+        """
+        self.fields = fields
+        self.collections_key = collections_key
+        self.default_collection = default_collection
+        self.max_values = max_values
+        self.batch_size = batch_size
+        self.local = LRUCache(max_items=1000, ttl=ttl)
+
+    def keys(self, data):
+        """Return the ``(collection, facet, value)`` triples of a record."""
+        return facet_keys(data, self.fields,
+                          collections_key=self.collections_key,
+                          default_collection=self.default_collection)
+
+    def update(self, session, records):
+        """Count changed records.
+
+        The counters are changed with ``UPDATE`` statements adding the
+        difference, so concurrent transactions do not lose counts.  The
+        versions of the changed collections are incremented in the same
+        transaction, which invalidates the cached counts in all processes.
+
+        :param session: Database session of the changes.
+        :param records: List of ``(record_id, data)`` pairs, with ``None``
+            as data of deleted records.
+        """
+        if not records:
+            return
+        with session.no_autoflush:
+            rows = dict((row.record_id, row) for row in session.query(
+                FacetRecord).filter(FacetRecord.record_id.in_(
+                    [record_id for record_id, data in records])))
+            changes = []
+            for record_id, data in records:
+                row = rows.get(record_id)
+                old = set(tuple(key) for key in row.keys) if row else set()
+                new = self.keys(data)
+                if old == new:
+                    continue
+                changes.append((old, new))
+                if row is None:
+                    row = rows[record_id] = FacetRecord(record_id=record_id)
+                    session.add(row)
+                if new:
+                    row.keys = sorted(list(key) for key in new)
+                else:
+                    session.delete(row)
+                    del rows[record_id]
+            self._apply(session, deltas(changes))
+
+    def _apply(self, session, changes):
+        table = FacetCount.__table__
+        connection = session.connection()
+        for (collection, facet, value), delta in sorted(changes.items()):
+            _upsert(connection, table.update().where(and_(
+                table.c.collection == collection, table.c.facet == facet,
+                table.c.value == value)).values(count=table.c.count + delta),
+                table.insert().values(collection=collection, facet=facet,
+                                      value=value, count=delta))
+        self._bump(session, set(key[0] for key in changes))
+
+    def _bump(self, session, collections):
+        table = FacetCollection.__table__
+        connection = session.connection()
+        for collection in sorted(collections):
+            _upsert(connection, table.update().where(
+                table.c.collection == collection).values(
+                    version=table.c.version + 1),
+                table.insert().values(collection=collection, version=1))
+        session.info.setdefault(_INFO_KEY, set()).update(collections)
+
+    def invalidate(self, session):
+        """Forget the cached counts changed by a committed transaction.
+
+        This only releases memory early, the versions of the collections
+        already prevent serving outdated counts.
+        """
+        for collection in session.info.pop(_INFO_KEY, ()):
+            self.local.delete(collection)
+
+    def counts(self, collection):
+        """Return the facet counts of a collection.
+
+        :returns: Dictionary mapping facet names to lists of
+            ``(value, count)`` pairs, largest counts first.
+        """
+        version = db.session.query(FacetCollection.version).filter(
+            FacetCollection.collection == collection).scalar() or 0
+        cached = self.local.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = top(db.session.query(
+            FacetCount.facet, FacetCount.value, FacetCount.count).filter(
+                FacetCount.collection == collection,
+                FacetCount.count > 0), max_values=self.max_values)
+        self.local.set(collection, (version, result))
+        return result
+
+    def check(self, fix=False, callback=None):
+        """Recount all records and compare with the stored counters.
+
+        Records written while the check runs may be reported as drift; run
+        the check again to confirm.
+
+        :param fix: Correct the counters and the counted values of records.
+        :param callback: Function called with the statistics after every
+            batch of records.
+        :returns: Dictionary with the number of ``records``, of records
+            counted with outdated values (``outdated``) and the ``drift`` of
+            the counters (see :func:`~.counts.drift`).
+        """
+        from invenio_records.models import RecordMetadata
+
+        from ..export.query import record_pages
+
+        stats = dict(records=0, outdated=0)
+        expected = {}
+        for page in record_pages(page_size=self.batch_size):
+            rows = dict(db.session.query(
+                FacetRecord.record_id, FacetRecord.keys).filter(
+                    FacetRecord.record_id.in_([row[0] for row in page])))
+            for row in page:
+                keys = self.keys(row[-1])
+                for key in keys:
+                    expected[key] = expected.get(key, 0) + 1
+                if set(tuple(key) for key in rows.get(row[0], ())) != keys:
+                    stats['outdated'] += 1
+                    if fix:
+                        self._store_keys(row[0], keys)
+            stats['records'] += len(page)
+            if fix:
+                db.session.commit()
+            if callback:
+                callback(stats)
+
+        orphans = db.session.query(FacetRecord).filter(
+            ~FacetRecord.record_id.in_(db.session.query(
+                RecordMetadata.id).filter(RecordMetadata.json.isnot(None))))
+        stats['outdated'] += orphans.count()
+        stored = dict(((row.collection, row.facet, row.value), row.count)
+                      for row in FacetCount.query)
+        stats['drift'] = drift(stored, expected)
+        if fix:
+            orphans.delete(synchronize_session=False)
+            self._store_counts(stats['drift'])
+            self._bump(db.session, set(
+                key[0] for key, stored, count in stats['drift']))
+            db.session.commit()
+            self.local.clear()
+        return stats
+
+    def _store_keys(self, record_id, keys):
+        row = FacetRecord.query.get(record_id)
+        if keys:
+            if row is None:
+                row = FacetRecord(record_id=record_id)
+                db.session.add(row)
+            row.keys = sorted(list(key) for key in keys)
+        elif row is not None:
+            db.session.delete(row)
+
+    def _store_counts(self, differences):
+        for (collection, facet, value), stored, count in differences:
+            row = FacetCount.query.get((collection, facet, value))
+            if not count:
+                db.session.delete(row)
+            elif row is None:
+                db.session.add(FacetCount(collection=collection,
+                                          facet=facet, value=value,
+                                          count=count))
+            else:
+                row.count = count
+
+
+def _upsert(connection, update, insert):
+    """Run ``update``, or ``insert`` if it did not match a row."""
+    if connection.execute(update).rowcount:
+        return
+    # A concurrent transaction may insert the same row first; the savepoint
+    # keeps the transaction usable to update it.
+    try:
+        with connection.begin_nested():
+            connection.execute(insert)
+    except IntegrityError:
+        connection.execute(update)
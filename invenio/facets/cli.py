@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_facets
+
+
+@click.group()
+def facets():
+    """Facet count commands."""
+
+
+@facets.command()
+@click.argument('collection')
+@click.option('-f', '--facet', multiple=True,
+              help='Only print the counts of this facet.')
+@with_appcontext
+def show(collection, facet):
+    """Print the facet counts of a collection."""
+    counts = current_facets.counter.counts(collection)
+    for name in facet or sorted(counts):
+        click.echo(name)
+        for value, count in counts.get(name, []):
+            click.echo('  {0}\t{1}'.format(count, value))
+
+
+@facets.command()
+@click.option('--fix', is_flag=True, default=False,
+              help='Correct the counters.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def check(fix, verbose):
+    """Recount all records and report counters which drifted.
+
+    Exits with status 1 if drift was found and not fixed.
+    """
+    def progress(stats):
+        if verbose:
+            click.echo('{records} records, {outdated} outdated'.format(
+                **stats), err=True)
+
+    stats = current_facets.counter.check(fix=fix, callback=progress)
+    for (collection, facet, value), stored, expected in stats['drift']:
+        click.echo('{0}\t{1}\t{2}\t{3} -> {4}'.format(
+            collection, facet, value, stored, expected))
+    click.echo('{records} records, {outdated} outdated, {0} counters '
+               '{1}'.format(len(stats['drift']),
+                            'fixed' if fix else 'drifted', **stats))
+    if stats['drift'] and not fix:
+        raise SystemExit(1)
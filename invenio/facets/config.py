@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts configuration."""
+
+FACETS_ENABLED = True
+"""Update the facet counts whenever records are written."""
+
+FACETS_FIELDS = {
+    'year': 'year',
+    'type': 'type',
+    'author': 'authors.name',
+}
+"""Facets counted in every collection.
+
+Maps facet names to the dotted path of their values in a record, or to the
+import path (``module:function``) of a function returning them.
+"""
+
+FACETS_COLLECTIONS_KEY = '_collections'
+"""Key of the list of collections of a record."""
+
+FACETS_DEFAULT_COLLECTION = None
+"""Collection counting all records (e.g. ``'all'``), if any."""
+
+FACETS_MAX_VALUES = 50
+"""Maximum number of values returned per facet, largest counts first."""
+
+FACETS_CACHE_TTL = 60
+"""Seconds the counts of a collection are kept in process memory.
+
+Cached counts are only served while the version of the collection is
+unchanged, hence the TTL only bounds the memory used.
+"""
+
+FACETS_BATCH_SIZE = 1000
+"""Number of records read at once by the consistency check."""
+
+FACETS_URL = '/facets/<collection>'
+"""URL of the facet counts endpoint (``None`` to disable it)."""
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet values of records and counter arithmetic."""
+
+from __future__ import absolute_import, print_function
+
+from collections import defaultdict
+
+try:
+    text_type = unicode
+except NameError:  # pragma: no cover
+    text_type = str
+
+MAX_LENGTH = 255
+"""Maximum length of collection names and facet values."""
+
+
+def _flatten(nodes):
+    for node in nodes:
+        if isinstance(node, (list, tuple)):
+            for item in _flatten(node):
+                yield item
+        elif node is not None:
+            yield node
+
+
+def field_values(data, path):
+    """Return the values at a dotted path of a record.
+
+    Lists are traversed at every level, e.g. ``authors.name`` returns the
+    names of all authors.
+    """
+    nodes = [data]
+    for key in path.split('.'):
+        nodes = [node[key] for node in _flatten(nodes)
+                 if isinstance(node, dict) and key in node]
+    return list(_flatten(nodes))
+
+
+def facet_keys(data, fields, collections_key='_collections',
+               default_collection=None):
+    """Return the ``(collection, facet, value)`` triples of a record.
+
+    :param data: Record (``None`` for deleted records).
+    :param fields: Dictionary mapping facet names to dotted paths or to
+        functions returning the values of a record.
+    :param collections_key: Dotted path of the collections of a record.
+    :param default_collection: Collection every record belongs to.
+    """
+    if not isinstance(data, dict):
+        return set()
+    collections = set(text_type(c)[:MAX_LENGTH]
+                      for c in field_values(data, collections_key))
+    if default_collection:
+        collections.add(default_collection)
+    values = set()
+    for facet, field in fields.items():
+        found = field(data) if callable(field) else \
+            field_values(data, field)
+        values.update((facet, text_type(value)[:MAX_LENGTH])
+                      for value in _flatten([found]))
+    return set((collection, facet, value) for collection in collections
+               for facet, value in values)
+
+
+def deltas(changes):
+    """Return the counter changes of records.
+
+    :param changes: Iterable of ``(old_keys, new_keys)`` pairs of records.
+    :returns: Dictionary of the non-zero changes by key.
+    """
+    result = defaultdict(int)
+    for old, new in changes:
+        for key in new - old:
+            result[key] += 1
+        for key in old - new:
+            result[key] -= 1
+    return dict((key, delta) for key, delta in result.items() if delta)
+
+
+def drift(stored, expected):
+    """Return the differences between stored and expected counts.
+
+    :returns: Sorted list of ``(key, stored, expected)`` tuples.
+    """
+    return sorted((key, stored.get(key, 0), expected.get(key, 0))
+                  for key in set(stored) | set(expected)
+                  if stored.get(key, 0) != expected.get(key, 0))
+
+
+def top(rows, max_values=None):
+    """Group ``(facet, value, count)`` rows by facet, largest counts first.
+
+    Values without records are left out.
+    """
+    result = defaultdict(list)
+    for facet, value, count in rows:
+        if count > 0:
+            result[facet].append((value, count))
+    for facet, values in result.items():
+        values.sort(key=lambda item: (-item[1], item[0]))
+        if max_values is not None:
+            del values[max_values:]
+    return dict(result)
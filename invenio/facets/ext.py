@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property, import_string
+
+from . import config
+
+
+class _FacetsState(object):
+    """Facet counts state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def counter(self):
+        """The :class:`~invenio.facets.api.FacetCounter`."""
+        from .api import FacetCounter
+
+        fields = dict(
+            (name, import_string(field) if ':' in field else field)
+            for name, field in self.app.config['FACETS_FIELDS'].items())
+        return FacetCounter(
+            fields,
+            collections_key=self.app.config['FACETS_COLLECTIONS_KEY'],
+            default_collection=self.app.config['FACETS_DEFAULT_COLLECTION'],
+            max_values=self.app.config['FACETS_MAX_VALUES'],
+            ttl=self.app.config['FACETS_CACHE_TTL'],
+            batch_size=self.app.config['FACETS_BATCH_SIZE'],
+        )
+
+
+class InvenioFacets(object):
+    """Invenio facet counts extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-facets'] = _FacetsState(app)
+        if app.config['FACETS_ENABLED']:
+            from . import receivers
+            receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('FACETS_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts database models."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from sqlalchemy_utils.types import JSONType, UUIDType
+
+from .counts import MAX_LENGTH
+
+
+class FacetCount(db.Model):
+    """Number of records of a collection with a facet value."""
+
+    __tablename__ = 'facets_counts'
+
+    collection = db.Column(db.String(MAX_LENGTH), primary_key=True)
+    """Collection name."""
+
+    facet = db.Column(db.String(64), primary_key=True)
+    """Facet name."""
+
+    value = db.Column(db.String(MAX_LENGTH), primary_key=True)
+    """Facet value."""
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+    """Number of records."""
+
+
+class FacetCollection(db.Model):
+    """Version of the counts of a collection."""
+
+    __tablename__ = 'facets_collections'
+
+    collection = db.Column(db.String(MAX_LENGTH), primary_key=True)
+    """Collection name."""
+
+    version = db.Column(db.Integer, nullable=False, default=0)
+    """Incremented by every transaction changing the counts."""
+
+
+class FacetRecord(db.Model):
+    """Facet values a record is counted for."""
+
+    __tablename__ = 'facets_records'
+
+    record_id = db.Column(UUIDType, primary_key=True)
+    """Identifier of the record."""
+
+    keys = db.Column(JSONType, nullable=False)
+    """List of the ``[collection, facet, value]`` triples of the record."""
+
+
+__all__ = ('FacetCollection', 'FacetCount', 'FacetRecord')
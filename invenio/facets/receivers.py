@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers counting the records written in a flush or bulk loaded."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from .api import _INFO_KEY
+
+
+def _counter():
+    state = current_app.extensions.get('invenio-facets') \
+        if current_app else None
+    if state is None or not current_app.config['FACETS_ENABLED']:
+        return None
+    return state.counter
+
+
+def count_records(session, flush_context, instances):
+    """Update the facet counters of the records changed by the flush."""
+    counter = _counter()
+    if counter is None:
+        return
+    records = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, RecordMetadata) or obj.id is None:
+            continue
+        if obj in session.new or \
+                attributes.get_history(obj, 'json').has_changes():
+            records.append((obj.id, obj.json))
+    for obj in session.deleted:
+        if isinstance(obj, RecordMetadata):
+            records.append((obj.id, None))
+    counter.update(session, records)
+
+
+def count_loaded(sender, records=None):
+    """Count bulk loaded records in the transaction of the loader."""
+    from invenio_db import db
+
+    counter = _counter()
+    if counter is not None:
+        counter.update(db.session, records)
+
+
+def invalidate_counts(session):
+    """Invalidate the cached counts changed by the committed transaction."""
+    counter = _counter()
+    if counter is not None:
+        counter.invalidate(session)
+
+
+def discard_counts(session):
+    """Forget the counts changed by a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners = (
+    ('before_flush', count_records),
+    ('after_commit', invalidate_counts),
+    ('after_rollback', discard_counts),
+)
+
+
+def connect():
+    """Listen to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    for name, func in _listeners:
+        if not event.contains(Session, name, func):
+            event.listen(Session, name, func)
+    records_loaded.connect(count_loaded)
+
+
+def disconnect():
+    """Stop listening to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    for name, func in _listeners:
+        if event.contains(Session, name, func):
+            event.remove(Session, name, func)
+    records_loaded.disconnect(count_loaded)
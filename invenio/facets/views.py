@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts endpoint."""
+
+from __future__ import absolute_import, print_function
+
+from flask import Blueprint, jsonify, request
+
+from .proxies import current_facets
+
+blueprint = Blueprint('invenio_facets', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``FACETS_URL``."""
+    url = state.app.config.get('FACETS_URL')
+    if url:
+        state.app.add_url_rule(url, 'invenio_facets.counts', counts)
+
+
+def counts(collection):
+    """Return the facet counts of a collection as JSON.
+
+    The ``facet`` query parameter restricts the result to some facets.
+    """
+    result = current_facets.counter.counts(collection)
+    names = request.args.getlist('facet')
+    if names:
+        result = dict((name, result.get(name, [])) for name in names)
+    return jsonify(dict(
+        (name, [dict(value=value, count=count) for value, count in values])
+        for name, values in result.items()))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local file storage with zero-copy downloads.
+
+Full texts and media are stored below ``FILES_STORAGE_DIR`` and described
+in the ``files_files`` table.  Uploads are written in chunks while their
+checksum is updated, so a file is never read a second time to checksum it:
+
+.. code-block:: python
+
+   from invenio.files.proxies import current_files
+
+   with open('thesis.pdf', 'rb') as fp:
+       stored = current_files.store.add(fp, 'thesis.pdf')
+   db.session.commit()
+   stored.checksum
+   # 'md5:...'
+
+Downloads honour ``If-None-Match``, ``If-Modified-Since``, ``Range`` and
+``If-Range``.  The checksum is the entity tag.  The bytes are not copied
+through Python: with ``FILES_SENDFILE = 'x-accel-redirect'`` (nginx) or
+``'x-sendfile'`` (Apache) the web server sends the file, otherwise the WSGI
+server's ``wsgi.file_wrapper`` uses the ``sendfile`` system call:
+
+.. code-block:: python
+
+   @blueprint.route('/records/<pid_value>/files/<file_id>')
+   def record_file(pid_value, file_id):
+       stored = current_files.store.get(file_id)
+       # ... check the permissions of the record ...
+       return current_files.store.send(stored, request.environ)
+
+For nginx the storage folder is served by an internal location:
+
+.. code-block:: nginx
+
+   location /protected-files/ {
+       internal;
+       alias /path/to/instance/files/;
+   }
+
+``python manage.py files verify`` reads all files and reports the ones
+whose content does not match their checksum.
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Stored files API."""
+
+from __future__ import absolute_import, print_function
+
+import mimetypes
+import uuid
+
+from invenio_db import db
+
+from .models import StoredFile
+from .serve import send_file
+
+
+class FileStore(object):
+    """Stores files on disk and their metadata in ``files_files``."""
+
+    def __init__(self, storage, size_limit=None, sendfile=None,
+                 offload_prefix=None, max_age=None):
+        """Initialize the store.
+
+        :param storage: :class:`~invenio.files.storage.LocalFileStorage`.
+        :param size_limit: Maximum size of a file in bytes.
+        :param sendfile: Offloading mode of
+            :func:`~invenio.files.serve.send_file`.
+        :param offload_prefix: Prefix of ``X-Accel-Redirect`` paths.
+        :param max_age: Seconds clients may cache files.
+        """
+        self.storage = storage
+        self.size_limit = size_limit
+        self.sendfile = sendfile
+        self.offload_prefix = offload_prefix
+        self.max_age = max_age
+
+    def add(self, stream, filename, mimetype=None):
+        """Store a stream and return its :class:`StoredFile`.
+
+        The checksum is computed while the data is written.  The file is
+        added to the database session, which the caller commits.
+        """
+        file_id = uuid.uuid4()
+        data = self.storage.save(stream, key=file_id.hex,
+                                 size_limit=self.size_limit)
+        try:
+            with db.session.begin_nested():
+                stored = StoredFile(
+                    id=file_id, filename=filename, size=data.size,
+                    checksum=data.checksum,
+                    mimetype=mimetype or mimetypes.guess_type(filename)[0])
+                db.session.add(stored)
+        except Exception:
+            self.storage.delete(data.key)
+            raise
+        return stored
+
+    def get(self, file_id):
+        """Return a :class:`StoredFile` or ``None``."""
+        try:
+            file_id = uuid.UUID(str(file_id))
+        except ValueError:
+            return None
+        return StoredFile.query.get(file_id)
+
+    def remove(self, stored):
+        """Delete a file from the database session.
+
+        The file is deleted from disk once the caller commits.
+        """
+        from .receivers import schedule_delete
+
+        db.session.delete(stored)
+        schedule_delete(db.session, self.storage, stored.key)
+
+    def verify(self, stored):
+        """Return whether the content of a file matches its checksum.
+
+        The content is hashed with the algorithm of the stored checksum.
+        """
+        algorithm = stored.checksum.split(':', 1)[0]
+        return self.storage.checksum(
+            stored.key, algorithm=algorithm) == stored.checksum
+
+    def send(self, stored, environ, as_attachment=False):
+        """Return the response downloading a file.
+
+        :param environ: WSGI environment of the request (for conditional
+            and range requests).
+        """
+        offload_path = None
+        if self.sendfile == 'x-accel-redirect':
+            offload_path = self.offload_prefix.rstrip('/') + '/' + \
+                self.storage.relative_path(stored.key)
+        return send_file(
+            environ, self.storage.path(stored.key),
+            etag=stored.checksum, mimetype=stored.mimetype,
+            filename=stored.filename, as_attachment=as_attachment,
+            sendfile=self.sendfile, offload_path=offload_path,
+            max_age=self.max_age)
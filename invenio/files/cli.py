@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File storage command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+import click
+from flask_cli import with_appcontext
+from invenio_db import db
+
+from .models import StoredFile
+from .proxies import current_files
+
+
+@click.group()
+def files():
+    """File storage commands."""
+
+
+@files.command()
+@click.argument('paths', nargs=-1, type=click.Path(exists=True,
+                                                   dir_okay=False))
+@click.option('-m', '--mimetype', default=None,
+              help='Content type (default guessed from the file name).')
+@with_appcontext
+def add(paths, mimetype):
+    """Store files and print their identifiers and checksums."""
+    store = current_files.store
+    for path in paths:
+        with open(path, 'rb') as fp:
+            stored = store.add(fp, os.path.basename(path), mimetype=mimetype)
+        db.session.commit()
+        click.echo('{0}\t{1}\t{2}'.format(stored.id, stored.checksum, path))
+
+
+@files.command()
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print every verified file.')
+@with_appcontext
+def verify(verbose):
+    """Read all files and report checksum mismatches.
+
+    Exits with status 1 if a file is missing or corrupted.
+    """
+    store = current_files.store
+    failed = 0
+    for stored in StoredFile.query.order_by(StoredFile.created).yield_per(
+            1000):
+        try:
+            ok = store.verify(stored)
+        except IOError:
+            ok = False
+        if not ok:
+            failed += 1
+            click.echo('{0}\t{1}\tFAILED'.format(stored.id, stored.filename))
+        elif verbose:
+            click.echo('{0}\t{1}\tOK'.format(stored.id, stored.filename),
+                       err=True)
+    if failed:
+        raise SystemExit(1)
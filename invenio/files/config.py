@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File storage configuration."""
+
+from __future__ import absolute_import, print_function
+
+FILES_STORAGE_DIR = None
+"""Folder of the stored files (default ``files`` in the instance folder)."""
+
+FILES_CHECKSUM_ALGORITHM = 'md5'
+""":mod:`hashlib` algorithm of the checksums computed on upload."""
+
+FILES_CHUNK_SIZE = 1 << 20
+"""Number of bytes read and written at once on upload."""
+
+FILES_FILE_MODE = None
+"""Permission bits of the stored files, e.g. ``0o640``.
+
+``None`` applies the umask of the process to ``0o666``.
+"""
+
+FILES_SIZE_LIMIT = None
+"""Maximum size of a stored file in bytes (``None`` for no limit)."""
+
+FILES_SENDFILE = None
+"""Let the web server send the files.
+
+``'x-sendfile'`` (Apache ``mod_xsendfile``, lighttpd) sends the absolute
+path in ``X-Sendfile``, ``'x-accel-redirect'`` (nginx) sends
+``FILES_OFFLOAD_PREFIX`` followed by the path relative to the storage
+folder in ``X-Accel-Redirect``.  ``None`` sends files from the WSGI
+server.
+"""
+
+FILES_OFFLOAD_PREFIX = '/protected-files/'
+"""Internal nginx location of the storage folder."""
+
+FILES_MAX_AGE = 3600
+"""Seconds clients may cache downloaded files."""
+
+FILES_URL = None
+"""URL of the download endpoint, e.g. ``'/files/<file_id>'``.
+
+The endpoint is only registered together with ``FILES_PERMISSION_FACTORY``;
+the modules owning files can also serve them with
+:meth:`~invenio.files.api.FileStore.send` after their own checks.
+"""
+
+FILES_PERMISSION_FACTORY = None
+"""Import path of the factory of the download permission of a file.
+
+The factory is called with the :class:`~invenio.files.models.StoredFile`
+and returns an object whose ``can()`` method allows the download.
+"""
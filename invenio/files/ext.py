@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File storage extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+from werkzeug.utils import cached_property, import_string
+
+from . import config
+
+
+class _FilesState(object):
+    """File storage state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def storage(self):
+        """The :class:`~invenio.files.storage.LocalFileStorage`."""
+        from .storage import LocalFileStorage
+
+        return LocalFileStorage(
+            self.app.config['FILES_STORAGE_DIR'] or
+            os.path.join(self.app.instance_path, 'files'),
+            algorithm=self.app.config['FILES_CHECKSUM_ALGORITHM'],
+            chunk_size=self.app.config['FILES_CHUNK_SIZE'],
+            file_mode=self.app.config['FILES_FILE_MODE'],
+        )
+
+    @cached_property
+    def permission_factory(self):
+        """Factory of the download permission of a file."""
+        return import_string(self.app.config['FILES_PERMISSION_FACTORY'])
+
+    @cached_property
+    def store(self):
+        """The :class:`~invenio.files.api.FileStore`."""
+        from .api import FileStore
+
+        return FileStore(
+            self.storage,
+            size_limit=self.app.config['FILES_SIZE_LIMIT'],
+            sendfile=self.app.config['FILES_SENDFILE'],
+            offload_prefix=self.app.config['FILES_OFFLOAD_PREFIX'],
+            max_age=self.app.config['FILES_MAX_AGE'],
+        )
+
+
+class InvenioFiles(object):
+    """Invenio file storage extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-files'] = _FilesState(app)
+        from . import receivers
+        receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('FILES_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File storage database models."""
+
+from __future__ import absolute_import, print_function
+
+import uuid
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy_utils.types import UUIDType
+
+
+class StoredFile(db.Model):
+    """File kept in the local file storage."""
+
+    __tablename__ = 'files_files'
+
+    id = db.Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    """Identifier of the file (its hexadecimal form is the storage key)."""
+
+    filename = db.Column(db.String(255), nullable=False)
+    """Name the file was uploaded with."""
+
+    mimetype = db.Column(db.String(255), nullable=True)
+    """Content type of the file."""
+
+    size = db.Column(db.BigInteger, nullable=False)
+    """Size of the file in bytes."""
+
+    checksum = db.Column(db.String(255), nullable=False)
+    """Checksum of the content as ``algorithm:hexdigest``."""
+
+    created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    """Time the file was stored."""
+
+    @property
+    def key(self):
+        """Return the storage key of the file."""
+        return self.id.hex
+
+
+__all__ = ('StoredFile', )
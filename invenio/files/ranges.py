@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Parsing of HTTP byte range requests."""
+
+from __future__ import absolute_import, print_function
+
+
+class RangeNotSatisfiable(ValueError):
+    """None of the requested ranges overlaps the file."""
+
+
+def parse_range(header, size):
+    """Return the ``(start, stop)`` byte range requested by a header.
+
+    Only single ranges are served partially; ``None`` is returned for a
+    missing, malformed or multiple range header, in which case the whole
+    file is sent (as allowed by RFC 7233).
+
+    :param header: Value of the ``Range`` header.
+    :param size: Size of the file.
+    :raises RangeNotSatisfiable: If the range starts after the end of the
+        file.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        suffix = int(last) if not first else None
+        start = int(first) if first else None
+        stop = int(last) + 1 if first and last else size
+    except ValueError:
+        return None
+    if suffix is not None:
+        if suffix < 0:
+            return None
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size
+    if start < 0 or last and stop <= start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, min(stop, size)
+
+
+def content_range(start, stop, size):
+    """Return the ``Content-Range`` header of a served range."""
+    return 'bytes {0}-{1}/{2}'.format(start, stop - 1, size)
+
+
+def if_range_matches(header, etag, last_modified=None):
+    """Return whether the ``If-Range`` validator allows a partial response.
+
+    :param header: Value of the ``If-Range`` header (an entity tag or an
+        HTTP date).
+    :param etag: Quoted entity tag of the file.
+    :param last_modified: HTTP date of the last modification of the file.
+    """
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith(('"', 'W/')):
+        return header == etag
+    return last_modified is not None and header == last_modified
+
+
+def iter_range(fp, start, stop, chunk_size=1 << 16):
+    """Yield the bytes ``start`` to ``stop`` of a file and close it."""
+    try:
+        fp.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = fp.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fp.close()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Deletion of removed files from database session events.
+
+Files removed with :meth:`~invenio.files.api.FileStore.remove` are deleted
+from disk once the transaction is committed, and kept if it is rolled back.
+"""
+
+from __future__ import absolute_import, print_function
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_INFO_KEY = 'invenio-files'
+
+
+def schedule_delete(session, storage, key):
+    """Delete a file from a storage when the transaction is committed."""
+    session.info.setdefault(_INFO_KEY, []).append((storage, key))
+
+
+def delete_files(session):
+    """Delete the files removed by the committed transaction."""
+    for storage, key in session.info.pop(_INFO_KEY, ()):
+        storage.delete(key)
+
+
+def discard_files(session):
+    """Keep the files removed by a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners = (
+    ('after_commit', delete_files),
+    ('after_rollback', discard_files),
+)
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    for name, func in _listeners:
+        if not event.contains(Session, name, func):
+            event.listen(Session, name, func)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    for name, func in _listeners:
+        if event.contains(Session, name, func):
+            event.remove(Session, name, func)
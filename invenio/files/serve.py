@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Responses sending stored files.
+
+Files are never read by Python when it can be avoided: the web server sends
+them itself when ``X-Sendfile`` or ``X-Accel-Redirect`` offloading is
+configured, otherwise the file object is handed to the ``wsgi.file_wrapper``
+of the WSGI server, which sends it with the ``sendfile`` system call (e.g.
+Gunicorn and uWSGI).  Only partial responses of byte ranges without
+offloading are read in chunks.
+"""
+
+from __future__ import absolute_import, print_function
+
+import mimetypes
+import os
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+from werkzeug.urls import url_quote
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from .ranges import RangeNotSatisfiable, content_range, if_range_matches, \
+    iter_range, parse_range
+
+SENDFILE_HEADERS = {
+    'x-sendfile': 'X-Sendfile',
+    'x-accel-redirect': 'X-Accel-Redirect',
+}
+"""Offloading header of each ``sendfile`` mode."""
+
+
+def content_disposition(filename, as_attachment=False):
+    """Return the ``Content-Disposition`` header of a file name."""
+    kind = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+    except UnicodeError:
+        return "{0}; filename*=UTF-8''{1}".format(
+            kind, url_quote(filename, safe=''))
+    return '{0}; filename="{1}"'.format(
+        kind, filename.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def send_file(environ, path, etag=None, mimetype=None, filename=None,
+              as_attachment=False, sendfile=None, offload_path=None,
+              max_age=None, chunk_size=1 << 16):
+    """Return a response sending a file, honouring conditional requests.
+
+    :param environ: WSGI environment of the request.
+    :param path: Absolute path of the file.
+    :param etag: Unquoted entity tag (e.g. the checksum of the file).
+    :param mimetype: Content type (default guessed from ``filename``).
+    :param filename: File name sent in ``Content-Disposition``.
+    :param sendfile: ``None``, ``'x-sendfile'`` or ``'x-accel-redirect'``.
+    :param offload_path: Value of the offloading header (default
+        ``path``), e.g. the internal nginx location of the file.
+    :param max_age: Seconds clients may cache the file.
+    :param chunk_size: Bytes read at once when Python sends the data.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    if mimetype is None and filename:
+        mimetype = mimetypes.guess_type(filename)[0]
+    headers = Headers()
+    headers['Accept-Ranges'] = 'bytes'
+    headers['Last-Modified'] = http_date(last_modified)
+    if etag:
+        headers['ETag'] = quote_etag(etag)
+    if filename:
+        headers['Content-Disposition'] = content_disposition(
+            filename, as_attachment)
+    if max_age is not None:
+        headers['Cache-Control'] = 'private, max-age={0}'.format(max_age)
+
+    if not is_resource_modified(environ, etag=etag,
+                                last_modified=last_modified):
+        return Response(status=304, headers=headers)
+
+    mimetype = mimetype or 'application/octet-stream'
+    if sendfile:
+        # The web server handles ranges of offloaded files itself.
+        headers[SENDFILE_HEADERS[sendfile]] = offload_path or path
+        headers['Content-Length'] = size
+        return Response(headers=headers, mimetype=mimetype)
+
+    byte_range = None
+    if if_range_matches(environ.get('HTTP_IF_RANGE'), headers.get('ETag'),
+                        headers['Last-Modified']):
+        try:
+            byte_range = parse_range(environ.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            headers['Content-Range'] = 'bytes */{0}'.format(size)
+            return Response(status=416, headers=headers)
+
+    status = 200
+    start, stop = 0, size
+    if byte_range is not None and byte_range != (0, size):
+        status = 206
+        start, stop = byte_range
+        headers['Content-Range'] = content_range(start, stop, size)
+    headers['Content-Length'] = stop - start
+
+    if environ.get('REQUEST_METHOD') == 'HEAD':
+        data = ()
+    elif status == 206:
+        data = iter_range(open(path, 'rb'), start, stop, chunk_size)
+    else:
+        data = wrap_file(environ, open(path, 'rb'), buffer_size=chunk_size)
+    return Response(data, status=status, headers=headers,
+                    mimetype=mimetype, direct_passthrough=True)
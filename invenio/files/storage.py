@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local file storage computing checksums while files are written."""
+
+from __future__ import absolute_import, print_function
+
+import errno
+import hashlib
+import os
+import re
+import tempfile
+import uuid
+
+_KEY = re.compile(r'^[0-9a-f]{32}$')
+
+
+class FileTooLarge(ValueError):
+    """The stream is larger than the allowed size."""
+
+
+class StoredData(object):
+    """Location, size and checksum of written data."""
+
+    def __init__(self, key, path, size, checksum):
+        """Initialize the stored data."""
+        self.key = key
+        self.path = path
+        self.size = size
+        self.checksum = checksum
+
+
+def checksum_file(fp, algorithm='md5', chunk_size=1 << 20):
+    """Return the ``algorithm:hexdigest`` checksum of the rest of a file."""
+    digest = hashlib.new(algorithm)
+    for chunk in iter(lambda: fp.read(chunk_size), b''):
+        digest.update(chunk)
+    return '{0}:{1}'.format(algorithm, digest.hexdigest())
+
+
+def _umask():
+    """Return the file mode creation mask of the process."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+class LocalFileStorage(object):
+    """Files below a root folder, addressed by random hexadecimal keys.
+
+    Files are sharded into two levels of folders (``ab/cd/abcd...``) so
+    that no folder grows too large.
+    """
+
+    def __init__(self, root, algorithm='md5', chunk_size=1 << 20,
+                 file_mode=None):
+        """Initialize the storage.
+
+        :param root: Folder of the files (created on the first write).
+        :param algorithm: Name of the :mod:`hashlib` checksum algorithm.
+        :param chunk_size: Number of bytes read and written at once.
+        :param file_mode: Permission bits of the stored files (default
+            ``0o666`` without the bits of the umask, like :func:`open`).
+        """
+        self.root = root
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.file_mode = 0o666 & ~_umask() if file_mode is None \
+            else file_mode
+
+    def relative_path(self, key):
+        """Return the path of a file relative to the root."""
+        if not _KEY.match(key or ''):
+            raise ValueError('Invalid file key {0!r}.'.format(key))
+        return '/'.join((key[:2], key[2:4], key))
+
+    def path(self, key):
+        """Return the absolute path of a file."""
+        return os.path.join(self.root, *self.relative_path(key).split('/'))
+
+    def save(self, stream, key=None, size_limit=None):
+        """Write a stream to a new file and return its :class:`StoredData`.
+
+        The checksum is updated with every chunk as it is written, so the
+        file is never read again.  Data is written to a temporary file which
+        is renamed when complete; a failed or too large upload leaves
+        nothing behind.
+
+        :param stream: File-like object with a ``read(size)`` method.
+        :param key: Key of the file (default a random one).
+        :param size_limit: Maximum number of bytes (raises
+            :class:`FileTooLarge`).
+        """
+        key = key or uuid.uuid4().hex
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+        digest = hashlib.new(self.algorithm)
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    size += len(chunk)
+                    if size_limit is not None and size > size_limit:
+                        raise FileTooLarge(
+                            'File is larger than {0} bytes.'.format(
+                                size_limit))
+                    digest.update(chunk)
+                    fp.write(chunk)
+                fp.flush()
+                # Temporary files are only readable by their owner.
+                os.fchmod(fp.fileno(), self.file_mode)
+                os.fsync(fp.fileno())
+            os.rename(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return StoredData(key, path, size, '{0}:{1}'.format(
+            self.algorithm, digest.hexdigest()))
+
+    def open(self, key):
+        """Open a file for reading."""
+        return open(self.path(key), 'rb')
+
+    def delete(self, key):
+        """Remove a file (if it exists)."""
+        try:
+            os.remove(self.path(key))
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+
+    def checksum(self, key, algorithm=None):
+        """Read a file and return its checksum.
+
+        :param algorithm: Name of the :mod:`hashlib` algorithm (default the
+            one of the storage).
+        """
+        algorithm = algorithm or self.algorithm
+        with self.open(key) as fp:
+            return checksum_file(fp, algorithm, self.chunk_size)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File download endpoint."""
+
+from __future__ import absolute_import, print_function
+
+from flask import Blueprint, abort, request
+
+from .proxies import current_files
+
+blueprint = Blueprint('invenio_files', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``FILES_URL``."""
+    url = state.app.config.get('FILES_URL')
+    if url and state.app.config.get('FILES_PERMISSION_FACTORY'):
+        state.app.add_url_rule(url, 'invenio_files.download', download)
+
+
+def download(file_id):
+    """Send a stored file.
+
+    The file must be readable according to ``FILES_PERMISSION_FACTORY``.
+    The ``download`` query parameter sends it as an attachment.
+    """
+    store = current_files.store
+    stored = store.get(file_id)
+    if stored is None:
+        abort(404)
+    if not current_files.permission_factory(stored).can():
+        abort(403)
+    return store.send(stored, request.environ,
+                      as_attachment='download' in request.args)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Materialized outputs of records in citation and display formats.
+
+Rendering a record as brief HTML, BibTeX or MARCXML on every result page or
+export request repeats the same work for records which rarely change.  This
+module keeps the rendered outputs in the ``formatter_outputs`` table, keyed
+by record and format, and serves them with a single primary key lookup.
+
+Formats are functions of the record metadata registered in
+``FORMATTER_FORMATS``:
+
+.. code-block:: python
+
+   FORMATTER_FORMATS = {
+       'hb': dict(function='invenio.formatter.formats:html_brief',
+                  mimetype='text/html'),
+       'csl': dict(function='mysite.formats:csl_json',
+                   mimetype='application/vnd.citationstyles.csl+json'),
+   }
+
+When a record is created, changed or deleted its outputs are deleted in the
+same flush, and after the commit a Celery task renders the formats listed
+in ``FORMATTER_PRERENDER`` again.  Outputs which are missing, e.g. of other
+formats or while the task is pending, are rendered and stored on read:
+
+.. code-block:: python
+
+   from invenio.formatter.proxies import current_formatter
+
+   current_formatter.formatter.get(record_id, 'bibtex')
+
+Outputs rendered on read are stored when the caller commits.  They can be
+served under ``FORMATTER_URL`` (disabled by default) to the users allowed
+to read the record by ``FORMATTER_PERMISSION_FACTORY``.  After a format
+function changed, ``python manage.py formatter regenerate -f bibtex``
+renders all records in a pool of worker processes and replaces the stored
+outputs page by page.
+"""
+
+from __future__ import absolute_import, print_function
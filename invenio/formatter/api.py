@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Materialized outputs of records in the configured formats."""
+
+from __future__ import absolute_import, print_function
+
+import logging
+import multiprocessing
+import uuid
+from collections import deque
+from datetime import datetime
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import import_string
+
+from .models import FormattedRecord
+from .receivers import _INFO_KEY
+
+logger = logging.getLogger(__name__)
+
+_functions = {}
+
+
+def _function(path):
+    """Return the format function of an import path (cached)."""
+    if path not in _functions:
+        _functions[path] = import_string(path)
+    return _functions[path]
+
+
+def render_records(formats, records):
+    """Render records in formats.
+
+    Executed in the worker processes of the bulk regeneration.
+
+    :param formats: List of ``(code, import path)`` pairs.
+    :param records: List of ``(record_id, data)`` pairs.
+    :returns: List of ``(record_id, code, output)`` triples and list of
+        ``(record_id, code, error)`` triples of failed renderings.
+    """
+    outputs = []
+    errors = []
+    for record_id, data in records:
+        for code, path in formats:
+            try:
+                outputs.append((record_id, code, _function(path)(data)))
+            except Exception as error:
+                errors.append((record_id, code, repr(error)))
+    return outputs, errors
+
+
+def _render_chunk(args):
+    return render_records(*args)
+
+
+def load_json(record_ids):
+    """Return the JSON of the records of ``record_ids`` in the same order.
+
+    ``None`` is returned for missing and deleted records.
+    """
+    records = dict(db.session.query(RecordMetadata.id, RecordMetadata.json)
+                   .filter(RecordMetadata.id.in_(record_ids)))
+    return [records.get(record_id) for record_id in record_ids]
+
+
+def _uuid(value):
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+class Formatter(object):
+    """Renders records and keeps their outputs in ``formatter_outputs``."""
+
+    def __init__(self, formats, batch_size=500, workers=None, loader=None):
+        """Initialize the formatter.
+
+        :param formats: Dictionary mapping format codes to the import paths
+            of their functions.
+        :param batch_size: Number of records regenerated per transaction.
+        :param workers: Number of processes of :meth:`regenerate_all`
+            (``None`` uses all CPUs, ``0`` renders in this process).
+        :param loader: Function returning the records of a list of
+            identifiers, like :func:`load_json` (the default).
+        """
+        self.formats = formats
+        self.loader = loader or load_json
+        self.batch_size = batch_size
+        self.workers = multiprocessing.cpu_count() if workers is None \
+            else workers
+
+    def _formats(self, codes=None):
+        return sorted((code, self.formats[code])
+                      for code in (self.formats if codes is None else codes))
+
+    def render(self, code, data):
+        """Render a record in a format (without storing the output)."""
+        return _function(self.formats[code])(data)
+
+    def get(self, record_id, code):
+        """Return the output of a record in a format.
+
+        Stored outputs are only served if they were rendered from the
+        current version of the record.  Missing and outdated outputs are
+        rendered and stored in a short transaction of their own, unless the
+        record was changed in the current transaction.
+
+        :returns: The output or ``None`` if the record does not exist or
+            was deleted.
+        """
+        record_id = _uuid(record_id)
+        row = db.session.query(
+            RecordMetadata.version_id, FormattedRecord.version_id,
+            FormattedRecord.output).outerjoin(FormattedRecord, and_(
+                FormattedRecord.record_id == RecordMetadata.id,
+                FormattedRecord.format == code)).filter(
+                    RecordMetadata.id == record_id).first()
+        if row is None:
+            return None
+        version_id, output_version_id, output = row
+        if output is not None and output_version_id == version_id:
+            return output
+        # The version is read before the record, so an output is never
+        # stored with a newer version than the one it was rendered from.
+        data = self.loader([record_id])[0]
+        if data is None:
+            return None
+        output = self.render(code, data)
+        if record_id not in db.session.info.get(_INFO_KEY, ()):
+            self._store(record_id, code, version_id, output)
+        return output
+
+    def _store(self, record_id, code, version_id, output):
+        """Store an output unless a newer one was stored concurrently."""
+        table = FormattedRecord.__table__
+        values = dict(output=output, version_id=version_id,
+                      created=datetime.utcnow())
+        try:
+            with db.engine.begin() as connection:
+                if not connection.execute(table.update().where(and_(
+                        table.c.record_id == record_id,
+                        table.c.format == code,
+                        table.c.version_id < version_id)).values(
+                            **values)).rowcount:
+                    connection.execute(table.insert().values(
+                        record_id=record_id, format=code, **values))
+        except IntegrityError:
+            pass
+
+    def _write(self, record_ids, codes, outputs, versions):
+        """Replace the outputs of records in formats and commit.
+
+        :param versions: Dictionary mapping the identifiers of the records
+            to the version their outputs were rendered from.
+        """
+        table = FormattedRecord.__table__
+        db.session.execute(table.delete().where(and_(
+            table.c.record_id.in_(record_ids), table.c.format.in_(codes))))
+        if outputs:
+            now = datetime.utcnow()
+            db.session.execute(table.insert(), [
+                dict(record_id=record_id, format=code, output=output,
+                     version_id=versions[record_id], created=now)
+                for record_id, code, output in outputs])
+        db.session.commit()
+
+    def _log(self, errors):
+        for record_id, code, error in errors:
+            logger.error('Rendering record %s in %s failed: %s',
+                         record_id, code, error)
+
+    def regenerate(self, record_ids, codes=None):
+        """Render records in formats (default all) and store the outputs.
+
+        Deleted records lose their outputs.
+
+        :returns: Number of stored outputs.
+        """
+        record_ids = [_uuid(record_id) for record_id in record_ids]
+        formats = self._formats(codes)
+        if not formats:
+            return 0
+        versions = dict(db.session.query(
+            RecordMetadata.id, RecordMetadata.version_id).filter(
+                RecordMetadata.id.in_(record_ids)))
+        records = [(record_id, data) for record_id, data in zip(
+            record_ids, self.loader(record_ids)) if data is not None]
+        outputs, errors = render_records(formats, records)
+        self._log(errors)
+        self._write(record_ids, [code for code, path in formats], outputs,
+                    versions)
+        return len(outputs)
+
+    def regenerate_all(self, codes=None, callback=None):
+        """Render all records in formats (default all) and store them.
+
+        Records are read in pages of ``batch_size`` and rendered in a pool
+        of worker processes; each page is written in its own transaction.
+
+        :param callback: Function called with the statistics after every
+            written page.
+        :returns: Dictionary with the number of ``records``, of stored
+            ``outputs`` and of rendering ``errors``.
+        """
+        from ..export.query import record_pages
+
+        formats = self._formats(codes)
+        codes = [code for code, path in formats]
+        stats = dict(records=0, outputs=0, errors=0)
+        if not formats:
+            return stats
+
+        def write(versions, result):
+            outputs, errors = result
+            self._log(errors)
+            self._write(list(versions), codes, outputs, versions)
+            stats['records'] += len(versions)
+            stats['outputs'] += len(outputs)
+            stats['errors'] += len(errors)
+            if callback:
+                callback(stats)
+
+        pages = record_pages(page_size=self.batch_size)
+        if not self.workers:
+            for page in pages:
+                write(dict((row[0], row[1]) for row in page), render_records(
+                    formats, [(row[0], row[-1]) for row in page]))
+            return stats
+
+        pool = multiprocessing.Pool(self.workers)
+        try:
+            pending = deque()
+            for page in pages:
+                pending.append((
+                    dict((row[0], row[1]) for row in page),
+                    pool.apply_async(_render_chunk, ((
+                        formats, [(row[0], row[-1]) for row in page]), ))))
+                if len(pending) >= 2 * self.workers:
+                    versions, result = pending.popleft()
+                    write(versions, result.get())
+            while pending:
+                versions, result = pending.popleft()
+                write(versions, result.get())
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+        return stats
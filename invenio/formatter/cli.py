@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatter output cache command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_formatter
+
+
+@click.group()
+def formatter():
+    """Formatter output commands."""
+
+
+@formatter.command()
+@click.option('-f', '--format', 'codes', multiple=True,
+              help='Only regenerate this format (default all).')
+@click.option('-w', '--workers', type=int, default=None,
+              help='Number of rendering processes (0 renders in-process).')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def regenerate(codes, workers, verbose):
+    """Render all records and replace their stored outputs."""
+    def progress(stats):
+        if verbose:
+            click.echo('{records} records, {outputs} outputs, '
+                       '{errors} errors'.format(**stats), err=True)
+
+    formatter = current_formatter.formatter
+    if workers is not None:
+        formatter.workers = workers
+    stats = formatter.regenerate_all(codes=codes or None, callback=progress)
+    click.echo('{records} records, {outputs} outputs, '
+               '{errors} errors'.format(**stats))
+    if stats['errors']:
+        raise SystemExit(1)
+
+
+@formatter.command()
+@click.argument('record_id')
+@click.argument('code')
+@with_appcontext
+def show(record_id, code):
+    """Print the output of a record in a format."""
+    output = current_formatter.formatter.get(record_id, code)
+    if output is None:
+        raise click.ClickException('Record {0} does not exist.'.format(
+            record_id))
+    click.echo(output)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatter output cache configuration."""
+
+from __future__ import absolute_import, print_function
+
+FORMATTER_FORMATS = {
+    'hb': dict(function='invenio.formatter.formats:html_brief',
+               mimetype='text/html'),
+    'bibtex': dict(function='invenio.formatter.formats:bibtex',
+                   mimetype='text/x-bibtex'),
+    'xm': dict(function='invenio.formatter.formats:marcxml',
+               mimetype='application/marcxml+xml'),
+}
+"""Output formats by code.
+
+``function`` is the import path of a function rendering a record.
+"""
+
+FORMATTER_PRERENDER = ('hb', 'bibtex', 'xm')
+"""Formats regenerated in the background when a record changes.
+
+Other formats are rendered and stored on their first read.
+"""
+
+FORMATTER_REGENERATE = True
+"""Regenerate the outputs of changed records with a Celery task.
+
+Otherwise the outputs of changed records are rendered on their next read.
+"""
+
+FORMATTER_BATCH_SIZE = 500
+"""Number of records regenerated per transaction."""
+
+FORMATTER_WORKERS = None
+"""Number of processes of the bulk regeneration (``None`` uses all CPUs)."""
+
+FORMATTER_PID_TYPE = 'recid'
+"""Persistent identifier type of the formatted record endpoint."""
+
+FORMATTER_URL = None
+"""URL of the formatted record endpoint, e.g.
+``'/records/<pid_value>/format/<code>'`` (``None`` disables it).
+
+Records are only served if ``FORMATTER_PERMISSION_FACTORY`` allows reading
+them.
+"""
+
+FORMATTER_PERMISSION_FACTORY = \
+    'invenio_records.permissions:read_permission_factory'
+"""Import path of the factory of the read permission of a record.
+
+The factory is called with the ``RecordMetadata`` row of the record, whose
+JSON is not loaded unless the permission reads it.
+"""
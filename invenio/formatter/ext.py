@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatter output cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property, import_string
+
+from . import config
+
+
+class _FormatterState(object):
+    """Formatter state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def formatter(self):
+        """The :class:`~invenio.formatter.api.Formatter`."""
+        from .api import Formatter
+
+        loader = None
+        if 'invenio-packing' in self.app.extensions:
+            from ..packing.api import load_records as loader
+        return Formatter(
+            dict((code, options['function']) for code, options in
+                 self.app.config['FORMATTER_FORMATS'].items()),
+            batch_size=self.app.config['FORMATTER_BATCH_SIZE'],
+            workers=self.app.config['FORMATTER_WORKERS'],
+            loader=loader,
+        )
+
+    @cached_property
+    def permission_factory(self):
+        """Factory of the read permission of a record."""
+        return import_string(self.app.config['FORMATTER_PERMISSION_FACTORY'])
+
+    def mimetype(self, code):
+        """Return the mimetype of a format."""
+        return self.app.config['FORMATTER_FORMATS'][code].get(
+            'mimetype', 'text/plain')
+
+
+class InvenioFormatter(object):
+    """Invenio formatter output cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-formatter'] = _FormatterState(app)
+        from . import receivers
+        receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('FORMATTER_'):
+                app.config.setdefault(k, getattr(config, k))
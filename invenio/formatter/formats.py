@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Built-in output formats of records.
+
+A format is a function of a record (dictionary) returning text.  Formats
+are called in worker processes by the bulk regeneration, hence they must
+not rely on the application context.
+"""
+
+from __future__ import absolute_import, print_function
+
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+
+def _authors(record):
+    return [author.get('name') or author.get('full_name', '')
+            for author in record.get('authors', [])
+            if isinstance(author, dict)]
+
+
+def html_brief(record):
+    """Return the title, authors and year of a record as HTML."""
+    authors = _authors(record)
+    parts = [u'<div class="record-brief">',
+             u'<h4>{0}</h4>'.format(escape(record.get('title', u'')))]
+    if authors:
+        parts.append(u'<p class="authors">{0}{1}</p>'.format(
+            u'; '.join(escape(a) for a in authors[:5]),
+            u' et al.' if len(authors) > 5 else u''))
+    if record.get('year'):
+        parts.append(u'<p class="year">{0}</p>'.format(record['year']))
+    parts.append(u'</div>')
+    return u''.join(parts)
+
+
+def _bibtex_value(value):
+    return u'{' + re.sub(r'([{}])', r'\\\1', u'{0}'.format(value)) + u'}'
+
+
+def bibtex(record):
+    """Return a record as a BibTeX ``@article`` entry."""
+    fields = [('title', record.get('title')),
+              ('author', u' and '.join(_authors(record)) or None),
+              ('year', record.get('year')),
+              ('abstract', record.get('abstract')),
+              ('keywords', u', '.join(record.get('keywords', [])) or None)]
+    lines = [u'@article{{{0},'.format(record.get('recid', 'record'))]
+    lines.extend(u'  {0} = {1},'.format(name, _bibtex_value(value))
+                 for name, value in fields if value)
+    lines.append(u'}')
+    return u'\n'.join(lines)
+
+
+def _datafield(tag, code, value):
+    return (u'<datafield tag="{0}" ind1=" " ind2=" ">'
+            u'<subfield code={1}>{2}</subfield></datafield>').format(
+                tag, quoteattr(code), escape(u'{0}'.format(value)))
+
+
+def marcxml(record):
+    """Return a record as MARCXML."""
+    parts = [u'<record xmlns="http://www.loc.gov/MARC21/slim">']
+    if record.get('recid') is not None:
+        parts.append(u'<controlfield tag="001">{0}</controlfield>'.format(
+            record['recid']))
+    authors = _authors(record)
+    if authors:
+        parts.append(_datafield('100', 'a', authors[0]))
+    if record.get('title'):
+        parts.append(_datafield('245', 'a', record['title']))
+    if record.get('year'):
+        parts.append(_datafield('260', 'c', record['year']))
+    if record.get('abstract'):
+        parts.append(_datafield('520', 'a', record['abstract']))
+    for keyword in record.get('keywords', []):
+        parts.append(_datafield('653', 'a', keyword))
+    for author in authors[1:]:
+        parts.append(_datafield('700', 'a', author))
+    parts.append(u'</record>')
+    return u''.join(parts)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatter output cache database models."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy_utils.types import UUIDType
+
+
+class FormattedRecord(db.Model):
+    """Pre-rendered output of a record in a format."""
+
+    __tablename__ = 'formatter_outputs'
+
+    record_id = db.Column(UUIDType, db.ForeignKey(
+        RecordMetadata.id, ondelete='CASCADE'), primary_key=True)
+    """Identifier of the record."""
+
+    format = db.Column(db.String(32), primary_key=True)
+    """Code of the format."""
+
+    output = db.Column(db.Text, nullable=False)
+    """Rendered record."""
+
+    version_id = db.Column(db.Integer, nullable=False)
+    """Version of the record the output was rendered from."""
+
+    created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    """Time the output was rendered."""
+
+
+__all__ = ('FormattedRecord', )
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers dropping and regenerating the outputs of changed records."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from .models import FormattedRecord
+
+_INFO_KEY = 'invenio-formatter'
+
+
+def clear_outputs(session, flush_context, instances):
+    """Delete the outputs of the records changed by the flush.
+
+    The identifiers of changed records which still exist are kept in the
+    session until the transaction is committed.
+    """
+    if not current_app or \
+            'invenio-formatter' not in current_app.extensions:
+        return
+    changed = set()
+    deleted = set()
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, RecordMetadata) or obj.id is None:
+            continue
+        if obj in session.new or \
+                attributes.get_history(obj, 'json').has_changes():
+            (changed if obj.json is not None else deleted).add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, RecordMetadata):
+            deleted.add(obj.id)
+    if not changed and not deleted:
+        return
+    table = FormattedRecord.__table__
+    session.execute(table.delete().where(
+        table.c.record_id.in_(list(changed | deleted))))
+    pending = session.info.setdefault(_INFO_KEY, set())
+    pending.difference_update(deleted)
+    pending.update(changed)
+
+
+def regenerate_outputs(session):
+    """Schedule the regeneration of the records changed in the transaction."""
+    record_ids = session.info.pop(_INFO_KEY, None)
+    if not record_ids or not current_app or \
+            not current_app.config['FORMATTER_REGENERATE'] or \
+            not current_app.config['FORMATTER_PRERENDER']:
+        return
+    from .tasks import regenerate_records
+    regenerate_records.delay(
+        [str(record_id) for record_id in record_ids],
+        list(current_app.config['FORMATTER_PRERENDER']))
+
+
+def discard_outputs(session):
+    """Forget the records changed in a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_LISTENERS = (
+    ('before_flush', clear_outputs),
+    ('after_commit', regenerate_outputs),
+    ('after_rollback', discard_outputs),
+)
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    for name, listener in _LISTENERS:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    for name, listener in _LISTENERS:
+        if event.contains(Session, name, listener):
+            event.remove(Session, name, listener)
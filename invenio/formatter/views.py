@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatted record endpoint."""
+
+from __future__ import absolute_import, print_function
+
+from flask import Blueprint, Response, abort, current_app
+from invenio_db import db
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_pidstore.models import PersistentIdentifier
+from invenio_records.models import RecordMetadata
+from sqlalchemy.orm import load_only
+
+from .proxies import current_formatter
+
+blueprint = Blueprint('invenio_formatter', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``FORMATTER_URL``."""
+    url = state.app.config.get('FORMATTER_URL')
+    if url:
+        state.app.add_url_rule(url, 'invenio_formatter.formatted', formatted)
+
+
+def formatted(pid_value, code):
+    """Return the stored output of a record in a format.
+
+    The record must be readable according to ``FORMATTER_PERMISSION_FACTORY``.
+    Missing outputs are stored by the formatter in their own transaction.
+    """
+    if code not in current_app.config['FORMATTER_FORMATS']:
+        abort(404)
+    try:
+        pid = PersistentIdentifier.get(
+            current_app.config['FORMATTER_PID_TYPE'], pid_value)
+    except PIDDoesNotExistError:
+        abort(404)
+    if not pid.is_registered() or pid.object_type != 'rec':
+        abort(404)
+    model = db.session.query(RecordMetadata).options(load_only(
+        RecordMetadata.id, RecordMetadata.version_id)).filter(
+            RecordMetadata.id == pid.object_uuid).first()
+    if model is None:
+        abort(410)
+    if not current_formatter.permission_factory(model).can():
+        abort(403)
+    output = current_formatter.formatter.get(pid.object_uuid, code)
+    if output is None:
+        abort(410)
+    return Response(output, mimetype=current_formatter.mimetype(code))
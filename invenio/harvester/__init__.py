@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Concurrent OAI-PMH harvester.
+
+Harvesting a large provider one ``ListRecords`` page after the other takes
+days.  This module harvests many providers concurrently on an :mod:`asyncio`
+event loop (Python 3.5 or later), with per-host limits of the request rate
+(``HARVESTER_HOST_RATE``) and of the concurrent requests.  Each page is
+stored as soon as it arrives, while the next page is fetched:
+
+.. code-block:: console
+
+   $ python manage.py harvester add arxiv http://export.arxiv.org/oai2
+   $ python manage.py harvester run
+
+New records are loaded with the bulk loader of :mod:`invenio.ingest`.
+Harvested records are registered under their OAI identifier as persistent
+identifiers of type ``HARVESTER_PID_TYPE`` (the identifier and the source
+are also kept in the ``_harvest`` key of the record), so records harvested
+again are updated and deleted ones lose their metadata.
+
+The resumption token is stored in the ``harvester_sources`` table after
+every loaded page, so a crashed harvest resumes from the last loaded page;
+completed harvests continue from the date they started at the next run.
+:class:`~.testing.OAIStandIn` is a local provider for tests.
+"""
+
+from __future__ import absolute_import, print_function
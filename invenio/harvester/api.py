@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Harvesting of the configured sources into the records."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+from functools import partial
+
+from flask import current_app
+from invenio_db import db
+
+from .models import HarvestSource
+
+HARVEST_KEY = '_harvest'
+"""Key of the source and OAI identifier of harvested records."""
+
+
+def load_sources(names=None):
+    """Return the :class:`~.harvester.Source` of the stored sources."""
+    from .harvester import Source
+
+    query = HarvestSource.query.order_by(HarvestSource.name)
+    if names:
+        query = query.filter(HarvestSource.name.in_(names))
+    return [Source(
+        model.name, model.url, metadata_prefix=model.metadata_prefix,
+        set_spec=model.set_spec, from_date=model.from_date,
+        resumption_token=model.resumption_token, started=model.started,
+        total=model.harvested or 0)
+        for model in query]
+
+
+def save_source(source):
+    """Persist the harvesting state of a source."""
+    model = HarvestSource.query.get(source.name)
+    model.from_date = source.from_date
+    model.resumption_token = source.resumption_token
+    model.started = source.started
+    model.harvested = source.total + source.harvested
+    model.last_run = datetime.utcnow()
+    model.error = None
+    db.session.commit()
+
+
+def convert_record(converter, item):
+    """Return the record of a harvested ``(source, identifier, data)`` item.
+
+    Executed in the worker processes of the bulk loader.
+    """
+    source, identifier, data = item
+    data = converter(data) if converter is not None else dict(data)
+    data[HARVEST_KEY] = dict(source=source, identifier=identifier)
+    return data
+
+
+def _mint_identifiers(pid_type, object_type, records):
+    """Register the OAI identifiers of loaded records."""
+    from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+    now = datetime.utcnow()
+    db.session.execute(PersistentIdentifier.__table__.insert(), [
+        dict(pid_type=pid_type, pid_value=data[HARVEST_KEY]['identifier'],
+             pid_provider=None, status=PIDStatus.REGISTERED,
+             object_type=object_type, object_uuid=record_id, created=now,
+             updated=now)
+        for record_id, data in records])
+
+
+def _set_status(record_ids, status, pid_type, object_type):
+    """Change the status of the other identifiers of records."""
+    from invenio_pidstore.models import PersistentIdentifier
+
+    if not record_ids:
+        return
+    PersistentIdentifier.query.filter(
+        PersistentIdentifier.object_type == object_type,
+        PersistentIdentifier.object_uuid.in_(record_ids),
+        PersistentIdentifier.pid_type != pid_type).update(
+            dict(status=status), synchronize_session=False)
+
+
+def store_page(source, page, loader, pid_type='oai'):
+    """Store the records of a harvested page.
+
+    Records are looked up by their OAI identifier, a persistent identifier
+    of type ``pid_type``: known records are updated, deleted ones lose
+    their metadata and the others are bulk loaded.
+
+    :param source: Name of the source.
+    :param page: The :class:`~.oai.Page`.
+    :param loader: :class:`~invenio.ingest.api.BulkLoader` converting
+        ``(source, identifier, data)`` items (see :func:`convert_record`).
+    :returns: The :class:`~invenio.ingest.api.IngestStats` of the new
+        records.
+    """
+    from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+    from invenio_records.models import RecordMetadata
+
+    from ..ingest.signals import records_loaded
+
+    convert = loader.converter or partial(convert_record, None)
+    items = dict(page.records)
+    items.update((identifier, None) for identifier in page.deleted)
+    pid = PersistentIdentifier
+    known = dict(db.session.query(pid.pid_value, pid.object_uuid).filter(
+        pid.pid_type == pid_type, pid.pid_value.in_(list(items))))
+    if known:
+        recids = dict(db.session.query(pid.object_uuid, pid.pid_value).filter(
+            pid.pid_type == loader.pid_type,
+            pid.object_uuid.in_(list(known.values()))))
+        models = dict((model.id, model) for model in
+                      RecordMetadata.query.filter(RecordMetadata.id.in_(
+                          list(known.values()))))
+        deleted, restored = [], []
+        for identifier, record_id in sorted(known.items()):
+            model = models[record_id]
+            if items[identifier] is None:
+                if model.json is not None:
+                    model.json = None
+                    deleted.append(record_id)
+                continue
+            data = convert((source, identifier, items[identifier]))
+            error = loader.validator(data)
+            if error is not None:
+                current_app.logger.warning('Invalid record %s of %s: %s',
+                                           identifier, source, error)
+                continue
+            if record_id in recids:
+                data['recid'] = int(recids[record_id])
+            if model.json is None:
+                restored.append(record_id)
+            model.json = data
+        _set_status(deleted, PIDStatus.DELETED, pid_type, loader.object_type)
+        _set_status(restored, PIDStatus.REGISTERED, pid_type,
+                    loader.object_type)
+        db.session.commit()
+
+    def mint(sender, records=None):
+        _mint_identifiers(pid_type, loader.object_type, records)
+
+    with records_loaded.connected_to(mint, sender=loader):
+        return loader.load(
+            (source, identifier, data) for identifier, data in items.items()
+            if identifier not in known and data is not None)
+
+
+def harvest(names=None, loader=None):
+    """Harvest sources concurrently into the records.
+
+    Every page is stored with :func:`store_page` as soon as it arrives:
+    new records are loaded with the bulk loader of :mod:`invenio.ingest`,
+    records harvested before are updated or deleted.
+
+    :param names: Names of the sources (default all).
+    :param loader: :class:`~invenio.ingest.api.BulkLoader` converting
+        harvested items (default one converting MARCXML with
+        ``HARVESTER_INGEST_WORKERS`` processes).
+    :returns: List of the harvested :class:`~.harvester.Source`.
+    """
+    from .harvester import Harvester
+
+    app = current_app._get_current_object()
+    if loader is None:
+        state = app.extensions['invenio-ingest']
+        loader = state.loader(
+            converter=partial(convert_record, state.marcxml_converter),
+            workers=app.config['HARVESTER_INGEST_WORKERS'])
+
+    def sink(source, page):
+        with app.app_context():
+            store_page(source.name, page, loader,
+                       pid_type=app.config['HARVESTER_PID_TYPE'])
+
+    def save(source):
+        with app.app_context():
+            save_source(source)
+
+    harvester = Harvester(
+        sink, save=save,
+        concurrency=app.config['HARVESTER_CONCURRENCY'],
+        host_rate=app.config['HARVESTER_HOST_RATE'],
+        host_connections=app.config['HARVESTER_HOST_CONNECTIONS'],
+        timeout=app.config['HARVESTER_TIMEOUT'],
+        retries=app.config['HARVESTER_RETRIES'])
+    sources = harvester.run(load_sources(names))
+    for source in sources:
+        if source.error is not None:
+            HarvestSource.query.get(source.name).error = str(source.error)
+    db.session.commit()
+    return sources
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""OAI-PMH harvester command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask_cli import with_appcontext
+
+
+@click.group()
+def harvester():
+    """OAI-PMH harvesting commands."""
+
+
+@harvester.command()
+@click.argument('name')
+@click.argument('url')
+@click.option('-p', '--metadata-prefix', default='marcxml',
+              help='Metadata format (default marcxml).')
+@click.option('-s', '--set', 'set_spec', default=None,
+              help='Only harvest this set.')
+@click.option('-f', '--from', 'from_date', default=None,
+              help='Only harvest records changed since this date.')
+@with_appcontext
+def add(name, url, metadata_prefix, set_spec, from_date):
+    """Add an OAI-PMH provider."""
+    from invenio_db import db
+
+    from .models import HarvestSource
+
+    db.session.add(HarvestSource(
+        name=name, url=url, metadata_prefix=metadata_prefix,
+        set_spec=set_spec, from_date=from_date))
+    db.session.commit()
+
+
+@harvester.command('list')
+@with_appcontext
+def list_sources():
+    """Print the sources and their state."""
+    from .models import HarvestSource
+
+    for source in HarvestSource.query.order_by(HarvestSource.name):
+        state = 'resumable' if source.resumption_token else 'complete'
+        if source.error:
+            state = 'failed: {0}'.format(source.error)
+        click.echo('{0}\t{1}\tfrom {2}\t{3} records\t{4}'.format(
+            source.name, source.url, source.from_date or '-',
+            source.harvested, state))
+
+
+@harvester.command()
+@click.argument('names', nargs=-1)
+@with_appcontext
+def run(names):
+    """Harvest the sources (default all) concurrently.
+
+    Interrupted harvests resume from their last stored page.
+    """
+    from .api import harvest
+
+    failed = False
+    for source in harvest(names or None):
+        click.echo('{0}: {1} records, {2} deleted, {3} pages{4}'.format(
+            source.name, source.harvested, source.deleted, source.pages,
+            ', failed: {0}'.format(source.error) if source.error else ''))
+        failed = failed or source.error is not None
+    if failed:
+        raise SystemExit(1)
+
+
+@harvester.command()
+@click.argument('name')
+@click.option('--from', 'from_date', default=None,
+              help='Harvest records changed since this date next time.')
+@with_appcontext
+def reset(name, from_date):
+    """Drop the state of an interrupted harvest."""
+    from invenio_db import db
+
+    from .models import HarvestSource
+
+    source = HarvestSource.query.get(name)
+    if source is None:
+        raise click.ClickException('Unknown source {0}.'.format(name))
+    source.resumption_token = source.started = source.error = None
+    source.from_date = from_date
+    db.session.commit()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""OAI-PMH harvester configuration."""
+
+from __future__ import absolute_import, print_function
+
+HARVESTER_CONCURRENCY = 8
+"""Maximum number of sources harvested at once."""
+
+HARVESTER_HOST_RATE = 1.0
+"""Maximum number of requests per second to a host (``None`` for none)."""
+
+HARVESTER_HOST_CONNECTIONS = 2
+"""Maximum number of concurrent requests to a host."""
+
+HARVESTER_TIMEOUT = 60
+"""Seconds to wait for a response."""
+
+HARVESTER_RETRIES = 5
+"""Number of retries of failed or refused (``503``) requests."""
+
+HARVESTER_INGEST_WORKERS = 0
+"""Number of validation processes used to load every page."""
+
+HARVESTER_PID_TYPE = 'oai'
+"""Persistent identifier type of the OAI identifiers of harvested records.
+
+Records harvested again are updated through it instead of inserted.
+"""
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Concurrent OAI-PMH harvester (Python 3.5 or later).
+
+Sources are harvested concurrently on an event loop, with the number of
+requests per second and of concurrent requests limited per host.  Every
+source follows its chain of resumption tokens: while a page is stored,
+the next page is already fetched.  Pages are stored one at a time in a
+single ingestion thread; the resumption token of a page is saved after
+its records have been stored, so a harvest resumes from the last stored
+page after a crash (records of the page being stored may be stored
+again).
+"""
+
+import asyncio
+import gzip
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from .oai import OAIError, list_records_url, parse_page
+
+logger = logging.getLogger(__name__)
+
+
+class Source(object):
+    """Harvesting state of an OAI-PMH provider."""
+
+    def __init__(self, name, url, metadata_prefix='marcxml', set_spec=None,
+                 from_date=None, until=None, resumption_token=None,
+                 started=None, total=0):
+        """Initialize the source.
+
+        :param from_date: Harvest records changed since this date.
+        :param resumption_token: Token to resume an interrupted list with.
+        :param started: ``responseDate`` of the first page of the list
+            being harvested, which becomes ``from_date`` once the list is
+            complete.
+        :param total: Number of records harvested in earlier runs.
+        """
+        self.name = name
+        self.url = url
+        self.metadata_prefix = metadata_prefix
+        self.set_spec = set_spec
+        self.from_date = from_date
+        self.until = until
+        self.resumption_token = resumption_token
+        self.started = started
+        self.total = total
+        self.pages = 0
+        self.harvested = 0
+        self.deleted = 0
+        self.error = None
+
+
+class RetryLater(Exception):
+    """Provider asked to retry after ``delay`` seconds."""
+
+    def __init__(self, delay):
+        """Initialize the exception."""
+        super(RetryLater, self).__init__(delay)
+        self.delay = delay
+
+
+def fetch(url, timeout=60):
+    """Return the body of a ``GET`` request.
+
+    :raises RetryLater: For ``503 Service Unavailable`` responses.
+    """
+    request = Request(url, headers={
+        'Accept-Encoding': 'gzip', 'User-Agent': 'Invenio OAI-PMH harvester'})
+    try:
+        response = urlopen(request, timeout=timeout)
+    except HTTPError as error:
+        if error.code != 503:
+            raise
+        delay = error.headers.get('Retry-After', '')
+        raise RetryLater(int(delay) if delay.isdigit() else 10)
+    try:
+        data = response.read()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            data = gzip.decompress(data)
+        return data
+    finally:
+        response.close()
+
+
+class HostLimiter(object):
+    """Rate and concurrency limit of the requests to every host."""
+
+    def __init__(self, rate=1.0, connections=2):
+        """Initialize the limiter.
+
+        :param rate: Maximum number of requests per second started to a
+            host (``None`` for no limit).
+        :param connections: Maximum number of concurrent requests to a host.
+        """
+        self.interval = 1.0 / rate if rate else 0
+        self.connections = connections
+        self._hosts = {}
+
+    def _host(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = [asyncio.Semaphore(self.connections), 0]
+        return self._hosts[host]
+
+    async def acquire(self, host):
+        """Wait until a request to ``host`` may be started."""
+        slot = self._host(host)
+        await slot[0].acquire()
+        now = asyncio.get_event_loop().time()
+        start = max(now, slot[1])
+        slot[1] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def release(self, host):
+        """Mark a request to ``host`` as finished."""
+        self._host(host)[0].release()
+
+    def delay(self, host, seconds):
+        """Start no request to ``host`` in the next ``seconds``."""
+        slot = self._host(host)
+        slot[1] = max(slot[1], asyncio.get_event_loop().time() + seconds)
+
+
+class Harvester(object):
+    """Concurrent OAI-PMH ``ListRecords`` harvester."""
+
+    def __init__(self, sink, save=None, concurrency=8, host_rate=1.0,
+                 host_connections=2, timeout=60, retries=5, get=fetch):
+        """Initialize the harvester.
+
+        :param sink: Function called with a :class:`Source` and a
+            :class:`~.oai.Page` to store the records of the page.
+        :param save: Function called with a :class:`Source` to persist its
+            state after each stored page.
+        :param concurrency: Maximum number of sources harvested at once.
+        :param host_rate: Maximum number of requests per second to a host.
+        :param host_connections: Maximum concurrent requests to a host.
+        :param timeout: Seconds to wait for a response.
+        :param retries: Number of retries of failed requests.
+        :param get: Function returning the body of a URL (see
+            :func:`fetch`), called in a thread.
+        """
+        self.sink = sink
+        self.save = save
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.host_connections = host_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.get = get
+
+    def run(self, sources):
+        """Harvest sources on a new event loop and return them.
+
+        Errors of a source are logged and kept in its ``error``.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.harvest(sources))
+        finally:
+            loop.close()
+
+    async def harvest(self, sources):
+        """Harvest sources concurrently and return them."""
+        limiter = HostLimiter(self.host_rate, self.host_connections)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        executor = ThreadPoolExecutor(1)
+
+        async def harvest_one(source):
+            async with semaphore:
+                try:
+                    await self.harvest_source(source, limiter, executor)
+                except Exception as error:
+                    logger.exception('Harvesting %s failed.', source.name)
+                    source.error = error
+
+        try:
+            await asyncio.gather(*[harvest_one(s) for s in sources])
+        finally:
+            executor.shutdown(wait=True)
+        return sources
+
+    async def fetch(self, url, limiter):
+        """Return the body of ``url``, retrying failed requests.
+
+        Client errors (HTTP status below 500) are not retried.
+        """
+        loop = asyncio.get_event_loop()
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            await limiter.acquire(host)
+            try:
+                return await loop.run_in_executor(
+                    None, self.get, url, self.timeout)
+            except RetryLater as error:
+                if attempt == self.retries:
+                    raise
+                limiter.delay(host, error.delay)
+            except HTTPError as error:
+                if error.code < 500 or attempt == self.retries:
+                    raise
+                limiter.delay(host, 2 ** attempt)
+            except (URLError, socket.timeout, ConnectionError):
+                if attempt == self.retries:
+                    raise
+                limiter.delay(host, 2 ** attempt)
+            finally:
+                limiter.release(host)
+
+    async def harvest_source(self, source, limiter, executor):
+        """Harvest the complete list of a source.
+
+        Each page is stored in ``executor`` while the next one is fetched.
+        """
+        loop = asyncio.get_event_loop()
+        token = source.resumption_token
+        resuming = token is not None
+        pending = None
+        try:
+            while True:
+                data = await self.fetch(list_records_url(
+                    source.url, metadata_prefix=source.metadata_prefix,
+                    set_spec=source.set_spec, from_date=source.from_date,
+                    until=source.until, token=token), limiter)
+                try:
+                    page = await loop.run_in_executor(None, parse_page, data)
+                except OAIError as error:
+                    if error.code != 'badResumptionToken' or not resuming:
+                        raise
+                    logger.warning('Resumption token of %s expired, '
+                                   'restarting the list.', source.name)
+                    token = source.resumption_token = source.started = None
+                    resuming = False
+                    continue
+                resuming = False
+                if pending is not None:
+                    await pending
+                pending = loop.run_in_executor(
+                    executor, self.store, source, page)
+                token = page.token
+                if not token:
+                    break
+        finally:
+            if pending is not None:
+                await pending
+
+    def store(self, source, page):
+        """Store a page and save the state of its source."""
+        if source.started is None:
+            source.started = page.response_date
+        self.sink(source, page)
+        source.pages += 1
+        source.harvested += len(page.records)
+        source.deleted += len(page.deleted)
+        source.resumption_token = page.token
+        if page.token is None:
+            if source.started:
+                source.from_date = source.started[:10]
+            source.started = None
+        if self.save is not None:
+            self.save(source)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""OAI-PMH harvester database models."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+
+
+class HarvestSource(db.Model):
+    """OAI-PMH provider and the state of its harvest."""
+
+    __tablename__ = 'harvester_sources'
+
+    name = db.Column(db.String(255), primary_key=True)
+    """Name of the source."""
+
+    url = db.Column(db.String(255), nullable=False)
+    """Base URL of the provider."""
+
+    metadata_prefix = db.Column(db.String(64), nullable=False,
+                                default='marcxml')
+    """Metadata format of the harvested records."""
+
+    set_spec = db.Column(db.String(255), nullable=True)
+    """Set to harvest (``None`` for all records)."""
+
+    from_date = db.Column(db.String(32), nullable=True)
+    """Date of the last complete harvest; the next one starts there."""
+
+    resumption_token = db.Column(db.Text, nullable=True)
+    """Token of the next page of an interrupted harvest."""
+
+    started = db.Column(db.String(32), nullable=True)
+    """Response date of the first page of the interrupted harvest."""
+
+    harvested = db.Column(db.Integer, nullable=False, default=0)
+    """Number of records harvested in total."""
+
+    last_run = db.Column(db.DateTime, nullable=True)
+    """Time the last page was stored."""
+
+    error = db.Column(db.Text, nullable=True)
+    """Error of the last harvest, if it failed."""
+
+
+__all__ = ('HarvestSource', )
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""OAI-PMH requests and ``ListRecords`` responses."""
+
+from __future__ import absolute_import, print_function
+
+from xml.etree import ElementTree
+
+from ..ingest.marcxml import read_record
+
+try:
+    from urllib.parse import urlencode
+except ImportError:  # pragma: no cover
+    from urllib import urlencode
+
+OAI = '{http://www.openarchives.org/OAI/2.0/}'
+"""Namespace of the OAI-PMH elements."""
+
+
+class OAIError(Exception):
+    """Error response of an OAI-PMH provider."""
+
+    def __init__(self, code, message=''):
+        """Initialize the error with the OAI-PMH error code."""
+        super(OAIError, self).__init__('{0}: {1}'.format(code, message))
+        self.code = code
+
+
+class Page(object):
+    """Page of a ``ListRecords`` response."""
+
+    def __init__(self, records, deleted, token=None, response_date=None,
+                 complete_size=None):
+        """Initialize the page.
+
+        :param records: List of ``(identifier, record)`` pairs, with the
+            records as read by :func:`~invenio.ingest.marcxml.read_record`.
+        :param deleted: List of the identifiers of deleted records.
+        :param token: Resumption token of the next page, if any.
+        :param response_date: ``responseDate`` of the response.
+        :param complete_size: Number of records of the whole list, if known.
+        """
+        self.records = records
+        self.deleted = deleted
+        self.token = token
+        self.response_date = response_date
+        self.complete_size = complete_size
+
+
+def list_records_url(url, metadata_prefix='marcxml', set_spec=None,
+                     from_date=None, until=None, token=None):
+    """Return the URL of a ``ListRecords`` request.
+
+    Only the resumption token is sent to continue a list.
+    """
+    if token:
+        params = [('verb', 'ListRecords'), ('resumptionToken', token)]
+    else:
+        params = [('verb', 'ListRecords'),
+                  ('metadataPrefix', metadata_prefix)]
+        for name, value in (('set', set_spec), ('from', from_date),
+                            ('until', until)):
+            if value:
+                params.append((name, value))
+    return '{0}{1}{2}'.format(url, '&' if '?' in url else '?',
+                              urlencode(params))
+
+
+def parse_page(data):
+    """Return the :class:`Page` of a ``ListRecords`` response.
+
+    An empty page is returned for the ``noRecordsMatch`` error.
+
+    :param data: Response body (bytes).
+    :raises OAIError: For any other error response.
+    """
+    root = ElementTree.fromstring(data)
+    response_date = root.findtext(OAI + 'responseDate')
+    error = root.find(OAI + 'error')
+    if error is not None:
+        if error.get('code') == 'noRecordsMatch':
+            return Page([], [], response_date=response_date)
+        raise OAIError(error.get('code'), (error.text or '').strip())
+
+    records = []
+    deleted = []
+    container = root.find(OAI + 'ListRecords')
+    for record in container.findall(OAI + 'record'):
+        header = record.find(OAI + 'header')
+        identifier = header.findtext(OAI + 'identifier')
+        metadata = record.find(OAI + 'metadata')
+        if header.get('status') == 'deleted' or metadata is None or \
+                not len(metadata):
+            deleted.append(identifier)
+        else:
+            records.append((identifier, read_record(metadata[0])))
+
+    token = complete_size = None
+    element = container.find(OAI + 'resumptionToken')
+    if element is not None:
+        token = (element.text or '').strip() or None
+        complete_size = element.get('completeListSize')
+    return Page(records, deleted, token=token, response_date=response_date,
+                complete_size=int(complete_size) if complete_size else None)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Local OAI-PMH stand-in server for tests and benchmarks."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+from xml.sax.saxutils import escape
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+RESPONSE = u"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<responseDate>2015-01-01T00:00:00Z</responseDate>
+<request verb="ListRecords">{url}</request>
+{body}
+</OAI-PMH>"""
+
+RECORD = u"""<record><header{status}><identifier>{identifier}</identifier>
+<datestamp>2015-01-01</datestamp></header>{metadata}</record>"""
+
+MARC = (u'<metadata><record xmlns="http://www.loc.gov/MARC21/slim">'
+        u'<controlfield tag="001">{0}</controlfield>'
+        u'<datafield tag="245" ind1=" " ind2=" ">'
+        u'<subfield code="a">{1}</subfield></datafield>'
+        u'</record></metadata>')
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class OAIStandIn(object):
+    """OAI-PMH provider serving ``ListRecords`` pages of sample records.
+
+    The server runs in a thread on a free local port.  Record ``i`` has the
+    identifier ``oai:<name>:<i>`` and the title ``Record <i>``; every
+    ``deleted_every``-th record is deleted.  The first ``busy`` requests
+    are answered with ``503 Retry-After``.
+
+    .. code-block:: python
+
+       with OAIStandIn(count=250, page_size=100) as server:
+           harvest(server.url)
+    """
+
+    def __init__(self, count=100, page_size=10, name='test', busy=0,
+                 deleted_every=0):
+        """Initialize the server."""
+        self.count = count
+        self.page_size = page_size
+        self.name = name
+        self.busy = busy
+        self.deleted_every = deleted_every
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self):
+        """Base URL of the provider."""
+        if self._server is None:
+            return 'http://127.0.0.1/oai2d'
+        return 'http://127.0.0.1:{0}/oai2d'.format(
+            self._server.server_address[1])
+
+    def page(self, query):
+        """Return the status and body of a request."""
+        params = dict((k, v[0]) for k, v in parse_qs(query).items())
+        if params.get('verb') != 'ListRecords':
+            return 400, self._error('badVerb', 'Illegal verb')
+        token = params.get('resumptionToken')
+        if token is None:
+            start = 0
+        elif token.isdigit() and int(token) < self.count:
+            start = int(token)
+        else:
+            return 200, self._error('badResumptionToken', token)
+        if not self.count:
+            return 200, self._error('noRecordsMatch', '')
+
+        end = min(start + self.page_size, self.count)
+        body = [u'<ListRecords>']
+        for i in range(start, end):
+            deleted = self.deleted_every and i % self.deleted_every == 0
+            body.append(RECORD.format(
+                identifier='oai:{0}:{1}'.format(self.name, i),
+                status=u' status="deleted"' if deleted else u'',
+                metadata=u'' if deleted else MARC.format(
+                    i, escape(u'Record {0}'.format(i)))))
+        body.append(u'<resumptionToken completeListSize="{0}">{1}'
+                    u'</resumptionToken>'.format(
+                        self.count, end if end < self.count else u''))
+        body.append(u'</ListRecords>')
+        return 200, RESPONSE.format(url=self.url, body=u''.join(body))
+
+    def _error(self, code, message):
+        return RESPONSE.format(url=self.url, body=u'<error code="{0}">{1}'
+                               u'</error>'.format(code, escape(message)))
+
+    def start(self):
+        """Start serving."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                standin.requests.append(self.path)
+                if standin.busy > 0:
+                    standin.busy -= 1
+                    self.send_response(503)
+                    self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    return
+                status, body = standin.page(urlparse(self.path).query)
+                body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _Server(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self.stop()
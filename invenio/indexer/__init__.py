@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Asynchronous bulk search indexer.
+
+Record changes are queued instead of being indexed one request at a time.
+The records changed by a transaction are sent to the workers in chunked
+tasks after the commit, each acknowledged once its records are indexed.
+Changes of the same record within ``INDEXER_WINDOW`` seconds of the
+long-running engine are coalesced, the documents are serialized in a pool
+of ``INDEXER_WORKERS`` processes and sent in ``_bulk`` requests of up to
+``INDEXER_BULK_SIZE`` actions over ``INDEXER_CONCURRENCY`` connections.
+Producers block while all connections are busy and the queue is full, and
+items rejected by the cluster (e.g. with ``429 Too Many Requests``) are
+retried with an exponential backoff.
+
+All records are indexed with:
+
+.. code-block:: console
+
+   $ python manage.py index reindex --verbose
+
+Incremental reindexing pages through the records by modification time.
+Databases whose records table existed before the indexer was installed
+need the supporting index, which is created with:
+
+.. code-block:: console
+
+   $ python manage.py index init-db
+
+The engine of the current process and its metrics are available through
+the proxy:
+
+.. code-block:: python
+
+   from invenio.indexer.proxies import current_indexer
+
+   current_indexer.engine.enqueue(record.id)
+   current_indexer.engine.metrics['docs_per_second']
+"""
+
+from __future__ import absolute_import, print_function
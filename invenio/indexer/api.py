@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexing engine."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import logging
+import multiprocessing
+import threading
+
+from .queue import DedupQueue
+
+logger = logging.getLogger(__name__)
+
+
+def default_serializer(record_id, data):
+    """Return the search document of a record."""
+    return data
+
+
+class BulkIndexer(object):
+    """Index records in bulk.
+
+    Record identifiers are queued in a :class:`~.queue.DedupQueue`.  A
+    consumer thread takes batches of ready identifiers, loads the records,
+    serializes them in a pool of worker processes and hands the bulk actions
+    to a :class:`~.bulk.BulkSender`.  A full sender blocks the consumer,
+    which in turn blocks the producers once the queue is full.
+    """
+
+    def __init__(self, sender, loader, serializer=None, queue=None,
+                 bulk_size=500, workers=0, index='records',
+                 doc_type='record'):
+        """Initialize the engine.
+
+        :param sender: :class:`~.bulk.BulkSender`.
+        :param loader: Function returning a dictionary of record data by
+            identifier for a list of identifiers.  Missing records are
+            deleted from the index.
+        :param serializer: Picklable function returning the search document
+            of a record identifier and record data.
+        :param queue: :class:`~.queue.DedupQueue`.
+        :param workers: Number of serialization processes (``0`` serializes
+            in the consumer thread).
+        """
+        self.sender = sender
+        self.loader = loader
+        self.serializer = serializer or default_serializer
+        self.queue = queue or DedupQueue()
+        self.bulk_size = bulk_size
+        self.workers = workers
+        self.index = index
+        self.doc_type = doc_type
+        self._pool = None
+        self._consumer = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the consumer (done implicitly when queuing)."""
+        with self._lock:
+            if self._consumer is not None:
+                return
+            if self.workers:
+                self._pool = multiprocessing.Pool(self.workers)
+            self._consumer = threading.Thread(
+                target=self._consume, name='bulk-indexer')
+            self._consumer.daemon = True
+            self._consumer.start()
+
+    def enqueue(self, record_id, op='index', delay=None):
+        """Queue a record for indexing (``op='index'``) or deletion."""
+        self.start()
+        self.queue.put(str(record_id), op=op, delay=delay)
+
+    def delete(self, record_id):
+        """Queue a record for deletion from the index."""
+        self.enqueue(record_id, op='delete')
+
+    def index_all(self, record_ids):
+        """Queue many records for immediate indexing (e.g. a reindex)."""
+        for record_id in record_ids:
+            self.enqueue(record_id, delay=0)
+
+    def flush(self):
+        """Wait until everything queued so far has been sent."""
+        if self._consumer is not None:
+            self.queue.join()
+        self.sender.flush()
+
+    def close(self):
+        """Process everything queued and stop the engine."""
+        self.queue.close()
+        if self._consumer is not None:
+            self._consumer.join()
+        self.sender.close()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+
+    @property
+    def metrics(self):
+        """Throughput and queue depth metrics."""
+        metrics = self.sender.metrics
+        return {
+            'docs_per_second': metrics.docs_per_second,
+            'queue_depth': len(self.queue),
+            'pending_bulks': self.sender.pending,
+            'coalesced': self.queue.coalesced,
+            'sent': metrics.sent,
+            'failed': metrics.failed,
+            'retries': metrics.retries,
+            'requests': metrics.requests,
+        }
+
+    def _consume(self):
+        while True:
+            batch = self.queue.get_batch(self.bulk_size)
+            if not batch:
+                return
+            try:
+                self.sender.submit(self.actions(batch))
+            except Exception:
+                logger.exception('Failed to index %d record(s).', len(batch))
+                self.sender.metrics.add(failed=len(batch))
+            finally:
+                self.queue.task_done(len(batch))
+
+    def actions(self, batch):
+        """Return the bulk actions of a batch of ``(id, op)`` pairs."""
+        records = self.loader([id_ for id_, op in batch if op == 'index'])
+        items = [(id_, records[id_]) for id_, op in batch if id_ in records]
+
+        encode = _EncodeDocument(self.serializer)
+        if self._pool is not None and len(items) > 1:
+            chunksize = max(1, len(items) // (4 * self.workers))
+            sources = self._pool.map(encode, items, chunksize)
+        else:
+            sources = [encode(item) for item in items]
+
+        meta = {'_index': self.index, '_type': self.doc_type}
+        actions = [({'index': dict(meta, _id=id_)}, source)
+                   for (id_, data), source in zip(items, sources)]
+        actions.extend(({'delete': dict(meta, _id=id_)}, None)
+                       for id_, op in batch if id_ not in records)
+        return actions
+
+
+class _EncodeDocument(object):
+    """Serialize and JSON encode documents in the worker processes."""
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+
+    def __call__(self, item):
+        record_id, data = item
+        return json.dumps(self.serializer(record_id, data))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Sender of ``_bulk`` requests over a bounded number of connections."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+try:
+    from queue import Queue
+except ImportError:  # pragma: no cover
+    from Queue import Queue
+
+try:
+    from urllib.error import URLError
+    from urllib.request import Request, urlopen
+except ImportError:  # pragma: no cover
+    from urllib2 import Request, URLError, urlopen
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+"""Item statuses which are retried."""
+
+
+class BulkMetrics(object):
+    """Counters of a :class:`BulkSender`."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.started = time.time()
+        self.requests = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counters):
+        """Increment counters."""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def docs_per_second(self):
+        """Successfully processed documents per second."""
+        elapsed = time.time() - self.started
+        return self.sent / elapsed if elapsed else 0.0
+
+
+class BulkSender(object):
+    """Send bulk actions with a fixed number of concurrent connections.
+
+    Every connection is served by a thread taking bulk bodies from a bounded
+    queue, so :meth:`submit` blocks as soon as all connections are busy and
+    ``max_pending`` bodies are waiting.  Items rejected with a retryable
+    status (see :data:`RETRY_STATUSES`), or whole requests failing on the
+    network, are sent again with an exponential backoff.
+    """
+
+    def __init__(self, url, concurrency=4, max_pending=None, max_retries=3,
+                 backoff=0.5, timeout=30):
+        """Initialize the sender and start its connection threads.
+
+        :param url: Base URL of the search cluster or index.
+        :param concurrency: Number of concurrent requests.
+        :param max_pending: Number of bodies waiting for a connection
+            (defaults to ``concurrency``).
+        :param max_retries: Number of times failed items are retried.
+        :param backoff: Seconds to wait before the first retry.
+        """
+        self.url = url.rstrip('/') + '/_bulk'
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.metrics = BulkMetrics()
+        self.errors = deque(maxlen=1000)
+        self._queue = Queue(maxsize=max_pending or concurrency)
+        self._threads = [
+            threading.Thread(target=self._run, name='bulk-sender-%d' % i)
+            for i in range(concurrency)
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    @property
+    def pending(self):
+        """Number of bodies waiting for a connection."""
+        return self._queue.qsize()
+
+    def submit(self, actions):
+        """Queue a list of ``(action, source)`` pairs for sending.
+
+        ``action`` is the action metadata (e.g. ``{'index': {'_id': 1}}``),
+        ``source`` the JSON encoded document or ``None`` for deletions.
+        """
+        if actions:
+            self._queue.put(actions)
+
+    def flush(self):
+        """Wait for all queued actions to be sent."""
+        self._queue.join()
+
+    def close(self):
+        """Wait for all queued actions to be sent and stop the threads."""
+        for dummy in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            actions = self._queue.get()
+            if actions is None:
+                self._queue.task_done()
+                return
+            try:
+                self._send(actions)
+            except Exception:
+                logger.exception('Bulk request failed.')
+                self.metrics.add(failed=len(actions))
+            finally:
+                self._queue.task_done()
+
+    def _send(self, actions, attempt=0):
+        """Send ``actions`` and retry the items which failed temporarily."""
+        lines = []
+        for action, source in actions:
+            lines.append(json.dumps(action))
+            if source is not None:
+                lines.append(source)
+        body = ('\n'.join(lines) + '\n').encode('utf-8')
+        self.metrics.add(requests=1, bytes=len(body))
+
+        try:
+            response = urlopen(Request(
+                self.url, data=body,
+                headers={'Content-Type': 'application/x-ndjson'}),
+                timeout=self.timeout)
+            items = json.loads(response.read().decode('utf-8'))['items']
+        except (URLError, IOError, ValueError, KeyError) as e:
+            status = getattr(e, 'code', None)
+            if status in RETRY_STATUSES or status is None:
+                self._retry(actions, attempt, e)
+            else:
+                self._fail(actions, e)
+            return
+
+        retry, failed = [], []
+        for pair, item in zip(actions, items):
+            op, result = next(iter(item.items()))
+            status = result.get('status', 200)
+            if status < 300 or (op == 'delete' and status == 404):
+                continue
+            if status in RETRY_STATUSES:
+                retry.append(pair)
+            else:
+                failed.append((pair, result.get('error')))
+        self.metrics.add(sent=len(actions) - len(retry) - len(failed))
+        for pair, error in failed:
+            self._fail([pair], error)
+        if retry:
+            self._retry(retry, attempt, 'rejected')
+
+    def _retry(self, actions, attempt, reason):
+        if attempt >= self.max_retries:
+            self._fail(actions, reason)
+            return
+        self.metrics.add(retries=len(actions))
+        time.sleep(self.backoff * 2 ** attempt)
+        self._send(actions, attempt + 1)
+
+    def _fail(self, actions, error):
+        self.metrics.add(failed=len(actions))
+        for action, source in actions:
+            self.errors.append((action, str(error)))
+        logger.warning('%d bulk action(s) failed: %s', len(actions), error)
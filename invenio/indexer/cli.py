@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexer command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_indexer
+
+
+def _print_metrics(metrics):
+    click.echo('{sent} sent, {failed} failed, {retries} retried in '
+               '{requests} request(s), {docs_per_second:.1f} docs/s'.format(
+                   **metrics))
+
+
+@click.group()
+def index():
+    """Search index commands."""
+
+
+@index.command()
+@click.option('--since-last', is_flag=True, default=False,
+              help='Only index records modified since the previous run.')
+@click.option('-b', '--bulk-size', type=int, default=None,
+              help='Number of actions per bulk request.')
+@click.option('-c', '--concurrency', type=int, default=None,
+              help='Number of concurrent bulk requests.')
+@click.option('-w', '--workers', type=int, default=None,
+              help='Number of serialization processes (0 to disable).')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print throughput after each checkpoint.')
+@with_appcontext
+def reindex(since_last, bulk_size, concurrency, workers, verbose):
+    """Index all records, or the ones modified since the previous run.
+
+    Progress is saved after every page of records, so an interrupted run is
+    resumed by running the command again with ``--since-last``.
+    """
+    engine = current_indexer.create_engine(
+        bulk_size=bulk_size, concurrency=concurrency, workers=workers)
+    sync = current_indexer.create_sync(engine)
+
+    def progress(stats):
+        if verbose:
+            click.echo('{indexed} indexed, {deleted} deleted, '
+                       '{docs_per_second:.1f} docs/s'.format(
+                           docs_per_second=engine.metrics['docs_per_second'],
+                           **stats), err=True)
+
+    try:
+        stats = sync.run(full=not since_last, callback=progress)
+    finally:
+        engine.close()
+
+    _print_metrics(engine.metrics)
+    for action, error in engine.sender.errors:
+        click.secho('{0}: {1}'.format(action, error), fg='red', err=True)
+    if stats['failed']:
+        click.secho('Stopped before the failed page; run again with '
+                    '--since-last to resume.', fg='red', err=True)
+        sys.exit(1)
+
+
+@index.command('init-db')
+@with_appcontext
+def init_db():
+    """Create the database index used by incremental reindexing.
+
+    Needed once for databases whose records table existed before the
+    indexer was installed.
+    """
+    from invenio_db import db
+    from sqlalchemy import inspect
+
+    from .models import updated_index
+
+    existing = set(ix['name'] for ix in inspect(db.engine).get_indexes(
+        updated_index.table.name))
+    if updated_index.name in existing:
+        click.echo('Index {0} already exists.'.format(updated_index.name))
+        return
+    click.echo('Creating index {0}...'.format(updated_index.name), err=True)
+    updated_index.create(bind=db.engine)
+    click.echo('Index {0} created.'.format(updated_index.name))
+
+
+@index.command()
+@click.argument('record_ids', nargs=-1, required=True)
+@with_appcontext
+def delete(record_ids):
+    """Delete records from the index."""
+    engine = current_indexer.create_engine()
+    for record_id in record_ids:
+        engine.enqueue(record_id, op='delete', delay=0)
+    engine.close()
+    _print_metrics(engine.metrics)
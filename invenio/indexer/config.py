@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexer configuration."""
+
+from __future__ import absolute_import, print_function
+
+INDEXER_URL = 'http://localhost:9200'
+"""URL of the search cluster."""
+
+INDEXER_INDEX = 'records'
+"""Index the records are indexed in."""
+
+INDEXER_DOC_TYPE = 'record'
+"""Document type of the indexed records."""
+
+INDEXER_SERIALIZER = 'invenio.indexer.api:default_serializer'
+"""Import path of the function building the document of a record."""
+
+INDEXER_BULK_SIZE = 500
+"""Maximum number of actions per bulk request."""
+
+INDEXER_CONCURRENCY = 4
+"""Number of concurrent bulk requests."""
+
+INDEXER_WORKERS = 0
+"""Number of document serialization processes (``0`` disables the pool)."""
+
+INDEXER_WINDOW = 2.0
+"""Seconds during which changes of the same record are coalesced."""
+
+INDEXER_QUEUE_MAXSIZE = 100000
+"""Number of queued records after which producers block."""
+
+INDEXER_MAX_RETRIES = 3
+"""Number of times temporarily rejected actions are retried."""
+
+INDEXER_RETRY_BACKOFF = 0.5
+"""Seconds before the first retry, doubled for every further retry."""
+
+INDEXER_REGISTER_SIGNALS = True
+"""Queue records for indexing when they are created or updated."""
+
+INDEXER_SYNC_PAGE_SIZE = 5000
+"""Number of records indexed between two checkpoints of a reindexing."""
+
+INDEXER_SYNC_OVERLAP = 60
+"""Seconds before the high-water mark an incremental reindexing starts."""
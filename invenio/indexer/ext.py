@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexer extension."""
+
+from __future__ import absolute_import, print_function
+
+import threading
+from datetime import timedelta
+
+from werkzeug.utils import import_string
+
+from . import config
+
+
+def load_records(app, record_ids):
+    """Return the JSON of records by identifier in one query.
+
+    Deleted records (without JSON) are left out, so they are removed from the
+    index.
+    """
+    from invenio_records.models import RecordMetadata
+
+    if not record_ids:
+        return {}
+    with app.app_context():
+        return dict(
+            (str(id_), json) for id_, json in RecordMetadata.query.filter(
+                RecordMetadata.id.in_(record_ids)).values(
+                    RecordMetadata.id, RecordMetadata.json)
+            if json is not None)
+
+
+class _IndexerState(object):
+    """Bulk indexer state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+        self._engine = None
+        self._lock = threading.Lock()
+
+    def create_engine(self, **kwargs):
+        """Create a :class:`~invenio.indexer.api.BulkIndexer` from config.
+
+        Keyword arguments which are not ``None`` override the configuration.
+        """
+        from .api import BulkIndexer
+        from .bulk import BulkSender
+        from .queue import DedupQueue
+
+        config = dict(
+            (k[len('INDEXER_'):].lower(), v)
+            for k, v in self.app.config.items() if k.startswith('INDEXER_'))
+        config.update((k, v) for k, v in kwargs.items() if v is not None)
+
+        return BulkIndexer(
+            BulkSender(
+                config['url'],
+                concurrency=config['concurrency'],
+                max_retries=config['max_retries'],
+                backoff=config['retry_backoff'],
+            ),
+            loader=lambda ids: load_records(self.app, ids),
+            serializer=import_string(config['serializer']),
+            queue=DedupQueue(window=config['window'],
+                             maxsize=config['queue_maxsize']),
+            bulk_size=config['bulk_size'],
+            workers=config['workers'],
+            index=config['index'],
+            doc_type=config['doc_type'],
+        )
+
+    def create_sync(self, engine=None, name=None):
+        """Create an :class:`~invenio.indexer.sync.IncrementalReindex`."""
+        from .sync import IncrementalReindex
+
+        return IncrementalReindex(
+            engine or self.create_engine(),
+            name=name or self.app.config['INDEXER_INDEX'],
+            page_size=self.app.config['INDEXER_SYNC_PAGE_SIZE'],
+            overlap=timedelta(
+                seconds=self.app.config['INDEXER_SYNC_OVERLAP']),
+        )
+
+    @property
+    def engine(self):
+        """Long running engine of the current process."""
+        with self._lock:
+            if self._engine is None:
+                self._engine = self.create_engine()
+            return self._engine
+
+
+class InvenioIndexer(object):
+    """Invenio bulk indexer extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        from . import receivers
+
+        self.init_config(app)
+        receivers.connect()
+        if app.config['INDEXER_REGISTER_SIGNALS']:
+            receivers.register_signals(app)
+        app.extensions['invenio-indexer'] = _IndexerState(app)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('INDEXER_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental reindexing database models."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy_utils.types import UUIDType
+
+
+class IndexerSyncState(db.Model):
+    """High-water mark of an incremental reindexing."""
+
+    __tablename__ = 'indexer_sync_state'
+
+    name = db.Column(db.String(255), primary_key=True)
+    """Name of the synchronized index."""
+
+    updated = db.Column(db.DateTime, nullable=True)
+    """Modification time of the last record indexed."""
+
+    synced = db.Column(db.DateTime, nullable=True)
+    """Time of the last checkpoint."""
+
+
+class IndexerTombstone(db.Model):
+    """Record deleted from the database but not yet from the index."""
+
+    __tablename__ = 'indexer_tombstone'
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'),
+                   primary_key=True, autoincrement=True)
+
+    record_id = db.Column(UUIDType, nullable=False)
+    """Identifier of the deleted record."""
+
+    created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    """Time of the deletion."""
+
+
+updated_index = db.Index('ix_records_metadata_updated_id',
+                         RecordMetadata.updated, RecordMetadata.id)
+"""Index serving the keyset pagination over modified records.
+
+Created with the records table by ``db.create_all()``; existing databases
+get it with ``index init-db``.
+"""
+
+
+__all__ = ('IndexerSyncState', 'IndexerTombstone')
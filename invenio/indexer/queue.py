@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bounded queue coalescing record operations within a time window."""
+
+from __future__ import absolute_import, print_function
+
+import heapq
+import itertools
+import threading
+import time
+
+try:
+    from queue import Full
+except ImportError:  # pragma: no cover
+    from Queue import Full
+
+
+class DedupQueue(object):
+    """Queue of ``(record id, operation)`` pairs.
+
+    An operation becomes ready ``window`` seconds after its record was first
+    queued.  Queuing a record again before that only replaces the operation,
+    so a record changed many times in a row is processed once.  Producers
+    block while the queue holds ``maxsize`` records.
+
+    Records are kept in a heap ordered by ready time, so taking a batch
+    only looks at the operations it returns.
+    """
+
+    def __init__(self, window=1.0, maxsize=100000):
+        """Initialize the queue.
+
+        :param window: Seconds operations on the same record are coalesced.
+        :param maxsize: Maximum number of queued records.
+        """
+        self.window = window
+        self.maxsize = maxsize
+        self.coalesced = 0
+        self.unfinished = 0
+        self.closed = False
+        self._items = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        """Return the number of queued records."""
+        return len(self._items)
+
+    def put(self, id_, op='index', delay=None, block=True, timeout=None):
+        """Queue an operation on a record.
+
+        :param delay: Seconds before the operation is ready (defaults to the
+            window).
+        :raises queue.Full: If the queue is full and ``block`` is false or
+            the ``timeout`` elapsed.
+        """
+        with self._cond:
+            if id_ in self._items:
+                self._items[id_] = (op, self._items[id_][1])
+                self.coalesced += 1
+                return
+            deadline = None if timeout is None else time.time() + timeout
+            while len(self._items) >= self.maxsize:
+                remaining = None if deadline is None else \
+                    deadline - time.time()
+                if not block or (remaining is not None and remaining <= 0):
+                    raise Full()
+                self._cond.wait(remaining)
+            ready = time.time() + (self.window if delay is None else delay)
+            self._items[id_] = (op, ready)
+            heapq.heappush(self._heap, (ready, next(self._counter), id_))
+            self.unfinished += 1
+            self._cond.notify_all()
+
+    def get_batch(self, size, timeout=None):
+        """Return up to ``size`` ready operations.
+
+        Blocks until at least one operation is ready, the ``timeout`` elapsed
+        or the queue is closed and empty.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                batch = []
+                while self._heap and len(batch) < size and (
+                        self.closed or self._heap[0][0] <= now):
+                    id_ = heapq.heappop(self._heap)[2]
+                    batch.append((id_, self._items.pop(id_)[0]))
+                if batch:
+                    self._cond.notify_all()
+                    return batch
+                if self.closed or (deadline is not None and now >= deadline):
+                    return []
+                next_ready = self._heap[0][0] if self._heap else None
+                wait = [t - now for t in (next_ready, deadline) if t]
+                self._cond.wait(min(wait) if wait else None)
+
+    def task_done(self, count=1):
+        """Mark ``count`` operations returned by :meth:`get_batch` as done."""
+        with self._cond:
+            self.unfinished -= count
+            self._cond.notify_all()
+
+    def join(self):
+        """Block until all queued operations are marked as done."""
+        with self._cond:
+            while self.unfinished > 0:
+                self._cond.wait()
+
+    def close(self):
+        """Make all queued operations ready and stop waiting consumers."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
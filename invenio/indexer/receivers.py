@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers queuing changed records for indexing.
+
+Records created or updated in a transaction are collected in the database
+session and sent in chunked tasks once the transaction is committed, so a
+worker never reads a record before its changes are visible.  Records
+deleted through the ORM leave a tombstone in the same transaction, which
+the next incremental reindexing removes from the index.
+"""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app, has_app_context
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from invenio_records.signals import after_record_insert, after_record_update
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models import IndexerTombstone
+
+_INFO_KEY = 'invenio-indexer'
+
+
+def queue_record(sender, record=None, **kwargs):
+    """Queue a created or updated record for indexing after the commit."""
+    db.session.info.setdefault(_INFO_KEY, set()).add(str(record.id))
+
+
+def register_signals(app):
+    """Connect the receivers to the record signals of ``app``."""
+    after_record_insert.connect(queue_record, sender=app, weak=False)
+    after_record_update.connect(queue_record, sender=app, weak=False)
+
+
+def record_deletions(session, flush_context, instances):
+    """Add a tombstone for every record deleted by the flush."""
+    for obj in list(session.deleted):
+        if isinstance(obj, RecordMetadata):
+            session.add(IndexerTombstone(record_id=obj.id))
+
+
+def send_records(session):
+    """Send the records queued in the committed transaction."""
+    record_ids = session.info.pop(_INFO_KEY, None)
+    if not record_ids or not has_app_context():
+        return
+
+    from .tasks import index_records
+
+    record_ids = sorted(record_ids)
+    size = current_app.config['INDEXER_BULK_SIZE']
+    for i in range(0, len(record_ids), size):
+        index_records.delay(record_ids[i:i + size])
+
+
+def discard_records(session):
+    """Forget the records queued in a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners = (
+    ('before_flush', record_deletions),
+    ('after_commit', send_records),
+    ('after_rollback', discard_records),
+)
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    for name, func in _listeners:
+        if not event.contains(Session, name, func):
+            event.listen(Session, name, func)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    for name, func in _listeners:
+        if event.contains(Session, name, func):
+            event.remove(Session, name, func)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental reindexing of the records modified since the last run.
+
+The records table is walked in ``(updated, id)`` order one page at a time,
+so the identifiers are never all held in memory.  After every page the
+engine is flushed and the modification time of the last record is stored
+as the high-water mark of the run in :class:`~.models.IndexerSyncState`.
+An interrupted run thus resumes from its last page.
+
+Every run starts ``overlap`` before the high-water mark, so records written
+by transactions which committed late, or on hosts with a skewed clock, are
+picked up again.  Reindexing a record twice is harmless.
+
+Records deleted with the ORM leave a :class:`~.models.IndexerTombstone`
+(see :mod:`.receivers`) which is removed from the index and then dropped.
+Records deleted with bulk statements must be removed from the index
+explicitly.
+"""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime, timedelta
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy import and_, or_
+
+from .models import IndexerSyncState, IndexerTombstone
+
+
+class IncrementalReindex(object):
+    """Reindex the records modified since the previous run."""
+
+    def __init__(self, engine, name='records', page_size=5000,
+                 overlap=timedelta(seconds=60)):
+        """Initialize the reindexing.
+
+        :param engine: :class:`~.api.BulkIndexer`.
+        :param name: Name of the high-water mark.
+        :param page_size: Number of records indexed between checkpoints.
+        :param overlap: Time before the high-water mark to start from.
+        """
+        self.engine = engine
+        self.name = name
+        self.page_size = page_size
+        self.overlap = overlap
+        self.stats = dict(indexed=0, deleted=0, pages=0, failed=0)
+
+    @property
+    def state(self):
+        """Persisted state of the reindexing."""
+        state = IndexerSyncState.query.get(self.name)
+        if state is None:
+            state = IndexerSyncState(name=self.name)
+            db.session.add(state)
+        return state
+
+    def run(self, full=False, callback=None):
+        """Reindex the modified records and remove the deleted ones.
+
+        :param full: Reindex all records regardless of the high-water mark.
+        :param callback: Function called with the statistics after every
+            page.
+        :returns: Statistics with the number of ``indexed`` and ``deleted``
+            records, of ``pages`` and of ``failed`` actions.  The run stops
+            at the first page with failed actions, leaving the high-water
+            mark before it.
+        """
+        until = datetime.utcnow()
+        since = None if full else self.state.updated
+        if since is not None:
+            since -= self.overlap
+        db.session.commit()
+
+        if not self._deletions(callback):
+            return self.stats
+        for page in self.pages(since, until):
+            for record_id, updated, deleted in page:
+                self.engine.enqueue(
+                    record_id, op='delete' if deleted else 'index', delay=0)
+                self.stats['deleted' if deleted else 'indexed'] += 1
+            if not self._checkpoint(callback, updated=page[-1][1]):
+                break
+        return self.stats
+
+    def pages(self, since=None, until=None):
+        """Yield pages of ``(id, updated, deleted)`` ordered by time."""
+        model = RecordMetadata
+        query = db.session.query(
+            model.id, model.updated, model.json.is_(None)).order_by(
+                model.updated, model.id)
+        if since is not None:
+            query = query.filter(model.updated >= since)
+        if until is not None:
+            query = query.filter(model.updated <= until)
+
+        page = query.limit(self.page_size).all()
+        while page:
+            yield page
+            updated, record_id = page[-1][1], page[-1][0]
+            page = query.filter(or_(
+                model.updated > updated,
+                and_(model.updated == updated, model.id > record_id),
+            )).limit(self.page_size).all()
+
+    def _deletions(self, callback):
+        """Remove the records of the tombstones from the index."""
+        query = db.session.query(
+            IndexerTombstone.id, IndexerTombstone.record_id).order_by(
+                IndexerTombstone.id).limit(self.page_size)
+        while True:
+            page = query.all()
+            if not page:
+                return True
+            for dummy, record_id in page:
+                self.engine.enqueue(record_id, op='delete', delay=0)
+            self.stats['deleted'] += len(page)
+            if not self._checkpoint(callback, tombstone=page[-1][0]):
+                return False
+
+    def _checkpoint(self, callback, updated=None, tombstone=None):
+        """Wait for the queued actions and persist the progress."""
+        failed = self.engine.sender.metrics.failed
+        self.engine.flush()
+        self.stats['pages'] += 1
+        self.stats['failed'] += self.engine.sender.metrics.failed - failed
+        if self.stats['failed']:
+            db.session.rollback()
+        else:
+            if tombstone is not None:
+                IndexerTombstone.query.filter(
+                    IndexerTombstone.id <= tombstone).delete(
+                        synchronize_session=False)
+            state = self.state
+            if updated is not None:
+                state.updated = updated
+            state.synced = datetime.utcnow()
+            db.session.commit()
+        if callback:
+            callback(self.stats)
+        return not self.stats['failed']
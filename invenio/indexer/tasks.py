@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexer tasks."""
+
+from __future__ import absolute_import, print_function
+
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+
+from .proxies import current_indexer
+
+_engines = set()
+"""Engines started by tasks of the current worker process."""
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def index_records(record_ids, op='index'):
+    """Index or delete records in bulk.
+
+    The task is acknowledged once the bulk requests were sent, so records
+    of a worker dying in between are indexed by the redelivered task.
+    """
+    engine = current_indexer.engine
+    _engines.add(engine)
+    for record_id in record_ids:
+        engine.enqueue(record_id, op=op, delay=0)
+    engine.flush()
+
+
+@worker_process_shutdown.connect
+def close_engines(**kwargs):
+    """Send what is still queued before the worker process exits."""
+    while _engines:
+        _engines.pop().close()
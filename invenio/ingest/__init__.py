@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming bulk ingestion of records.
+
+Records are read from JSON lines, JSON array or MARCXML dumps, converted and
+validated in a pool of worker processes and written together with their
+persistent identifiers in batches, with one commit per batch:
+
+.. code-block:: console
+
+   $ cat records.jsonl | python manage.py ingest load -b 5000 -v
+   $ python manage.py ingest load dump-1.json dump-2.json
+   $ python manage.py ingest load -f marcxml harvest.xml
+
+The same pipeline is available from Python:
+
+.. code-block:: python
+
+   from invenio.ingest.proxies import current_ingest
+
+   stats = current_ingest.loader(batch_size=5000).load(records)
+   for line in stats.summary():
+       print(line)
+"""
+
+from __future__ import absolute_import, print_function
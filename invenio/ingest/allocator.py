@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Block-reserving allocator of record identifiers.
+
+Instead of taking one value of the record identifier sequence per record,
+an allocator reserves a whole range of identifiers in one short transaction
+and hands them out from memory.  Concurrent ingestion processes therefore
+only meet on the counter row once per block.
+
+Every reservation is stored in
+:class:`~invenio.ingest.models.RecidReservation` and shrinks in the same
+transaction that registers the identifiers taken from it.  Hence a crash
+never loses or duplicates identifiers: the unused part of the range of a
+dead allocator stays reserved until :func:`recover_reservations` releases
+it, after which the next allocator claims it before reserving new ranges.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import socket
+import uuid
+from datetime import datetime
+
+from invenio_db import db
+from invenio_pidstore.models import RecordIdentifier
+from sqlalchemy import and_, bindparam, func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from .models import RecidCounter, RecidReservation
+
+
+def default_owner():
+    """Return a unique name of the allocator in the current process."""
+    return '{0}:{1}:{2}'.format(
+        socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8])
+
+
+class _Block(object):
+    """Reserved range currently used by an allocator."""
+
+    __slots__ = ('id', 'start', 'cursor', 'end')
+
+    def __init__(self, id_, start, end):
+        self.id = id_
+        self.start = start
+        self.cursor = start
+        self.end = end
+
+
+class RecidAllocator(object):
+    """Hand out record identifiers from ranges reserved in blocks.
+
+    Identifiers returned by :meth:`take` must be registered in the current
+    database session, followed by :meth:`flush`, the commit of the session
+    and :meth:`commit`.  If the transaction fails, :meth:`rollback` makes
+    the identifiers available again.
+    """
+
+    def __init__(self, pid_type='recid', block_size=1000, owner=None):
+        """Initialize the allocator.
+
+        :param pid_type: Persistent identifier type.
+        :param block_size: Number of identifiers reserved at once.
+        :param owner: Name of the allocator (see :func:`default_owner`).
+        """
+        self.pid_type = pid_type
+        self.block_size = block_size
+        self.owner = owner or default_owner()
+        self._blocks = []
+
+    def take(self, count):
+        """Return a list of ``count`` unused identifiers."""
+        values = []
+        while len(values) < count:
+            block = next((b for b in self._blocks if b.cursor < b.end), None)
+            if block is None:
+                block = self._acquire()
+                self._blocks.append(block)
+            size = min(count - len(values), block.end - block.cursor)
+            values.extend(range(block.cursor, block.cursor + size))
+            block.cursor += size
+        return values
+
+    def flush(self, session=None):
+        """Shrink the reservations by the identifiers taken so far.
+
+        Must be executed in the transaction registering the identifiers.
+        """
+        session = session or db.session
+        table = RecidReservation.__table__
+        dirty = [b for b in self._blocks if b.cursor != b.start]
+
+        used = [b.id for b in dirty if b.cursor >= b.end]
+        if used:
+            session.execute(table.delete().where(table.c.id.in_(used)))
+
+        moved = [dict(_id=b.id, _start=b.cursor, _updated=datetime.utcnow())
+                 for b in dirty if b.cursor < b.end]
+        if moved:
+            session.execute(
+                table.update().where(table.c.id == bindparam('_id')).values(
+                    start=bindparam('_start'), updated=bindparam('_updated')),
+                moved)
+
+    def commit(self):
+        """Mark the flushed identifiers as registered."""
+        for block in self._blocks:
+            block.start = block.cursor
+        self._blocks = [b for b in self._blocks if b.cursor < b.end]
+
+    def rollback(self):
+        """Make identifiers taken since the last commit available again."""
+        for block in self._blocks:
+            block.cursor = block.start
+
+    def release(self):
+        """Give up the remaining reservations so others can claim them."""
+        self.rollback()
+        table = RecidReservation.__table__
+        with db.engine.begin() as conn:
+            conn.execute(table.update().where(
+                table.c.owner == self.owner).values(owner=None))
+        self._blocks = []
+
+    def _acquire(self):
+        """Claim an orphaned reservation or reserve a new range."""
+        while True:
+            try:
+                with db.engine.begin() as conn:
+                    block = self._claim(conn) or self._reserve(conn)
+            except IntegrityError:
+                # Concurrent creation of the counter row, try again.
+                continue
+            if block is not None:
+                return block
+
+    def _claim(self, conn):
+        """Take over a released reservation."""
+        table = RecidReservation.__table__
+        orphaned = and_(table.c.pid_type == self.pid_type,
+                        table.c.owner.is_(None))
+        rows = conn.execute(
+            select([table.c.id, table.c.start, table.c.end]).where(
+                orphaned).order_by(table.c.start).limit(10)).fetchall()
+        for row in rows:
+            result = conn.execute(
+                table.update().where(and_(orphaned, table.c.id == row.id))
+                .values(owner=self.owner, updated=datetime.utcnow()))
+            if result.rowcount == 1:
+                return _Block(row.id, row.start, row.end)
+        return None
+
+    def _reserve(self, conn):
+        """Reserve a new range past the counter and the sequence.
+
+        The counter is moved with a compare-and-set update, so concurrent
+        allocators can never reserve overlapping ranges.  Returns ``None``
+        if another allocator moved the counter in the meantime.
+        """
+        counter = RecidCounter.__table__
+        table = RecidReservation.__table__
+        recids = RecordIdentifier.__table__
+
+        _lock_identifiers(conn)
+        value = conn.execute(select([counter.c.value]).where(
+            counter.c.pid_type == self.pid_type)).scalar()
+        highest = conn.execute(select([func.max(recids.c.recid)])).scalar()
+        start = max(value or 0, highest or 0) + 1
+        end = start + self.block_size
+
+        if value is None:
+            conn.execute(counter.insert().values(
+                pid_type=self.pid_type, value=end - 1))
+        else:
+            result = conn.execute(counter.update().where(and_(
+                counter.c.pid_type == self.pid_type,
+                counter.c.value == value)).values(value=end - 1))
+            if result.rowcount != 1:
+                return None
+
+        id_ = conn.execute(table.insert().values(
+            pid_type=self.pid_type, start=start, end=end, owner=self.owner,
+            updated=datetime.utcnow())).inserted_primary_key[0]
+        _advance_sequence(conn, end - 1)
+        return _Block(id_, start, end)
+
+
+def _lock_identifiers(conn):
+    """Block registration of record identifiers until the transaction ends.
+
+    On PostgreSQL the table lock conflicts with the lock taken by any
+    ``INSERT`` into the identifier table, including the one of
+    :meth:`~invenio_pidstore.models.RecordIdentifier.next` before it draws
+    from the sequence.  Hence the highest registered identifier can not
+    change between reading it and moving the sequence, and the sequence is
+    never set below a value it already handed out.  Other databases
+    serialize the writes of the reservation transaction anyway.
+    """
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('LOCK TABLE {0} IN SHARE ROW EXCLUSIVE MODE'.format(
+            RecordIdentifier.__table__.name)))
+
+
+def _advance_sequence(conn, value):
+    """Move the record identifier sequence past ``value``.
+
+    Keeps :meth:`~invenio_pidstore.models.RecordIdentifier.next` from
+    handing out identifiers of reserved ranges.  Must be called after
+    :func:`_lock_identifiers` in the same transaction.
+    """
+    recids = RecordIdentifier.__table__
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence(:table, 'recid'), :value)"
+        ), table=recids.name, value=value)
+    else:
+        conn.execute(recids.insert().values(recid=value))
+
+
+def recover_reservations(pid_type='recid', owner=None, older_than=None):
+    """Release reservations of crashed allocators.
+
+    :param owner: Release the reservations of this allocator.
+    :param older_than: Release reservations not used for this
+        :class:`~datetime.timedelta`.  Running allocators update their
+        reservations after every committed batch, hence it must be longer
+        than the slowest batch.
+    :returns: Number of released identifiers.
+    """
+    table = RecidReservation.__table__
+    condition = and_(table.c.pid_type == pid_type,
+                     table.c.owner.isnot(None))
+    if owner is not None:
+        condition = and_(condition, table.c.owner == owner)
+    if older_than is not None:
+        condition = and_(
+            condition, table.c.updated < datetime.utcnow() - older_than)
+
+    with db.engine.begin() as conn:
+        released = conn.execute(select(
+            [func.sum(table.c.end - table.c.start)]).where(condition)).scalar()
+        conn.execute(table.update().where(condition).values(owner=None))
+    return released or 0
+
+
+__all__ = ('RecidAllocator', 'default_owner', 'recover_reservations')
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion API."""
+
+from __future__ import absolute_import, print_function
+
+import multiprocessing
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from .readers import batched
+
+
+def validate_record(data):
+    """Validate a record and return an error message or ``None``.
+
+    Records referencing a JSON schema in ``$schema`` are validated against it.
+    The function is executed in the validation worker processes, hence it
+    must not rely on the application context.
+    """
+    if not isinstance(data, dict):
+        return 'Record must be a JSON object.'
+    schema = data.get('$schema')
+    if schema is None:
+        return None
+
+    from jsonschema import ValidationError
+
+    from ..validation.api import default_cache
+
+    try:
+        default_cache.validate(data, schema)
+    except ValidationError as e:
+        return e.message
+    return None
+
+
+def _validate_chunk(validator, chunk, converter=None):
+    """Convert and validate ``(index, record)`` pairs in a worker process."""
+    results = []
+    for index, data in chunk:
+        try:
+            if converter is not None:
+                data = converter(data)
+            error = validator(data)
+        except Exception as e:
+            error = '{0}: {1}'.format(type(e).__name__, e)
+        results.append((index, data, error))
+    return results
+
+
+class IngestStats(object):
+    """Per-stage record counters and timers of a bulk load."""
+
+    STAGES = ('validate', 'insert', 'mint', 'commit')
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.started = time.time()
+        self.counts = defaultdict(int)
+        self.timings = defaultdict(float)
+        self.batches = 0
+        self.errors = []
+
+    @contextmanager
+    def timer(self, stage, count=0):
+        """Measure time spent in ``stage`` while processing ``count`` items."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.timings[stage] += time.time() - start
+            self.counts[stage] += count
+
+    @property
+    def loaded(self):
+        """Number of committed records."""
+        return self.counts['commit']
+
+    @property
+    def elapsed(self):
+        """Wall clock time since the load started."""
+        return time.time() - self.started
+
+    def rate(self, stage=None):
+        """Return records per second of ``stage`` (or of the whole load)."""
+        if stage is None:
+            count, elapsed = self.loaded, self.elapsed
+        else:
+            count, elapsed = self.counts[stage], self.timings[stage]
+        return count / elapsed if elapsed else 0.0
+
+    def summary(self):
+        """Return a list of human readable summary lines."""
+        lines = ['{0:<10} {1:>10} {2:>10.2f}s {3:>12.1f}/s'.format(
+            stage, self.counts[stage], self.timings[stage], self.rate(stage))
+            for stage in self.STAGES]
+        lines.append('{0:<10} {1:>10} {2:>10.2f}s {3:>12.1f}/s'.format(
+            'total', self.loaded, self.elapsed, self.rate()))
+        if self.errors:
+            lines.append('{0} invalid record(s) skipped.'.format(
+                len(self.errors)))
+        return lines
+
+
+class BulkLoader(object):
+    """Load records and mint their persistent identifiers in batches.
+
+    Records are converted (if a ``converter`` is given) and validated in a
+    pool of worker processes while the loading process writes the already
+    validated ones.  Each batch is written with
+    one multi-row ``INSERT`` for the records and one for the persistent
+    identifiers, followed by a single commit.
+
+    .. note::
+
+       Records are written through the tables of
+       :class:`invenio_records.models.RecordMetadata` and
+       :class:`invenio_pidstore.models.PersistentIdentifier`, hence the
+       record signals are *not* sent for bulk loaded records.  Indexes
+       maintained in the same transaction listen to
+       :data:`~invenio.ingest.signals.records_loaded` instead.
+    """
+
+    chunk_size = 100
+    """Number of records sent to a validation worker at once."""
+
+    def __init__(self, batch_size=1000, workers=None, validator=None,
+                 pid_type='recid', pid_provider='recid', object_type='rec',
+                 allocator=None, converter=None):
+        """Initialize the loader.
+
+        :param batch_size: Number of records per transaction.
+        :param workers: Number of validation processes. ``None`` uses all
+            CPUs, ``0`` validates in the current process.
+        :param validator: Function returning an error message for invalid
+            records (see :func:`validate_record`).  It must be picklable.
+        :param allocator: :class:`~invenio.ingest.allocator.RecidAllocator`
+            for records without ``recid``.  If not given, one is created
+            on the first record without identifier.
+        :param converter: Function turning the input items into record
+            dictionaries (e.g.
+            :func:`~invenio.ingest.marcxml.marc21_to_json`).  It must be
+            picklable.
+        """
+        self.batch_size = batch_size
+        self.workers = multiprocessing.cpu_count() if workers is None \
+            else workers
+        self.validator = validator or validate_record
+        self.pid_type = pid_type
+        self.pid_provider = pid_provider
+        self.object_type = object_type
+        self.allocator = allocator
+        self.converter = converter
+
+    def load(self, records, callback=None):
+        """Validate and write ``records``.
+
+        :param records: Iterable of record dictionaries, or of input items
+            of the ``converter``.
+        :param callback: Function called with the :class:`IngestStats` after
+            each committed batch.
+        :returns: The :class:`IngestStats` of the load.
+        """
+        stats = IngestStats()
+        pool = multiprocessing.Pool(self.workers) if self.workers else None
+        try:
+            valid = self._collect(self._validate(records, pool), stats)
+            for batch in batched(valid, self.batch_size):
+                self.write(batch, stats)
+                if callback:
+                    callback(stats)
+        except BaseException:
+            if pool is not None:
+                pool.terminate()
+            raise
+        else:
+            if pool is not None:
+                pool.close()
+        finally:
+            if pool is not None:
+                pool.join()
+            if self.allocator is not None:
+                self.allocator.release()
+        return stats
+
+    def _validate(self, records, pool):
+        """Yield ``(index, record, error)`` triples in input order.
+
+        At most two chunks per worker are in flight, so that the input is
+        never read faster than it can be validated and written.
+        """
+        chunks = batched(enumerate(records), self.chunk_size)
+        if pool is None:
+            for chunk in chunks:
+                for result in _validate_chunk(
+                        self.validator, chunk, self.converter):
+                    yield result
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(
+                _validate_chunk, (self.validator, chunk, self.converter)))
+            if len(pending) >= 2 * self.workers:
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+
+    def _collect(self, results, stats):
+        """Yield valid records, recording time spent waiting for workers."""
+        results = iter(results)
+        while True:
+            with stats.timer('validate', 1):
+                try:
+                    index, data, error = next(results)
+                except StopIteration:
+                    stats.counts['validate'] -= 1
+                    return
+            if error is None:
+                yield data
+            else:
+                stats.errors.append((index, error))
+
+    def write(self, batch, stats):
+        """Insert a batch of records, mint their identifiers and commit."""
+        from invenio_db import db
+        from invenio_pidstore.models import PersistentIdentifier, PIDStatus, \
+            RecordIdentifier
+        from invenio_records.models import RecordMetadata
+
+        from .signals import records_loaded
+
+        now = datetime.utcnow()
+        try:
+            with stats.timer('mint', len(batch)):
+                explicit = [data['recid'] for data in batch
+                            if data.get('recid') is not None]
+                recids = self.recids(batch)
+
+            with stats.timer('insert', len(batch)):
+                uuids = [uuid.uuid4() for dummy in batch]
+                db.session.execute(RecordMetadata.__table__.insert(), [
+                    dict(id=id_, json=data, version_id=1, created=now,
+                         updated=now)
+                    for id_, data in zip(uuids, batch)
+                ])
+
+            with stats.timer('mint'):
+                # Explicit identifiers are registered like ``recid_minter``
+                # does, so that allocators never hand them out.
+                if explicit:
+                    db.session.execute(RecordIdentifier.__table__.insert(), [
+                        dict(recid=recid) for recid in explicit
+                    ])
+                db.session.execute(PersistentIdentifier.__table__.insert(), [
+                    dict(pid_type=self.pid_type, pid_value=str(recid),
+                         pid_provider=self.pid_provider,
+                         status=PIDStatus.REGISTERED,
+                         object_type=self.object_type, object_uuid=id_,
+                         created=now, updated=now)
+                    for id_, recid in zip(uuids, recids)
+                ])
+
+            records_loaded.send(self, records=list(zip(uuids, batch)))
+
+            with stats.timer('commit', len(batch)):
+                if self.allocator is not None:
+                    self.allocator.flush()
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if self.allocator is not None:
+                self.allocator.rollback()
+            raise
+        if self.allocator is not None:
+            self.allocator.commit()
+        stats.batches += 1
+
+    def recids(self, batch):
+        """Return the record identifiers of ``batch``.
+
+        Records without a ``recid`` get a new identifier, which is stored in
+        the record.
+        """
+        missing = [data for data in batch if data.get('recid') is None]
+        if missing:
+            if self.allocator is None:
+                from .allocator import RecidAllocator
+                self.allocator = RecidAllocator(pid_type=self.pid_type)
+            values = self.allocator.take(len(missing))
+            for data, value in zip(missing, values):
+                data['recid'] = value
+        return [data['recid'] for data in batch]
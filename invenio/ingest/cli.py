@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import codecs
+import itertools
+import sys
+from datetime import timedelta
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+from .marcxml import iter_marcxml
+from .proxies import current_ingest
+from .readers import iter_json
+
+
+@click.group()
+def ingest():
+    """Bulk record ingestion commands."""
+
+
+@ingest.command()
+@click.argument('sources', nargs=-1, type=click.File('rb'))
+@click.option('-f', '--format', 'format_', default='json',
+              type=click.Choice(['json', 'marcxml']),
+              help='Format of the sources.')
+@click.option('-b', '--batch-size', type=int, default=None,
+              help='Number of records committed per transaction.')
+@click.option('-w', '--workers', type=int, default=None,
+              help='Number of validation processes (0 to disable).')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print throughput after each batch.')
+@with_appcontext
+def load(sources, format_, batch_size, workers, verbose):
+    """Load records from JSON lines, JSON array or MARCXML files.
+
+    Records are read from standard input if no SOURCES are given.  MARCXML
+    records are converted to JSON in the validation processes.
+    """
+    sources = sources or (click.get_binary_stream('stdin'), )
+    if format_ == 'marcxml':
+        records = itertools.chain.from_iterable(
+            iter_marcxml(fp) for fp in sources)
+        converter = current_ingest.marcxml_converter
+    else:
+        records = itertools.chain.from_iterable(
+            iter_json(codecs.getreader('utf-8')(fp)) for fp in sources)
+        converter = None
+    loader = current_ingest.loader(
+        batch_size=batch_size, workers=workers, converter=converter)
+
+    def progress(stats):
+        if verbose:
+            click.echo('batch {0}: {1} records, {2:.1f} records/s'.format(
+                stats.batches, stats.loaded, stats.rate()), err=True)
+
+    stats = loader.load(records, callback=progress)
+
+    for index, error in stats.errors:
+        click.secho('Record #{0}: {1}'.format(index, error), fg='red',
+                    err=True)
+    for line in stats.summary():
+        click.echo(line)
+    if stats.errors:
+        sys.exit(1)
+
+
+@ingest.command()
+@click.option('--owner', default=None,
+              help='Release the reservations of this ingestion process.')
+@click.option('--older-than', type=int, default=None,
+              help='Release reservations unused for this many seconds.')
+@with_appcontext
+def recover(owner, older_than):
+    """Release record identifiers reserved by crashed ingestion processes.
+
+    Released identifiers are handed out by the next ingestion process before
+    any new range is reserved.
+    """
+    from .allocator import recover_reservations
+
+    if owner is None and older_than is None:
+        older_than = current_app.config['INGEST_RECID_RECOVER_AFTER']
+    min_age = current_app.config['INGEST_RECID_RECOVER_MIN_AGE']
+    if older_than is not None and older_than < min_age:
+        raise click.BadParameter(
+            'must be at least {0} seconds, younger reservations may belong '
+            'to running ingestion processes.'.format(min_age),
+            param_hint='--older-than')
+    released = recover_reservations(
+        pid_type=current_app.config['INGEST_PID_TYPE'], owner=owner,
+        older_than=timedelta(seconds=older_than) if older_than else None)
+    click.echo('{0} reserved identifier(s) released.'.format(released))
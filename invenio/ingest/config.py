@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion configuration."""
+
+from __future__ import absolute_import, print_function
+
+INGEST_BATCH_SIZE = 1000
+"""Number of records inserted and committed in one transaction."""
+
+INGEST_WORKERS = None
+"""Number of validation processes (``None`` uses all CPUs, ``0`` disables
+the process pool and validates records in the loading process)."""
+
+INGEST_VALIDATOR = 'invenio.ingest.api:validate_record'
+"""Import path of the function used to validate a single record."""
+
+INGEST_MARCXML_CONVERTER = 'invenio.ingest.marcxml:marc21_to_json'
+"""Import path of the function converting MARCXML records to JSON (see
+:func:`invenio.ingest.marcxml.iter_marcxml` for its input)."""
+
+INGEST_PID_TYPE = 'recid'
+"""Persistent identifier type minted for ingested records."""
+
+INGEST_PID_PROVIDER = 'recid'
+"""Persistent identifier provider stored with the minted identifiers."""
+
+INGEST_OBJECT_TYPE = 'rec'
+"""Object type the minted identifiers are assigned to."""
+
+INGEST_RECID_BLOCK_SIZE = 1000
+"""Number of record identifiers reserved by an ingestion process at once."""
+
+INGEST_RECID_RECOVER_AFTER = 3600
+"""Seconds of inactivity after which ``ingest recover`` considers the
+reservations of an ingestion process abandoned."""
+
+INGEST_RECID_RECOVER_MIN_AGE = 300
+"""Smallest ``--older-than`` accepted by ``ingest recover``.  Reservations
+of running ingestion processes are only updated once per batch, so this must
+exceed the time needed to load the longest batch."""
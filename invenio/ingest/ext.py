@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property, import_string
+
+from . import config
+
+
+class _IngestState(object):
+    """Bulk ingestion state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def validator(self):
+        """Record validation function."""
+        return import_string(self.app.config['INGEST_VALIDATOR'])
+
+    @cached_property
+    def marcxml_converter(self):
+        """MARCXML to JSON record conversion function."""
+        return import_string(self.app.config['INGEST_MARCXML_CONVERTER'])
+
+    def loader(self, **kwargs):
+        """Create a :class:`~invenio.ingest.api.BulkLoader` from config.
+
+        Keyword arguments which are not ``None`` override the configuration.
+        """
+        from .allocator import RecidAllocator
+        from .api import BulkLoader
+
+        options = dict(
+            batch_size=self.app.config['INGEST_BATCH_SIZE'],
+            workers=self.app.config['INGEST_WORKERS'],
+            validator=self.validator,
+            pid_type=self.app.config['INGEST_PID_TYPE'],
+            pid_provider=self.app.config['INGEST_PID_PROVIDER'],
+            object_type=self.app.config['INGEST_OBJECT_TYPE'],
+        )
+        options.update((k, v) for k, v in kwargs.items() if v is not None)
+        if options.get('allocator') is None:
+            options['allocator'] = RecidAllocator(
+                pid_type=options['pid_type'],
+                block_size=self.app.config['INGEST_RECID_BLOCK_SIZE'],
+            )
+        return BulkLoader(**options)
+
+
+class InvenioIngest(object):
+    """Invenio bulk ingestion extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-ingest'] = _IngestState(app)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('INGEST_'):
+                app.config.setdefault(k, getattr(config, k))
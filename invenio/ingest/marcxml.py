@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming reader of MARCXML dumps.
+
+:func:`iter_marcxml` parses one ``<record>`` element at a time and drops it
+as soon as it has been read, so that dumps of any size are read with
+constant memory.  Records are yielded as plain tuples, which are cheap to
+send to the worker processes of :class:`~invenio.ingest.api.BulkLoader`,
+where :func:`marc21_to_json` (or the function configured in
+``INGEST_MARCXML_CONVERTER``) turns them into JSON records.
+"""
+
+from __future__ import absolute_import, print_function
+
+try:
+    from xml.etree.cElementTree import iterparse
+except ImportError:  # pragma: no cover
+    from xml.etree.ElementTree import iterparse
+
+
+def _localname(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_marcxml(fp):
+    """Yield the records of a MARCXML stream.
+
+    Every record is a ``(leader, controlfields, datafields)`` tuple, where
+    ``controlfields`` is a list of ``(tag, value)`` pairs and ``datafields``
+    a list of ``(tag, ind1, ind2, subfields)`` tuples with ``subfields`` a
+    list of ``(code, value)`` pairs.  Both the MARC 21 slim namespace and
+    unqualified element names are accepted.
+
+    :param fp: File-like object opened in binary mode, or a file name.
+    :raises SyntaxError: If the stream is not well-formed XML (a
+        ``ParseError``).
+    """
+    root = None
+    for event, elem in iterparse(fp, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end' or _localname(elem.tag) != 'record':
+            continue
+
+        yield read_record(elem)
+
+        # Drop the record and every element parsed before it.
+        elem.clear()
+        if root is not elem:
+            root.clear()
+
+
+def read_record(elem):
+    """Return the tuple of a parsed MARCXML ``<record>`` element.
+
+    See :func:`iter_marcxml` for the structure of the tuple.
+    """
+    leader = None
+    controlfields = []
+    datafields = []
+    for field in elem:
+        name = _localname(field.tag)
+        if name == 'controlfield':
+            controlfields.append((field.get('tag'), field.text or ''))
+        elif name == 'datafield':
+            datafields.append((
+                field.get('tag'),
+                (field.get('ind1') or ' ').strip(),
+                (field.get('ind2') or ' ').strip(),
+                [(subfield.get('code'), subfield.text or '')
+                 for subfield in field],
+            ))
+        elif name == 'leader':
+            leader = field.text
+    return leader, controlfields, datafields
+
+
+def marc21_to_json(record):
+    """Convert a record read by :func:`iter_marcxml` to a JSON record.
+
+    Control fields are stored by tag, the ``001`` field also as
+    ``control_number``.  Data fields are stored as lists of subfield
+    dictionaries under their tag followed by the two indicators, with ``_``
+    for blank indicators (e.g. ``245__``).  Values of repeated subfield
+    codes are collected in a list.
+
+    .. code-block:: python
+
+       {'control_number': '1', '001': '1',
+        '100__': [{'a': 'Doe, J.'}], '650_7': [{'a': ['X', 'Y']}]}
+    """
+    leader, controlfields, datafields = record
+    data = {}
+    if leader:
+        data['leader'] = leader
+    for tag, value in controlfields:
+        data[tag] = value
+    if '001' in data:
+        data['control_number'] = data['001']
+    for tag, ind1, ind2, subfields in datafields:
+        field = {}
+        for code, value in subfields:
+            if code not in field:
+                field[code] = value
+            elif isinstance(field[code], list):
+                field[code].append(value)
+            else:
+                field[code] = [field[code], value]
+        key = '{0}{1}{2}'.format(tag, ind1 or '_', ind2 or '_')
+        data.setdefault(key, []).append(field)
+    return data
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion database models."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+
+
+class RecidCounter(db.Model):
+    """High-water mark of the record identifiers reserved in blocks."""
+
+    __tablename__ = 'ingest_recid_counter'
+
+    pid_type = db.Column(db.String(6), primary_key=True)
+    """Persistent identifier type the counter is used for."""
+
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    """Last reserved identifier."""
+
+
+class RecidReservation(db.Model):
+    """Range of record identifiers reserved but not yet used.
+
+    The range ``[start, end)`` shrinks in the same transaction which registers
+    the identifiers handed out from it, so after a crash it contains exactly
+    the identifiers which were never committed.  A reservation without an
+    ``owner`` can be claimed by any allocator.
+    """
+
+    __tablename__ = 'ingest_recid_reservation'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    pid_type = db.Column(db.String(6), nullable=False)
+    """Persistent identifier type of the reserved identifiers."""
+
+    start = db.Column(db.BigInteger, nullable=False)
+    """First unused identifier of the range."""
+
+    end = db.Column(db.BigInteger, nullable=False)
+    """First identifier after the range."""
+
+    owner = db.Column(db.String(255), nullable=True, index=True)
+    """Allocator currently handing out identifiers from the range."""
+
+    updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                        onupdate=datetime.utcnow)
+    """Time of the last change done by the owner."""
+
+
+__all__ = ('RecidCounter', 'RecidReservation')
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Streaming readers for record dumps.
+
+Both JSON lines (one object per line) and JSON arrays of objects are
+supported.  The input is consumed in fixed size chunks so that arbitrarily
+large dumps can be loaded with constant memory.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[-+.eE0-9]*$')
+_LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+
+def _truncated(error, buf):
+    """Check if a decoding error may be caused by the end of the buffer.
+
+    Such an error may go away once more data is read, any other error means
+    that the element is malformed.
+    """
+    if error.msg.startswith('Unterminated string'):
+        return True
+    rest = buf[error.pos:]
+    return bool(_NUMBER_TAIL.match(rest)) or \
+        any(literal.startswith(rest) for literal in _LITERALS)
+
+
+def iter_json(fp, chunk_size=65536):
+    """Yield JSON objects from a JSON array or a JSON lines stream.
+
+    The format is detected from the first non-whitespace character of the
+    stream: ``[`` starts an array of comma separated objects, anything else
+    is read as JSON lines, i.e. one object per line.
+
+    :param fp: File-like object opened in text mode.
+    :param chunk_size: Number of characters read from ``fp`` at once.
+    :raises ValueError: If the stream contains malformed JSON or a top-level
+        value which is not an object.  Malformed JSON lines are reported as
+        soon as their end of line is read.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    scan = 0
+    eof = False
+    in_array = None
+    need_comma = after_comma = False
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                if in_array:
+                    raise ValueError('Unterminated JSON array.')
+                return
+            chunk = fp.read(chunk_size)
+            buf, pos, scan = buf[pos:] + chunk, 0, 0
+            eof = not chunk
+            continue
+
+        if in_array is None:
+            in_array = buf[pos] == '['
+            if in_array:
+                pos += 1
+            continue
+
+        if not in_array:
+            # Only search the newly read part of the buffer for the end of
+            # the line, so that long lines are not scanned repeatedly.
+            newline = buf.find('\n', max(pos, scan))
+            if newline < 0 and not eof:
+                scan = len(buf) - pos
+                chunk = fp.read(chunk_size)
+                buf, pos = buf[pos:] + chunk, 0
+                eof = not chunk
+                continue
+            end = len(buf) if newline < 0 else newline + 1
+            obj = decoder.decode(buf[pos:end])
+        elif buf[pos] == ']':
+            if after_comma:
+                raise ValueError('Trailing comma in JSON array.')
+            rest = buf[pos + 1:]
+            while rest:
+                if rest.strip():
+                    raise ValueError('Unexpected data after JSON array.')
+                rest = fp.read(chunk_size)
+            return
+        elif buf[pos] == ',':
+            if not need_comma:
+                raise ValueError('Unexpected comma in JSON array.')
+            pos += 1
+            need_comma, after_comma = False, True
+            continue
+        elif need_comma:
+            raise ValueError('Expected comma between JSON array elements.')
+        else:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except ValueError as e:
+                if eof or not _truncated(e, buf):
+                    raise
+                chunk = fp.read(chunk_size)
+                buf, pos = buf[pos:] + chunk, 0
+                eof = not chunk
+                continue
+            need_comma, after_comma = True, False
+
+        if not isinstance(obj, dict):
+            raise ValueError(
+                'Expected a JSON object, got {0}.'.format(type(obj).__name__))
+        pos = end
+        yield obj
+
+
+def batched(iterable, size):
+    """Group items of ``iterable`` into lists of at most ``size`` items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
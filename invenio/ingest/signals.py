@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion signals."""
+
+from __future__ import absolute_import, print_function
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+records_loaded = _signals.signal('records-loaded')
+"""Signal sent when a batch of records was inserted, before the commit.
+
+Parameters:
+    records     - list of ``(record_id, data)`` pairs
+
+Example subscriber:
+
+.. code-block:: python
+
+    def listener(sender, records=None):
+        for record_id, data in records:
+            ...
+
+    from invenio.ingest.signals import records_loaded
+
+    records_loaded.connect(listener)
+"""
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packed copies of the record JSON with lazy field decoding.
+
+Listings typically show a few fields of many records, yet reading a record
+decodes its whole JSON document.  This module keeps a packed copy of every
+record in the ``records_metadata_packed`` table: each top-level field is
+serialized on its own (e.g. with MessagePack) and the whole document is
+compressed (e.g. with Zstandard).  Reading a packed record only
+decompresses it and splits it into fields; a field is decoded the first
+time it is accessed:
+
+.. code-block:: python
+
+   from invenio.packing.api import load_records
+
+   for record in load_records(record_ids):
+       print(record['title'])
+
+The codec is chosen with ``PACKING_CODEC``.  ``json+zlib`` only needs the
+standard library; ``msgpack+zstd`` needs the ``packing`` extra.
+
+The formatter reads the records it renders with :func:`~.api.load_records`
+when this extension is installed.
+
+The JSON column of the records stays the authoritative copy.  Packed copies
+remember the revision they were packed from, and stale or missing copies
+are transparently read from the JSON column.  The packed copies are a read
+cache kept in the database: they speed up reading a few fields of many
+records, but they are stored in addition to the JSON column and hence
+increase the size of the database rather than reduce it.
+
+With ``PACKING_ON_COMMIT`` records are repacked in the flush writing them
+and when bulk loaded.
+Existing records are packed, and stale copies refreshed, in batches with:
+
+.. code-block:: console
+
+   $ python manage.py packing migrate -v
+   $ python manage.py packing stats
+"""
+
+from __future__ import absolute_import, print_function
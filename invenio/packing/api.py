@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packing of records and reading of packed records."""
+
+from __future__ import absolute_import, print_function
+
+import json
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy import func, or_
+
+from .codec import get_codec
+from .models import RecordPackedMetadata
+
+
+def load_records(record_ids):
+    """Return the records of ``record_ids`` in the same order.
+
+    Records with an up to date packed copy are returned as
+    :class:`~.codec.LazyRecord`, the others are decoded from their JSON
+    column.  ``None`` is returned for missing and deleted records.
+    """
+    record_ids = list(record_ids)
+    if not record_ids:
+        return []
+    model, packed = RecordMetadata, RecordPackedMetadata
+    rows = db.session.query(
+        model.id, model.version_id, packed.version_id, packed.codec,
+        packed.data).outerjoin(packed, packed.id == model.id).filter(
+            model.id.in_(record_ids)).all()
+
+    records, stale = {}, []
+    for record_id, version_id, packed_version_id, codec, data in rows:
+        if packed_version_id == version_id:
+            records[record_id] = get_codec(codec).unpack(data)
+        else:
+            stale.append(record_id)
+    if stale:
+        records.update(db.session.query(model.id, model.json).filter(
+            model.id.in_(stale)).all())
+    return [records.get(record_id) for record_id in record_ids]
+
+
+def pack_records(session, records, codec):
+    """Replace the packed copies of records in a session's transaction.
+
+    :param records: List of ``(record_id, version_id, data)`` triples;
+        ``data`` is ``None`` for deleted records, whose copies are removed.
+    :param codec: Name of the codec.
+    :returns: Pair of the total JSON size and packed size.
+    """
+    if not records:
+        return 0, 0
+    codec = get_codec(codec)
+    table = RecordPackedMetadata.__table__
+    values = []
+    json_total = packed_total = 0
+    for record_id, version_id, data in records:
+        if data is None:
+            continue
+        json_size = len(json.dumps(data, separators=(',', ':')))
+        blob = codec.pack(data)
+        values.append(dict(id=record_id, version_id=version_id,
+                           codec=codec.name, data=blob, json_size=json_size))
+        json_total += json_size
+        packed_total += len(blob)
+    session.execute(table.delete().where(table.c.id.in_(
+        [record_id for record_id, version_id, data in records])))
+    if values:
+        session.execute(table.insert(), values)
+    return json_total, packed_total
+
+
+def migrate(codec, batch_size=500, repack=False, callback=None):
+    """Pack the records without an up to date packed copy.
+
+    Records are read in batches ordered by identifier; every batch is
+    committed on its own, so an interrupted migration keeps its progress.
+    Packed copies of deleted records are removed.
+
+    :param codec: Name of the codec.
+    :param repack: Pack all records, including the up to date ones.
+    :param callback: Function called with the statistics after every batch.
+    :returns: Statistics with the number of ``packed`` records, of
+        ``batches``, and the total ``json_size`` and ``packed_size``.
+    """
+    codec = get_codec(codec)
+    model, packed = RecordMetadata, RecordPackedMetadata
+    query = db.session.query(
+        model.id, model.version_id, model.json).outerjoin(
+            packed, packed.id == model.id).filter(model.json.isnot(None))
+    if not repack:
+        query = query.filter(or_(
+            packed.id.is_(None),
+            packed.version_id != model.version_id,
+            packed.codec != codec.name,
+        ))
+    query = query.order_by(model.id)
+
+    stats = dict(packed=0, batches=0, json_size=0, packed_size=0)
+    after = None
+    while True:
+        page = query if after is None else query.filter(model.id > after)
+        rows = page.limit(batch_size).all()
+        if not rows:
+            break
+        json_size, packed_size = pack_records(db.session, rows, codec.name)
+        stats['json_size'] += json_size
+        stats['packed_size'] += packed_size
+        db.session.commit()
+        after = rows[-1][0]
+        stats['packed'] += len(rows)
+        stats['batches'] += 1
+        if callback:
+            callback(stats)
+
+    packed.query.filter(packed.id.in_(db.session.query(model.id).filter(
+        model.json.is_(None)))).delete(synchronize_session=False)
+    db.session.commit()
+    return stats
+
+
+def storage_stats():
+    """Return the number and sizes of the packed records by codec."""
+    packed = RecordPackedMetadata
+    rows = db.session.query(
+        packed.codec, func.count(packed.id), func.sum(packed.json_size),
+        func.sum(func.length(packed.data))).group_by(packed.codec).all()
+    return dict((codec, dict(records=count, json_size=int(json_size or 0),
+                             packed_size=int(packed_size or 0)))
+                for codec, count, json_size, packed_size in rows)
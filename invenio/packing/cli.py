@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packed record storage command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+
+@click.group()
+def packing():
+    """Packed record storage commands."""
+
+
+def _ratio(stats):
+    if not stats['json_size']:
+        return 0
+    return 100.0 * stats['packed_size'] / stats['json_size']
+
+
+@packing.command()
+@click.option('-c', '--codec', default=None,
+              help='Codec of the packed records (default PACKING_CODEC).')
+@click.option('-b', '--batch-size', type=int, default=None,
+              help='Number of records packed per transaction.')
+@click.option('--all', 'repack', is_flag=True, default=False,
+              help='Also repack up to date records.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def migrate(codec, batch_size, repack, verbose):
+    """Pack the records without an up to date packed copy.
+
+    The migration can be interrupted and run again at any time.
+    """
+    from .api import migrate as migrate_records
+
+    start = time.time()
+
+    def progress(stats):
+        if verbose:
+            click.echo('{0} packed, {1:.1f} records/s'.format(
+                stats['packed'], stats['packed'] / (time.time() - start)),
+                err=True)
+
+    try:
+        stats = migrate_records(
+            codec or current_app.config['PACKING_CODEC'],
+            batch_size=batch_size or current_app.config['PACKING_BATCH_SIZE'],
+            repack=repack, callback=progress)
+    except (ImportError, ValueError) as e:
+        raise click.UsageError(str(e))
+    click.echo('{0} packed in {1:.1f}s (adding {2:.1f}% to the JSON '
+               'size)'.format(stats['packed'], time.time() - start,
+                              _ratio(stats)))
+
+
+@packing.command()
+@with_appcontext
+def stats():
+    """Print the storage used by the packed copies."""
+    from .api import storage_stats
+
+    for codec, values in sorted(storage_stats().items()):
+        click.echo('{0}: {1} records, {2} bytes of JSON, packed copies add '
+                   '{3} bytes ({4:.1f}%)'.format(
+                       codec, values['records'], values['json_size'],
+                       values['packed_size'], _ratio(values)))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Codecs and the field-wise packed record format.
+
+A packed record is the compressed concatenation of a header and of the
+serialized top-level values::
+
+    magic | count (uint32) | count * (key length (uint16), key,
+    value length (uint32)) | values
+
+where the magic is ``IP`` followed by the format version byte.  All
+integers are big-endian.
+
+Only the header has to be parsed to access a single field.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import struct
+import zlib
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+MAGIC = b'IP\x01'
+"""Prefix of the packed format, including its version."""
+
+_COUNT = struct.Struct('>I')
+_KEY = struct.Struct('>H')
+_VALUE = struct.Struct('>I')
+
+
+def _json_serializer():
+    def dumps(value):
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def loads(data):
+        return json.loads(data.decode('utf-8'))
+    return dumps, loads
+
+
+def _msgpack_serializer():
+    import msgpack
+
+    def dumps(value):
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(data):
+        return msgpack.unpackb(data, raw=False)
+    return dumps, loads
+
+
+def _zlib_compressor():
+    return (lambda data: zlib.compress(data, 6)), zlib.decompress
+
+
+def _zstd_compressor():
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=3)
+    decompressor = zstandard.ZstdDecompressor()
+    return compressor.compress, decompressor.decompress
+
+
+def _no_compressor():
+    return (lambda data: data), (lambda data: data)
+
+
+SERIALIZERS = {'json': _json_serializer, 'msgpack': _msgpack_serializer}
+"""Factories of the ``(dumps, loads)`` functions of the serializers."""
+
+COMPRESSORS = {'zlib': _zlib_compressor, 'zstd': _zstd_compressor,
+               'none': _no_compressor}
+"""Factories of the ``(compress, decompress)`` functions."""
+
+
+class Codec(object):
+    """Serializer and compressor of packed records."""
+
+    def __init__(self, name):
+        """Initialize the codec ``<serializer>+<compressor>``.
+
+        :raises ValueError: If the codec is unknown.
+        :raises ImportError: If a library of the codec is missing.
+        """
+        try:
+            serializer, compressor = name.split('+')
+            serializer = SERIALIZERS[serializer]
+            compressor = COMPRESSORS[compressor]
+        except (KeyError, ValueError):
+            raise ValueError('Unknown codec {0!r}.'.format(name))
+        self.name = name
+        self.dumps, self.loads = serializer()
+        self.compress, self.decompress = compressor()
+
+    def pack(self, data):
+        """Return the packed form of a JSON object."""
+        if not isinstance(data, dict):
+            raise TypeError('Only JSON objects can be packed.')
+        header = [MAGIC, _COUNT.pack(len(data))]
+        values = []
+        for key, value in data.items():
+            key = key.encode('utf-8')
+            value = self.dumps(value)
+            header.extend((_KEY.pack(len(key)), key,
+                           _VALUE.pack(len(value))))
+            values.append(value)
+        return self.compress(b''.join(header) + b''.join(values))
+
+    def unpack(self, blob):
+        """Return a :class:`LazyRecord` of a packed record."""
+        data = memoryview(self.decompress(bytes(blob)))
+        if data[:len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError('Not a packed record.')
+        offset = len(MAGIC)
+        count, = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        fields = []
+        for dummy in range(count):
+            length, = _KEY.unpack_from(data, offset)
+            offset += _KEY.size
+            key = data[offset:offset + length].tobytes().decode('utf-8')
+            offset += length
+            length, = _VALUE.unpack_from(data, offset)
+            offset += _VALUE.size
+            fields.append((key, length))
+        raw = {}
+        for key, length in fields:
+            raw[key] = data[offset:offset + length]
+            offset += length
+        return LazyRecord([key for key, length in fields], raw, self.loads)
+
+
+_codecs = {}
+
+
+def get_codec(name):
+    """Return the (shared) codec ``name``."""
+    codec = _codecs.get(name)
+    if codec is None:
+        codec = _codecs[name] = Codec(name)
+    return codec
+
+
+class LazyRecord(Mapping):
+    """Read-only record whose top-level fields are decoded on access.
+
+    Decoded values are kept, so that every field is decoded at most once.
+    """
+
+    def __init__(self, keys, raw, loads):
+        """Initialize the record.
+
+        :param keys: Field names in their original order.
+        :param raw: Serialized value of every field.
+        :param loads: Function decoding a serialized value.
+        """
+        self._keys = keys
+        self._raw = raw
+        self._loads = loads
+        self._values = {}
+
+    def __getitem__(self, key):
+        """Return the decoded value of a field."""
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = self._loads(
+                self._raw[key].tobytes())
+            return value
+
+    def __iter__(self):
+        """Iterate over the field names."""
+        return iter(self._keys)
+
+    def __len__(self):
+        """Return the number of fields."""
+        return len(self._keys)
+
+    def __contains__(self, key):
+        """Check if the record has a field without decoding it."""
+        return key in self._raw
+
+    @property
+    def decoded(self):
+        """Names of the fields decoded so far."""
+        return set(self._values)
+
+    def to_dict(self):
+        """Return the whole record as a dictionary."""
+        return dict((key, self[key]) for key in self._keys)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packed record storage configuration."""
+
+from __future__ import absolute_import, print_function
+
+PACKING_CODEC = 'json+zlib'
+"""Codec of the packed records: ``<serializer>+<compressor>``.
+
+Serializers are ``json`` and ``msgpack``; compressors are ``zlib``, ``zstd``
+and ``none``.  ``msgpack+zstd`` is the most compact and the fastest to
+decode but needs the ``packing`` extra.
+"""
+
+PACKING_ON_COMMIT = True
+"""Pack created, changed and bulk loaded records in their transaction.
+
+Otherwise records are only packed by the migration and changed records are
+read from their JSON column until it runs again.
+"""
+
+PACKING_BATCH_SIZE = 500
+"""Number of records packed per transaction by the migration."""
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packed record storage database models."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy_utils.types import UUIDType
+
+
+class RecordPackedMetadata(db.Model):
+    """Packed copy of the JSON of a record."""
+
+    __tablename__ = 'records_metadata_packed'
+
+    id = db.Column(UUIDType, db.ForeignKey(
+        RecordMetadata.id, ondelete='CASCADE'), primary_key=True)
+    """Identifier of the record."""
+
+    version_id = db.Column(db.Integer, nullable=False)
+    """Revision of the record the copy was packed from."""
+
+    codec = db.Column(db.String(32), nullable=False)
+    """Name of the codec of ``data``."""
+
+    data = db.Column(db.LargeBinary, nullable=False)
+    """Packed record."""
+
+    json_size = db.Column(db.Integer, nullable=False)
+    """Size of the compact JSON serialization of the record."""
+
+
+__all__ = ('RecordPackedMetadata', )
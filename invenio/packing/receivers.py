@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers packing the records written in a flush or bulk loaded."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def _codec():
+    if not current_app or 'invenio-packing' not in current_app.extensions \
+            or not current_app.config['PACKING_ON_COMMIT']:
+        return None
+    return current_app.config['PACKING_CODEC']
+
+
+def pack_flushed(session, flush_context):
+    """Repack the records written by the flush in its transaction.
+
+    Runs after the flush, so that the copies carry the new revisions.
+    """
+    codec = _codec()
+    if codec is None:
+        return
+    from .api import pack_records
+
+    records = [(obj.id, obj.version_id, obj.json)
+               for obj in list(session.new) + list(session.dirty)
+               if isinstance(obj, RecordMetadata) and obj.id is not None]
+    records.extend((obj.id, None, None) for obj in session.deleted
+                   if isinstance(obj, RecordMetadata))
+    pack_records(session, records, codec)
+
+
+def pack_loaded(sender, records=None):
+    """Pack bulk loaded records in the transaction of the loader."""
+    from invenio_db import db
+
+    from .api import pack_records
+
+    codec = _codec()
+    if codec is not None:
+        pack_records(db.session, [(record_id, 1, data)
+                                  for record_id, data in records], codec)
+
+
+def connect():
+    """Listen to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    if not event.contains(Session, 'after_flush', pack_flushed):
+        event.listen(Session, 'after_flush', pack_flushed)
+    records_loaded.connect(pack_loaded)
+
+
+def disconnect():
+    """Stop listening to database session events and bulk ingestion."""
+    from ..ingest.signals import records_loaded
+
+    if event.contains(Session, 'after_flush', pack_flushed):
+        event.remove(Session, 'after_flush', pack_flushed)
+    records_loaded.disconnect(pack_loaded)
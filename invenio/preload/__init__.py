@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Preloading of the application into forked worker processes.
+
+By default every Gunicorn and Celery worker creates its own application and
+imports all extensions, so memory grows linearly with the number of
+workers.  Preloading creates the application once in the master process;
+the workers are forked from it and share its memory pages as long as
+neither process writes to them.
+
+Python writes to every object it touches (reference counts) and the
+garbage collector writes to the header of every object it visits, so
+shared pages are gradually copied into each worker.  Before forking, the
+heap is therefore frozen with :func:`gc.freeze` (Python 3.7+), which moves
+all objects out of the reach of later collections.
+
+The WSGI module creates the application with
+:func:`~invenio.preload.api.preload_app`, which also imports the
+implementation modules extensions would otherwise import on first use and
+loads the templates:
+
+.. code-block:: python
+
+   from invenio.preload.api import preload_app
+
+   from .factory import create_app
+
+   application = preload_app(create_app)
+
+Gunicorn loads it in the master and freezes the heap when started with the
+shipped configuration:
+
+.. code-block:: console
+
+   $ gunicorn -c python:invenio.preload.gunicorn -w 16 mysite.wsgi:application
+
+uWSGI forks its workers after importing the WSGI module, which calls
+:func:`~invenio.preload.api.freeze` right after creating the application.
+Celery workers freeze the heap before forking their pool when the module
+creating the Celery application calls
+:func:`~invenio.preload.api.connect_celery`.
+
+``python -m invenio.preload`` reports the unique memory of each worker,
+either of workers it forks itself or of a running master.
+"""
+
+from __future__ import absolute_import, print_function
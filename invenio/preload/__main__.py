@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Report of the unique memory of each forked worker.
+
+.. code-block:: console
+
+   $ python -m invenio.preload --app mysite.factory:create_app -w 16
+   $ python -m invenio.preload --app mysite.factory:create_app --no-freeze
+   $ python -m invenio.preload --pid $(cat gunicorn.pid)
+
+The first form loads the application once, forks the workers (after
+freezing the heap unless ``--no-freeze``), lets each request the ``--url``
+paths and run a full garbage collection, and reports their resident,
+proportional and unique set sizes.  The last form reports the children of
+a running Gunicorn or Celery master.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import sys
+
+from .api import load_object, preload_app
+from .measure import fork_workers, format_report, summarize
+from .memory import child_pids, memory_usage
+
+
+def _requests(urls, repeat):
+    def work(app):
+        client = app.test_client()
+        for dummy in range(repeat):
+            for url in urls:
+                client.get(url)
+    return work
+
+
+def main(argv=None):
+    """Print the memory report of the workers."""
+    parser = argparse.ArgumentParser(
+        prog='python -m invenio.preload', description=__doc__.split('\n')[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        '--app', help='application factory as module:function')
+    source.add_argument(
+        '--pid', type=int, help='master process of running workers')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=16,
+        help='number of forked workers (default: 16)')
+    parser.add_argument(
+        '--no-freeze', action='store_true',
+        help='do not freeze the heap before forking')
+    parser.add_argument(
+        '--url', action='append', default=[],
+        help='path requested by every worker')
+    parser.add_argument(
+        '--repeat', type=int, default=10,
+        help='number of times every path is requested (default: 10)')
+    parser.add_argument(
+        '--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.pid:
+        master = memory_usage(args.pid)
+        workers = [memory_usage(pid) for pid in child_pids(args.pid)]
+        frozen = None
+    else:
+        factory = load_object(args.app)
+        result = fork_workers(
+            lambda: preload_app(factory), workers=args.workers,
+            freeze=not args.no_freeze,
+            work=_requests(args.url, args.repeat) if args.url else None)
+        master, workers, frozen = (result['master'], result['workers'],
+                                   result['frozen'])
+
+    if args.json:
+        print(json.dumps(dict(master=master, workers=workers, frozen=frozen,
+                              summary=summarize(master, workers)),
+                         indent=2))
+    else:
+        print('\n'.join(format_report(master, workers)))
+    return 1 if None in workers else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Preloading of the application before worker processes are forked."""
+
+from __future__ import absolute_import, print_function
+
+import gc
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def load_object(path):
+    """Import an object from a ``module:attribute`` path."""
+    module, _, name = path.partition(':')
+    obj = importlib.import_module(module)
+    for attribute in filter(None, name.split('.')):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def lazy_modules(app):
+    """Return the implementation modules of the application extensions.
+
+    Extensions import their implementation (the ``api`` module next to the
+    ``ext`` module) on first use, which keeps startup cheap but would load
+    it again in every worker.
+    """
+    modules = []
+    for state in app.extensions.values():
+        module = type(state).__module__
+        if module.endswith('.ext'):
+            name = module[:-len('ext')] + 'api'
+            if name not in modules:
+                modules.append(name)
+    return modules
+
+
+def import_modules(names):
+    """Import modules, ignoring the ones which do not exist.
+
+    :returns: Names of the imported modules.
+    """
+    imported = []
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError as error:
+            logger.debug('Not preloading %s: %s', name, error)
+        else:
+            imported.append(name)
+    return imported
+
+
+def preload_app(factory, modules=None):
+    """Create the application and load everything workers will need.
+
+    The garbage collector is disabled while loading, so that no collection
+    frees memory in the middle of pages which would then be reused and
+    copied after the fork; its previous state is restored afterwards.
+    Templates are loaded unless ``TEMPLATING_PRELOAD`` is false.
+
+    :param factory: Application factory, called without arguments.
+    :param modules: Additional modules to import (default
+        ``PRELOAD_MODULES`` of the application configuration).
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        app = factory()
+        if modules is None:
+            modules = app.config.get('PRELOAD_MODULES', ())
+        import_modules(lazy_modules(app) + list(modules))
+        # Compile the URL rules and create the template environment, which
+        # Flask otherwise does on the first request of each worker.
+        app.url_map.update()
+        if app.config.get('TEMPLATING_PRELOAD', True):
+            from ..templating.api import preload
+            preload(app)
+        else:
+            app.jinja_env
+    finally:
+        if enabled:
+            gc.enable()
+    return app
+
+
+def freeze():
+    """Move all objects to the permanent generation of the collector.
+
+    Collections no longer visit frozen objects, so worker processes do not
+    write to (and copy) the pages of the preloaded heap.  Called in the
+    master process right before forking.
+
+    :returns: Number of frozen objects (``0`` before Python 3.7).
+    """
+    count = 0
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+        count = gc.get_freeze_count()
+    return count
+
+
+def connect_celery():
+    """Freeze the heap of Celery workers before the pool is forked.
+
+    Call it in the module creating the Celery application.
+    """
+    from celery.signals import worker_init
+
+    worker_init.connect(_freeze_worker, weak=False)
+
+
+def _freeze_worker(**kwargs):
+    logger.info('Froze %d objects before forking the pool.', freeze())
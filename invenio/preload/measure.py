@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Measurement of the memory shared by forked workers."""
+
+from __future__ import absolute_import, print_function
+
+import gc
+import os
+
+from .api import freeze as freeze_heap
+from .memory import memory_usage
+
+
+def fork_workers(load, workers=16, freeze=True, work=None):
+    """Load an application once, fork workers and measure their memory.
+
+    Every worker runs ``work(app)`` and a full garbage collection, as a
+    long running worker eventually does, then waits until its memory was
+    measured.
+
+    :param load: Function returning the application.
+    :param workers: Number of forked workers.
+    :param freeze: Freeze the heap before forking.
+    :param work: Function called with the application in every worker.
+    :returns: Dictionary with the ``master`` usage, the list of ``workers``
+        usages (``None`` for failed workers) and the number of ``frozen``
+        objects.
+    """
+    gc.disable()
+    children = []
+    try:
+        app = load()
+        frozen = freeze_heap() if freeze else 0
+        gc.enable()
+        for dummy in range(workers):
+            ready_r, ready_w = os.pipe()
+            stop_r, stop_w = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    os.close(ready_r)
+                    os.close(stop_w)
+                    # Pipes of the previous workers would keep them alive.
+                    for other in children:
+                        os.close(other[1])
+                        os.close(other[2])
+                    if work is not None:
+                        work(app)
+                    gc.collect()
+                    os.write(ready_w, b'1')
+                    os.read(stop_r, 1)
+                    status = 0
+                finally:
+                    os._exit(status)
+            os.close(ready_w)
+            os.close(stop_r)
+            children.append((pid, ready_r, stop_w))
+
+        usages = []
+        for pid, ready_r, stop_w in children:
+            ready = os.read(ready_r, 1)
+            usages.append(memory_usage(pid) if ready else None)
+        return dict(master=memory_usage(os.getpid()), workers=usages,
+                    frozen=frozen)
+    finally:
+        for pid, ready_r, stop_w in children:
+            os.close(ready_r)
+            os.close(stop_w)
+            os.waitpid(pid, 0)
+        gc.enable()
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+
+def summarize(master, workers):
+    """Return the totals of a master and its worker usages.
+
+    ``total`` is the sum of the proportional set sizes, i.e. the memory
+    actually used by all processes together.
+    """
+    measured = [usage for usage in workers if usage is not None]
+    total = master['pss'] + sum(usage['pss'] for usage in measured)
+    mean_uss = sum(usage['uss'] for usage in measured) // len(measured) \
+        if measured else 0
+    return dict(workers=len(measured), failed=len(workers) - len(measured),
+                mean_uss=mean_uss, total=total)
+
+
+def _mb(value):
+    return '{0:.1f}'.format(value / 1048576.0)
+
+
+def format_report(master, workers):
+    """Return the usages as a list of lines (sizes in MiB)."""
+    row = '{0:<8} {1:>10} {2:>10} {3:>10}'
+    lines = [row.format('process', 'rss MiB', 'pss MiB', 'uss MiB'),
+             row.format('master', _mb(master['rss']), _mb(master['pss']),
+                        _mb(master['uss']))]
+    for number, usage in enumerate(workers, 1):
+        if usage is None:
+            lines.append(row.format(number, '-', '-', 'failed'))
+        else:
+            lines.append(row.format(number, _mb(usage['rss']),
+                                    _mb(usage['pss']), _mb(usage['uss'])))
+    summary = summarize(master, workers)
+    lines.append('{0} workers, mean uss {1} MiB, total pss {2} MiB'.format(
+        summary['workers'], _mb(summary['mean_uss']), _mb(summary['total'])))
+    return lines
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Memory usage of processes read from ``/proc`` (Linux)."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+_FIELDS = {
+    'Rss': 'rss',
+    'Pss': 'pss',
+    'Private_Clean': 'uss',
+    'Private_Dirty': 'uss',
+    'Shared_Clean': 'shared',
+    'Shared_Dirty': 'shared',
+}
+
+
+def parse_smaps(lines):
+    """Sum the sizes of ``smaps`` lines in bytes.
+
+    :returns: Dictionary with the resident (``rss``), proportional
+        (``pss``), unique (``uss``) and ``shared`` set sizes.
+    """
+    usage = dict(rss=0, pss=0, uss=0, shared=0)
+    for line in lines:
+        name, _, value = line.partition(':')
+        key = _FIELDS.get(name)
+        if key is not None:
+            usage[key] += int(value.split()[0]) * 1024
+    return usage
+
+
+def memory_usage(pid):
+    """Return the memory usage of a process (see :func:`parse_smaps`).
+
+    ``smaps_rollup`` (Linux 4.14) is read if it exists, which is much faster
+    than ``smaps`` for large processes.
+    """
+    path = '/proc/{0}/smaps_rollup'.format(pid)
+    if not os.path.exists(path):
+        path = '/proc/{0}/smaps'.format(pid)
+    with open(path) as fp:
+        return parse_smaps(fp)
+
+
+def child_pids(pid):
+    """Return the identifiers of the child processes of a process."""
+    children = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open('/proc/{0}/stat'.format(name)) as fp:
+                stat = fp.read()
+        except IOError:
+            continue
+        # The command name in parentheses may contain spaces.
+        fields = stat[stat.rindex(')') + 2:].split()
+        if int(fields[1]) == pid:
+            children.append(int(name))
+    return sorted(children)
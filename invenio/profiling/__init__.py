@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Per-request profiling of the hot path.
+
+The latency of every request is recorded in a histogram per endpoint.  For
+a sample of ``PROFILING_SAMPLE_RATE`` of the requests the time spent in SQL
+queries, cache lookups, JSON Schema validation and template rendering is
+measured as well.  With ``PROFILING_SERVER_TIMING`` the phases are sent back
+to clients sending the ``PROFILING_METRICS_TOKEN`` in a ``Server-Timing``
+header, which browser developer tools display next to the request:
+
+.. code-block:: text
+
+   Server-Timing: cache;dur=0.41, jsonschema;dur=2.10, sql;dur=8.93,
+       template;dur=5.02, total;dur=21.76
+
+The histograms of the process are exposed in the Prometheus text format
+under ``PROFILING_METRICS_URL`` to the same clients.  Phases are exclusive:
+time spent in a SQL query run by a cache loader is accounted to ``sql``
+only.  SQL queries and templates are timed through SQLAlchemy events and
+Flask signals, the record cache and the validator cache call
+:class:`~invenio.profiling.api.phase`, which times further blocks and
+functions as a context manager or decorator.
+"""
+
+from __future__ import absolute_import, print_function
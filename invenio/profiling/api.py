@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request phase timers and latency histograms."""
+
+from __future__ import absolute_import, print_function
+
+import bisect
+import functools
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+"""Upper bounds in seconds of the histogram buckets."""
+
+_local = threading.local()
+
+
+class RequestTimer(object):
+    """Exclusive time spent in the phases of one request.
+
+    Phases may nest (e.g. SQL queries run by a cache loader); the time of a
+    nested phase is only accounted to the nested phase.
+    """
+
+    def __init__(self):
+        """Start timing."""
+        self.start = time.time()
+        self.phases = defaultdict(float)
+        self._stack = []
+
+    def push(self, name):
+        """Enter the phase ``name``."""
+        self._stack.append([name, time.time(), 0.0])
+
+    def pop(self, name=None):
+        """Leave the current phase, or the innermost phase ``name``.
+
+        Phases left open by an exception inside phase ``name`` are discarded.
+        Nothing happens if phase ``name`` was not entered.
+        """
+        if name is not None:
+            if not any(entry[0] == name for entry in self._stack):
+                return
+            while self._stack[-1][0] != name:
+                self._stack.pop()
+        name, start, nested = self._stack.pop()
+        elapsed = time.time() - start
+        self.phases[name] += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    @property
+    def elapsed(self):
+        """Seconds since the request started."""
+        return time.time() - self.start
+
+
+def current_timer():
+    """Return the :class:`RequestTimer` of the current thread or ``None``."""
+    return getattr(_local, 'timer', None)
+
+
+def set_timer(timer):
+    """Set the :class:`RequestTimer` of the current thread."""
+    _local.timer = timer
+
+
+class phase(object):
+    """Time a block or function as a phase of the current request.
+
+    Does nothing when the current request is not sampled.
+
+    .. code-block:: python
+
+       with phase('render'):
+           ...
+    """
+
+    def __init__(self, name):
+        """Initialize the phase ``name``."""
+        self.name = name
+        self.timer = None
+
+    def __enter__(self):
+        """Enter the phase."""
+        self.timer = current_timer()
+        if self.timer is not None:
+            self.timer.push(self.name)
+
+    def __exit__(self, *exc_info):
+        """Leave the phase."""
+        if self.timer is not None:
+            self.timer.pop()
+            self.timer = None
+
+    def __call__(self, func):
+        """Decorate ``func``."""
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = current_timer()
+            if timer is None:
+                return func(*args, **kwargs)
+            timer.push(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.pop()
+        wrapper.profiling_phase = name
+        return wrapper
+
+
+def server_timing(timer, total=None):
+    """Return the ``Server-Timing`` header value of a timer."""
+    entries = ['{0};dur={1:.2f}'.format(name, value * 1000)
+               for name, value in sorted(timer.phases.items())]
+    entries.append('total;dur={0:.2f}'.format(
+        (timer.elapsed if total is None else total) * 1000))
+    return ', '.join(entries)
+
+
+class Histogram(object):
+    """Cumulative histogram of observed values."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize empty buckets with the given upper bounds."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Yield ``(upper bound, count of values <= bound)`` pairs."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'), ), self.counts):
+            total += count
+            yield bound, total
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class MetricsRegistry(object):
+    """Latency histograms by endpoint and by endpoint and phase."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='invenio'):
+        """Initialize an empty registry."""
+        self.buckets = buckets
+        self.prefix = prefix
+        self.requests = defaultdict(lambda: Histogram(self.buckets))
+        self.phases = defaultdict(lambda: Histogram(self.buckets))
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, duration, phases=None):
+        """Record the duration and, if sampled, the phases of a request."""
+        with self._lock:
+            self.requests[endpoint].observe(duration)
+            for name, value in (phases or {}).items():
+                self.phases[endpoint, name].observe(value)
+
+    def prometheus(self):
+        """Return the histograms in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            requests = [((('endpoint', endpoint), ), histogram)
+                        for endpoint, histogram in sorted(
+                            self.requests.items())]
+            phases = [((('endpoint', endpoint), ('phase', name)), histogram)
+                      for (endpoint, name), histogram in sorted(
+                          self.phases.items())]
+            self._format(lines, 'request_duration_seconds',
+                         'Request latency by endpoint.', requests)
+            self._format(lines, 'request_phase_seconds',
+                         'Time spent per phase of sampled requests.', phases)
+        return '\n'.join(lines) + '\n'
+
+    def _format(self, lines, name, help_, series):
+        name = '{0}_{1}'.format(self.prefix, name)
+        lines.append('# HELP {0} {1}'.format(name, help_))
+        lines.append('# TYPE {0} histogram'.format(name))
+        for labels, histogram in series:
+            labels = ','.join('{0}="{1}"'.format(k, _escape(v))
+                              for k, v in labels)
+            for bound, count in histogram.cumulative():
+                lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                    name, labels, _format_bound(bound), count))
+            lines.append('{0}_sum{{{1}}} {2!r}'.format(
+                name, labels, histogram.sum))
+            lines.append('{0}_count{{{1}}} {2}'.format(
+                name, labels, histogram.count))
+
+    def clear(self):
+        """Remove all observations."""
+        with self._lock:
+            self.requests.clear()
+            self.phases.clear()
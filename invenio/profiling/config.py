@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request profiling configuration."""
+
+from __future__ import absolute_import, print_function
+
+PROFILING_ENABLED = True
+"""Record request latencies and time the phases of sampled requests."""
+
+PROFILING_SAMPLE_RATE = 0.1
+"""Fraction of the requests whose phases are timed.
+
+The latency of every request is recorded at a negligible cost.  Timing the
+phases adds a few microseconds per query, cache lookup and template.
+"""
+
+PROFILING_SERVER_TIMING = False
+"""Send the phases of sampled requests in a ``Server-Timing`` header.
+
+The header is only sent to requests carrying the
+``PROFILING_METRICS_TOKEN``, as timings reveal internals of the service.
+"""
+
+PROFILING_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                     0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds in seconds of the latency histogram buckets."""
+
+PROFILING_METRICS_URL = '/metrics'
+"""URL of the Prometheus endpoint (``None`` to disable the endpoint)."""
+
+PROFILING_METRICS_TOKEN = None
+"""Bearer token required to read the Prometheus endpoint and to receive the
+``Server-Timing`` header.
+
+The endpoint is disabled while no token is set.  Clients send it in the
+``Authorization: Bearer <token>`` header.
+"""
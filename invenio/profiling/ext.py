@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request profiling extension."""
+
+from __future__ import absolute_import, print_function
+
+import hmac
+import random
+import time
+
+from . import config
+
+
+class _ProfilingState(object):
+    """Request profiling state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        from .api import MetricsRegistry
+
+        self.app = app
+        self.registry = MetricsRegistry(
+            buckets=app.config['PROFILING_BUCKETS'])
+
+    def authorized(self):
+        """Check if the request carries the ``PROFILING_METRICS_TOKEN``."""
+        from flask import request
+
+        token = self.app.config['PROFILING_METRICS_TOKEN']
+        return bool(token) and hmac.compare_digest(
+            request.headers.get('Authorization', ''),
+            'Bearer {0}'.format(token))
+
+    def before_request(self):
+        """Start timing the request and decide whether it is sampled."""
+        from flask import g
+
+        from .api import RequestTimer, set_timer
+
+        g.profiling_start = time.time()
+        rate = self.app.config['PROFILING_SAMPLE_RATE']
+        set_timer(RequestTimer() if rate and random.random() < rate
+                  else None)
+
+    def after_request(self, response):
+        """Record the request latency and send the ``Server-Timing``."""
+        from flask import g, request
+
+        from .api import current_timer, server_timing
+
+        start = getattr(g, 'profiling_start', None)
+        if start is None:
+            return response
+        duration = time.time() - start
+        endpoint = request.url_rule.endpoint if request.url_rule else \
+            '<unmatched>'
+        timer = current_timer()
+        self.registry.observe(endpoint, duration,
+                              timer.phases if timer is not None else None)
+        if timer is not None and self.app.config['PROFILING_SERVER_TIMING'] \
+                and self.authorized():
+            response.headers['Server-Timing'] = server_timing(
+                timer, duration)
+        return response
+
+    def teardown_request(self, exception=None):
+        """Drop the timer of the request."""
+        from .api import set_timer
+        set_timer(None)
+
+
+class InvenioProfiling(object):
+    """Invenio request profiling extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        state = _ProfilingState(app)
+        app.extensions['invenio-profiling'] = state
+        if not app.config['PROFILING_ENABLED']:
+            return
+
+        from . import receivers
+
+        app.before_request(state.before_request)
+        app.after_request(state.after_request)
+        app.teardown_request(state.teardown_request)
+        try:
+            receivers.connect_sql()
+        except ImportError:
+            pass
+        receivers.connect_templates(app)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('PROFILING_'):
+                app.config.setdefault(k, getattr(config, k))
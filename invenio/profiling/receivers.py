@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers timing SQL queries and template rendering."""
+
+from __future__ import absolute_import, print_function
+
+from .api import current_timer
+
+
+def before_cursor_execute(*args):
+    """Enter the ``sql`` phase."""
+    timer = current_timer()
+    if timer is not None:
+        timer.push('sql')
+
+
+def after_cursor_execute(*args):
+    """Leave the ``sql`` phase."""
+    timer = current_timer()
+    if timer is not None:
+        timer.pop('sql')
+
+
+def before_render_template(sender, **extra):
+    """Enter the ``template`` phase."""
+    timer = current_timer()
+    if timer is not None:
+        timer.push('template')
+
+
+def template_rendered(sender, **extra):
+    """Leave the ``template`` phase."""
+    timer = current_timer()
+    if timer is not None:
+        timer.pop('template')
+
+
+def connect_sql():
+    """Time the queries of all SQLAlchemy engines."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    for name, func in (('before_cursor_execute', before_cursor_execute),
+                       ('after_cursor_execute', after_cursor_execute),
+                       ('handle_error', after_cursor_execute)):
+        if not event.contains(Engine, name, func):
+            event.listen(Engine, name, func)
+
+
+def connect_templates(app):
+    """Time the templates rendered by ``app``.
+
+    Requires blinker and Flask 0.11 or later for the
+    ``before_render_template`` signal.
+    """
+    from flask import signals
+
+    before = getattr(signals, 'before_render_template', None)
+    if before is not None and signals.signals_available:
+        before.connect(before_render_template, app, weak=False)
+        signals.template_rendered.connect(template_rendered, app, weak=False)
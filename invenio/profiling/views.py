@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Prometheus metrics endpoint."""
+
+from __future__ import absolute_import, print_function
+
+from flask import Blueprint, Response, abort, current_app
+
+blueprint = Blueprint('invenio_profiling', __name__)
+
+
+@blueprint.record_once
+def register_url(state):
+    """Register the endpoint under ``PROFILING_METRICS_URL``."""
+    url = state.app.config.get('PROFILING_METRICS_URL')
+    if url and state.app.config.get('PROFILING_METRICS_TOKEN'):
+        state.app.add_url_rule(url, 'invenio_profiling.metrics', metrics)
+
+
+def metrics():
+    """Return the latency histograms of this process."""
+    state = current_app.extensions['invenio-profiling']
+    if not state.authorized():
+        abort(403)
+    registry = state.registry
+    return Response(registry.prometheus(),
+                    mimetype='text/plain; version=0.0.4')
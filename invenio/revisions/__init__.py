@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded record revisions.
+
+Keeping a full copy of every revision makes the history of heavily curated
+records many times larger than the records themselves.  This module stores
+the revisions of a record as periodic full snapshots with JSON patches in
+between, in the ``records_revisions`` table.  A revision is rebuilt by
+applying the patches following the nearest snapshot before it, while the
+latest revision is read from the record itself.
+
+Revisions are recorded whenever a record is flushed through the ORM.  The
+number of revisions between two snapshots (the interval) is tuned for every
+record by the compaction: records whose revisions are large and change
+little get long intervals, records whose changes are large compared with
+their size get short ones.  Compaction runs from the command line or as
+the :func:`~.tasks.compact_revisions` task, e.g. nightly with Celery beat:
+
+.. code-block:: python
+
+   CELERYBEAT_SCHEDULE = {
+       'compact-revisions': {
+           'task': 'invenio.revisions.tasks.compact_revisions',
+           'schedule': crontab(minute=0, hour=3),
+       },
+   }
+
+Existing full copies kept by SQLAlchemy-Continuum are converted with
+``python manage.py revisions import-versions``; disable
+``DB_VERSIONING`` afterwards to stop writing them.
+"""
+
+from __future__ import absolute_import, print_function
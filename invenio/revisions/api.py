@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Writing, rebuilding and compaction of delta-encoded revisions."""
+
+from __future__ import absolute_import, print_function
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from jsonpatch import make_patch
+from sqlalchemy import func
+
+from .delta import documents, json_size, rebuild, tune_interval
+from .models import RecordRevision
+
+
+class RevisionStore(object):
+    """Delta-encoded revisions of records."""
+
+    def __init__(self, interval=10, max_interval=100, read_weight=1.0):
+        """Initialize the store.
+
+        :param interval: Snapshot interval of new records.
+        :param max_interval: Maximum interval chosen by the compaction.
+        :param read_weight: Cost of applying a byte of patches relative to
+            storing a byte (see :func:`tune_interval`).
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        self.read_weight = read_weight
+
+    def add(self, record_id, revision, data, new=False):
+        """Return the revision row of a new revision of a record.
+
+        The revision is stored as a patch from the previous revision, read
+        from the record table, unless a snapshot is due.  The row is not
+        added to the session.
+
+        :param new: The record is created, hence has no previous revision.
+        """
+        latest = None if new else db.session.query(
+            RecordRevision.revision, RecordRevision.chain,
+            RecordRevision.interval).filter(
+                RecordRevision.record_id == record_id).order_by(
+                    RecordRevision.revision.desc()).first()
+        interval = latest.interval if latest else self.interval
+        size = json_size(data) if data is not None else 0
+
+        if data is not None and latest is not None and \
+                latest.revision == revision - 1 and \
+                latest.chain + 1 < interval:
+            previous = self.get(record_id, revision - 1)
+            if previous is not None:
+                patch = make_patch(previous, data).patch
+                patch_size = json_size(patch)
+                if patch_size < size:
+                    return RecordRevision(
+                        record_id=record_id, revision=revision,
+                        snapshot=False, data=patch, size=patch_size,
+                        chain=latest.chain + 1, interval=interval)
+        return RecordRevision(
+            record_id=record_id, revision=revision, snapshot=True, data=data,
+            size=size, chain=0, interval=interval)
+
+    def get(self, record_id, revision=None):
+        """Return a revision of a record (default the latest).
+
+        The latest revision is read from the record table.  Older revisions
+        are rebuilt from the nearest snapshot.  ``None`` is returned for
+        unknown revisions and revisions in which the record was deleted.
+        """
+        current = db.session.query(
+            RecordMetadata.version_id, RecordMetadata.json).filter(
+                RecordMetadata.id == record_id).first()
+        if current is None:
+            return None
+        if revision is None or revision == current.version_id:
+            return current.json
+        if not 0 < revision < current.version_id:
+            return None
+
+        model = RecordRevision
+        snapshot = db.session.query(func.max(model.revision)).filter(
+            model.record_id == record_id, model.revision <= revision,
+            model.snapshot.is_(True)).scalar()
+        if snapshot is None:
+            return None
+        rows = db.session.query(model.snapshot, model.data).filter(
+            model.record_id == record_id,
+            model.revision.between(snapshot, revision)).order_by(
+                model.revision).all()
+        if len(rows) != revision - snapshot + 1:
+            return None
+        return rebuild(rows)
+
+    def revisions(self, record_id):
+        """Return the revision numbers stored for a record."""
+        return [revision for revision, in db.session.query(
+            RecordRevision.revision).filter(
+                RecordRevision.record_id == record_id).order_by(
+                    RecordRevision.revision)]
+
+    def compact(self, record_id):
+        """Tune the snapshot interval of a record and re-encode it.
+
+        :returns: Dictionary with the old and new ``interval`` and ``size``
+            of the revisions, and whether they were ``rewritten``.
+        """
+        model = RecordRevision
+        rows = db.session.query(
+            model.revision, model.snapshot, model.data, model.size,
+            model.interval, model.created).filter(
+                model.record_id == record_id).order_by(model.revision).all()
+        result = dict(old_interval=rows[-1].interval if rows else None,
+                      old_size=sum(row.size for row in rows),
+                      rewritten=False)
+
+        # First pass: sizes of the documents and patches between them.
+        sizes, patches, patch_sizes = [], [], []
+        previous = None
+        for row, document in zip(rows, documents(
+                [(r.revision, r.snapshot, r.data) for r in rows])):
+            patch = None
+            if document is not None and previous is not None and \
+                    previous[0] == row.revision - 1:
+                patch = make_patch(previous[1], document).patch \
+                    if row.snapshot else row.data
+            sizes.append(json_size(document) if document is not None else None)
+            patches.append(patch)
+            patch_sizes.append(json_size(patch) if patch is not None else None)
+            previous = (row.revision, document) \
+                if document is not None else None
+
+        document_sizes = [size for size in sizes if size is not None]
+        delta_sizes = [size for size in patch_sizes if size is not None]
+        interval = tune_interval(
+            sum(document_sizes) / float(len(document_sizes) or 1),
+            sum(delta_sizes) / float(len(delta_sizes) or 1),
+            read_weight=self.read_weight, max_interval=self.max_interval)
+        result.update(interval=interval, size=result['old_size'])
+
+        # Second pass: encode the revisions with the tuned interval.
+        values, chain = [], 0
+        for i, (row, document) in enumerate(zip(rows, documents(
+                [(r.revision, r.snapshot, r.data) for r in rows]))):
+            size, patch, patch_size = sizes[i] or 0, patches[i], \
+                patch_sizes[i]
+            if patch is not None and chain + 1 < interval and \
+                    patch_size < size:
+                chain += 1
+                values.append(dict(snapshot=False, data=patch,
+                                   size=patch_size, chain=chain))
+            else:
+                chain = 0
+                values.append(dict(snapshot=True, data=document, size=size,
+                                   chain=0))
+            values[-1].update(record_id=record_id, revision=row.revision,
+                              interval=interval, created=row.created)
+
+        if all(row.snapshot == value['snapshot'] and
+               row.interval == interval for row, value in zip(rows, values)):
+            return result
+        model.query.filter(model.record_id == record_id).delete(
+            synchronize_session=False)
+        db.session.execute(model.__table__.insert(), values)
+        result.update(size=sum(value['size'] for value in values),
+                      rewritten=True)
+        return result
+
+    def compact_all(self, min_revisions=3, since=None, batch_size=100,
+                    callback=None):
+        """Compact the records with at least ``min_revisions`` revisions.
+
+        :param since: Only compact records with revisions written after
+            this time.
+        :param callback: Function called with the statistics after every
+            batch.
+        :returns: Statistics with the number of ``records`` and of
+            ``rewritten`` records, and the total size ``before`` and
+            ``after`` the compaction.
+        """
+        model = RecordRevision
+        stats = dict(records=0, rewritten=0, before=0, after=0)
+        after = None
+        while True:
+            query = db.session.query(model.record_id)
+            if after is not None:
+                query = query.filter(model.record_id > after)
+            query = query.group_by(model.record_id).having(
+                func.count(model.revision) >= min_revisions)
+            if since is not None:
+                query = query.having(func.max(model.created) >= since)
+            record_ids = [record_id for record_id, in query.order_by(
+                model.record_id).limit(batch_size)]
+            if not record_ids:
+                return stats
+            for record_id in record_ids:
+                result = self.compact(record_id)
+                stats['records'] += 1
+                stats['rewritten'] += result['rewritten']
+                stats['before'] += result['old_size']
+                stats['after'] += result['size']
+            db.session.commit()
+            after = record_ids[-1]
+            if callback:
+                callback(stats)
+
+    def import_versions(self, purge=False, batch_size=100, callback=None):
+        """Import the revisions kept by SQLAlchemy-Continuum.
+
+        Versions which are not stored yet are added and the records are
+        compacted.
+
+        :param purge: Delete the imported versions.
+        :returns: Statistics with the number of ``records`` and imported
+            ``versions``.
+        """
+        from sqlalchemy_continuum import version_class
+
+        version = version_class(RecordMetadata)
+        stats = dict(records=0, versions=0)
+        after = None
+        while True:
+            query = db.session.query(version.id).distinct()
+            if after is not None:
+                query = query.filter(version.id > after)
+            record_ids = [record_id for record_id, in query.order_by(
+                version.id).limit(batch_size)]
+            if not record_ids:
+                return stats
+            for record_id in record_ids:
+                stored = set(self.revisions(record_id))
+                rows = db.session.query(
+                    version.version_id, version.json).filter(
+                        version.id == record_id,
+                        version.version_id.isnot(None)).order_by(
+                            version.transaction_id).all()
+                values = [dict(
+                    record_id=record_id, revision=revision, snapshot=True,
+                    data=data, size=json_size(data) if data is not None else 0,
+                    chain=0, interval=self.interval,
+                ) for revision, data in rows if revision not in stored]
+                if values:
+                    db.session.execute(
+                        RecordRevision.__table__.insert(), values)
+                    self.compact(record_id)
+                if purge:
+                    version.query.filter(version.id == record_id).delete(
+                        synchronize_session=False)
+                stats['records'] += 1
+                stats['versions'] += len(values)
+            db.session.commit()
+            after = record_ids[-1]
+            if callback:
+                callback(stats)
+
+    def stats(self):
+        """Return the number of revisions, of snapshots and their size."""
+        model = RecordRevision
+        count, size = db.session.query(
+            func.count(model.revision), func.sum(model.size)).one()
+        snapshots = model.query.filter(model.snapshot.is_(True)).count()
+        return dict(revisions=count, snapshots=snapshots,
+                    size=int(size or 0))
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded revisions command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+from .proxies import current_revisions
+
+
+def _print_stats():
+    stats = current_revisions.store.stats()
+    click.echo('{revisions} revisions, {snapshots} snapshots, '
+               '{size} bytes'.format(**stats))
+
+
+@click.group()
+def revisions():
+    """Record revision commands."""
+
+
+@revisions.command()
+@click.argument('record_id', type=uuid.UUID)
+@click.argument('revision', type=int, required=False)
+@with_appcontext
+def show(record_id, revision):
+    """Print a revision of a record (default the latest)."""
+    data = current_revisions.store.get(record_id, revision)
+    if data is None:
+        raise click.ClickException('Revision not found.')
+    click.echo(json.dumps(data, indent=2, sort_keys=True))
+
+
+@revisions.command()
+@click.option('--days', type=int, default=None,
+              help='Only records changed in the last DAYS days.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def compact(days, verbose):
+    """Tune the snapshot intervals and re-encode the revisions."""
+    def progress(stats):
+        if verbose:
+            click.echo('{records} records, {rewritten} rewritten'.format(
+                **stats), err=True)
+
+    stats = current_revisions.store.compact_all(
+        min_revisions=current_app.config['REVISIONS_COMPACT_MIN_REVISIONS'],
+        since=datetime.utcnow() - timedelta(days=days) if days else None,
+        callback=progress)
+    click.echo('{records} records compacted, {rewritten} rewritten, '
+               '{before} -> {after} bytes'.format(**stats))
+    _print_stats()
+
+
+@revisions.command('import-versions')
+@click.option('--purge', is_flag=True, default=False,
+              help='Delete the imported SQLAlchemy-Continuum versions.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each batch.')
+@with_appcontext
+def import_versions(purge, verbose):
+    """Import the record versions kept by SQLAlchemy-Continuum."""
+    def progress(stats):
+        if verbose:
+            click.echo('{records} records, {versions} versions'.format(
+                **stats), err=True)
+
+    stats = current_revisions.store.import_versions(
+        purge=purge, callback=progress)
+    click.echo('{versions} versions of {records} records imported'.format(
+        **stats))
+    _print_stats()
+
+
+@revisions.command()
+@with_appcontext
+def stats():
+    """Print the number and size of the stored revisions."""
+    _print_stats()
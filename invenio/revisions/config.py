@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded revisions configuration."""
+
+from __future__ import absolute_import, print_function
+
+REVISIONS_ENABLED = True
+"""Record a revision whenever a record is flushed."""
+
+REVISIONS_SNAPSHOT_INTERVAL = 10
+"""Number of revisions between two snapshots until compaction tunes it."""
+
+REVISIONS_MAX_INTERVAL = 100
+"""Maximum number of revisions between two snapshots."""
+
+REVISIONS_READ_WEIGHT = 1.0
+"""Cost of reading a byte of patches relative to storing a byte.
+
+Compaction chooses the interval minimizing the stored bytes per revision
+plus this weight times the patch bytes applied to rebuild a revision.
+Higher weights favour faster reads of old revisions over storage.
+"""
+
+REVISIONS_COMPACT_MIN_REVISIONS = 3
+"""Records with fewer revisions are not compacted."""
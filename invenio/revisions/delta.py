@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Snapshot interval tuning and rebuilding of revisions from patches."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import math
+
+from jsonpatch import apply_patch
+
+
+def json_size(data):
+    """Return the length of the compact JSON serialization of ``data``."""
+    return len(json.dumps(data, separators=(',', ':')))
+
+
+def tune_interval(snapshot_size, delta_size, read_weight=1.0,
+                  max_interval=100):
+    """Return the snapshot interval minimizing storage and rebuild costs.
+
+    With snapshots of ``snapshot_size`` bytes every ``k`` revisions and
+    patches of ``delta_size`` bytes in between, a revision takes about
+    ``snapshot_size / k + delta_size`` bytes of storage, and rebuilding it
+    applies on average ``delta_size * k / 2`` bytes of patches.  The sum of
+    the storage and of ``read_weight`` times the rebuild cost is minimal
+    for ``k = sqrt(2 * snapshot_size / (read_weight * delta_size))``.
+    """
+    if delta_size <= 0 or read_weight <= 0:
+        return max_interval
+    interval = int(round(math.sqrt(
+        2.0 * snapshot_size / (read_weight * delta_size))))
+    return max(1, min(interval, max_interval))
+
+
+def rebuild(rows):
+    """Return the document of the last of consecutive revisions.
+
+    :param rows: ``(snapshot, data)`` pairs starting with a snapshot.  The
+        data of the snapshot is modified.
+    """
+    document = None
+    for snapshot, data in rows:
+        document = data if snapshot else apply_patch(
+            document, data, in_place=True)
+    return document
+
+
+def documents(rows):
+    """Yield the document of every ``(revision, snapshot, data)`` row.
+
+    ``None`` is yielded for deleted records and after gaps in the revisions.
+    """
+    document, previous = None, None
+    for revision, snapshot, data in rows:
+        if snapshot:
+            document = data
+        elif document is not None and previous == revision - 1:
+            document = apply_patch(document, data)
+        else:
+            document = None
+        previous = revision
+        yield document
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded revisions database models."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+from invenio_records.models import RecordMetadata
+from sqlalchemy_utils.types import JSONType, UUIDType
+
+
+class RecordRevision(db.Model):
+    """Revision of a record, either a full snapshot or a JSON patch."""
+
+    __tablename__ = 'records_revisions'
+
+    record_id = db.Column(UUIDType, db.ForeignKey(
+        RecordMetadata.id, ondelete='CASCADE'), primary_key=True)
+    """Identifier of the record."""
+
+    revision = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    """Revision number (the ``version_id`` of the record)."""
+
+    snapshot = db.Column(db.Boolean, nullable=False)
+    """Whether ``data`` is the record (or ``None`` if it was deleted)."""
+
+    data = db.Column(JSONType, nullable=True)
+    """Record or JSON patch from the previous revision."""
+
+    size = db.Column(db.Integer, nullable=False, default=0)
+    """Size of the JSON serialization of ``data``."""
+
+    chain = db.Column(db.Integer, nullable=False, default=0)
+    """Number of patches since the last snapshot (``0`` for snapshots)."""
+
+    interval = db.Column(db.Integer, nullable=False)
+    """Snapshot interval of the record when the revision was written."""
+
+    created = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    """Time the revision was written."""
+
+
+__all__ = ('RecordRevision', )
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Receivers recording a revision whenever a record is flushed."""
+
+from __future__ import absolute_import, print_function
+
+from flask import current_app
+from invenio_records.models import RecordMetadata
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+
+def record_revisions(session, flush_context, instances):
+    """Add a revision for every record created or changed by the flush.
+
+    The revision number is the ``version_id`` the record gets in the flush.
+    """
+    state = current_app.extensions.get('invenio-revisions') \
+        if current_app else None
+    if state is None or not current_app.config['REVISIONS_ENABLED']:
+        return
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, RecordMetadata) or obj.id is None:
+            continue
+        new = obj in session.new
+        if not new and not attributes.get_history(obj, 'json').has_changes():
+            continue
+        with session.no_autoflush:
+            session.add(state.store.add(
+                obj.id, 1 if new else (obj.version_id or 0) + 1, obj.json,
+                new=new))
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    if not event.contains(Session, 'before_flush', record_revisions):
+        event.listen(Session, 'before_flush', record_revisions)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    if event.contains(Session, 'before_flush', record_revisions):
+        event.remove(Session, 'before_flush', record_revisions)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded revisions tasks."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime, timedelta
+
+from celery import shared_task
+from flask import current_app
+
+from .proxies import current_revisions
+
+
+@shared_task(ignore_result=True)
+def compact_revisions(days=None):
+    """Tune the snapshot intervals and re-encode the revisions.
+
+    :param days: Only compact the records with revisions written in the
+        last ``days`` days (default all records).
+    """
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    return current_revisions.store.compact_all(
+        min_revisions=current_app.config['REVISIONS_COMPACT_MIN_REVISIONS'],
+        since=since)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Report of the import and initialization time of Invenio extensions.
+
+Extensions registered in the ``invenio_base.apps`` entry point group are
+imported and initialized on a bare application one after the other, in the
+same order as the application factory does:
+
+.. code-block:: console
+
+   $ python -m invenio.startup
+   $ python -m invenio.startup --group invenio_base.api_apps --json
+   $ python -m invenio.startup --budget 1.5
+
+Modules shared by several extensions are accounted to the first extension
+importing them.  With ``--budget`` the command exits with a non-zero status
+when the total startup time exceeds the given number of seconds.
+
+Extensions shipped with this package keep their import and initialization
+cheap: the extension modules only import the configuration, and the
+implementation modules are imported when a command, a task or a request
+first uses them.
+"""
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import sys
+import timeit
+from collections import namedtuple
+
+DEFAULT_GROUPS = ('invenio_base.apps', )
+"""Entry point groups measured by default."""
+
+ExtensionTiming = namedtuple('ExtensionTiming', [
+    'group', 'name', 'module', 'import_time', 'init_time', 'modules', 'error',
+])
+"""Import and initialization time of one extension in seconds."""
+
+
+def measure(groups=DEFAULT_GROUPS, app=None):
+    """Import and initialize the extensions of the given entry point groups.
+
+    :param groups: Entry point groups to load.
+    :param app: Application the extensions are initialized on.  If ``None``
+        only the import time is measured.
+    :returns: List of :class:`ExtensionTiming`.
+    """
+    import pkg_resources
+
+    timer = timeit.default_timer
+    timings = []
+    for group in groups:
+        for ep in pkg_resources.iter_entry_points(group):
+            before = len(sys.modules)
+            import_time = init_time = None
+            error = None
+            try:
+                start = timer()
+                ext = ep.load()
+                import_time = timer() - start
+                if app is not None:
+                    start = timer()
+                    ext(app)
+                    init_time = timer() - start
+            except Exception as e:
+                error = '{0}: {1}'.format(type(e).__name__, e)
+            timings.append(ExtensionTiming(
+                group, ep.name, ep.module_name, import_time, init_time,
+                len(sys.modules) - before, error))
+    return timings
+
+
+def total_time(timings):
+    """Return the sum of import and initialization times."""
+    return sum((t.import_time or 0) + (t.init_time or 0) for t in timings)
+
+
+def format_report(timings):
+    """Return the timings as a list of lines, slowest extension first."""
+    row = '{0:<32} {1:>10} {2:>10} {3:>8}'
+    lines = [row.format('extension', 'import ms', 'init ms', 'modules')]
+    for t in sorted(timings, key=lambda t: -(
+            (t.import_time or 0) + (t.init_time or 0))):
+        lines.append(row.format(
+            t.name,
+            '-' if t.import_time is None else
+            '{0:.1f}'.format(t.import_time * 1000),
+            '-' if t.init_time is None else
+            '{0:.1f}'.format(t.init_time * 1000),
+            t.modules))
+        if t.error:
+            lines.append('    {0}'.format(t.error))
+    lines.append('total: {0:.1f} ms'.format(total_time(timings) * 1000))
+    return lines
+
+
+def create_app():
+    """Create the bare application extensions are initialized on."""
+    from flask import Flask
+    return Flask('invenio')
+
+
+def main(argv=None):
+    """Print the startup report and check it against a budget."""
+    parser = argparse.ArgumentParser(
+        prog='python -m invenio.startup', description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '-g', '--group', action='append', dest='groups',
+        help='entry point group to load (default: invenio_base.apps)')
+    parser.add_argument(
+        '--no-init', action='store_true',
+        help='only import the extensions')
+    parser.add_argument(
+        '--budget', type=float, default=None,
+        help='fail if the total time exceeds this many seconds')
+    parser.add_argument(
+        '--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    app = None if args.no_init else create_app()
+    timings = measure(groups=args.groups or DEFAULT_GROUPS, app=app)
+    total = total_time(timings)
+
+    if args.json:
+        print(json.dumps({
+            'extensions': [t._asdict() for t in timings],
+            'total': total,
+            'budget': args.budget,
+        }, indent=2))
+    else:
+        print('\n'.join(format_report(timings)))
+
+    failed = [t.name for t in timings if t.error]
+    if failed:
+        print('Failed to load {0}.'.format(', '.join(failed)),
+              file=sys.stderr)
+        return 1
+    if args.budget is not None and total > args.budget:
+        print('Startup time {0:.3f}s exceeds the budget of {1:.3f}s.'.format(
+            total, args.budget), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
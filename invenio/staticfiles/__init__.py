@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental, parallel collection of static files and bundle builds.
+
+Deployments copy the static files of all modules into the static folder and
+build the CSS and JavaScript bundles.  The commands of this module record
+the content digest of every copied file and of the inputs of every built
+bundle, so that repeated deployments only copy the changed files and only
+rebuild the bundles whose inputs changed:
+
+.. code-block:: console
+
+   $ python manage.py static collect -v
+   $ python manage.py static build
+
+Files are copied and independent bundles are built concurrently.  Digests
+are cached by file size and modification time, hence a deployment without
+changes does not even read the files again.  Bundle versions default to
+content hashes (``ASSETS_VERSIONS = 'hash'``), so bundles with
+``%(version)s`` in their output name get fingerprinted file names which can
+be cached forever.
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental and parallel building of asset bundles.
+
+A bundle is rebuilt only if the content digest of its input files (and
+their dependencies), its filters or its output name changed since the last
+build.  Changed bundles are independent of each other and are built
+concurrently; filters running external programs (e.g. ``lessc`` or
+``uglifyjs``) thus use several cores.
+
+Bundles whose output contains ``%(version)s`` are written to fingerprinted
+file names (e.g. ``gen/styles.3f2a1b9c.css``), which can be cached by
+browsers forever.  The versions are recorded in the webassets manifest so
+that production processes resolve the URLs without building anything.
+"""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+from .manifest import Manifest
+
+try:
+    string_types = basestring
+except NameError:  # pragma: no cover
+    string_types = str
+
+
+def bundle_name(bundle):
+    """Return the name a bundle is recorded under in the manifest."""
+    return bundle.output or repr(bundle)
+
+
+def bundle_files(bundle, env):
+    """Return the paths of the input and dependency files of a bundle."""
+    files = []
+    for item, path in bundle.resolve_contents(env, force=True):
+        if hasattr(path, 'resolve_contents'):
+            files.extend(bundle_files(path, env))
+        elif isinstance(path, string_types) and os.path.isfile(path):
+            files.append(path)
+    files.extend(bundle.resolve_depends(env))
+    return files
+
+
+def bundle_digest(bundle, env, manifest):
+    """Return the digest of everything the output of a bundle depends on."""
+    digest = hashlib.sha1()
+    digest.update(repr(bundle.output).encode('utf-8'))
+    for flt in bundle.filters:
+        digest.update(repr(flt.id()).encode('utf-8'))
+    for path in bundle_files(bundle, env):
+        digest.update(path.encode('utf-8'))
+        digest.update(manifest.digest(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def _locked_manifest(manifest):
+    """Wrap a webassets manifest to serialize updates from several threads."""
+    from webassets.version import Manifest as BaseManifest
+
+    class LockedManifest(BaseManifest):
+        lock = threading.Lock()
+
+        def remember(self, *args, **kwargs):
+            with self.lock:
+                return manifest.remember(*args, **kwargs)
+
+        def query(self, *args, **kwargs):
+            with self.lock:
+                return manifest.query(*args, **kwargs)
+
+    return LockedManifest()
+
+
+def _output_exists(bundle, env):
+    """Check if the output of a bundle without a version placeholder exists.
+
+    Versioned outputs are assumed to exist; deleted ones are rebuilt with
+    ``force``.
+    """
+    if not bundle.output or '%(version)s' in bundle.output:
+        return True
+    return os.path.exists(os.path.join(env.directory, bundle.output))
+
+
+def build(env, bundles=None, manifest=None, workers=4, force=False,
+          context=None):
+    """Build the changed bundles of a webassets environment.
+
+    :param env: :class:`webassets.Environment`.
+    :param bundles: Bundles to consider (defaults to all bundles of
+        ``env``).
+    :param manifest: Path of the digest manifest (defaults to
+        ``.build-manifest.json`` in the environment directory).
+    :param workers: Number of bundles built concurrently.
+    :param force: Rebuild all bundles.
+    :param context: Function returning a context manager entered by the
+        building threads (e.g. ``app.app_context``).
+    :returns: The pair of lists of built and of unchanged bundle names.
+    """
+    bundles = list(env) if bundles is None else list(bundles)
+    manifest = Manifest(manifest or os.path.join(
+        env.directory, '.build-manifest.json'))
+
+    changed, unchanged = [], []
+    for bundle in bundles:
+        name = bundle_name(bundle)
+        digest = bundle_digest(bundle, env, manifest)
+        if not force and manifest.get(name) == digest and \
+                _output_exists(bundle, env):
+            unchanged.append(name)
+        else:
+            changed.append((bundle, name, digest))
+
+    def run(item):
+        bundle, name, digest = item
+        if context is None:
+            bundle.build(force=True)
+        else:
+            with context():
+                bundle.build(force=True)
+        return name, digest
+
+    webassets_manifest = env.manifest
+    if workers > 1 and len(changed) > 1:
+        if webassets_manifest:
+            env.manifest = _locked_manifest(webassets_manifest)
+        pool = ThreadPool(workers)
+        try:
+            results = pool.map(run, changed)
+        finally:
+            pool.close()
+            pool.join()
+            env.manifest = webassets_manifest
+    else:
+        results = [run(item) for item in changed]
+
+    for name, digest in results:
+        manifest.set(name, digest)
+    manifest.save()
+    return [name for name, digest in results], unchanged
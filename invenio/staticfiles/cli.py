@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Static files command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+
+@click.group()
+def static():
+    """Incremental static files commands."""
+
+
+@static.command()
+@click.option('-w', '--workers', type=int, default=None,
+              help='Number of files copied concurrently.')
+@click.option('--prune', is_flag=True, default=False,
+              help='Remove collected files whose source was removed.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print the copied files.')
+@with_appcontext
+def collect(workers, prune, verbose):
+    """Copy changed static files of all blueprints to the static folder.
+
+    The target folder is ``COLLECT_STATIC_ROOT`` (defaults to the static
+    folder of the application).
+    """
+    from .collect import collect as collect_files
+    from .collect import static_folders
+
+    start = time.time()
+    target = current_app.config.get('COLLECT_STATIC_ROOT') or \
+        current_app.static_folder
+    stats = collect_files(
+        static_folders(current_app), target, prune=prune,
+        workers=workers or current_app.config['STATICFILES_WORKERS'])
+    if verbose:
+        for path in stats.copied:
+            click.echo('Copied {0}'.format(path))
+        for path in stats.removed:
+            click.echo('Removed {0}'.format(path))
+        for path, name in stats.overridden:
+            click.echo('Skipped {0} of {1} (overridden)'.format(path, name))
+    click.echo('{0} copied, {1} unchanged, {2} removed in {3:.1f}s'.format(
+        len(stats.copied), stats.unchanged, len(stats.removed),
+        time.time() - start))
+
+
+@static.command()
+@click.argument('names', nargs=-1)
+@click.option('-w', '--workers', type=int, default=None,
+              help='Number of bundles built concurrently.')
+@click.option('-f', '--force', is_flag=True, default=False,
+              help='Rebuild unchanged bundles.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print the built bundles.')
+@with_appcontext
+def build(names, workers, force, verbose):
+    """Build the asset bundles whose inputs changed.
+
+    Only the bundles registered under NAMES are considered if given.
+    """
+    from .bundles import build as build_bundles
+
+    start = time.time()
+    env = current_app.jinja_env.assets_environment
+    bundles = [env[name] for name in names] if names else None
+    built, unchanged = build_bundles(
+        env, bundles, force=force, context=current_app.app_context,
+        workers=workers or current_app.config['STATICFILES_WORKERS'])
+    if verbose:
+        for name in built:
+            click.echo('Built {0}'.format(name))
+    click.echo('{0} built, {1} unchanged in {2:.1f}s'.format(
+        len(built), len(unchanged), time.time() - start))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Incremental collection of static files.
+
+Static files of all blueprints are copied into one folder, as
+``Flask-Collect`` does, but a file is only copied when its content differs
+from the content copied on the previous run.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+from multiprocessing.pool import ThreadPool
+
+from .manifest import Manifest
+
+
+class CollectStats(object):
+    """Result of a collection."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.copied = []
+        self.unchanged = 0
+        self.removed = []
+        self.overridden = []
+
+
+def static_folders(app):
+    """Return the ``(name, folder)`` pairs of the blueprint static folders.
+
+    Folders are returned in blueprint registration order.
+    """
+    return [(name, blueprint.static_folder)
+            for name, blueprint in app.blueprints.items()
+            if blueprint.static_folder and
+            os.path.isdir(blueprint.static_folder)]
+
+
+def iter_files(folder):
+    """Yield the paths of the files below ``folder`` relative to it."""
+    for root, dirs, files in os.walk(folder, followlinks=True):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, folder).replace(os.sep, '/')
+
+
+def _copy(args):
+    source, target = args
+    directory = os.path.dirname(target)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+    shutil.copy2(source, target)
+
+
+def collect(sources, target, manifest=None, workers=8, prune=False):
+    """Copy the changed static files of ``sources`` into ``target``.
+
+    :param sources: List of ``(name, folder)`` pairs.  If several folders
+        contain the same file, the first one wins.
+    :param target: Folder the files are collected into.
+    :param manifest: Path of the manifest of the collected files (defaults
+        to ``.collect-manifest.json`` in ``target``).
+    :param workers: Number of files copied concurrently.
+    :param prune: Remove files collected on a previous run whose source no
+        longer exists.
+    :returns: :class:`CollectStats`.
+    """
+    stats = CollectStats()
+    manifest = Manifest(manifest or os.path.join(
+        target, '.collect-manifest.json'))
+    previous = set(manifest.entries)
+    selected = {}
+    for name, folder in sources:
+        for path in iter_files(folder):
+            if path in selected:
+                stats.overridden.append((path, name))
+                continue
+            selected[path] = os.path.join(folder, path)
+
+    copies = []
+    for path, source in sorted(selected.items()):
+        digest = manifest.digest(source)
+        destination = os.path.join(target, path)
+        if manifest.get(path) == digest and os.path.exists(destination):
+            stats.unchanged += 1
+            continue
+        copies.append((source, destination))
+        manifest.set(path, digest)
+        stats.copied.append(path)
+
+    if workers > 1 and len(copies) > 1:
+        pool = ThreadPool(workers)
+        try:
+            pool.map(_copy, copies)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for args in copies:
+            _copy(args)
+
+    if prune:
+        for path in sorted(previous - set(selected)):
+            del manifest.entries[path]
+            destination = os.path.join(target, path)
+            if os.path.exists(destination):
+                os.remove(destination)
+            stats.removed.append(path)
+
+    manifest.save()
+    return stats
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Content hash manifests of built and collected files."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def file_digest(path, block_size=1 << 16):
+    """Return the SHA-1 hex digest of the content of a file."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fp:
+        for block in iter(lambda: fp.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest(object):
+    """JSON file mapping names to content digests.
+
+    Digests of files are cached together with their size and modification
+    time, so that unchanged files are not read again on the next run.
+    """
+
+    def __init__(self, path=None):
+        """Load the manifest at ``path`` (if it exists)."""
+        self.path = path
+        self.entries = {}
+        self.files = {}
+        if path and os.path.exists(path):
+            with open(path) as fp:
+                data = json.load(fp)
+            self.entries = data.get('entries', {})
+            self.files = data.get('files', {})
+        self._seen = set()
+
+    def digest(self, path):
+        """Return the digest of the file at ``path``."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = [stat.st_size, stat.st_mtime]
+        self._seen.add(path)
+        cached = self.files.get(path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+        digest = file_digest(path)
+        self.files[path] = key + [digest]
+        return digest
+
+    def get(self, name):
+        """Return the recorded digest of ``name``."""
+        return self.entries.get(name)
+
+    def set(self, name, digest):
+        """Record the digest of ``name``."""
+        self.entries[name] = digest
+
+    def save(self):
+        """Write the manifest, dropping files not looked at in this run."""
+        if not self.path:
+            return
+        files = dict((k, v) for k, v in self.files.items()
+                     if k in self._seen)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.manifest-')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(dict(entries=self.entries, files=files), fp,
+                      sort_keys=True)
+        os.rename(tmp, self.path)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Persistent Jinja bytecode cache and template precompilation.
+
+Jinja compiles a template to Python code the first time it is rendered by a
+process, hence every new worker pays the compilation of all the templates of
+the pages it serves.  This module stores the compiled templates in a
+bytecode cache on disk which is shared by all the workers of a host, and
+provides a command which fills it before the workers start:
+
+.. code-block:: console
+
+   $ python manage.py templates precompile --prune
+
+Workers load the bytecode instead of compiling the templates.  Cache
+entries are keyed by the template name and file, and by the options of the
+Jinja environment which affect the generated code (delimiters, extensions,
+autoescaping).  Jinja itself checks the checksum of the template source
+and its own bytecode version, so changed templates are compiled again on
+their first use.
+
+With ``TEMPLATING_PRELOAD`` processes further load all templates into
+memory before their first request.  Applications preloaded before the
+workers are forked (see :mod:`invenio.preload`) load them only once.
+"""
+
+from __future__ import absolute_import, print_function
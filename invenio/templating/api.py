@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template precompilation and preloading."""
+
+from __future__ import absolute_import, print_function
+
+from jinja2 import TemplateError
+
+
+class PrecompileStats(object):
+    """Result of a precompilation."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.compiled = []
+        self.cached = []
+        self.failed = []
+        self.removed = 0
+
+
+def precompile(environment, names=None, prune=False):
+    """Compile templates into the bytecode cache of an environment.
+
+    Templates whose bytecode is up to date are not compiled again.
+
+    :param environment: Jinja environment with a bytecode cache.
+    :param names: Names of the templates (defaults to all the templates of
+        the environment loader).
+    :param prune: Remove the cache entries of templates which were not
+        looked at.  Entries of other applications sharing the cache
+        directory are removed too.
+    :returns: :class:`PrecompileStats`.
+    """
+    cache = environment.bytecode_cache
+    if cache is None:
+        raise RuntimeError('Environment has no bytecode cache.')
+    if names is None:
+        names = environment.list_templates()
+
+    stats = PrecompileStats()
+    for name in names:
+        try:
+            source, filename, uptodate = environment.loader.get_source(
+                environment, name)
+            bucket = cache.get_bucket(environment, name, filename, source)
+            if bucket.code is not None:
+                stats.cached.append(name)
+                continue
+            bucket.code = environment.compile(source, name, filename)
+            cache.set_bucket(bucket)
+            stats.compiled.append(name)
+        except (TemplateError, UnicodeDecodeError) as e:
+            stats.failed.append((name, e))
+
+    if prune:
+        stats.removed = cache.prune()
+    return stats
+
+
+def preload(app, names=None):
+    """Load templates into the template cache of an application.
+
+    The templates are loaded from the bytecode cache when possible.  Only
+    as many templates as the environment ``cache_size`` stay in memory.
+
+    :returns: Number of loaded templates.
+    """
+    environment = app.jinja_env
+    if names is None:
+        names = environment.list_templates()
+    loaded = 0
+    for name in names:
+        try:
+            environment.get_template(name)
+            loaded += 1
+        except (TemplateError, UnicodeDecodeError):
+            pass
+    return loaded
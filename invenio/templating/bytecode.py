@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Shared on-disk Jinja bytecode cache."""
+
+from __future__ import absolute_import, print_function
+
+import fnmatch
+import hashlib
+import os
+import tempfile
+
+import jinja2
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+FINGERPRINT_OPTIONS = (
+    'block_start_string', 'block_end_string', 'variable_start_string',
+    'variable_end_string', 'comment_start_string', 'comment_end_string',
+    'line_statement_prefix', 'line_comment_prefix', 'trim_blocks',
+    'lstrip_blocks', 'newline_sequence', 'keep_trailing_newline',
+    'optimized', 'autoescape', 'finalize', 'is_async',
+)
+"""Environment attributes which affect the code generated for a template."""
+
+
+def _describe(value):
+    """Return a description of an option value stable across processes."""
+    if callable(value):
+        return '{0}.{1}'.format(
+            getattr(value, '__module__', ''),
+            getattr(value, '__name__', type(value).__name__))
+    return repr(value)
+
+
+def environment_fingerprint(environment):
+    """Return the digest of the code generation options of an environment.
+
+    Environments with different delimiters, extensions or autoescaping
+    generate different code for the same template source.
+    """
+    parts = [jinja2.__version__]
+    parts.extend(_describe(getattr(environment, option, None))
+                 for option in FINGERPRINT_OPTIONS)
+    parts.extend(sorted(environment.extensions))
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class SharedBytecodeCache(FileSystemBytecodeCache):
+    """File system bytecode cache shared by several processes.
+
+    Entries are written atomically, so that processes never load partially
+    written bytecode, and unreadable entries are compiled again.
+    """
+
+    def __init__(self, directory, pattern='__jinja2_%s.cache'):
+        """Initialize the cache in ``directory``."""
+        super(SharedBytecodeCache, self).__init__(directory, pattern)
+        self.used = set()
+        mask = os.umask(0)
+        os.umask(mask)
+        self.file_mode = 0o666 & ~mask
+
+    def get_bucket(self, environment, name, filename, source):
+        """Return the bucket of a template in an environment."""
+        key = self.get_cache_key(u'{0}|{1}'.format(
+            environment_fingerprint(environment), name), filename)
+        bucket = Bucket(environment, key, self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket):
+        """Load the bytecode of a bucket, ignoring unreadable entries."""
+        self.used.add(self._get_cache_filename(bucket))
+        try:
+            super(SharedBytecodeCache, self).load_bytecode(bucket)
+        except (EOFError, ValueError, TypeError):
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        """Write the bytecode of a bucket atomically."""
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                bucket.write_bytecode(fp)
+                # Entries are shared with processes of other users, e.g.
+                # the workers of the web server.
+                os.fchmod(fp.fileno(), self.file_mode)
+            os.rename(tmp, self._get_cache_filename(bucket))
+        except Exception:
+            os.remove(tmp)
+            raise
+
+    def prune(self):
+        """Remove the entries not used since the cache was created.
+
+        :returns: Number of removed entries.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in fnmatch.filter(os.listdir(self.directory),
+                                   self.pattern % '*'):
+            path = os.path.join(self.directory, name)
+            if path not in self.used:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
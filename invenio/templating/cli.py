@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template bytecode cache command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import click
+from flask import current_app
+from flask_cli import with_appcontext
+
+
+@click.group()
+def templates():
+    """Template bytecode cache commands."""
+
+
+@templates.command()
+@click.argument('names', nargs=-1)
+@click.option('--prune', is_flag=True, default=False,
+              help='Remove cache entries of removed templates.')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print the compiled templates.')
+@with_appcontext
+def precompile(names, prune, verbose):
+    """Compile all templates into the bytecode cache.
+
+    Only the templates NAMES are compiled if given.
+    """
+    from .api import precompile as precompile_templates
+
+    start = time.time()
+    stats = precompile_templates(
+        current_app.jinja_env, names=names or None, prune=prune)
+    if verbose:
+        for name in stats.compiled:
+            click.echo('Compiled {0}'.format(name))
+    for name, error in stats.failed:
+        click.secho('Failed {0}: {1}'.format(name, error), fg='yellow',
+                    err=True)
+    click.echo('{0} compiled, {1} up to date, {2} failed, {3} removed '
+               'in {4:.1f}s'.format(len(stats.compiled), len(stats.cached),
+                                    len(stats.failed), stats.removed,
+                                    time.time() - start))
+
+
+@templates.command()
+@with_appcontext
+def clear():
+    """Remove all entries of the bytecode cache."""
+    cache = current_app.jinja_env.bytecode_cache
+    if cache is not None:
+        cache.clear()
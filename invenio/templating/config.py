@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template bytecode cache configuration."""
+
+from __future__ import absolute_import, print_function
+
+TEMPLATING_BYTECODE_CACHE = True
+"""Enable the persistent Jinja bytecode cache."""
+
+TEMPLATING_PRELOAD = True
+"""Load all templates into memory before the first request of a process.
+
+Processes forked from a preloaded application (see
+:func:`invenio.preload.api.preload_app`) find them loaded already.
+"""
+
+TEMPLATING_BYTECODE_CACHE_DIR = None
+"""Directory of the bytecode cache.
+
+Defaults to ``jinja-bytecode`` in the instance folder.  The directory can be
+shared by several applications; their entries are kept apart.
+"""
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template bytecode cache extension."""
+
+from __future__ import absolute_import, print_function
+
+import os
+from functools import partial
+
+from . import config
+
+
+class InvenioTemplating(object):
+    """Invenio template bytecode cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-templating'] = self
+        if app.config['TEMPLATING_PRELOAD']:
+            app.before_first_request(partial(self.preload, app))
+        if not app.config['TEMPLATING_BYTECODE_CACHE']:
+            return
+
+        from .bytecode import SharedBytecodeCache
+
+        cache = SharedBytecodeCache(
+            app.config['TEMPLATING_BYTECODE_CACHE_DIR'] or
+            os.path.join(app.instance_path, 'jinja-bytecode'))
+        if 'jinja_env' in app.__dict__:
+            app.jinja_env.bytecode_cache = cache
+        else:
+            app.jinja_options = dict(app.jinja_options,
+                                     bytecode_cache=cache)
+
+    @staticmethod
+    def preload(app):
+        """Load the templates of ``app`` into memory."""
+        from .api import preload
+        return preload(app)
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('TEMPLATING_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cached current user loading and batched session cleanup.
+
+With Invenio-Accounts every authenticated request loads the user and then
+their roles from the database.  This module replaces the user loader of
+Flask-Login by one reading through a two-tier cache (see
+:class:`~invenio.cache.api.TieredCache`): the columns of the user and their
+roles are cached for ``USERCACHE_TTL`` seconds in the process and in
+Redis, which also invalidates the users cached by other processes.  The
+cache is only enabled with a shared tier:
+
+.. code-block:: python
+
+   USERCACHE_SHARED_URL = 'redis://localhost:6379/3'
+
+Cached users are attached to the database session without a query.  Users
+and roles changed through the ORM are invalidated when the transaction is
+committed; columns which are not cached (e.g. the password hash) are loaded
+when they are accessed.
+
+Expired sessions are deleted in bounded chunks, each in its own short
+transaction, by ``python manage.py usercache sweep-sessions`` or by the
+:func:`~.tasks.sweep_sessions` task, e.g. hourly with Celery beat:
+
+.. code-block:: python
+
+   CELERYBEAT_SCHEDULE = {
+       'sweep-sessions': {
+           'task': 'invenio.usercache.tasks.sweep_sessions',
+           'schedule': crontab(minute=30),
+       },
+   }
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cache of users and their roles."""
+
+from __future__ import absolute_import, print_function
+
+from datetime import datetime
+
+from invenio_db import db
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.types import DateTime
+
+from ..cache.api import TieredCache
+
+_SCALARS = (type(u''), str, int, float, bool, type(None))
+
+_DATE_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S')
+
+
+def user_key(user_id):
+    """Return the cache key of a user."""
+    return 'user:{0}'.format(user_id)
+
+
+def dump(obj, exclude=()):
+    """Return the cacheable column values of an ORM object.
+
+    Values which are not JSON scalars or datetimes (e.g. IP addresses) are
+    left out.
+    """
+    data = {}
+    for prop in inspect(type(obj)).column_attrs:
+        if prop.key in exclude:
+            continue
+        value = getattr(obj, prop.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif not isinstance(value, _SCALARS):
+            continue
+        data[prop.key] = value
+    return data
+
+
+def _parse(value):
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    raise ValueError('Invalid datetime {0!r}'.format(value))
+
+
+def restore(model, data, **relationships):
+    """Return a detached ORM object with the dumped column values.
+
+    Values are set without history, so the object is clean; columns which
+    were not dumped are expired and loaded when accessed.
+
+    :param relationships: Already restored related objects by attribute.
+    """
+    mapper = inspect(model)
+    obj = mapper.class_manager.new_instance()
+    for prop in mapper.column_attrs:
+        if prop.key not in data:
+            continue
+        value = data[prop.key]
+        if value is not None and isinstance(prop.columns[0].type, DateTime):
+            value = _parse(value)
+        set_committed_value(obj, prop.key, value)
+    for key, value in relationships.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return obj
+
+
+class UserCache(TieredCache):
+    """Cache of the columns of users and of their roles.
+
+    Users are returned attached to the database session without querying
+    it, so they can be changed and flushed like loaded users.
+    """
+
+    def __init__(self, exclude=('password', ), **kwargs):
+        """Initialize the cache.
+
+        :param exclude: User columns which are never cached.
+        """
+        super(UserCache, self).__init__(**kwargs)
+        self.exclude = exclude
+
+    def dump_user(self, user):
+        """Return the cacheable value of a user and their roles."""
+        return dict(user=dump(user, exclude=self.exclude),
+                    roles=[dump(role) for role in user.roles])
+
+    def restore_user(self, data):
+        """Return the user of a cached value attached to the session."""
+        from invenio_accounts.models import Role, User
+
+        roles = [restore(Role, role) for role in data['roles']]
+        return db.session.merge(restore(User, data['user'], roles=roles),
+                                load=False)
+
+    def load_user(self, user_id, loader):
+        """Return a user from the cache, calling ``loader`` on a miss.
+
+        :param loader: Function returning the user of an identifier (e.g.
+            the original user loader of Flask-Login) or ``None``.
+        """
+        loaded = []
+
+        def load():
+            user = loader(user_id)
+            if user is None:
+                return None
+            loaded.append(user)
+            return self.dump_user(user)
+
+        data = self.get(user_key(user_id), load)
+        if loaded:
+            return loaded[0]
+        return self.restore_user(data) if data is not None else None
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""User cache command line interface."""
+
+from __future__ import absolute_import, print_function
+
+import click
+from flask_cli import with_appcontext
+
+from .proxies import current_usercache
+
+
+@click.group()
+def usercache():
+    """User cache and session commands."""
+
+
+@usercache.command('sweep-sessions')
+@click.option('-v', '--verbose', is_flag=True, default=False,
+              help='Print progress after each chunk.')
+@with_appcontext
+def sweep_sessions(verbose):
+    """Delete the expired sessions in chunks."""
+    def progress(stats):
+        if verbose:
+            click.echo('{deleted} sessions deleted'.format(**stats),
+                       err=True)
+
+    stats = current_usercache.sweep_sessions(callback=progress)
+    click.echo('{deleted} expired sessions deleted in {chunks} '
+               'chunks'.format(**stats))
+
+
+@usercache.command()
+@click.argument('user_ids', nargs=-1, type=int, required=True)
+@with_appcontext
+def invalidate(user_ids):
+    """Invalidate users changed without the ORM (e.g. with SQL).
+
+    Only the shared tier and the tier of this process are invalidated.
+    """
+    from .api import user_key
+
+    current_usercache.cache.invalidate(user_key(i) for i in user_ids)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""User cache configuration."""
+
+from __future__ import absolute_import, print_function
+
+USERCACHE_ENABLED = True
+"""Load the current user through the cache.
+
+The cache is only used with a shared tier (``USERCACHE_SHARED_URL``).
+"""
+
+USERCACHE_TTL = 60
+"""Seconds users are cached."""
+
+USERCACHE_LOCAL_MAX_ITEMS = 10000
+"""Maximum number of users in the in-process tier (``0`` disables it)."""
+
+USERCACHE_SHARED_URL = None
+"""URL of the shared tier, e.g. ``redis://localhost:6379/3``.
+
+The shared tier also holds the generations used to invalidate the users
+cached by all processes, hence ``None`` disables the cache altogether.
+``memory://`` keeps the shared tier in the process and is only correct when
+a single process serves requests.
+"""
+
+USERCACHE_PREFIX = 'users:'
+"""Prefix of the keys in the shared tier."""
+
+USERCACHE_EXCLUDE = ('password', )
+"""User columns which are never cached."""
+
+USERCACHE_SESSION_LIFETIME = None
+"""Seconds of inactivity after which sessions are swept.
+
+Defaults to ``PERMANENT_SESSION_LIFETIME``.
+"""
+
+USERCACHE_SWEEP_BATCH_SIZE = 1000
+"""Number of expired sessions deleted per transaction."""
+
+USERCACHE_SWEEP_PAUSE = 0.1
+"""Seconds to wait between two chunks of expired sessions."""
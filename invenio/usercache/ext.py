@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""User cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property
+
+from . import config
+
+
+class _UserCacheState(object):
+    """User cache state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def cache(self):
+        """The :class:`~invenio.usercache.api.UserCache` of the application."""
+        from ..cache.clients import create_client
+        from ..cache.lru import LRUCache
+        from .api import UserCache
+
+        max_items = self.app.config['USERCACHE_LOCAL_MAX_ITEMS']
+        url = self.app.config['USERCACHE_SHARED_URL']
+        ttl = self.app.config['USERCACHE_TTL']
+        return UserCache(
+            exclude=self.app.config['USERCACHE_EXCLUDE'],
+            local=LRUCache(max_items=max_items, ttl=ttl)
+            if max_items else None,
+            shared=create_client(url) if url else None,
+            prefix=self.app.config['USERCACHE_PREFIX'],
+            ttl=ttl,
+        )
+
+    @property
+    def session_lifetime(self):
+        """Inactivity after which sessions are swept."""
+        return self.app.config['USERCACHE_SESSION_LIFETIME'] or \
+            self.app.permanent_session_lifetime
+
+    def sweep_sessions(self, callback=None):
+        """Delete the expired sessions in chunks."""
+        from .sweeper import sweep_sessions
+
+        return sweep_sessions(
+            self.session_lifetime,
+            store=getattr(self.app, 'kvsession_store', None),
+            batch_size=self.app.config['USERCACHE_SWEEP_BATCH_SIZE'],
+            pause=self.app.config['USERCACHE_SWEEP_PAUSE'],
+            callback=callback)
+
+
+class InvenioUserCache(object):
+    """Invenio user cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        app.extensions['invenio-usercache'] = _UserCacheState(app)
+        if app.config['USERCACHE_ENABLED'] and \
+                app.config['USERCACHE_SHARED_URL']:
+            if getattr(app, 'login_manager', None) is not None:
+                self.patch_login_manager(app)
+            else:
+                app.before_first_request(
+                    lambda: self.patch_login_manager(app))
+
+    @staticmethod
+    def patch_login_manager(app):
+        """Load the users of the Flask-Login manager through the cache."""
+        from . import receivers
+
+        manager = getattr(app, 'login_manager', None)
+        loader = getattr(manager, 'user_callback', None)
+        if loader is None or getattr(loader, 'cached', False):
+            return
+        state = app.extensions['invenio-usercache']
+
+        def load_user(user_id):
+            return state.cache.load_user(user_id, loader)
+        load_user.cached = True
+
+        manager.user_loader(load_user)
+        receivers.connect()
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('USERCACHE_'):
+                app.config.setdefault(k, getattr(config, k))
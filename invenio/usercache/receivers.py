@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Invalidation of cached users from database session events.
+
+Users changed through the ORM are collected after each flush and
+invalidated once the transaction is committed.  A changed or deleted role
+invalidates all its users, whose identifiers are read from the membership
+table before the flush removes the memberships of deleted roles.
+"""
+
+from __future__ import absolute_import, print_function
+
+import itertools
+
+from flask import current_app, has_app_context
+from invenio_accounts.models import Role, User, userrole
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from .api import user_key
+
+_INFO_KEY = 'invenio-usercache'
+
+
+def collect_roles(session, flush_context, instances):
+    """Remember the cache keys of the users of roles to be flushed."""
+    roles = [obj for obj in itertools.chain(session.dirty, session.deleted)
+             if isinstance(obj, Role)]
+    if not roles:
+        return
+    keys = session.info.setdefault(_INFO_KEY, set())
+    for role in roles:
+        # Users added to the role in this flush are not stored yet.
+        added = attributes.get_history(
+            role, 'users', passive=attributes.PASSIVE_NO_INITIALIZE).added
+        keys.update(user_key(user.id) for user in added or ()
+                    if user.id is not None)
+    role_ids = [role.id for role in roles if role.id is not None]
+    if role_ids:
+        with session.no_autoflush:
+            keys.update(user_key(user_id) for user_id, in session.execute(
+                userrole.select().with_only_columns(
+                    [userrole.c.user_id]).where(
+                        userrole.c.role_id.in_(role_ids))))
+
+
+def collect_changes(session, flush_context):
+    """Remember the cache keys of flushed users."""
+    keys = session.info.setdefault(_INFO_KEY, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            keys.add(user_key(obj.id))
+
+
+def invalidate_changes(session):
+    """Invalidate the users changed by the committed transaction."""
+    keys = session.info.pop(_INFO_KEY, None)
+    if keys and has_app_context():
+        state = current_app.extensions.get('invenio-usercache')
+        if state is not None:
+            state.cache.invalidate(keys)
+
+
+def discard_changes(session):
+    """Forget the users changed by a rolled back transaction."""
+    session.info.pop(_INFO_KEY, None)
+
+
+_listeners = (
+    ('before_flush', collect_roles),
+    ('after_flush', collect_changes),
+    ('after_commit', invalidate_changes),
+    ('after_rollback', discard_changes),
+)
+
+
+def connect():
+    """Listen to the events of all database sessions."""
+    for name, func in _listeners:
+        if not event.contains(Session, name, func):
+            event.listen(Session, name, func)
+
+
+def disconnect():
+    """Stop listening to database session events."""
+    for name, func in _listeners:
+        if event.contains(Session, name, func):
+            event.remove(Session, name, func)
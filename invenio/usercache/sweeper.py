@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Batched deletion of expired sessions."""
+
+from __future__ import absolute_import, print_function
+
+import time
+from datetime import datetime, timedelta
+
+from invenio_accounts.models import SessionActivity
+from invenio_db import db
+
+
+def sweep_sessions(lifetime, store=None, batch_size=1000, pause=0,
+                   callback=None):
+    """Delete the sessions which were not used for ``lifetime``.
+
+    Expired session activities are deleted oldest first in chunks of
+    ``batch_size``, each in its own transaction, so that the table is never
+    locked for long.  The sessions themselves are deleted from ``store``.
+
+    :param lifetime: :class:`~datetime.timedelta` (or seconds) of
+        inactivity after which a session expired.
+    :param store: Key-value store of the sessions (e.g. the
+        ``kvsession_store`` of the application), if any.
+    :param pause: Seconds to wait between two chunks.
+    :param callback: Function called with the statistics after every chunk.
+    :returns: Dictionary with the number of ``deleted`` sessions and of
+        ``chunks``.
+    """
+    if not isinstance(lifetime, timedelta):
+        lifetime = timedelta(seconds=lifetime)
+    before = datetime.utcnow() - lifetime
+    stats = dict(deleted=0, chunks=0)
+    while True:
+        sids = [sid for sid, in db.session.query(
+            SessionActivity.sid_s).filter(
+                SessionActivity.updated < before).order_by(
+                    SessionActivity.updated).limit(batch_size)]
+        if not sids:
+            break
+        if store is not None:
+            for sid in sids:
+                try:
+                    store.delete(sid)
+                except KeyError:
+                    pass
+        SessionActivity.query.filter(SessionActivity.sid_s.in_(sids)).delete(
+            synchronize_session=False)
+        db.session.commit()
+        stats['deleted'] += len(sids)
+        stats['chunks'] += 1
+        if callback:
+            callback(stats)
+        if len(sids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return stats
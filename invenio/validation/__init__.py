@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Cache of compiled JSON schema validators and batch validation.
+
+Validating a record with :func:`jsonschema.validate` fetches its schema and
+every schema it references, checks the schema itself and builds a new
+validator every time.  :class:`~.api.ValidatorCache` does this once per
+schema: validators are kept in an LRU cache keyed by the content hash of
+the schema and of all the schemas it references, which are fetched ahead
+of time so that validation never goes to the network.  Schema URLs are
+fetched again after ``VALIDATION_SCHEMA_TTL`` seconds; a validator is only
+rebuilt when the content changed.
+
+The extension makes the record API validate through the cache and
+:func:`~.api.validate_many` validates a batch of records against the same
+schema, optionally in a process pool, collecting all errors of every
+record:
+
+.. code-block:: python
+
+   from invenio.validation.api import validate_many
+
+   errors = validate_many(records, 'https://example.org/schemas/record.json',
+                          workers=4)
+   invalid = dict((i, e) for i, e in enumerate(errors) if e)
+"""
+
+from __future__ import absolute_import, print_function
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Compiled validator cache and batch validation."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import defaultdict
+
+from ..cache.lru import LRUCache
+from ..ingest.readers import batched
+from ..profiling.api import phase
+
+try:
+    from urllib.parse import urldefrag, urljoin
+except ImportError:  # pragma: no cover
+    from urlparse import urldefrag, urljoin
+
+try:
+    string_types = basestring
+except NameError:  # pragma: no cover
+    string_types = str
+
+
+def fetch_schema(url):
+    """Return the JSON schema at ``url``."""
+    from jsonschema import RefResolver
+    return RefResolver('', {}).resolve_remote(url)
+
+
+def _refs(schema):
+    """Yield the ``$ref`` values of a schema."""
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, string_types):
+                yield ref
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def prefetch(schema, base_uri='', fetch=fetch_schema):
+    """Return the schemas referenced by ``schema``, recursively.
+
+    :returns: Dictionary of the fetched schemas by URL.
+    """
+    store = {}
+    pending = [(base_uri, schema)]
+    while pending:
+        base, document = pending.pop()
+        if isinstance(document, dict):
+            base = urljoin(base, document.get('id', ''))
+        for ref in _refs(document):
+            url = urldefrag(urljoin(base, ref))[0]
+            if url and url != urldefrag(base_uri)[0] and url not in store:
+                store[url] = fetch(url)
+                pending.append((url, store[url]))
+    return store
+
+
+def content_hash(schema, store=None, base_uri=''):
+    """Return the digest of a schema and the schemas it references."""
+    return hashlib.sha1(json.dumps(
+        [base_uri, schema, sorted((store or {}).items())],
+        sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def error_info(error):
+    """Return a picklable description of a validation error."""
+    def pointer(path):
+        return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1')
+                       for part in path)
+    return dict(path=pointer(error.absolute_path),
+                schema_path=pointer(error.absolute_schema_path),
+                validator=error.validator, message=error.message)
+
+
+class CompiledSchema(object):
+    """Checked schema with its referenced schemas.
+
+    Validators are not thread-safe (their reference resolver keeps the
+    resolution scope), hence every thread gets its own.
+    """
+
+    def __init__(self, schema, store, base_uri=''):
+        """Check the schema.
+
+        :raises jsonschema.SchemaError: If the schema is invalid.
+        """
+        from jsonschema.validators import validator_for
+
+        self.schema = schema
+        self.store = store
+        self.base_uri = base_uri
+        self.cls = validator_for(schema)
+        self.cls.check_schema(schema)
+        self._local = threading.local()
+
+    def __getstate__(self):
+        """Return the picklable state."""
+        return (self.schema, self.store, self.base_uri)
+
+    def __setstate__(self, state):
+        """Restore the state in another process."""
+        self.__init__(*state)
+
+    @property
+    def validator(self):
+        """Validator of the current thread."""
+        validator = getattr(self._local, 'validator', None)
+        if validator is None:
+            from jsonschema import RefResolver
+
+            resolver = RefResolver(self.base_uri, self.schema,
+                                   store=self.store)
+            validator = self._local.validator = self.cls(
+                self.schema, resolver=resolver)
+        return validator
+
+    def errors(self, data):
+        """Return the descriptions of all validation errors of ``data``."""
+        return [error_info(e) for e in self.validator.iter_errors(data)]
+
+    def validate(self, data):
+        """Validate ``data``.
+
+        :raises jsonschema.ValidationError: The most relevant error.
+        """
+        from jsonschema.exceptions import best_match
+
+        error = best_match(self.validator.iter_errors(data))
+        if error is not None:
+            raise error
+
+
+class ValidatorCache(object):
+    """LRU cache of compiled schemas by URL and content hash."""
+
+    def __init__(self, max_items=128, ttl=300, fetch=fetch_schema):
+        """Initialize the cache.
+
+        :param max_items: Maximum number of compiled schemas.
+        :param ttl: Seconds after which schema URLs are fetched again.
+        :param fetch: Function returning the schema at a URL.
+        """
+        self.compiled = LRUCache(max_items=max_items)
+        self.urls = LRUCache(max_items=max_items, ttl=ttl)
+        self.fetch = fetch
+        self.stats = defaultdict(int)
+
+    def get(self, schema):
+        """Return the :class:`CompiledSchema` of a schema or schema URL."""
+        if isinstance(schema, dict):
+            key = 'schema:' + content_hash(schema)
+            compiled = self.compiled.get(key)
+            if compiled is None:
+                compiled = self._compile(schema, schema.get('id', ''))
+                self.compiled.set(key, compiled)
+            return compiled
+
+        key = self.urls.get(schema)
+        compiled = self.compiled.get(key) if key is not None else None
+        if compiled is None:
+            self.stats['fetched'] += 1
+            compiled = self._compile(self.fetch(schema), schema)
+            self.urls.set(schema, compiled.key)
+        return compiled
+
+    def _compile(self, schema, base_uri):
+        """Return the compiled schema, unless its content is cached."""
+        store = prefetch(schema, base_uri, fetch=self.fetch)
+        self.stats['fetched'] += len(store)
+        key = content_hash(schema, store, base_uri)
+        compiled = self.compiled.get(key)
+        if compiled is None:
+            compiled = CompiledSchema(schema, store, base_uri)
+            compiled.key = key
+            self.compiled.set(key, compiled)
+            self.stats['compiled'] += 1
+        return compiled
+
+    @phase('jsonschema')
+    def validate(self, data, schema):
+        """Validate ``data`` against a schema or schema URL.
+
+        :raises jsonschema.ValidationError: The most relevant error.
+        """
+        self.get(schema).validate(data)
+
+    def clear(self):
+        """Remove all compiled schemas."""
+        self.compiled.clear()
+        self.urls.clear()
+
+
+default_cache = ValidatorCache()
+"""Validator cache of processes without an application (e.g. workers)."""
+
+_worker_schema = None
+
+
+def _init_worker(compiled):
+    global _worker_schema
+    _worker_schema = compiled
+
+
+def _errors_chunk(chunk):
+    return [_worker_schema.errors(data) for data in chunk]
+
+
+def validate_many(records, schema, workers=0, chunk_size=100, cache=None):
+    """Validate records against the same schema and collect all errors.
+
+    :param records: Iterable of records.
+    :param schema: Schema or schema URL.
+    :param workers: Number of validation processes (``0`` validates in the
+        current process, ``None`` uses all CPUs).
+    :param chunk_size: Number of records sent to a process at once.
+    :param cache: :class:`ValidatorCache` (defaults to
+        :data:`default_cache`).
+    :returns: List with the list of errors (see :func:`error_info`) of every
+        record, in input order.  Valid records have no errors.
+    """
+    compiled = (cache or default_cache).get(schema)
+    if workers == 0:
+        return [compiled.errors(data) for data in records]
+
+    pool = multiprocessing.Pool(workers, initializer=_init_worker,
+                                initargs=(compiled, ))
+    try:
+        results = []
+        for errors in pool.imap(_errors_chunk,
+                                batched(records, chunk_size)):
+            results.extend(errors)
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+    return results
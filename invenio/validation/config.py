@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Validator cache configuration."""
+
+from __future__ import absolute_import, print_function
+
+VALIDATION_CACHE_SIZE = 128
+"""Maximum number of compiled validators kept per process."""
+
+VALIDATION_SCHEMA_TTL = 300
+"""Seconds after which a schema URL is fetched again (``None`` for never).
+
+The validator is only rebuilt if the content of the schema, or of a schema
+it references, changed.
+"""
+
+VALIDATION_RECORDS = True
+"""Validate records of the record API through the validator cache."""
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Validator cache extension."""
+
+from __future__ import absolute_import, print_function
+
+from werkzeug.utils import cached_property
+
+from . import config
+
+
+class _ValidationState(object):
+    """Validator cache state."""
+
+    def __init__(self, app):
+        """Initialize state."""
+        self.app = app
+
+    @cached_property
+    def cache(self):
+        """The :class:`~invenio.validation.api.ValidatorCache`."""
+        from .api import ValidatorCache, fetch_schema
+
+        records = self.app.extensions.get('invenio-records')
+        resolver_cls = getattr(records, 'ref_resolver_cls', None)
+        if resolver_cls is not None:
+            def fetch(url):
+                return resolver_cls.from_schema({}).resolve_from_url(url)
+        else:
+            fetch = fetch_schema
+        return ValidatorCache(
+            max_items=self.app.config['VALIDATION_CACHE_SIZE'],
+            ttl=self.app.config['VALIDATION_SCHEMA_TTL'],
+            fetch=fetch,
+        )
+
+
+def _cached_validate(state, validate):
+    """Wrap the record validation of Invenio-Records."""
+    def cached_validate(data, schema, **kwargs):
+        if kwargs or state.app.config.get('RECORDS_VALIDATION_TYPES'):
+            return validate(data, schema, **kwargs)
+        return state.cache.validate(data, schema)
+    return cached_validate
+
+
+class InvenioValidation(object):
+    """Invenio validator cache extension."""
+
+    def __init__(self, app=None):
+        """Extension initialization."""
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Flask application initialization."""
+        self.init_config(app)
+        state = _ValidationState(app)
+        app.extensions['invenio-validation'] = state
+        if app.config['VALIDATION_RECORDS']:
+            if 'invenio-records' in app.extensions:
+                self.patch_records(app)
+            else:
+                app.before_first_request(lambda: self.patch_records(app))
+
+    @staticmethod
+    def patch_records(app):
+        """Validate the records of ``app`` through the validator cache.
+
+        Validations with extra arguments (e.g. a ``format_checker``) or
+        custom ``RECORDS_VALIDATION_TYPES`` are left to Invenio-Records.
+        """
+        records = app.extensions.get('invenio-records')
+        if records is None or getattr(records.validate, 'cached', False):
+            return
+        records.validate = _cached_validate(
+            app.extensions['invenio-validation'], records.validate)
+        records.validate.cached = True
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith('VALIDATION_'):
+                app.config.setdefault(k, getattr(config, k))
@@ -137,8 +137,9 @@ cd -
 # sphinxdoc-run-bower-end
 
 # sphinxdoc-collect-and-build-assets-begin
-python manage.py collect -v
-python manage.py assets build
+python manage.py static collect -v
+python manage.py static build
+python manage.py templates precompile --prune
 # sphinxdoc-collect-and-build-assets-end
 
 # sphinxdoc-create-database-begin
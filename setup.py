@@ -74,6 +74,13 @@ extras_require = {
     'docs': [
         'Sphinx>=1.3',
     ],
+    'packing': [
+        'msgpack>=0.5.2',
+        'zstandard>=0.8.0',
+    ],
+    'redis': [
+        'redis>=2.10.0',
+    ],
     'tests': tests_require,
 }
 
@@ -169,7 +176,100 @@ setup(
     zip_safe=False,
     include_package_data=True,
     platforms='any',
-    entry_points={},
+    entry_points={
+        'flask.commands': [
+            'access-index = invenio.accessindex.cli:access_index',
+            'batching = invenio.batching.cli:batching',
+            'dbpool = invenio.dbpool.cli:dbpool',
+            'duplicates = invenio.duplicates.cli:duplicates',
+            'export = invenio.export.cli:export',
+            'facets = invenio.facets.cli:facets',
+            'files = invenio.files.cli:files',
+            'formatter = invenio.formatter.cli:formatter',
+            'harvester = invenio.harvester.cli:harvester',
+            'index = invenio.indexer.cli:index',
+            'ingest = invenio.ingest.cli:ingest',
+            'packing = invenio.packing.cli:packing',
+            'revisions = invenio.revisions.cli:revisions',
+            'static = invenio.staticfiles.cli:static',
+            'templates = invenio.templating.cli:templates',
+            'usercache = invenio.usercache.cli:usercache',
+        ],
+        'invenio_base.apps': [
+            'invenio_accessindex = '
+            'invenio.accessindex.ext:InvenioAccessIndex',
+            'invenio_batching = invenio.batching.ext:InvenioBatching',
+            'invenio_dbpool = invenio.dbpool.ext:InvenioDBPool',
+            'invenio_duplicates = invenio.duplicates.ext:InvenioDuplicates',
+            'invenio_export = invenio.export.ext:InvenioExport',
+            'invenio_facets = invenio.facets.ext:InvenioFacets',
+            'invenio_files = invenio.files.ext:InvenioFiles',
+            'invenio_formatter = invenio.formatter.ext:InvenioFormatter',
+            'invenio_harvester = invenio.harvester.ext:InvenioHarvester',
+            'invenio_indexer = invenio.indexer.ext:InvenioIndexer',
+            'invenio_ingest = invenio.ingest.ext:InvenioIngest',
+            'invenio_packing = invenio.packing.ext:InvenioPacking',
+            'invenio_profiling = invenio.profiling.ext:InvenioProfiling',
+            'invenio_records_cache = invenio.cache.ext:InvenioRecordsCache',
+            'invenio_revisions = invenio.revisions.ext:InvenioRevisions',
+            'invenio_staticfiles = '
+            'invenio.staticfiles.ext:InvenioStaticFiles',
+            'invenio_templating = invenio.templating.ext:InvenioTemplating',
+            'invenio_usercache = invenio.usercache.ext:InvenioUserCache',
+            'invenio_validation = invenio.validation.ext:InvenioValidation',
+        ],
+        'invenio_base.api_apps': [
+            'invenio_accessindex = '
+            'invenio.accessindex.ext:InvenioAccessIndex',
+            'invenio_dbpool = invenio.dbpool.ext:InvenioDBPool',
+            'invenio_duplicates = invenio.duplicates.ext:InvenioDuplicates',
+            'invenio_export = invenio.export.ext:InvenioExport',
+            'invenio_facets = invenio.facets.ext:InvenioFacets',
+            'invenio_files = invenio.files.ext:InvenioFiles',
+            'invenio_formatter = invenio.formatter.ext:InvenioFormatter',
+            'invenio_packing = invenio.packing.ext:InvenioPacking',
+            'invenio_profiling = invenio.profiling.ext:InvenioProfiling',
+            'invenio_records_cache = invenio.cache.ext:InvenioRecordsCache',
+            'invenio_revisions = invenio.revisions.ext:InvenioRevisions',
+            'invenio_usercache = invenio.usercache.ext:InvenioUserCache',
+            'invenio_validation = invenio.validation.ext:InvenioValidation',
+        ],
+        'invenio_base.blueprints': [
+            'invenio_dbpool = invenio.dbpool.views:blueprint',
+            'invenio_facets = invenio.facets.views:blueprint',
+            'invenio_files = invenio.files.views:blueprint',
+            'invenio_formatter = invenio.formatter.views:blueprint',
+            'invenio_profiling = invenio.profiling.views:blueprint',
+        ],
+        'invenio_base.api_blueprints': [
+            'invenio_dbpool = invenio.dbpool.views:blueprint',
+            'invenio_facets = invenio.facets.views:blueprint',
+            'invenio_files = invenio.files.views:blueprint',
+            'invenio_formatter = invenio.formatter.views:blueprint',
+            'invenio_export = invenio.export.views:blueprint',
+            'invenio_profiling = invenio.profiling.views:blueprint',
+        ],
+        'invenio_celery.tasks': [
+            'invenio_facets = invenio.facets.tasks',
+            'invenio_formatter = invenio.formatter.tasks',
+            'invenio_harvester = invenio.harvester.tasks',
+            'invenio_indexer = invenio.indexer.tasks',
+            'invenio_revisions = invenio.revisions.tasks',
+            'invenio_usercache = invenio.usercache.tasks',
+        ],
+        'invenio_db.models': [
+            'invenio_accessindex = invenio.accessindex.models',
+            'invenio_duplicates = invenio.duplicates.models',
+            'invenio_facets = invenio.facets.models',
+            'invenio_files = invenio.files.models',
+            'invenio_formatter = invenio.formatter.models',
+            'invenio_harvester = invenio.harvester.models',
+            'invenio_indexer = invenio.indexer.models',
+            'invenio_ingest = invenio.ingest.models',
+            'invenio_packing = invenio.packing.models',
+            'invenio_revisions = invenio.revisions.models',
+        ],
+    },
     extras_require=extras_require,
     install_requires=install_requires,
     setup_requires=setup_requires,
@@ -27,4 +27,47 @@
 
 from __future__ import absolute_import, print_function
 
+import os
+
 import pytest
+
+
+@pytest.fixture()
+def app(request):
+    """Flask application with the records stack on an SQLite database."""
+    for name in ('flask_cli', 'invenio_db', 'invenio_pidstore',
+                 'invenio_records'):
+        pytest.importorskip(name)
+
+    from flask import Flask
+    from flask_cli import FlaskCLI
+    from invenio_db import InvenioDB, db
+    from invenio_pidstore import InvenioPIDStore
+    from invenio_records import InvenioRecords
+
+    from invenio.indexer.ext import InvenioIndexer
+    from invenio.ingest.ext import InvenioIngest
+
+    app = Flask('testapp')
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=os.environ.get(
+            'SQLALCHEMY_DATABASE_URI', 'sqlite://'),
+        INDEXER_REGISTER_SIGNALS=False,
+    )
+    FlaskCLI(app)
+    InvenioDB(app)
+    InvenioPIDStore(app)
+    InvenioRecords(app)
+    InvenioIndexer(app)
+    InvenioIngest(app)
+
+    with app.app_context():
+        db.create_all()
+
+    def teardown():
+        with app.app_context():
+            db.drop_all()
+
+    request.addfinalizer(teardown)
+    return app
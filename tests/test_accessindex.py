@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Access index tests."""
+
+from __future__ import absolute_import, print_function
+
+from invenio.accessindex.bitmap import Bitmap
+from invenio.accessindex.changes import PUBLIC, bit_changes, record_keys
+
+
+def test_bitmap():
+    """Test set operations and serialization of bitmaps."""
+    bitmap = Bitmap.from_values([3, 0, 700, 3, 64])
+    assert list(bitmap) == [0, 3, 64, 700]
+    assert len(bitmap) == 4
+    assert 700 in bitmap and 701 not in bitmap and -1 not in bitmap
+    assert bitmap.filter([701, 64, 5, 0, 100000]) == [64, 0]
+
+    bitmap.add(5)
+    bitmap.discard(3)
+    bitmap.discard(4)
+    assert bitmap.filter([3, 5]) == [5]
+    assert Bitmap.loads(bitmap.dumps()) == bitmap
+    assert Bitmap.loads(Bitmap().dumps()) == Bitmap()
+    assert not Bitmap.from_values([])
+
+    other = Bitmap.from_values([5, 6])
+    assert list(bitmap & other) == [5]
+    assert list(bitmap - other) == [0, 64, 700]
+    assert list(Bitmap.union([bitmap, other])) == [0, 5, 6, 64, 700]
+
+    chunks = {0: Bitmap.from_values([1]), 2: Bitmap.from_values([0, 255])}
+    assert list(Bitmap.from_chunks(chunks, 8)) == [1, 512, 767]
+    assert list(Bitmap.from_chunks({1: Bitmap.from_values([7])}, 3)) == [15]
+    assert not Bitmap.from_chunks({}, 3)
+
+
+def test_record_keys():
+    """Test the bitmaps a record is indexed in."""
+    data = {'recid': 7, '_access': {'read': ['admins', 'cern']}}
+    assert record_keys(data) == (7, set(['admins', 'cern']))
+    assert record_keys({'recid': 8}) == (8, set([PUBLIC]))
+    assert record_keys({'recid': '8'}) == (None, set())
+    assert record_keys({'recid': True}) == (None, set())
+    assert record_keys(None) == (None, set())
+
+
+def test_bit_changes():
+    """Test changed roles and identifiers of records."""
+    changes = bit_changes([
+        ((None, set()), (1, set(['a']))),
+        ((2, set(['a', 'b'])), (2, set(['b', 'c']))),
+        ((3, set(['c'])), (4, set(['c']))),
+        ((5, set([PUBLIC])), (None, set())),
+    ])
+    assert changes == {
+        'a': (set([1]), set([2])),
+        'c': (set([2, 4]), set([3])),
+        PUBLIC: (set(), set([5])),
+    }
+
+
+def test_access_index(app):
+    """Test incremental indexing and filtering."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.accessindex.ext import InvenioAccessIndex
+    from invenio.accessindex.proxies import current_access_index
+
+    app.config['ACCESS_INDEX_CHUNK_BITS'] = 3
+    InvenioAccessIndex(app)
+    with app.app_context():
+        db.create_all()
+        Record.create({'recid': 1})
+        restricted = Record.create({'recid': 2,
+                                    '_access': {'read': ['admins']}})
+        Record.create({'recid': 3, '_access': {'read': ['cern']}})
+        db.session.commit()
+        index = current_access_index.index
+        assert index.filter([3, 2, 1], []) == [1]
+        assert index.filter([3, 2, 1], ['admins', 'cern']) == [3, 2, 1]
+
+        restricted['_access']['read'] = ['cern']
+        restricted.commit()
+        db.session.commit()
+        assert index.filter([3, 2, 1], ['admins']) == [1]
+        assert index.filter([3, 2, 1], ['cern']) == [3, 2, 1]
+
+        stats = index.rebuild()
+        assert stats == dict(records=3, indexed=3, bitmaps=2)
+        assert list(index.bitmap('cern')) == [2, 3]
+
+
+def test_access_index_processes(app):
+    """Test chunks, bulk loading and changes made by other processes."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.accessindex import receivers
+    from invenio.accessindex.api import AccessIndex
+    from invenio.accessindex.ext import InvenioAccessIndex
+    from invenio.accessindex.models import AccessBitmap
+    from invenio.accessindex.proxies import current_access_index
+
+    app.config['ACCESS_INDEX_CHUNK_BITS'] = 3
+    InvenioAccessIndex(app)
+    try:
+        with app.app_context():
+            app.extensions['invenio-ingest'].loader(workers=0).load(
+                [{'recid': recid, '_access': {'read': ['cern']}}
+                 for recid in (1, 9, 17)])
+            index = current_access_index.index
+            assert list(index.bitmap('cern')) == [1, 9, 17]
+            assert AccessBitmap.query.filter_by(key='cern').count() == 3
+
+            # Another process, with its own cached chunks.
+            other = AccessIndex(chunk_bits=3)
+            assert other.filter([1, 9, 17], ['cern']) == [1, 9, 17]
+            record = Record.create({'recid': 6, '_access': {'read': ['cern']}})
+            db.session.commit()
+            assert other.filter([1, 6, 9, 17], ['cern']) == [1, 6, 9, 17]
+            record['_access']['read'] = ['admins']
+            record.commit()
+            db.session.commit()
+            assert other.filter([1, 6, 9, 17], ['cern']) == [1, 9, 17]
+            assert list(other.bitmap('admins')) == [6]
+
+            # Rebuilds keep the chunk versions of other processes valid.
+            index.rebuild()
+            assert list(other.bitmap('admins')) == [6]
+            receivers.disconnect()
+            record['_access']['read'] = ['cern']
+            record.commit()
+            db.session.commit()
+            index.rebuild()
+            assert list(other.bitmap('admins')) == []
+            assert other.filter([1, 6, 9, 17], ['cern']) == [1, 6, 9, 17]
+    finally:
+        receivers.disconnect()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Task batching tests."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import pytest
+
+from invenio.batching.api import Batcher, BatchItemError, run_batch
+
+
+class _Result(object):
+    """Result of a chunk processed in place."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def ready(self):
+        return True
+
+    def get(self, timeout=None):
+        return self.value
+
+
+def _inverse(item):
+    return 1.0 / item
+
+
+def _batcher(chunks, **kwargs):
+    def dispatch(items):
+        chunks.append(list(items))
+        return _Result(run_batch(_inverse, items))
+    return Batcher(dispatch, **kwargs)
+
+
+def test_run_batch():
+    """Test that failing items do not affect the others."""
+    assert run_batch(_inverse, [1, 0, 4]) == [
+        [True, 1.0], [False, 'ZeroDivisionError: float division by zero'],
+        [True, 0.25]]
+
+
+def test_chunks():
+    """Test dispatching full chunks and per-item results."""
+    chunks = []
+    batcher = _batcher(chunks, max_items=3, window=None)
+    results = [batcher.add(i) for i in (1, 2, 0, 4, 5)]
+    assert chunks == [[1, 2, 0]]
+    assert results[1].get() == 0.5
+    with pytest.raises(BatchItemError):
+        results[2].get()
+
+    # Getting the result of a collected item dispatches its chunk.
+    assert not results[4].ready()
+    assert results[4].get() == 0.2
+    assert chunks == [[1, 2, 0], [4, 5]]
+    assert batcher.stats['items'] == 5 and batcher.stats['chunks'] == 2
+
+
+def test_window():
+    """Test dispatching chunks after the collection window."""
+    chunks = []
+    batcher = _batcher(chunks, max_items=100, window=0.05)
+    result = batcher.add(1)
+    batcher.add(2)
+    assert chunks == []
+    time.sleep(0.2)
+    assert chunks == [[1, 2]]
+    assert result.ready() and result.get() == 1.0
+    batcher.add(4)
+    batcher.flush()
+    time.sleep(0.1)
+    assert chunks == [[1, 2], [4]]
+
+
+def test_disabled():
+    """Test sending one task per item when batching is disabled."""
+    chunks = []
+    batcher = _batcher(chunks, max_items=100, enabled=False)
+    assert [batcher.add(i).get() for i in (1, 2)] == [1.0, 0.5]
+    assert chunks == [[1], [2]]
+
+
+def test_dispatch_error():
+    """Test that dispatch errors are raised for the items of the chunk."""
+    def dispatch(items):
+        raise IOError('broker unavailable')
+
+    batcher = Batcher(dispatch, max_items=2, window=None)
+    result = batcher.add(1)
+    with pytest.raises(IOError):
+        batcher.add(2)
+    with pytest.raises(IOError):
+        result.get()
+
+
+def test_celery_eager():
+    """Test chunked tasks in Celery eager mode."""
+    pytest.importorskip('celery')
+    pytest.importorskip('flask')
+    from celery import Celery
+    from flask import Flask
+
+    from invenio.batching.api import batched_task
+    from invenio.batching.ext import InvenioBatching
+
+    celery = Celery('testapp')
+    celery.conf.update(CELERY_ALWAYS_EAGER=True, task_always_eager=True)
+    celery.set_default()
+
+    app = Flask('testapp')
+    app.config.update(BATCHING_MAX_ITEMS=2)
+    InvenioBatching(app)
+
+    calls = []
+
+    @batched_task(name='tests.inverse')
+    def inverse(item):
+        calls.append(item)
+        return _inverse(item)
+
+    with app.app_context():
+        results = [inverse.delay(i) for i in (1, 2, 0)]
+        inverse.flush()
+    assert [r.get() for r in results[:2]] == [1.0, 0.5]
+    with pytest.raises(BatchItemError):
+        results[2].get()
+    assert calls == [1, 2, 0]
+    assert inverse.batcher.stats['chunks'] == 2
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Benchmark suite tests."""
+
+from __future__ import absolute_import, print_function
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from invenio.benchmarks import runner
+from invenio.benchmarks.__main__ import main
+
+
+@pytest.fixture()
+def registry(monkeypatch):
+    """Empty benchmark registry."""
+    monkeypatch.setattr(runner, 'registry', runner.OrderedDict())
+    return runner.registry
+
+
+@contextmanager
+def _environment():
+    yield {'calls': 0}
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    samples = list(range(1, 101))
+    assert runner.percentile(samples, 50) == 50
+    assert runner.percentile(samples, 99) == 99
+    assert runner.percentile([7], 99) == 7
+    assert runner.percentile([], 50) is None
+
+
+def test_run(registry):
+    """Test running registered cases."""
+    @runner.benchmark('dummy.op', iterations=20, items=10)
+    def dummy(env):
+        def operation():
+            env['calls'] += 1
+        return operation
+
+    @runner.benchmark('other.op')
+    def other(env):
+        return lambda: None
+
+    report = runner.run(_environment, names=['dummy'], warmup=5)
+    assert list(report['benchmarks']) == ['dummy.op']
+    result = report['benchmarks']['dummy.op']
+    assert result['iterations'] == 20
+    assert result['p50'] <= result['p99'] <= result['max']
+    json.dumps(report)
+
+
+def test_compare():
+    """Test detection of regressions against a baseline."""
+    baseline = {'benchmarks': {
+        'a': {'throughput': 100.0, 'p50': 0.010, 'p99': 0.020},
+        'b': {'throughput': 100.0, 'p50': 0.010, 'p99': 0.020},
+    }}
+    report = {'benchmarks': {
+        'a': {'throughput': 95.0, 'p50': 0.0105, 'p99': 0.019},
+        'b': {'throughput': 50.0, 'p50': 0.010, 'p99': 0.030},
+        'c': {'throughput': 1.0, 'p50': 1.0, 'p99': 1.0},
+    }}
+    regressions = runner.compare(report, baseline, tolerance=0.1)
+    assert [(r.name, r.metric) for r in regressions] == [
+        ('b', 'throughput'), ('b', 'p99')]
+
+
+def test_reference_baseline(registry, monkeypatch, tmpdir, capsys):
+    """Test updating and comparing with the reference baseline."""
+    import invenio.benchmarks.__main__ as cli
+
+    path = str(tmpdir.join('baseline.json'))
+    monkeypatch.setattr(cli, 'DEFAULT_BASELINE', path)
+    assert main(['--update-baseline']) == 0
+    baseline = runner.load_report(path)
+    assert baseline['benchmarks'] == {}
+
+    baseline['python'] = '0.0'
+    with open(path, 'w') as fp:
+        runner.dump_report(baseline, fp)
+    assert main([]) == 0
+    assert 'WARNING baseline python 0.0' in capsys.readouterr()[1]
+    assert main(['--no-baseline']) == 0
+    assert 'WARNING' not in capsys.readouterr()[1]
+
+    tmpdir.join('baseline.json').remove()
+    assert main([]) == 0
+    assert 'WARNING reference baseline' in capsys.readouterr()[1]
+
+
+def test_baseline_missing_cases(registry, monkeypatch, tmpdir, capsys):
+    """Test that cases without baseline results are reported."""
+    import invenio.benchmarks.__main__ as cli
+
+    monkeypatch.setattr(cli, 'environment', lambda **kwargs: _environment())
+    runner.benchmark('noop', iterations=2)(lambda env: lambda: None)
+    path = str(tmpdir.join('baseline.json'))
+    with open(path, 'w') as fp:
+        runner.dump_report({'benchmarks': {}}, fp)
+    assert main(['--baseline', path, '-n', '2']) == 0
+    assert 'WARNING baseline has no results for noop' in \
+        capsys.readouterr()[1]
+
+
+def test_shipped_baseline():
+    """Test that the reference baseline is part of the source tree."""
+    assert 'benchmarks' in runner.load_report(runner.DEFAULT_BASELINE)
+
+
+def test_list(capsys):
+    """Test listing of the shipped cases."""
+    assert main(['--list']) == 0
+    out = capsys.readouterr()[0]
+    for name in ('records.create', 'pidstore.resolve', 'rest.get_record',
+                 'jsonschema.validate', 'templates.render', 'ingest.bulk'):
+        assert name in out
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record read cache tests."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+from invenio.cache.api import TieredCache, pid_key, record_key
+from invenio.cache.clients import MemoryClient, create_client
+from invenio.cache.lru import LRUCache
+
+
+def test_lru_eviction():
+    """Test eviction by item count and by size."""
+    cache = LRUCache(max_items=3, max_size=10)
+    for key in 'abc':
+        cache.set(key, key, size=2)
+    assert cache.get('a') == 'a'
+    cache.set('d', 'd', size=2)
+    assert 'b' not in cache
+    cache.set('e', 'e', size=7)
+    assert len(cache) == 2 and cache.size == 9
+    assert cache.get('a') is None
+    cache.set('huge', 'x', size=11)
+    assert 'huge' not in cache
+    assert cache.evictions == 3
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_ttl():
+    """Test expiration."""
+    cache = LRUCache(ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is None
+    assert cache.size == 0
+
+
+def test_memory_client():
+    """Test the Redis stand-in."""
+    client = create_client('memory://')
+    assert isinstance(client, MemoryClient)
+    client.set('a', 'x')
+    assert client.mget(['a', 'b']) == [b'x', None]
+    assert client.incr('n') == 1 and client.incr('n') == 2
+    assert client.get('n') == b'2'
+    assert client.delete('a', 'b') == 1
+    client.setex('t', 0.01, 'y')
+    time.sleep(0.02)
+    assert client.get('t') is None
+
+
+class Loader(object):
+    """Counting loader."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_tiers():
+    """Test serving from the local and the shared tier."""
+    shared = MemoryClient()
+    first = TieredCache(local=LRUCache(), shared=shared)
+    second = TieredCache(local=LRUCache(), shared=shared)
+    loader = Loader({'title': 'A'})
+
+    assert first.get('k', loader) == {'title': 'A'}
+    assert first.get('k', loader) == {'title': 'A'}
+    assert second.get('k', loader) == {'title': 'A'}
+    assert second.get('k', loader) == {'title': 'A'}
+    assert loader.calls == 1
+    assert first.stats == {'misses': 1, 'local_hits': 1}
+    assert second.stats == {'shared_hits': 1, 'local_hits': 1}
+
+    # An invalidation in one process is seen by the others.
+    loader.value = {'title': 'B'}
+    second.invalidate(['k'])
+    assert first.get('k', loader) == {'title': 'B'}
+    assert second.get('k', loader) == {'title': 'B'}
+    assert loader.calls == 2
+
+    assert first.get('none', Loader(None)) is None
+    assert first.get('none', loader) == {'title': 'B'}
+
+
+def test_concurrent_invalidation():
+    """Test that values loaded during an invalidation are not served."""
+    for shared in (MemoryClient(), None):
+        cache = TieredCache(local=LRUCache(), shared=shared)
+
+        def stale_loader():
+            cache.invalidate(['k'])
+            return 'stale'
+
+        assert cache.get('k', stale_loader) == 'stale'
+        assert cache.get('k', Loader('fresh')) == 'fresh'
+        assert cache.get('k', Loader('other')) == 'fresh'
+
+
+def test_generation_ttl():
+    """Test that generations expire after the local values."""
+    shared = MemoryClient()
+    cache = TieredCache(local=LRUCache(ttl=0.01), shared=shared, ttl=0.01)
+    cache.invalidate(['k'])
+    assert shared.get('cache:gen:k') == b'1'
+    assert cache.get('k', Loader(1)) == 1
+    time.sleep(0.03)
+    assert shared.get('cache:gen:k') is None
+    assert cache.get('k', Loader(2)) == 2
+
+
+def test_without_local_tier():
+    """Test a cache with only the shared tier."""
+    cache = TieredCache(shared=MemoryClient())
+    loader = Loader(1)
+    assert cache.get('k', loader) == cache.get('k', loader) == 1
+    assert loader.calls == 1
+
+
+def test_keys():
+    """Test cache keys."""
+    assert pid_key('recid', '1') == 'pid:recid:1'
+    assert record_key('abc') == 'rec:abc'
+
+
+def test_resolver(app):
+    """Test resolving through the cache and invalidation on commit."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.cache.api import CachedResolver
+    from invenio.cache.ext import InvenioRecordsCache
+    from invenio.cache.proxies import current_records_cache
+
+    app.config.update(
+        RECORDS_CACHE_SHARED_URL='memory://',
+        RECORDS_UI_ENDPOINTS=dict(recid=dict(pid_type='recid')),
+    )
+    InvenioRecordsCache(app)
+    with app.app_context():
+        from invenio.cache.records import CachedRecord
+
+        assert app.config['RECORDS_UI_ENDPOINTS']['recid'][
+            'record_class'] is CachedRecord
+        app.extensions['invenio-ingest'].loader(workers=0).load(
+            [{'title': 'Cached', 'recid': 1}])
+        resolver = CachedResolver(pid_type='recid')
+        pid, record = resolver.resolve('1')
+        assert record['title'] == 'Cached'
+        pid, record = resolver.resolve('1')
+        assert current_records_cache.stats['local_hits'] == 2
+        assert record.revision_id is not None
+        assert record.created == Record.get_record(pid.object_uuid).created
+        assert CachedRecord.get_record(pid.object_uuid)['title'] == 'Cached'
+
+        record = Record.get_record(pid.object_uuid)
+        record['title'] = 'Changed'
+        record.commit()
+        db.session.commit()
+        assert resolver.resolve('1')[1]['title'] == 'Changed'
+
+
+def test_disabled_without_shared_tier(app):
+    """Test that only a shared tier enables the cache."""
+    from invenio.cache.ext import InvenioRecordsCache
+    from invenio.cache.proxies import current_records_cache
+
+    InvenioRecordsCache(app)
+    with app.app_context():
+        assert current_records_cache.cache.local is None
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Connection pool instrumentation tests."""
+
+from __future__ import absolute_import, print_function
+
+import gc
+import json
+import threading
+import time
+
+import pytest
+
+from invenio.dbpool.ext import detect_role
+
+
+@pytest.mark.parametrize('argv,role', [
+    (['/usr/bin/celery', 'worker', '-A', 'app.celery'], 'worker'),
+    (['/usr/bin/inveniomanage', 'celery', 'worker'], 'worker'),
+    (['/usr/bin/gunicorn', 'app.wsgi'], 'web'),
+    (['uwsgi', '--ini', 'app.ini'], 'web'),
+    (['manage.py', 'runserver'], 'web'),
+    (['flask', 'run'], 'web'),
+    (['manage.py', 'ingest', 'load'], 'cli'),
+    ([], 'web'),
+])
+def test_detect_role(argv, role):
+    """Test detecting the role of a process."""
+    assert detect_role(argv) == role
+
+
+def test_monitor_concurrent_load(tmpdir):
+    """Test pool metrics under more concurrent callers than connections."""
+    pytest.importorskip('sqlalchemy')
+    from sqlalchemy import create_engine, exc, text
+    from sqlalchemy.pool import QueuePool
+
+    from invenio.dbpool import monitor
+
+    engine = create_engine(
+        'sqlite:///{0}'.format(tmpdir.join('pool.db')), poolclass=QueuePool,
+        pool_size=2, max_overflow=1, pool_timeout=0.2)
+    monitor.connect(slow_query_threshold=0.02)
+    mon = monitor.monitor(engine)
+    errors = []
+
+    def run():
+        try:
+            with mon.connect() as conn:
+                conn.execute(text('SELECT 1'))
+                time.sleep(0.05)
+        except exc.TimeoutError as e:
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=run) for dummy in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with engine.connect() as conn:
+            conn.connection.create_function('sleep', 1, time.sleep)
+            conn.execute(text('SELECT sleep(0.03)'))
+            metrics = monitor.monitor(engine).snapshot()
+            assert metrics['checked_out'] == 1
+            assert metrics['pool_checkedout'] == 1
+    finally:
+        monitor.disconnect()
+
+    metrics = monitor.monitor(engine).snapshot()
+    assert metrics['pool'] == 'QueuePool' and metrics['pool_size'] == 2
+    assert metrics['checked_out'] == 0
+    assert metrics['connects'] <= 3
+    assert metrics['timeouts'] == len(errors)
+    assert metrics['wait_max'] >= 0.04
+    assert metrics['wait_avg'] <= metrics['wait_max']
+    assert metrics['slow'] == 1
+    assert metrics['slow_queries'][0][1] == 'SELECT sleep(0.03)'
+    assert metrics['queries'] == 13 - len(errors)
+
+
+def test_monitor_released_with_engine():
+    """Test that monitors do not keep their engine alive."""
+    pytest.importorskip('sqlalchemy')
+    from sqlalchemy import create_engine
+
+    from invenio.dbpool import monitor
+
+    engine = create_engine('sqlite://')
+    mon = monitor.monitor(engine)
+    assert mon.engine is engine
+    del engine
+    gc.collect()
+    assert mon.engine is None
+    assert mon not in monitor.monitors()
+
+
+def test_pool_settings():
+    """Test that role settings only apply to databases with a QueuePool."""
+    pytest.importorskip('flask')
+    from flask import Flask
+
+    from invenio.dbpool.ext import InvenioDBPool, pool_options, uses_queue_pool
+
+    assert uses_queue_pool('postgresql+psycopg2://localhost/invenio')
+    assert not uses_queue_pool('sqlite:///invenio.db')
+    assert not uses_queue_pool(None)
+
+    app = Flask('testapp')
+    app.config.update(
+        DB_POOL_ROLE='worker', SQLALCHEMY_POOL_TIMEOUT=5,
+        SQLALCHEMY_DATABASE_URI='postgresql://localhost/invenio')
+    InvenioDBPool(app)
+    assert app.config['SQLALCHEMY_POOL_SIZE'] == 2
+    assert app.config['SQLALCHEMY_POOL_TIMEOUT'] == 5
+    assert pool_options(app, 'web')['pool_size'] == 10
+
+    app = Flask('testapp')
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+    InvenioDBPool(app)
+    assert 'SQLALCHEMY_POOL_SIZE' not in app.config
+
+
+def test_extension():
+    """Test the metrics endpoint on a new SQLite engine."""
+    for name in ('flask', 'invenio_db'):
+        pytest.importorskip(name)
+    from flask import Flask
+    from invenio_db import InvenioDB, db
+
+    from invenio.dbpool.ext import InvenioDBPool
+    from invenio.dbpool.views import blueprint
+
+    app = Flask('testapp')
+    app.config.update(
+        TESTING=True, SQLALCHEMY_DATABASE_URI='sqlite://',
+        DB_POOL_ROLE='worker', DB_POOL_METRICS_TOKEN='secret')
+    InvenioDBPool(app)
+    InvenioDB(app)
+    app.register_blueprint(blueprint)
+
+    with app.app_context():
+        db.session.execute('SELECT 1')
+        db.session.commit()
+
+    with app.test_client() as client:
+        res = client.get('/metrics/db-pool',
+                         headers=[('Authorization', 'Bearer secret')])
+        assert res.status_code == 200
+        data = json.loads(res.get_data(as_text=True))
+        assert data['role'] == 'worker'
+        assert data['engines'][0]['checkouts'] >= 1
+        assert client.get('/metrics/db-pool').status_code == 403
+        res = client.get('/metrics/db-pool',
+                         headers=[('Authorization', 'Bearer wrong')])
+        assert res.status_code == 403
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Near-duplicate index tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+from invenio.duplicates.minhash import MinHasher, author_key, band_keys, \
+    clusters, dumps, features, loads, normalize, similar_pairs, similarity
+
+HIGGS = {'title': u'Observation of a new boson at 125 GeV with the CMS '
+                  u'experiment at the LHC',
+         'authors': [{'name': u'Chatrchyan, Serguei'}, {'name': u'Khachatryan'
+                                                                u', V.'}],
+         'doi': u'10.1016/J.PHYSLETB.2012.08.021'}
+
+
+def test_features():
+    """Test the normalization of titles, authors and identifiers."""
+    assert normalize(u'Évolution: QCD-jets!') == u'evolution qcd jets'
+    assert author_key(u'Chatrchyan, Serguei') == u'chatrchyan s'
+    assert author_key(u'Serguei Chatrchyan') == u'chatrchyan s'
+    assert author_key(u'') == u''
+    result = features({'title': u'A b-c', 'authors': [{'name': u'Doe, J.'}],
+                       'doi': u' 10.1/X '})
+    assert result == set([u't:a b ', u't: b c', u'a:doe j', u'i:10.1/x'])
+    assert features({'title': u'Ab'}) == set([u't:ab'])
+    assert features({}) == set()
+
+
+def test_signature():
+    """Test that signatures estimate the Jaccard similarity."""
+    hasher = MinHasher(128)
+    first = set(u'f{0}'.format(i) for i in range(100))
+    second = set(u'f{0}'.format(i) for i in range(25, 125))
+    a, b = hasher.signature(first), hasher.signature(second)
+    assert len(a) == 128
+    assert a == MinHasher(128).signature(first)
+    assert abs(similarity(a, b) - 0.6) < 0.15
+    assert hasher.signature(set()) is None
+    assert loads(dumps(a)) == a
+    with pytest.raises(ValueError):
+        MinHasher(100)
+
+
+def test_near_duplicates():
+    """Test that near duplicates share buckets and others do not."""
+    hasher = MinHasher(128)
+    original = hasher.signature(features(HIGGS))
+    variant = dict(HIGGS, title=HIGGS['title'].upper() + u'.',
+                   authors=[{'name': u'S. Chatrchyan'}])
+    other = hasher.signature(features({'title': u'Search for dark matter '
+                                                u'in monojet events'}))
+    duplicate = hasher.signature(features(variant))
+    assert similarity(original, duplicate) > 0.8
+    assert set(band_keys(original)) & set(band_keys(duplicate))
+    assert not set(band_keys(original)) & set(band_keys(other))
+    assert [band for band, bucket in band_keys(original, 16)] == \
+        list(range(16))
+
+
+def test_clusters():
+    """Test verification of candidate pairs and grouping into clusters."""
+    a, b = [1] * 8, [1] * 7 + [2]
+    assert similar_pairs([('x', 'y', a, b), ('x', 'z', a, [3] * 8)],
+                         0.8) == [('x', 'y', 0.875)]
+    assert clusters([(1, 2, 0.9), (3, 4, 0.8), (2, 5, 0.85)]) == [
+        ([1, 2, 5], [(1, 2, 0.9), (2, 5, 0.85)]),
+        ([3, 4], [(3, 4, 0.8)]),
+    ]
+    assert clusters([]) == []
+
+
+def test_index(app):
+    """Test incremental indexing, candidates and the duplicate report."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.duplicates.ext import InvenioDuplicates
+    from invenio.duplicates.models import DuplicateSignature
+    from invenio.duplicates.proxies import current_duplicates
+
+    app.config.update(DUPLICATES_WORKERS=0)
+    InvenioDuplicates(app)
+    with app.app_context():
+        db.create_all()
+        original = Record.create(dict(HIGGS))
+        duplicate = Record.create(dict(HIGGS, title=HIGGS['title'] + u'.'))
+        other = Record.create({'title': u'Search for dark matter'})
+        db.session.commit()
+        index = current_duplicates.index
+
+        found = index.candidates(record_id=original.model.id)
+        assert [r for r, value in found] == [duplicate.model.id]
+        assert index.candidates(data={'title': u'Search for dark matter'}) \
+            == [(other.model.id, 1.0)]
+
+        result = index.report()
+        assert result['clusters'][0][0] == sorted(
+            [original.model.id, duplicate.model.id])
+        assert len(result['clusters']) == 1
+
+        other['title'] = HIGGS['title']
+        other.commit()
+        db.session.commit()
+        assert len(index.candidates(record_id=original.model.id)) == 2
+        index.max_bucket = 1
+        assert index.candidates(record_id=original.model.id) == []
+        index.max_bucket = 1000
+
+        assert index.rebuild() == 3
+        assert DuplicateSignature.query.count() == 3
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Record export tests."""
+
+from __future__ import absolute_import, print_function
+
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from invenio.export.api import InvalidCursor, decode_cursor, encode_cursor, \
+    gzip_stream, ndjson, serialize_page
+
+
+def _row(i):
+    return (uuid.UUID(int=i), 1, datetime(2015, 1, 1), datetime(2015, 1, 2),
+            {'title': str(i)})
+
+
+def test_cursor():
+    """Test cursor token round trip and validation."""
+    record_id = uuid.uuid4()
+    token = encode_cursor(record_id)
+    assert '=' not in token
+    assert decode_cursor(token) == record_id
+    for token in ('', 'x', encode_cursor('not-a-uuid'), 'e30'):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(token)
+
+
+def test_serialize_page():
+    """Test NDJSON lines of a page."""
+    lines = serialize_page([_row(1), _row(2)]).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [{
+        'id': str(uuid.UUID(int=i)),
+        'revision': 1,
+        'created': '2015-01-01T00:00:00',
+        'updated': '2015-01-02T00:00:00',
+        'metadata': {'title': str(i)},
+    } for i in (1, 2)]
+
+
+def test_gzip_stream():
+    """Test that the compressed stream is produced chunk by chunk."""
+    pages = [[_row(i) for i in range(j, j + 100)] for j in range(0, 1000, 100)]
+    chunks = list(gzip_stream(ndjson(pages), level=1))
+    assert len(chunks) > 1
+    data = gzip.GzipFile(fileobj=io.BytesIO(b''.join(chunks))).read()
+    assert data == b''.join(ndjson(pages))
+
+
+def test_record_pages(app):
+    """Test keyset pagination over the records."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.export.query import page_boundary, record_pages
+
+    with app.app_context():
+        ids = sorted(Record.create({'title': str(i)}).id for i in range(7))
+        deleted = Record.get_record(ids[3])
+        deleted.delete()
+        db.session.commit()
+        ids.remove(deleted.id)
+
+        pages = list(record_pages(page_size=4))
+        assert [len(page) for page in pages] == [4, 2]
+        assert [row[0] for page in pages for row in page] == ids
+
+        pages = list(record_pages(after=ids[1], page_size=2, limit=3))
+        assert [row[0] for page in pages for row in page] == ids[2:5]
+        pages = list(record_pages(after=ids[1], page_size=2, until=ids[4]))
+        assert [row[0] for page in pages for row in page] == ids[2:5]
+
+        assert page_boundary(size=5) == ids[4]
+        assert page_boundary(size=6) is None
+
+
+def test_endpoint(app):
+    """Test the streaming endpoint with cursors and compression."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.export.ext import InvenioExport
+    from invenio.export.views import blueprint
+
+    app.config['EXPORT_TOKEN'] = 'secret'
+    InvenioExport(app)
+    app.register_blueprint(blueprint)
+    with app.app_context():
+        ids = sorted(str(Record.create({'title': str(i)}).id)
+                     for i in range(5))
+        db.session.commit()
+
+    auth = ('Authorization', 'Bearer secret')
+    with app.test_client() as client:
+        response = client.get('/export/records?size=3', headers=[auth])
+        assert response.status_code == 200
+        lines = response.get_data().decode('utf-8').splitlines()
+        assert [json.loads(line)['id'] for line in lines] == ids[:3]
+        cursor = response.headers['X-Export-Cursor']
+        assert 'rel="next"' in response.headers['Link']
+
+        response = client.get('/export/records?cursor=' + cursor,
+                              headers=[auth, ('Accept-Encoding', 'gzip')])
+        assert response.headers['Content-Encoding'] == 'gzip'
+        data = gzip.GzipFile(fileobj=io.BytesIO(response.get_data())).read()
+        assert [json.loads(line)['id'] for line in
+                data.decode('utf-8').splitlines()] == ids[3:]
+
+        assert client.get('/export/records?cursor=x',
+                          headers=[auth]).status_code == 400
+        assert client.get('/export/records').status_code == 403
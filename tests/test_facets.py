@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Facet counts tests."""
+
+from __future__ import absolute_import, print_function
+
+from invenio.facets.counts import deltas, drift, facet_keys, field_values, top
+
+FIELDS = {'year': 'year', 'author': 'authors.name'}
+
+
+def test_field_values():
+    """Test reading values at dotted paths."""
+    data = {'year': 2015, 'authors': [{'name': 'A'}, {'name': ['B', 'C']},
+                                      {'affiliation': 'CERN'}]}
+    assert field_values(data, 'year') == [2015]
+    assert field_values(data, 'authors.name') == ['A', 'B', 'C']
+    assert field_values(data, 'title') == []
+    assert field_values({'year': None}, 'year') == []
+
+
+def test_facet_keys():
+    """Test the facet values a record is counted for."""
+    data = {'_collections': ['articles', 'cern'], 'year': 2015,
+            'authors': [{'name': 'A'}, {'name': 'A'}]}
+    assert facet_keys(data, FIELDS) == set([
+        ('articles', 'year', '2015'), ('articles', 'author', 'A'),
+        ('cern', 'year', '2015'), ('cern', 'author', 'A')])
+    assert facet_keys(data, {'decade': lambda d: d['year'] // 10 * 10},
+                      collections_key='missing',
+                      default_collection='all') == set([
+                          ('all', 'decade', '2010')])
+    assert facet_keys(None, FIELDS) == set()
+
+
+def test_deltas_and_drift():
+    """Test counter changes of updates and deletions."""
+    a = ('c', 'year', '2014')
+    b = ('c', 'year', '2015')
+    changes = [(set(), set([a])), (set([a]), set([b])), (set([b]), set())]
+    assert deltas(changes) == {}
+    assert deltas(changes[:2]) == {b: 1}
+    assert drift({a: 2, b: 1}, {a: 2, b: 3}) == [(b, 1, 3)]
+    assert drift({a: 1}, {}) == [(a, 1, 0)]
+
+
+def test_top():
+    """Test grouping and ordering of counts."""
+    rows = [('year', '2014', 3), ('year', '2015', 5), ('year', '2013', 3),
+            ('year', '2012', 0), ('type', 'article', 1)]
+    assert top(rows) == {'year': [('2015', 5), ('2013', 3), ('2014', 3)],
+                         'type': [('article', 1)]}
+    assert top(rows, max_values=1)['year'] == [('2015', 5)]
+
+
+def test_counter(app):
+    """Test incremental counting and the consistency check."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.facets.ext import InvenioFacets
+    from invenio.facets.models import FacetCount
+    from invenio.facets.proxies import current_facets
+
+    InvenioFacets(app)
+    with app.app_context():
+        db.create_all()
+        first = Record.create({'_collections': ['articles'], 'year': 2014,
+                               'authors': [{'name': 'A'}]})
+        second = Record.create({'_collections': ['articles'], 'year': 2015,
+                                'authors': [{'name': 'A'}]})
+        db.session.commit()
+        counter = current_facets.counter
+        assert counter.counts('articles') == {
+            'year': [('2014', 1), ('2015', 1)], 'author': [('A', 2)]}
+
+        first['year'] = 2015
+        first.commit()
+        second.delete()
+        db.session.commit()
+        assert counter.counts('articles') == {
+            'year': [('2015', 1)], 'author': [('A', 1)]}
+        assert counter.check()['drift'] == []
+
+        FacetCount.query.filter_by(facet='author').update({'count': 7})
+        db.session.commit()
+        stats = counter.check(fix=True)
+        assert stats['drift'] == [(('articles', 'author', 'A'), 7, 1)]
+        assert counter.check()['drift'] == []
+        assert counter.counts('articles')['author'] == [('A', 1)]
+
+
+def test_counter_loaded_and_conflicts(app):
+    """Test counting bulk loaded records and cache invalidation."""
+    from invenio_db import db
+
+    from invenio.facets import receivers
+    from invenio.facets.api import FacetCounter
+    from invenio.facets.ext import InvenioFacets
+    from invenio.facets.models import FacetCount
+    from invenio.facets.proxies import current_facets
+
+    InvenioFacets(app)
+    try:
+        with app.app_context():
+            counter = current_facets.counter
+            assert counter.counts('articles') == {}
+            app.extensions['invenio-ingest'].loader(workers=0).load(
+                [{'_collections': ['articles'], 'year': 2015}] * 2)
+            assert counter.counts('articles') == {'year': [('2015', 2)]}
+
+            counter._apply(db.session, {('articles', 'year', '2016'): 1})
+            counter._apply(db.session, {('articles', 'year', '2016'): 1})
+            db.session.commit()
+            assert FacetCount.query.get(
+                ('articles', 'year', '2016')).count == 2
+            assert counter.counts('articles')['year'][0] == ('2016', 2)
+
+            # The cache of another process sees the committed changes.
+            other = FacetCounter(counter.fields)
+            assert other.counts('articles')['year'][0] == ('2016', 2)
+            counter._apply(db.session, {('articles', 'year', '2016'): -2})
+            db.session.commit()
+            assert other.counts('articles') == {'year': [('2015', 2)]}
+    finally:
+        receivers.disconnect()
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""File storage tests."""
+
+from __future__ import absolute_import, print_function
+
+import hashlib
+import io
+import os
+import stat
+
+import pytest
+
+from invenio.files.ranges import RangeNotSatisfiable, content_range, \
+    if_range_matches, iter_range, parse_range
+from invenio.files.storage import FileTooLarge, LocalFileStorage
+
+DATA = b''.join(bytes(bytearray([i % 256])) for i in range(100000))
+
+
+def test_save(tmpdir):
+    """Test that the checksum is computed while the file is written."""
+    storage = LocalFileStorage(str(tmpdir), chunk_size=4096)
+    data = storage.save(io.BytesIO(DATA))
+    assert data.size == len(DATA)
+    assert data.checksum == 'md5:' + hashlib.md5(DATA).hexdigest()
+    assert data.path == storage.path(data.key)
+    assert storage.relative_path(data.key) == '{0}/{1}/{2}'.format(
+        data.key[:2], data.key[2:4], data.key)
+    with storage.open(data.key) as fp:
+        assert fp.read() == DATA
+    assert storage.checksum(data.key) == data.checksum
+    assert storage.checksum(data.key, algorithm='sha1') == \
+        'sha1:' + hashlib.sha1(DATA).hexdigest()
+
+    mask = os.umask(0)
+    os.umask(mask)
+    assert stat.S_IMODE(os.stat(data.path).st_mode) == 0o666 & ~mask
+    private = LocalFileStorage(str(tmpdir), file_mode=0o600).save(
+        io.BytesIO(DATA))
+    assert stat.S_IMODE(os.stat(private.path).st_mode) == 0o600
+
+    storage.delete(data.key)
+    storage.delete(data.key)
+    assert not os.path.exists(data.path)
+    with pytest.raises(ValueError):
+        storage.path('../../etc/passwd')
+
+
+def test_size_limit(tmpdir):
+    """Test that too large uploads leave no file behind."""
+    storage = LocalFileStorage(str(tmpdir), algorithm='sha1',
+                               chunk_size=4096)
+    with pytest.raises(FileTooLarge):
+        storage.save(io.BytesIO(DATA), key='a' * 32, size_limit=10000)
+    assert os.listdir(os.path.dirname(storage.path('a' * 32))) == []
+    data = storage.save(io.BytesIO(DATA), size_limit=len(DATA))
+    assert data.checksum == 'sha1:' + hashlib.sha1(DATA).hexdigest()
+
+
+def test_parse_range():
+    """Test single byte range parsing."""
+    assert parse_range(None, 100) is None
+    assert parse_range('bytes=0-9', 100) == (0, 10)
+    assert parse_range('bytes=90-', 100) == (90, 100)
+    assert parse_range('bytes=90-200', 100) == (90, 100)
+    assert parse_range('bytes=-10', 100) == (90, 100)
+    assert parse_range('bytes=-200', 100) == (0, 100)
+    for header in ('bytes=0-1,5-6', 'items=0-1', 'bytes=5-1', 'bytes=a-',
+                   'bytes=5'):
+        assert parse_range(header, 100) is None
+    for header in ('bytes=100-', 'bytes=-0'):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 100)
+    assert content_range(90, 100, 100) == 'bytes 90-99/100'
+
+
+def test_if_range():
+    """Test the validators of partial responses."""
+    date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert if_range_matches(None, '"a"', date)
+    assert if_range_matches('"a"', '"a"', date)
+    assert not if_range_matches('"b"', '"a"', date)
+    assert if_range_matches(date, '"a"', date)
+    assert not if_range_matches('Thu, 22 Oct 2015 07:28:00 GMT', '"a"',
+                                date)
+
+
+def test_iter_range(tmpdir):
+    """Test that ranges are read in chunks and the file is closed."""
+    path = str(tmpdir.join('data'))
+    with open(path, 'wb') as fp:
+        fp.write(DATA)
+    fp = open(path, 'rb')
+    chunks = list(iter_range(fp, 1000, 11000, chunk_size=4096))
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 1808]
+    assert b''.join(chunks) == DATA[1000:11000]
+    assert fp.closed
+
+
+def test_send_file(tmpdir):
+    """Test conditional, partial and offloaded downloads."""
+    pytest.importorskip('werkzeug')
+    from werkzeug.test import Client
+    from werkzeug.wrappers import Response
+
+    from invenio.files.serve import send_file
+
+    path = str(tmpdir.join('paper.pdf'))
+    with open(path, 'wb') as fp:
+        fp.write(DATA)
+
+    def client(**kwargs):
+        def app(environ, start_response):
+            response = send_file(environ, path, etag='md5:1',
+                                 filename='paper.pdf', **kwargs)
+            return response(environ, start_response)
+        return Client(app, Response)
+
+    response = client().get('/')
+    assert response.status_code == 200
+    assert response.data == DATA
+    assert response.headers['ETag'] == '"md5:1"'
+    assert response.headers['Content-Type'] == 'application/pdf'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+
+    response = client().get('/', headers={'If-None-Match': '"md5:1"'})
+    assert response.status_code == 304
+
+    response = client().get('/', headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.data == DATA[10:20]
+    assert response.headers['Content-Range'] == 'bytes 10-19/100000'
+
+    response = client().get('/', headers={'Range': 'bytes=10-19',
+                                          'If-Range': '"md5:2"'})
+    assert response.status_code == 200
+
+    response = client().get('/', headers={'Range': 'bytes=200000-'})
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == 'bytes */100000'
+
+    response = client(sendfile='x-accel-redirect',
+                      offload_path='/protected/paper.pdf').get('/')
+    assert response.data == b''
+    assert response.headers['X-Accel-Redirect'] == '/protected/paper.pdf'
+    assert response.headers['Content-Length'] == str(len(DATA))
+
+
+def test_store(app, tmpdir):
+    """Test storing, verifying and sending files."""
+    from invenio_db import db
+
+    from invenio.files.ext import InvenioFiles
+    from invenio.files.proxies import current_files
+    from invenio.files.views import blueprint
+
+    class Permission(object):
+        def __init__(self, stored):
+            self.stored = stored
+
+        def can(self):
+            return self.stored.filename != 'private.pdf'
+
+    app.config.update(FILES_STORAGE_DIR=str(tmpdir),
+                      FILES_URL='/files/<file_id>',
+                      FILES_PERMISSION_FACTORY='tests:Permission')
+    InvenioFiles(app)
+    app.register_blueprint(blueprint)
+    app.extensions['invenio-files'].permission_factory = Permission
+    with app.app_context():
+        db.create_all()
+        stored = current_files.store.add(io.BytesIO(DATA), 'paper.pdf')
+        db.session.commit()
+        assert stored.mimetype == 'application/pdf'
+        assert current_files.store.verify(stored)
+        file_id = str(stored.id)
+        private_id = str(current_files.store.add(
+            io.BytesIO(DATA), 'private.pdf').id)
+        db.session.commit()
+
+    with app.test_client() as client:
+        response = client.get('/files/' + file_id,
+                              headers={'Range': 'bytes=0-9'})
+        assert response.status_code == 206
+        assert response.data == DATA[:10]
+        assert client.get('/files/unknown').status_code == 404
+        assert client.get('/files/' + private_id).status_code == 403
+
+    with app.app_context():
+        store = current_files.store
+        stored = store.get(file_id)
+        path = store.storage.path(stored.key)
+        store.storage.algorithm = 'sha256'
+        assert store.verify(stored)
+
+        store.remove(stored)
+        db.session.rollback()
+        assert os.path.exists(path)
+        store.remove(store.get(file_id))
+        assert os.path.exists(path)
+        db.session.commit()
+        assert not os.path.exists(path)
+        assert store.get(file_id) is None
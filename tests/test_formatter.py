@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Formatter output cache tests."""
+
+from __future__ import absolute_import, print_function
+
+from invenio.formatter.formats import bibtex, html_brief, marcxml
+
+RECORD = {'recid': 1, 'title': 'Quarks & {gluons}', 'year': 2015,
+          'authors': [{'name': 'Doe, J.'}, {'full_name': 'Roe, R.'}],
+          'keywords': ['QCD']}
+
+
+def test_html_brief():
+    """Test that the brief format escapes the metadata."""
+    output = html_brief(RECORD)
+    assert '<h4>Quarks &amp; {gluons}</h4>' in output
+    assert '<p class="authors">Doe, J.; Roe, R.</p>' in output
+    assert html_brief({'authors': [{'name': str(i)} for i in range(7)]}) \
+        .count('et al.') == 1
+
+
+def test_bibtex():
+    """Test the BibTeX entry."""
+    assert bibtex(RECORD).splitlines() == [
+        '@article{1,',
+        '  title = {Quarks & \\{gluons\\}},',
+        '  author = {Doe, J. and Roe, R.},',
+        '  year = {2015},',
+        '  keywords = {QCD},',
+        '}']
+
+
+def test_marcxml():
+    """Test the MARCXML tag order."""
+    output = marcxml(RECORD)
+    tags = [part.split('"')[0] for part in output.split('tag="')[1:]]
+    assert tags == ['001', '100', '245', '260', '653', '700']
+    assert '<subfield code="a">Quarks &amp; {gluons}</subfield>' in output
+
+
+def test_formatter(app):
+    """Test that outputs are stored, dropped on change and regenerated."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.formatter.ext import InvenioFormatter
+    from invenio.formatter.models import FormattedRecord
+    from invenio.formatter.proxies import current_formatter
+
+    app.config.update(FORMATTER_REGENERATE=False, FORMATTER_WORKERS=0)
+    InvenioFormatter(app)
+    with app.app_context():
+        db.create_all()
+        record = Record.create({'title': 'First', 'year': 2014})
+        db.session.commit()
+        record_id = record.model.id
+        formatter = current_formatter.formatter
+
+        assert '<h4>First</h4>' in formatter.get(record_id, 'hb')
+        assert FormattedRecord.query.filter_by(
+            record_id=record_id).count() == 1
+
+        record['title'] = 'Second'
+        record.commit()
+        db.session.commit()
+        assert FormattedRecord.query.filter_by(
+            record_id=record_id).count() == 0
+        assert '<h4>Second</h4>' in formatter.get(record_id, 'hb')
+
+        # Outputs rendered from an older version are not served.
+        FormattedRecord.query.update({
+            'output': 'stale', 'version_id': FormattedRecord.version_id - 1})
+        db.session.commit()
+        assert '<h4>Second</h4>' in formatter.get(record_id, 'hb')
+        assert FormattedRecord.query.get((record_id, 'hb')).output != 'stale'
+        assert formatter.regenerate([record_id], ()) == 0
+
+        stats = formatter.regenerate_all(codes=['hb', 'bibtex'])
+        assert stats == dict(records=1, outputs=2, errors=0)
+        assert formatter.regenerate([str(record_id)], ['xm']) == 1
+        assert FormattedRecord.query.filter_by(
+            record_id=record_id).count() == 3
+
+
+def test_formatted_endpoint(app):
+    """Test that the endpoint checks the read permission of records."""
+    from invenio_db import db
+    from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+    from invenio_records.api import Record
+
+    from invenio.formatter.ext import InvenioFormatter
+    from invenio.formatter.models import FormattedRecord
+    from invenio.formatter.views import blueprint
+
+    public = set()
+
+    class Permission(object):
+        def __init__(self, record):
+            self.record = record
+
+        def can(self):
+            return self.record.id in public
+
+    app.config.update(FORMATTER_REGENERATE=False,
+                      FORMATTER_URL='/records/<pid_value>/format/<code>')
+    InvenioFormatter(app)
+    app.register_blueprint(blueprint)
+    app.extensions['invenio-formatter'].permission_factory = Permission
+    with app.app_context():
+        db.create_all()
+        for recid, public in ((1, True), (2, False)):
+            record = Record.create({'title': 'Test'})
+            if public:
+                public.add(record.id)
+            PersistentIdentifier.create(
+                'recid', str(recid), object_type='rec',
+                object_uuid=record.id, status=PIDStatus.REGISTERED)
+        db.session.commit()
+
+    with app.test_client() as client:
+        res = client.get('/records/1/format/hb')
+        assert res.status_code == 200
+        assert b'<h4>Test</h4>' in res.data
+        assert client.get('/records/2/format/hb').status_code == 403
+        assert client.get('/records/3/format/hb').status_code == 404
+    with app.app_context():
+        assert FormattedRecord.query.count() == 1
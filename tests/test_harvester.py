@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""OAI-PMH harvester tests."""
+
+from __future__ import absolute_import, print_function
+
+import sys
+import timeit
+
+import pytest
+
+from invenio.harvester.oai import OAIError, list_records_url, parse_page
+from invenio.harvester.testing import OAIStandIn
+
+py35 = pytest.mark.skipif(sys.version_info < (3, 5),
+                          reason='requires Python 3.5')
+
+
+def test_list_records_url():
+    """Test request URLs of new and resumed lists."""
+    assert list_records_url('http://x/oai2d', set_spec='a:b',
+                            from_date='2015-01-01') == \
+        'http://x/oai2d?verb=ListRecords&metadataPrefix=marcxml&set=a%3Ab' \
+        '&from=2015-01-01'
+    assert list_records_url('http://x/oai2d?key=1', token='10') == \
+        'http://x/oai2d?key=1&verb=ListRecords&resumptionToken=10'
+
+
+def test_parse_page():
+    """Test parsing records, deletions and errors."""
+    standin = OAIStandIn(count=25, page_size=10, deleted_every=4)
+    status, body = standin.page('verb=ListRecords&resumptionToken=20')
+    page = parse_page(body.encode('utf-8'))
+    assert [i for i, r in page.records] == [
+        'oai:test:{0}'.format(i) for i in (21, 22, 23)]
+    assert page.deleted == ['oai:test:20', 'oai:test:24']
+    assert page.records[0][1][1] == [('001', '21')]
+    assert page.token is None
+    assert page.complete_size == 25
+    assert page.response_date == '2015-01-01T00:00:00Z'
+
+    status, body = standin.page('verb=ListRecords&resumptionToken=x')
+    with pytest.raises(OAIError) as excinfo:
+        parse_page(body.encode('utf-8'))
+    assert excinfo.value.code == 'badResumptionToken'
+
+    standin.count = 0
+    status, body = standin.page('verb=ListRecords')
+    assert parse_page(body.encode('utf-8')).records == []
+
+
+class Sink(object):
+    """Keep the harvested identifiers and fail on request."""
+
+    def __init__(self, fail_after=None):
+        self.identifiers = []
+        self.fail_after = fail_after
+
+    def __call__(self, source, page):
+        if self.fail_after is not None and \
+                len(self.identifiers) >= self.fail_after:
+            raise RuntimeError('Ingestion failed')
+        self.identifiers.extend(i for i, record in page.records)
+
+
+@py35
+def test_concurrent_harvest():
+    """Test harvesting several sources with refused requests."""
+    from invenio.harvester.harvester import Harvester, Source
+
+    sink = Sink()
+    saved = []
+    with OAIStandIn(count=95, name='a', busy=2, deleted_every=5) as a, \
+            OAIStandIn(count=30, name='b') as b:
+        sources = Harvester(
+            sink, save=lambda s: saved.append((s.name, s.resumption_token)),
+            host_rate=None).run([Source('a', a.url), Source('b', b.url)])
+    assert [s.error for s in sources] == [None, None]
+    assert [(s.pages, s.harvested, s.deleted) for s in sources] == [
+        (10, 76, 19), (3, 30, 0)]
+    assert [s.from_date for s in sources] == ['2015-01-01'] * 2
+    assert sorted(sink.identifiers) == sorted(
+        ['oai:a:{0}'.format(i) for i in range(95) if i % 5] +
+        ['oai:b:{0}'.format(i) for i in range(30)])
+    assert [t for n, t in saved if n == 'b'] == ['10', '20', None]
+
+
+@py35
+def test_resume_after_crash():
+    """Test resuming from the last stored page."""
+    from invenio.harvester.harvester import Harvester, Source
+
+    with OAIStandIn(count=50) as standin:
+        source = Source('test', standin.url)
+        sink = Sink(fail_after=20)
+        Harvester(sink, host_rate=None).run([source])
+        assert isinstance(source.error, RuntimeError)
+        assert source.resumption_token == '20'
+        assert source.started == '2015-01-01T00:00:00Z'
+
+        sink.fail_after = None
+        resumed = Source('test', standin.url, resumption_token='20',
+                         started=source.started)
+        Harvester(sink, host_rate=None).run([resumed])
+        assert sink.identifiers == ['oai:test:{0}'.format(i)
+                                    for i in range(50)]
+        assert standin.requests[-3].endswith('resumptionToken=20')
+
+        expired = Source('test', standin.url, resumption_token='x')
+        Harvester(Sink(), host_rate=None).run([expired])
+        assert expired.error is None
+        assert expired.harvested == 50
+
+
+@py35
+def test_client_errors_not_retried():
+    """Test that only server errors are retried."""
+    from urllib.error import HTTPError
+
+    from invenio.harvester.harvester import Harvester, Source
+
+    requests = []
+
+    def get(url, timeout):
+        requests.append(url)
+        raise HTTPError(url, 404 if len(requests) > 2 else 500,
+                        'Error', {}, None)
+
+    source = Source('a', 'http://localhost/oai2d')
+    Harvester(Sink(), host_rate=None, retries=5, get=get).run([source])
+    assert isinstance(source.error, HTTPError) and source.error.code == 404
+    assert len(requests) == 3
+
+
+@py35
+def test_host_rate():
+    """Test that requests to a host are spaced by the rate limit."""
+    from invenio.harvester.harvester import Harvester, Source
+
+    with OAIStandIn(count=40, name='a') as a:
+        start = timeit.default_timer()
+        Harvester(Sink(), host_rate=20).run(
+            [Source('a', a.url), Source('b', a.url)])
+        assert timeit.default_timer() - start >= 7 * 0.05
+        assert len(a.requests) == 8
+
+
+@py35
+def test_harvest_twice(app):
+    """Test that harvesting again updates and deletes known records."""
+    from invenio_db import db
+    from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+    from invenio_records.models import RecordMetadata
+
+    from invenio.harvester.api import harvest
+    from invenio.harvester.ext import InvenioHarvester
+    from invenio.harvester.models import HarvestSource
+
+    InvenioHarvester(app)
+    app.config['HARVESTER_HOST_RATE'] = None
+    with app.app_context():
+        db.create_all()
+        with OAIStandIn(count=25) as standin:
+            db.session.add(HarvestSource(name='test', url=standin.url))
+            db.session.commit()
+            harvest()
+            assert RecordMetadata.query.count() == 25
+            recids = dict((pid.pid_value, pid.object_uuid) for pid in
+                          PersistentIdentifier.query.filter_by(
+                              pid_type='oai'))
+            assert len(recids) == 25
+
+            standin.deleted_every = 5
+            harvest()
+            assert RecordMetadata.query.count() == 25
+            assert PersistentIdentifier.query.filter_by(
+                pid_type='oai').count() == 25
+            deleted = RecordMetadata.query.get(recids['oai:test:5'])
+            assert deleted.json is None
+            assert PersistentIdentifier.query.filter_by(
+                pid_type='recid', object_uuid=deleted.id).one().status == \
+                PIDStatus.DELETED
+            updated = RecordMetadata.query.get(recids['oai:test:6'])
+            assert updated.version_id == 2
+            assert updated.json['_harvest'] == dict(
+                source='test', identifier='oai:test:6')
+            assert updated.json['recid'] == int(
+                PersistentIdentifier.query.filter_by(
+                    pid_type='recid', object_uuid=updated.id).one().pid_value)
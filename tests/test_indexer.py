@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk indexer tests."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import threading
+import time
+
+import pytest
+
+from invenio.indexer.api import BulkIndexer
+from invenio.indexer.bulk import BulkSender
+from invenio.indexer.queue import DedupQueue
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from queue import Full
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from Queue import Full
+
+
+class BulkHandler(BaseHTTPRequestHandler):
+    """Minimal ``_bulk`` endpoint storing documents in ``server.docs``."""
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        lines = iter(body.decode('utf-8').splitlines())
+        items = []
+        with server.lock:
+            server.requests += 1
+            for line in lines:
+                action = json.loads(line)
+                op, meta = next(iter(action.items()))
+                source = json.loads(next(lines)) if op == 'index' else None
+                if server.reject.get(meta['_id'], 0) > 0:
+                    server.reject[meta['_id']] -= 1
+                    items.append({op: {'_id': meta['_id'], 'status': 429}})
+                elif meta['_id'] in server.invalid:
+                    items.append({op: {'_id': meta['_id'], 'status': 400,
+                                       'error': 'mapper_parsing_exception'}})
+                elif op == 'index':
+                    server.docs[meta['_id']] = source
+                    items.append({op: {'_id': meta['_id'], 'status': 201}})
+                else:
+                    found = server.docs.pop(meta['_id'], None) is not None
+                    items.append({op: {'_id': meta['_id'],
+                                       'status': 200 if found else 404}})
+        response = json.dumps({'errors': False, 'items': items}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def search(request):
+    """Local search cluster stand-in."""
+    server = HTTPServer(('127.0.0.1', 0), BulkHandler)
+    server.lock = threading.Lock()
+    server.docs = {}
+    server.reject = {}
+    server.invalid = set()
+    server.requests = 0
+    server.url = 'http://127.0.0.1:{0}'.format(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    def teardown():
+        server.shutdown()
+        server.server_close()
+    request.addfinalizer(teardown)
+    return server
+
+
+def _index(id_, title):
+    return ({'index': {'_index': 'records', '_id': id_}},
+            json.dumps({'title': title}))
+
+
+def test_queue_coalescing():
+    """Test that operations on the same record are coalesced."""
+    queue = DedupQueue(window=0.05)
+    queue.put('1')
+    queue.put('2')
+    queue.put('1', op='delete')
+    assert len(queue) == 2 and queue.coalesced == 1
+    assert queue.get_batch(10, timeout=0) == []
+    start = time.time()
+    assert queue.get_batch(10) == [('1', 'delete'), ('2', 'index')]
+    assert time.time() - start >= 0.04
+    queue.put('3', delay=0)
+    assert queue.get_batch(10, timeout=0) == [('3', 'index')]
+
+
+def test_queue_backpressure():
+    """Test that producers block on a full queue until it is drained."""
+    queue = DedupQueue(window=0, maxsize=2)
+    queue.put('1')
+    queue.put('2')
+    queue.put('2')
+    with pytest.raises(Full):
+        queue.put('3', block=False)
+    with pytest.raises(Full):
+        queue.put('3', timeout=0.01)
+
+    def drain():
+        time.sleep(0.05)
+        queue.get_batch(1)
+    threading.Thread(target=drain).start()
+    queue.put('3', timeout=5)
+    assert len(queue) == 2
+
+
+def test_queue_close():
+    """Test that closing flushes pending operations and stops consumers."""
+    queue = DedupQueue(window=60)
+    queue.put('1')
+    queue.close()
+    assert queue.get_batch(10) == [('1', 'index')]
+    assert queue.get_batch(10) == []
+
+
+def test_sender(search):
+    """Test sending, retrying and failing bulk actions."""
+    search.reject['2'] = 2
+    search.reject['3'] = 10
+    search.invalid.add('4')
+    sender = BulkSender(search.url, concurrency=2, max_retries=3,
+                        backoff=0.001)
+    sender.submit([_index(str(i), 'Record {0}'.format(i))
+                   for i in range(1, 5)])
+    sender.submit([({'delete': {'_index': 'records', '_id': '5'}}, None)])
+    sender.close()
+
+    assert sorted(search.docs) == ['1', '2']
+    assert search.docs['2'] == {'title': 'Record 2'}
+    metrics = sender.metrics
+    assert metrics.sent == 3
+    assert metrics.failed == 2
+    assert metrics.retries == 3 + 2
+    assert metrics.requests == 1 + 3 + 1
+    assert metrics.docs_per_second > 0
+    failed = sorted(action['index']['_id'] for action, error in sender.errors)
+    assert failed == ['3', '4']
+
+
+def test_sender_unreachable():
+    """Test that unreachable clusters fail after the retries."""
+    sender = BulkSender('http://127.0.0.1:1', concurrency=1, max_retries=1,
+                        backoff=0.001, timeout=1)
+    sender.submit([_index('1', 'a')])
+    sender.close()
+    assert sender.metrics.failed == 1
+    assert sender.metrics.retries == 1
+
+
+def test_indexer(search):
+    """Test indexing and deleting records end to end."""
+    records = dict((str(i), {'title': 'Record {0}'.format(i)})
+                   for i in range(1, 51))
+    loaded = []
+
+    def loader(ids):
+        loaded.append(len(ids))
+        return dict((id_, records[id_]) for id_ in ids if id_ in records)
+
+    def serializer(record_id, data):
+        return dict(data, id=record_id)
+
+    indexer = BulkIndexer(BulkSender(search.url, concurrency=2), loader,
+                          serializer=serializer,
+                          queue=DedupQueue(window=0.05), bulk_size=20)
+    for i in range(1, 51):
+        indexer.enqueue(i)
+        indexer.enqueue(i)
+    indexer.delete(99)
+    assert indexer.metrics['coalesced'] == 50
+    indexer.close()
+
+    assert len(search.docs) == 50
+    assert search.docs['7'] == {'title': 'Record 7', 'id': '7'}
+    assert max(loaded) <= 20 and sum(loaded) == 50
+    metrics = indexer.metrics
+    assert metrics['sent'] == 51 and metrics['failed'] == 0
+    assert metrics['queue_depth'] == 0
+    assert metrics['requests'] >= 3
+
+
+def test_indexer_deletes_missing(search):
+    """Test that records missing from the database are removed."""
+    search.docs['1'] = {'title': 'Stale'}
+    indexer = BulkIndexer(BulkSender(search.url), lambda ids: {},
+                          queue=DedupQueue(window=0))
+    indexer.index_all(['1'])
+    indexer.close()
+    assert search.docs == {}
+
+
+def _serialize(record_id, data):
+    return {'id': record_id, 'size': len(data['title'])}
+
+
+def test_indexer_pool(search):
+    """Test serializing documents in worker processes."""
+    records = dict((str(i), {'title': 'x' * i}) for i in range(1, 11))
+    indexer = BulkIndexer(
+        BulkSender(search.url), lambda ids: dict(
+            (id_, records[id_]) for id_ in ids),
+        serializer=_serialize, queue=DedupQueue(window=0), workers=2)
+    indexer.index_all(records)
+    indexer.close()
+    assert search.docs['10'] == {'id': '10', 'size': 10}
+    assert len(search.docs) == 10
+
+
+def test_flush(search):
+    """Test waiting for queued records without stopping the engine."""
+    indexer = BulkIndexer(BulkSender(search.url), lambda ids: dict(
+        (id_, {'title': id_}) for id_ in ids), queue=DedupQueue(window=0))
+    indexer.index_all(['1', '2'])
+    indexer.flush()
+    assert sorted(search.docs) == ['1', '2']
+    assert indexer.queue.unfinished == 0
+    indexer.index_all(['3'])
+    indexer.close()
+    assert len(search.docs) == 3
+
+
+def test_incremental_reindex(app, search):
+    """Test reindexing modified and deleted records since the last run."""
+    from datetime import timedelta
+
+    from invenio_db import db
+    from invenio_records.api import Record
+    from invenio_records.models import RecordMetadata
+
+    from invenio.indexer.models import IndexerSyncState
+    from invenio.indexer.proxies import current_indexer
+
+    app.config.update(INDEXER_URL=search.url, INDEXER_WINDOW=0,
+                      INDEXER_SYNC_PAGE_SIZE=2)
+
+    with app.app_context():
+        records = [Record.create({'title': str(i)}) for i in range(5)]
+        db.session.commit()
+
+        def run(**kwargs):
+            engine = current_indexer.create_engine()
+            sync = current_indexer.create_sync(engine)
+            sync.overlap = timedelta(0)
+            stats = sync.run(**kwargs)
+            engine.close()
+            return stats
+
+        stats = run()
+        assert stats['indexed'] == 5 and stats['pages'] == 3
+        assert len(search.docs) == 5
+        watermark = IndexerSyncState.query.get('records').updated
+        assert watermark == max(r.model.updated for r in records)
+
+        # Only the modified and deleted records, and the last record at the
+        # high-water mark, are processed again.
+        records[1]['title'] = 'changed'
+        records[1].commit()
+        db.session.delete(RecordMetadata.query.get(records[2].id))
+        db.session.commit()
+        stats = run()
+        assert stats['indexed'] == 2 and stats['deleted'] == 1
+        assert search.docs[str(records[1].id)]['title'] == 'changed'
+        assert str(records[2].id) not in search.docs
+
+        # A failed page leaves the high-water mark before it.
+        search.invalid.add(str(records[3].id))
+        records[3]['title'] = 'invalid'
+        records[3].commit()
+        db.session.commit()
+        stats = run()
+        assert stats['failed'] == 1
+        assert IndexerSyncState.query.get('records').updated < \
+            records[3].model.updated
+        search.invalid.clear()
+        assert run()['indexed'] == 2
+        assert search.docs[str(records[3].id)]['title'] == 'invalid'
+
+
+def test_queue_after_commit(app, monkeypatch):
+    """Test that changed records are sent once per committed transaction."""
+    pytest.importorskip('celery')
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.indexer import receivers, tasks
+
+    sent = []
+    monkeypatch.setattr(tasks.index_records, 'delay', sent.append)
+    app.config['INDEXER_BULK_SIZE'] = 2
+    receivers.register_signals(app)
+
+    with app.app_context():
+        records = [Record.create({'title': str(i)}) for i in range(3)]
+        assert sent == []
+        db.session.commit()
+        assert sorted(sum(sent, [])) == sorted(str(r.id) for r in records)
+        assert [len(ids) for ids in sent] == [2, 1]
+
+        del sent[:]
+        Record.create({'title': 'rolled back'})
+        db.session.rollback()
+        db.session.commit()
+        assert sent == []
+
+
+def test_init_db(app):
+    """Test creating the index of an existing records table."""
+    from click.testing import CliRunner
+    from flask_cli import ScriptInfo
+    from invenio_db import db
+
+    from invenio.indexer.cli import index
+    from invenio.indexer.models import updated_index
+
+    with app.app_context():
+        updated_index.drop(bind=db.engine)
+
+    runner = CliRunner()
+    obj = ScriptInfo(create_app=lambda info: app)
+    result = runner.invoke(index, ['init-db'], obj=obj)
+    assert result.exit_code == 0
+    assert 'created' in result.output
+    result = runner.invoke(index, ['init-db'], obj=obj)
+    assert 'already exists' in result.output
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Bulk ingestion tests."""
+
+from __future__ import absolute_import, print_function
+
+import io
+import json
+
+import pytest
+
+from invenio.ingest.api import BulkLoader, IngestStats, validate_record
+from invenio.ingest.marcxml import iter_marcxml, marc21_to_json
+from invenio.ingest.readers import batched, iter_json
+
+
+def _records(n):
+    return [{'title': 'Record {0}'.format(i), 'recid': i}
+            for i in range(1, n + 1)]
+
+
+def test_iter_json_lines():
+    """Test reading JSON lines in small chunks."""
+    records = _records(20)
+    data = '\n'.join(json.dumps(r) for r in records) + '\n'
+    assert list(iter_json(io.StringIO(data), chunk_size=7)) == records
+
+
+def test_iter_json_array():
+    """Test reading a JSON array in small chunks."""
+    records = _records(20)
+    data = u' [\n' + u',\n'.join(json.dumps(r) for r in records) + u'\n] \n'
+    assert list(iter_json(io.StringIO(data), chunk_size=5)) == records
+    assert list(iter_json(io.StringIO(u'[]'))) == []
+    assert list(iter_json(io.StringIO(u''))) == []
+
+
+def test_iter_json_errors():
+    """Test malformed input."""
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(u'[{"a": 1}')))
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(u'{"a": 1}\n{"a": ')))
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(u'[1, 2]')))
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(u'[{"a": 1}] {"b": 2}')))
+    with pytest.raises(ValueError):
+        list(iter_json(io.StringIO(u'[{"a": 1}]' + u' ' * 20 + u'x'),
+                       chunk_size=4))
+    for data in (u'[{"a": 1},, {"b": 2}]', u'[{"a": 1} {"b": 2}]',
+                 u'[{"a": 1},]', u'[, {"a": 1}]', u'{"a": 1} {"b": 2}\n'):
+        with pytest.raises(ValueError):
+            list(iter_json(io.StringIO(data)))
+
+
+def test_iter_json_lines_error_position():
+    """Test that a malformed line is reported before reading further."""
+    fp = io.StringIO(u'{"a": 1}\n{"a": }\n' + u'{"b": 2}\n' * 10000)
+    records = iter_json(fp, chunk_size=16)
+    assert next(records) == {'a': 1}
+    with pytest.raises(ValueError):
+        next(records)
+    assert fp.tell() <= 32
+
+
+def test_iter_json_array_error_position():
+    """Test that a malformed array element is reported immediately."""
+    fp = io.StringIO(u'[{"a": 1}, {"a": }, ' + u'{"b": 2}, ' * 10000 + u']')
+    records = iter_json(fp, chunk_size=16)
+    assert next(records) == {'a': 1}
+    with pytest.raises(ValueError):
+        next(records)
+    assert fp.tell() <= 32
+    data = u'[{"a": "xx"}, {"b": 1.5e-3}, {"c": true}, {"d": null}]  \n'
+    for chunk_size in range(1, 12):
+        assert len(list(iter_json(io.StringIO(data), chunk_size))) == 4
+
+
+def test_batched():
+    """Test batching."""
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_validate_record(tmpdir):
+    """Test default validator."""
+    schema = tmpdir.join('record.json')
+    schema.write(json.dumps({
+        'type': 'object',
+        'properties': {'title': {'type': 'string'}},
+        'required': ['title'],
+    }))
+    url = 'file://{0}'.format(schema)
+
+    assert validate_record({'title': 'a'}) is None
+    assert validate_record([]) == 'Record must be a JSON object.'
+    assert validate_record({'$schema': url, 'title': 'a'}) is None
+    assert 'title' in validate_record({'$schema': url})
+    assert 'string' in validate_record({'$schema': url, 'title': 1})
+
+
+def test_stats():
+    """Test stage statistics."""
+    stats = IngestStats()
+    with stats.timer('insert', 10):
+        pass
+    assert stats.counts['insert'] == 10
+    assert len(stats.summary()) == len(IngestStats.STAGES) + 1
+
+
+def _reject_odd(data):
+    return 'odd' if data['recid'] % 2 else None
+
+
+class _MemoryLoader(BulkLoader):
+    """Loader collecting batches instead of writing them."""
+
+    def __init__(self, **kwargs):
+        super(_MemoryLoader, self).__init__(**kwargs)
+        self.batches = []
+
+    def write(self, batch, stats):
+        self.batches.append([r['recid'] for r in batch])
+        stats.counts['commit'] += len(batch)
+        stats.batches += 1
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_loader_pipeline(workers):
+    """Test validation pool, ordering and batching."""
+    loader = _MemoryLoader(batch_size=4, workers=workers,
+                           validator=_reject_odd)
+    loader.chunk_size = 3
+    stats = loader.load(iter(_records(20)))
+    assert loader.batches == [[2, 4, 6, 8], [10, 12, 14, 16], [18, 20]]
+    assert stats.loaded == 10
+    assert stats.batches == 3
+    assert [index for index, error in stats.errors] == list(range(0, 20, 2))
+
+
+MARCXML_RECORD = u"""<record>
+  <leader>00000nam  2200000uu 4500</leader>
+  <controlfield tag="001">{0}</controlfield>
+  <datafield tag="245" ind1=" " ind2=" ">
+    <subfield code="a">Record {0}</subfield>
+  </datafield>
+  <datafield tag="650" ind1="1" ind2="7">
+    <subfield code="a">Physics</subfield>
+    <subfield code="a">Astronomy</subfield>
+    <subfield code="2">INSPIRE</subfield>
+  </datafield>
+  <datafield tag="650" ind1="1" ind2="7">
+    <subfield code="a">Caf\u00e9</subfield>
+  </datafield>
+</record>
+"""
+
+
+class _MARCXMLStream(object):
+    """Binary stream of a MARCXML collection generated on the fly."""
+
+    def __init__(self, count, namespace=True):
+        xmlns = ' xmlns="http://www.loc.gov/MARC21/slim"' if namespace \
+            else ''
+        self.parts = iter([u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                           u'<collection{0}>\n'.format(xmlns)] +
+                          [None] * count + [u'</collection>\n'])
+        self.count = 0
+        self.buf = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buf) < size:
+            part = next(self.parts, False)
+            if part is False:
+                break
+            if part is None:
+                self.count += 1
+                part = MARCXML_RECORD.format(self.count)
+            self.buf += part.encode('utf-8')
+        data, self.buf = (self.buf, b'') if size < 0 else \
+            (self.buf[:size], self.buf[size:])
+        return data
+
+
+@pytest.mark.parametrize('namespace', [True, False])
+def test_iter_marcxml(namespace):
+    """Test reading MARCXML records incrementally."""
+    records = list(iter_marcxml(_MARCXMLStream(3, namespace=namespace)))
+    assert len(records) == 3
+    leader, controlfields, datafields = records[1]
+    assert leader == '00000nam  2200000uu 4500'
+    assert controlfields == [('001', '2')]
+    assert datafields[0] == ('245', '', '', [('a', 'Record 2')])
+    assert datafields[1][:3] == ('650', '1', '7')
+
+    data = marc21_to_json(records[1])
+    assert data['control_number'] == '2'
+    assert data['245__'] == [{'a': 'Record 2'}]
+    assert data['65017'] == [{'a': ['Physics', 'Astronomy'], '2': 'INSPIRE'},
+                             {'a': u'Caf\u00e9'}]
+
+
+def test_iter_marcxml_memory():
+    """Test that memory use does not grow with the number of records."""
+    tracemalloc = pytest.importorskip('tracemalloc')
+
+    def peak(count):
+        tracemalloc.start()
+        try:
+            for dummy in iter_marcxml(_MARCXMLStream(count)):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(5000) < 2 * peak(500)
+
+
+def _marcxml_record(data):
+    data = marc21_to_json(data)
+    data['recid'] = int(data['control_number'])
+    return data
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_loader_marcxml(workers):
+    """Test converting MARCXML records in the validation pool."""
+    loader = _MemoryLoader(batch_size=4, workers=workers,
+                           validator=_reject_odd, converter=_marcxml_record)
+    loader.chunk_size = 3
+    stats = loader.load(iter_marcxml(_MARCXMLStream(10)))
+    assert loader.batches == [[2, 4, 6, 8], [10]]
+    assert stats.loaded == 5
+
+
+def test_loader_database(app):
+    """Test writing records and identifiers to the database."""
+    from invenio_pidstore.models import PersistentIdentifier
+    from invenio_records.api import Record
+
+    from invenio.ingest.proxies import current_ingest
+
+    with app.app_context():
+        records = _records(6)
+        stats = current_ingest.loader(batch_size=2, workers=0).load(records)
+        assert stats.loaded == 6
+        assert stats.batches == 3
+
+        pid = PersistentIdentifier.get('recid', '3')
+        assert pid.is_registered()
+        assert Record.get_record(pid.object_uuid)['title'] == 'Record 3'
+
+
+def test_allocator_blocks(app):
+    """Test handing out identifiers from reserved blocks."""
+    from invenio_db import db
+
+    from invenio.ingest.allocator import RecidAllocator
+    from invenio.ingest.models import RecidReservation
+
+    with app.app_context():
+        first = RecidAllocator(block_size=10)
+        second = RecidAllocator(block_size=10)
+        assert first.take(4) == [1, 2, 3, 4]
+        assert second.take(12) == list(range(11, 23))
+        assert first.take(7) == [5, 6, 7, 8, 9, 10, 31]
+
+        first.flush()
+        db.session.commit()
+        first.commit()
+        reservation = RecidReservation.query.filter_by(
+            owner=first.owner).one()
+        assert (reservation.start, reservation.end) == (32, 41)
+
+        # Uncommitted identifiers are handed out again.
+        assert second.take(1) == [23]
+        second.rollback()
+        assert second.take(1) == [11]
+
+
+def test_allocator_recovery(app):
+    """Test recovery of reservations of a crashed allocator."""
+    from invenio_db import db
+
+    from invenio.ingest.allocator import RecidAllocator, recover_reservations
+
+    with app.app_context():
+        crashed = RecidAllocator(block_size=10)
+        assert crashed.take(3) == [1, 2, 3]
+        crashed.flush()
+        db.session.commit()
+        crashed.commit()
+        crashed.take(2)  # never committed
+
+        assert recover_reservations(owner=crashed.owner) == 7
+        assert RecidAllocator(block_size=10).take(8) == \
+            [4, 5, 6, 7, 8, 9, 10, 11]
+
+
+def test_loader_allocates_recids(app):
+    """Test bulk loading of records without identifiers."""
+    from invenio_pidstore.models import PersistentIdentifier
+
+    from invenio.ingest.proxies import current_ingest
+
+    with app.app_context():
+        records = [{'title': 'Record {0}'.format(i)} for i in range(5)]
+        stats = current_ingest.loader(batch_size=2, workers=0).load(records)
+        assert stats.loaded == 5
+        assert [r['recid'] for r in records] == [1, 2, 3, 4, 5]
+        assert PersistentIdentifier.get('recid', '5').is_registered()
+
+
+def test_allocator_skips_explicit_recids(app):
+    """Test that allocated identifiers never collide with explicit ones."""
+    from invenio_pidstore.models import PersistentIdentifier
+
+    from invenio.ingest.proxies import current_ingest
+
+    with app.app_context():
+        current_ingest.loader(batch_size=2, workers=0).load(
+            [{'title': 'Explicit', 'recid': 3}])
+        records = [{'title': 'Record {0}'.format(i)} for i in range(2)]
+        current_ingest.loader(batch_size=2, workers=0).load(records)
+        assert [r['recid'] for r in records] == [4, 5]
+        assert PersistentIdentifier.get('recid', '5').is_registered()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Packed record storage tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+from invenio.packing.codec import Codec, LazyRecord, get_codec
+
+RECORD = {
+    'title': u'Caf\xe9',
+    'authors': [{'name': 'Ellis, J.'}, {'name': 'Smith, J.'}],
+    'year': 2015,
+    'open': True,
+    'abstract': 'Lorem ipsum dolor sit amet. ' * 50,
+    'empty': None,
+}
+
+
+@pytest.mark.parametrize('name', ['json+zlib', 'json+none'])
+def test_round_trip(name):
+    """Test that packed records decode to the original record."""
+    codec = get_codec(name)
+    record = codec.unpack(codec.pack(RECORD))
+    assert isinstance(record, LazyRecord)
+    assert record.to_dict() == RECORD
+    assert list(record) == list(RECORD)
+    assert codec.unpack(codec.pack({})).to_dict() == {}
+
+
+def test_msgpack_zstd():
+    """Test the MessagePack and Zstandard codec."""
+    pytest.importorskip('msgpack')
+    pytest.importorskip('zstandard')
+    codec = get_codec('msgpack+zstd')
+    assert codec.unpack(codec.pack(RECORD)).to_dict() == RECORD
+
+
+def test_lazy_decoding():
+    """Test that fields are only decoded when accessed."""
+    codec = get_codec('json+zlib')
+    record = codec.unpack(codec.pack(RECORD))
+    assert 'abstract' in record
+    assert len(record) == len(RECORD)
+    assert record.decoded == set()
+    assert record['title'] == RECORD['title']
+    assert record.get('missing') is None
+    assert record.decoded == {'title'}
+    assert record['authors'] is record['authors']
+
+
+def test_invalid():
+    """Test unknown codecs and invalid input."""
+    for name in ('json', 'xml+zlib', 'json+lzma'):
+        with pytest.raises(ValueError):
+            Codec(name)
+    codec = get_codec('json+none')
+    with pytest.raises(TypeError):
+        codec.pack([1, 2])
+    with pytest.raises(ValueError):
+        codec.unpack(b'{"title": "x"}')
+
+
+def test_migrate_and_load(app):
+    """Test the migration and reading of packed and stale records."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.packing.api import load_records, migrate, storage_stats
+    from invenio.packing.models import RecordPackedMetadata
+
+    with app.app_context():
+        db.create_all()
+        records = [Record.create(dict(RECORD, recid=i)) for i in range(5)]
+        db.session.commit()
+        ids = [record.id for record in records]
+
+        stats = migrate('json+zlib', batch_size=2)
+        assert stats['packed'] == 5
+        assert stats['batches'] == 3
+        assert stats['packed_size'] < stats['json_size']
+        assert migrate('json+zlib')['packed'] == 0
+
+        loaded = load_records(ids)
+        assert all(isinstance(record, LazyRecord) for record in loaded)
+        assert [record['recid'] for record in loaded] == list(range(5))
+
+        records[0]['title'] = 'Changed'
+        records[0].commit()
+        records[1].delete()
+        db.session.commit()
+        first, second = load_records(ids[:2])
+        assert not isinstance(first, LazyRecord)
+        assert first['title'] == 'Changed'
+        assert second is None
+
+        assert migrate('json+zlib')['packed'] == 1
+        assert load_records(ids[:1])[0]['title'] == 'Changed'
+        assert RecordPackedMetadata.query.count() == 4
+        assert storage_stats()['json+zlib']['records'] == 4
+        assert migrate('json+none')['packed'] == 4
+
+
+def test_pack_on_commit(app):
+    """Test that written and bulk loaded records are packed on flush."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.formatter.api import Formatter
+    from invenio.packing import receivers
+    from invenio.packing.api import load_records
+    from invenio.packing.ext import InvenioPacking
+
+    InvenioPacking(app)
+    try:
+        with app.app_context():
+            record = Record.create(dict(RECORD))
+            db.session.commit()
+            loaded, = load_records([record.id])
+            assert isinstance(loaded, LazyRecord)
+
+            record['title'] = 'Changed'
+            record.commit()
+            db.session.commit()
+            loaded, = load_records([record.id])
+            assert isinstance(loaded, LazyRecord)
+            assert loaded['title'] == 'Changed'
+
+            stats = app.extensions['invenio-ingest'].loader(
+                workers=0).load([dict(RECORD, title='Loaded')])
+            assert not stats.errors
+            uuid, = [id_ for id_, in db.session.query(
+                Record.model_cls.id).filter(Record.model_cls.id != record.id)]
+            loaded, = load_records([uuid])
+            assert isinstance(loaded, LazyRecord)
+            assert loaded['title'] == 'Loaded'
+
+            formatter = Formatter(
+                {'hb': 'invenio.formatter.formats:html_brief'},
+                loader=load_records)
+            assert 'Changed' in formatter.get(record.id, 'hb')
+    finally:
+        receivers.disconnect()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Application preloading tests."""
+
+from __future__ import absolute_import, print_function
+
+import gc
+import os
+import subprocess
+import sys
+
+import pytest
+
+from invenio.preload.api import freeze, lazy_modules, load_object, preload_app
+from invenio.preload.measure import fork_workers, format_report, summarize
+from invenio.preload.memory import child_pids, memory_usage, parse_smaps
+
+linux = pytest.mark.skipif(not os.path.exists('/proc/self/smaps'),
+                           reason='requires /proc')
+
+SMAPS = """\
+00400000-00452000 r-xp 00000000 08:02 173521      /usr/bin/python
+Rss:                 100 kB
+Pss:                  40 kB
+Shared_Clean:         70 kB
+Shared_Dirty:          0 kB
+Private_Clean:        10 kB
+Private_Dirty:        20 kB
+Swap:                  0 kB
+""".splitlines()
+
+
+class _State(object):
+    pass
+
+
+_State.__module__ = 'invenio.facets.ext'
+
+
+class _App(object):
+    extensions = {'a': _State(), 'b': _State(), 'c': object()}
+
+
+def test_parse_smaps():
+    """Test the sums of the set sizes."""
+    assert parse_smaps(SMAPS + SMAPS[1:]) == dict(
+        rss=200 * 1024, pss=80 * 1024, uss=60 * 1024, shared=140 * 1024)
+
+
+def test_load_object_and_lazy_modules():
+    """Test resolving factories and the modules of the extensions."""
+    assert load_object('os.path:join') is os.path.join
+    assert load_object('invenio.preload.api') is \
+        sys.modules['invenio.preload.api']
+    assert lazy_modules(_App()) == ['invenio.facets.api']
+
+
+class _UrlMap(object):
+    def update(self):
+        self.updated = True
+
+
+class _PreloadedApp(object):
+    config = {'PRELOAD_MODULES': ['invenio.preload.gunicorn'],
+              'TEMPLATING_PRELOAD': False}
+    extensions = {}
+    url_map = _UrlMap()
+    jinja_env = None
+
+
+def test_preload_app_gc_state():
+    """Test that the collector state is restored after preloading."""
+    def factory():
+        assert not gc.isenabled()
+        return _PreloadedApp()
+
+    def failing():
+        raise RuntimeError()
+
+    assert gc.isenabled()
+    app = preload_app(factory)
+    assert app.url_map.updated
+    assert 'invenio.preload.gunicorn' in sys.modules
+    assert gc.isenabled()
+    with pytest.raises(RuntimeError):
+        preload_app(failing)
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        preload_app(factory)
+        freeze()
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+
+def test_summarize():
+    """Test the totals of the workers."""
+    usage = dict(rss=4 << 20, pss=2 << 20, uss=1 << 20, shared=3 << 20)
+    summary = summarize(usage, [usage, usage, None])
+    assert summary == dict(workers=2, failed=1, mean_uss=1 << 20,
+                           total=6 << 20)
+    lines = format_report(usage, [usage, None])
+    assert lines[-2].endswith('failed')
+    assert lines[-1] == '1 workers, mean uss 1.0 MiB, total pss 4.0 MiB'
+
+
+@linux
+def test_memory_usage():
+    """Test reading the usage of processes."""
+    usage = memory_usage(os.getpid())
+    assert 0 < usage['uss'] <= usage['rss']
+    process = subprocess.Popen([sys.executable, '-c',
+                                'import sys; sys.stdin.read()'],
+                               stdin=subprocess.PIPE)
+    try:
+        assert process.pid in child_pids(os.getpid())
+    finally:
+        process.communicate()
+
+
+@linux
+@pytest.mark.skipif(not hasattr(gc, 'freeze'), reason='requires gc.freeze')
+def test_fork_workers():
+    """Test that frozen heaps stay shared after a collection in workers."""
+    def load():
+        return [[number] for number in range(200000)]
+
+    copied = fork_workers(load, workers=2, freeze=False)
+    shared = fork_workers(load, workers=2, freeze=True)
+    assert copied['frozen'] == 0
+    assert shared['frozen'] >= 200000
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+    assert summarize(shared['master'], shared['workers'])['mean_uss'] * 4 < \
+        summarize(copied['master'], copied['workers'])['mean_uss']
+
+    def fail(app):
+        raise RuntimeError()
+
+    assert fork_workers(load, workers=1, work=fail)['workers'] == [None]
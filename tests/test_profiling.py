@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Request profiling tests."""
+
+from __future__ import absolute_import, print_function
+
+import time
+
+import pytest
+
+from invenio.profiling.api import Histogram, MetricsRegistry, RequestTimer, \
+    current_timer, phase, server_timing, set_timer
+
+
+def test_timer_exclusive_phases():
+    """Test that nested phases are only accounted once."""
+    timer = RequestTimer()
+    timer.push('cache')
+    time.sleep(0.01)
+    timer.push('sql')
+    time.sleep(0.02)
+    timer.pop()
+    timer.pop()
+    assert 0.02 <= timer.phases['sql'] < 0.03
+    assert 0.01 <= timer.phases['cache'] < 0.02
+
+    # Phases left open inside a phase are discarded.
+    timer.push('template')
+    timer.push('sql')
+    timer.pop('template')
+    assert timer._stack == []
+
+    # Leaving a phase which was not entered keeps the open phases.
+    timer.push('template')
+    timer.pop('sql')
+    assert [entry[0] for entry in timer._stack] == ['template']
+
+
+def test_phase():
+    """Test timing blocks and functions of sampled requests only."""
+    @phase('work')
+    def work():
+        return 42
+
+    set_timer(None)
+    with phase('block'):
+        assert work() == 42
+
+    timer = RequestTimer()
+    set_timer(timer)
+    try:
+        with phase('block'):
+            work()
+        assert sorted(timer.phases) == ['block', 'work']
+    finally:
+        set_timer(None)
+    assert current_timer() is None
+
+
+def test_cache_phase():
+    """Test that record cache lookups are timed."""
+    from invenio.cache.api import TieredCache
+
+    timer = RequestTimer()
+    set_timer(timer)
+    try:
+        TieredCache().get('k', lambda: 1)
+    finally:
+        set_timer(None)
+    assert 'cache' in timer.phases
+
+
+def test_server_timing():
+    """Test the ``Server-Timing`` header value."""
+    timer = RequestTimer()
+    timer.phases.update(sql=0.0125, cache=0.0004)
+    assert server_timing(timer, total=0.02) == \
+        'cache;dur=0.40, sql;dur=12.50, total;dur=20.00'
+
+
+def test_prometheus():
+    """Test histograms and their Prometheus text format."""
+    histogram = Histogram(buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [
+        (0.1, 2), (1, 3), (float('inf'), 4)]
+
+    registry = MetricsRegistry(buckets=(0.1, 1))
+    registry.observe('records.detail', 0.05, {'sql': 0.01})
+    registry.observe('records.detail', 0.5)
+    registry.observe('say "hi"', 2)
+    lines = registry.prometheus().splitlines()
+    assert '# TYPE invenio_request_duration_seconds histogram' in lines
+    assert 'invenio_request_duration_seconds_bucket' \
+        '{endpoint="records.detail",le="0.1"} 1' in lines
+    assert 'invenio_request_duration_seconds_bucket' \
+        '{endpoint="records.detail",le="+Inf"} 2' in lines
+    assert 'invenio_request_duration_seconds_count' \
+        '{endpoint="say \\"hi\\""} 1' in lines
+    assert 'invenio_request_phase_seconds_sum' \
+        '{endpoint="records.detail",phase="sql"} 0.01' in lines
+
+
+def test_extension():
+    """Test latency recording, sampling and the metrics endpoint."""
+    pytest.importorskip('flask')
+    from flask import Flask, render_template_string
+
+    from invenio.profiling.ext import InvenioProfiling
+    from invenio.profiling.views import blueprint
+
+    app = Flask('testapp')
+    app.config.update(PROFILING_SAMPLE_RATE=1.0, PROFILING_SERVER_TIMING=True,
+                      PROFILING_METRICS_TOKEN='secret')
+    InvenioProfiling(app)
+    app.register_blueprint(blueprint)
+
+    @app.route('/page')
+    def page():
+        with phase('work'):
+            time.sleep(0.01)
+        return render_template_string('{{ 1 + 1 }}')
+
+    auth = [('Authorization', 'Bearer secret')]
+    with app.test_client() as client:
+        res = client.get('/page', headers=auth)
+        assert res.get_data(as_text=True) == '2'
+        header = res.headers['Server-Timing']
+        assert 'work;dur=' in header and 'total;dur=' in header
+        assert 'Server-Timing' not in client.get('/page').headers
+
+        app.config['PROFILING_SAMPLE_RATE'] = 0
+        assert 'Server-Timing' not in client.get(
+            '/page', headers=auth).headers
+
+        metrics = client.get('/metrics', headers=auth).get_data(as_text=True)
+        assert 'invenio_request_duration_seconds_count' \
+            '{endpoint="page"} 3' in metrics
+        assert 'invenio_request_phase_seconds_count' \
+            '{endpoint="page",phase="work"} 2' in metrics
+        assert client.get('/metrics').status_code == 403
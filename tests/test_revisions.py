@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Delta-encoded revisions tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+pytest.importorskip('jsonpatch')
+
+from invenio.revisions.delta import documents, rebuild, tune_interval  # noqa
+
+
+def test_tune_interval():
+    """Test the snapshot interval tuning."""
+    assert tune_interval(10000, 200) == 10
+    assert tune_interval(10000, 200, read_weight=4) == 5
+    assert tune_interval(10000, 2, max_interval=50) == 50
+    assert tune_interval(100, 5000) == 1
+    assert tune_interval(100, 0, max_interval=20) == 20
+
+
+def test_rebuild():
+    """Test rebuilding revisions from a snapshot and patches."""
+    rows = [
+        (True, {'title': 'a', 'keywords': []}),
+        (False, [{'op': 'replace', 'path': '/title', 'value': 'b'}]),
+        (False, [{'op': 'add', 'path': '/keywords/0', 'value': 'x'}]),
+    ]
+    assert rebuild(rows) == {'title': 'b', 'keywords': ['x']}
+
+
+def test_documents():
+    """Test sequential rebuilding with deletions and gaps."""
+    patch = [{'op': 'replace', 'path': '/v', 'value': 2}]
+    rows = [(1, True, {'v': 1}), (2, False, patch), (3, True, None),
+            (4, True, {'v': 4}), (6, False, patch)]
+    assert list(documents(rows)) == [{'v': 1}, {'v': 2}, None, {'v': 4},
+                                     None]
+    assert rows[0][2] == {'v': 1}
+
+
+def test_revision_store(app):
+    """Test recording, reading and compacting revisions."""
+    from invenio_db import db
+    from invenio_records.api import Record
+
+    from invenio.revisions.ext import InvenioRevisions
+    from invenio.revisions.models import RecordRevision
+    from invenio.revisions.proxies import current_revisions
+
+    InvenioRevisions(app)
+    app.config['REVISIONS_SNAPSHOT_INTERVAL'] = 4
+    with app.app_context():
+        db.create_all()
+        record = Record.create({'title': 'v1', 'abstract': 'x' * 2000})
+        db.session.commit()
+        for i in range(2, 11):
+            record['title'] = 'v{0}'.format(i)
+            record.commit()
+            db.session.commit()
+
+        store = current_revisions.store
+        assert store.revisions(record.id) == list(range(1, 11))
+        snapshots = [r.revision for r in RecordRevision.query.filter_by(
+            record_id=record.id, snapshot=True).order_by(
+                RecordRevision.revision)]
+        assert snapshots == [1, 5, 9]
+        for i in range(1, 11):
+            assert store.get(record.id, i)['title'] == 'v{0}'.format(i)
+        assert store.get(record.id)['title'] == 'v10'
+        assert store.get(record.id, 11) is None
+
+        result = store.compact(record.id)
+        db.session.commit()
+        assert result['rewritten']
+        assert result['interval'] > 4
+        assert result['size'] < result['old_size']
+        for i in range(1, 11):
+            assert store.get(record.id, i)['title'] == 'v{0}'.format(i)
+        assert not store.compact(record.id)['rewritten']
+
+        record.delete()
+        db.session.commit()
+        assert store.get(record.id) is None
+        assert store.get(record.id, 10)['title'] == 'v10'
+        assert store.stats()['revisions'] == 11
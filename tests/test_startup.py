@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Startup time tests."""
+
+from __future__ import absolute_import, print_function
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from invenio.startup import ExtensionTiming, format_report, main, total_time
+
+IMPORT_BUDGET = 0.5
+"""Seconds ``import invenio`` and the extension modules may take."""
+
+APP_BUDGET = 1.5
+"""Seconds creating an application with all extensions may take."""
+
+EXTENSION_MODULES = ('invenio.accessindex.ext', 'invenio.batching.ext',
+                     'invenio.cache.ext', 'invenio.dbpool.ext',
+                     'invenio.duplicates.ext', 'invenio.export.ext',
+                     'invenio.facets.ext', 'invenio.files.ext',
+                     'invenio.formatter.ext', 'invenio.harvester.ext',
+                     'invenio.indexer.ext', 'invenio.ingest.ext',
+                     'invenio.packing.ext', 'invenio.profiling.ext',
+                     'invenio.revisions.ext', 'invenio.staticfiles.ext',
+                     'invenio.templating.ext', 'invenio.usercache.ext',
+                     'invenio.validation.ext')
+"""Extension modules which must import without the heavy dependencies."""
+
+
+def _run(code):
+    return subprocess.check_output([sys.executable, '-c', code]).decode()
+
+
+def test_import_budget():
+    """Test that the package and its extensions import within budget."""
+    pytest.importorskip('flask')
+    code = (
+        'import timeit\n'
+        'start = timeit.default_timer()\n'
+        'import invenio\n'
+        'for name in {0!r}:\n'
+        '    __import__(name)\n'
+        'print(timeit.default_timer() - start)\n'
+    ).format(EXTENSION_MODULES)
+    assert float(_run(code)) < IMPORT_BUDGET
+
+
+def test_registered_extensions():
+    """Test that the registered extensions import within budget."""
+    pkg_resources = pytest.importorskip('pkg_resources')
+    try:
+        entry_points = pkg_resources.get_entry_map(
+            'invenio', 'invenio_base.apps')
+    except pkg_resources.DistributionNotFound:
+        pytest.skip('invenio is not installed')
+    assert set(ep.module_name for ep in entry_points.values()) == \
+        set(EXTENSION_MODULES)
+    assert main(['--no-init', '--budget', str(IMPORT_BUDGET)]) == 0
+
+
+def test_app_budget():
+    """Test that an application with all extensions is created in budget."""
+    for name in ('flask', 'flask_cli', 'invenio_db'):
+        pytest.importorskip(name)
+    code = (
+        'import inspect, timeit\n'
+        'start = timeit.default_timer()\n'
+        'from flask_cli import FlaskCLI\n'
+        'from invenio_db import InvenioDB\n'
+        'from invenio.startup import create_app\n'
+        'app = create_app()\n'
+        'FlaskCLI(app)\n'
+        'InvenioDB(app)\n'
+        'for name in {0!r}:\n'
+        '    module = __import__(name, fromlist=["*"])\n'
+        '    for attr, ext in inspect.getmembers(module, inspect.isclass):\n'
+        '        if attr.startswith("Invenio") and \\\n'
+        '                ext.__module__ == name:\n'
+        '            ext(app)\n'
+        'print(timeit.default_timer() - start)\n'
+    ).format(EXTENSION_MODULES)
+    assert float(_run(code)) < APP_BUDGET
+
+
+def test_lazy_imports():
+    """Test that extension modules do not import their implementation."""
+    pytest.importorskip('werkzeug')
+    pytest.importorskip('flask')
+    code = (
+        'import sys\n'
+        'for name in {0!r}:\n'
+        '    __import__(name)\n'
+        'print(" ".join(sorted(sys.modules)))\n'
+    ).format(EXTENSION_MODULES)
+    modules = set(_run(code).split())
+    for name in EXTENSION_MODULES:
+        assert name in modules
+    for heavy in ('sqlalchemy', 'invenio_db', 'invenio_records',
+                  'invenio.indexer.api', 'invenio.ingest.api',
+                  'invenio.ingest.allocator', 'invenio.validation.api'):
+        assert heavy not in modules
+
+
+def test_report():
+    """Test report formatting and budget."""
+    timings = [
+        ExtensionTiming('g', 'fast', 'a', 0.001, 0.002, 1, None),
+        ExtensionTiming('g', 'slow', 'b', 0.5, None, 10, None),
+        ExtensionTiming('g', 'broken', 'c', None, None, 0, 'ImportError: x'),
+    ]
+    assert abs(total_time(timings) - 0.503) < 1e-9
+    lines = format_report(timings)
+    assert lines[1].startswith('slow')
+    assert '    ImportError: x' in lines
+
+
+def test_main(capsys):
+    """Test the command line entry point on an empty group."""
+    assert main(['--no-init', '--json', '-g', 'invenio.nonexistent']) == 0
+    report = json.loads(capsys.readouterr()[0])
+    assert report['extensions'] == []
+    assert main(['--no-init', '-g', 'invenio.nonexistent',
+                 '--budget', '-1']) == 1
+
+
+def test_main_failed_extension(monkeypatch):
+    """Test that a failing extension fails the command."""
+    import invenio.startup
+    monkeypatch.setattr(invenio.startup, 'measure', lambda **kwargs: [
+        ExtensionTiming('g', 'broken', 'c', None, None, 0, 'ImportError: x'),
+    ])
+    assert main(['--no-init', '--budget', '10']) == 1
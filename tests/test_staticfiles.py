@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Static file collection and bundle building tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+
+import pytest
+
+from invenio.staticfiles.collect import collect
+from invenio.staticfiles.manifest import Manifest, file_digest
+
+
+def _write(path, content):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as fp:
+        fp.write(content)
+
+
+def _read(path):
+    with open(path) as fp:
+        return fp.read()
+
+
+@pytest.fixture()
+def sources(tmpdir):
+    """Two blueprint static folders sharing one file."""
+    first, second = str(tmpdir.join('first')), str(tmpdir.join('second'))
+    _write(os.path.join(first, 'css', 'a.css'), 'a')
+    _write(os.path.join(first, 'js', 'shared.js'), 'first')
+    _write(os.path.join(second, 'js', 'shared.js'), 'second')
+    _write(os.path.join(second, 'img', 'b.png'), 'b')
+    return [('first', first), ('second', second)]
+
+
+def test_collect_incremental(tmpdir, sources):
+    """Test that only changed files are copied again."""
+    target = str(tmpdir.join('static'))
+    stats = collect(sources, target, workers=4)
+    assert sorted(stats.copied) == ['css/a.css', 'img/b.png', 'js/shared.js']
+    assert stats.overridden == [('js/shared.js', 'second')]
+    assert _read(os.path.join(target, 'js', 'shared.js')) == 'first'
+
+    stats = collect(sources, target, workers=4)
+    assert stats.copied == []
+    assert stats.unchanged == 3
+
+    _write(os.path.join(sources[0][1], 'css', 'a.css'), 'changed')
+    stats = collect(sources, target, workers=1)
+    assert stats.copied == ['css/a.css']
+    assert _read(os.path.join(target, 'css', 'a.css')) == 'changed'
+
+    os.remove(os.path.join(target, 'img', 'b.png'))
+    stats = collect(sources, target)
+    assert stats.copied == ['img/b.png']
+
+
+def test_collect_prune(tmpdir, sources):
+    """Test that stale files are only removed when pruning."""
+    target = str(tmpdir.join('static'))
+    collect(sources, target)
+    os.remove(os.path.join(sources[1][1], 'img', 'b.png'))
+
+    stats = collect(sources, target)
+    assert stats.removed == []
+    assert os.path.exists(os.path.join(target, 'img', 'b.png'))
+
+    stats = collect(sources, target, prune=True)
+    assert stats.removed == ['img/b.png']
+    assert not os.path.exists(os.path.join(target, 'img', 'b.png'))
+    assert 'img/b.png' not in Manifest(
+        os.path.join(target, '.collect-manifest.json')).entries
+
+
+def test_manifest_digest_cache(tmpdir, monkeypatch):
+    """Test that digests of unmodified files are not recomputed."""
+    path = str(tmpdir.join('file.txt'))
+    _write(path, 'content')
+    manifest = Manifest(str(tmpdir.join('manifest.json')))
+    digest = manifest.digest(path)
+    assert digest == file_digest(path)
+    manifest.save()
+
+    import invenio.staticfiles.manifest as module
+
+    def fail(path):
+        raise AssertionError('digest recomputed')
+    monkeypatch.setattr(module, 'file_digest', fail)
+    assert Manifest(manifest.path).digest(path) == digest
+
+
+def test_build_bundles(tmpdir):
+    """Test that unchanged bundles are not rebuilt."""
+    webassets = pytest.importorskip('webassets')
+    from invenio.staticfiles.bundles import build
+
+    directory = str(tmpdir)
+    _write(os.path.join(directory, 'a.js'), 'var a;')
+    _write(os.path.join(directory, 'b.js'), 'var b;')
+    env = webassets.Environment(directory, '/static')
+    env.register('a', webassets.Bundle('a.js', output='gen/a.js'))
+    env.register('b', webassets.Bundle('b.js', output='gen/b.js'))
+
+    built, unchanged = build(env, workers=2)
+    assert sorted(built) == ['gen/a.js', 'gen/b.js']
+    assert unchanged == []
+
+    built, unchanged = build(env, workers=2)
+    assert built == []
+
+    _write(os.path.join(directory, 'a.js'), 'var a = 1;')
+    built, unchanged = build(env)
+    assert built == ['gen/a.js']
+    assert unchanged == ['gen/b.js']
+    assert _read(os.path.join(directory, 'gen', 'a.js')) == 'var a = 1;'
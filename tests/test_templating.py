@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Template bytecode cache tests."""
+
+from __future__ import absolute_import, print_function
+
+import os
+import stat
+
+import pytest
+
+jinja2 = pytest.importorskip('jinja2')
+
+from invenio.templating.api import precompile  # noqa
+from invenio.templating.bytecode import SharedBytecodeCache, \
+    environment_fingerprint  # noqa
+
+
+def _write(folder, name, content):
+    with open(os.path.join(folder, name), 'w') as fp:
+        fp.write(content)
+
+
+@pytest.fixture()
+def templates(tmpdir):
+    """Folder with a layout and a page template."""
+    folder = str(tmpdir.mkdir('templates'))
+    _write(folder, 'layout.html', '<p>{% block body %}{% endblock %}</p>')
+    _write(folder, 'page.html', "{% extends 'layout.html' %}"
+                                "{% block body %}{{ value }}{% endblock %}")
+    return folder
+
+
+def _environment(folder, cache_dir, **options):
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(folder),
+        bytecode_cache=SharedBytecodeCache(cache_dir), **options)
+
+
+def test_precompile(tmpdir, templates):
+    """Test that templates are compiled once and invalidated on change."""
+    cache_dir = str(tmpdir.join('cache'))
+    stats = precompile(_environment(templates, cache_dir))
+    assert sorted(stats.compiled) == ['layout.html', 'page.html']
+    assert len(os.listdir(cache_dir)) == 2
+    mask = os.umask(0)
+    os.umask(mask)
+    for name in os.listdir(cache_dir):
+        assert stat.S_IMODE(os.stat(os.path.join(
+            cache_dir, name)).st_mode) == 0o666 & ~mask
+
+    env = _environment(templates, cache_dir)
+    stats = precompile(env)
+    assert stats.compiled == []
+    assert sorted(stats.cached) == ['layout.html', 'page.html']
+    assert env.get_template('page.html').render(value=1) == '<p>1</p>'
+
+    _write(templates, 'page.html',
+           "{% extends 'layout.html' %}{% block body %}-{{ value }}"
+           "{% endblock %}")
+    env = _environment(templates, cache_dir)
+    stats = precompile(env)
+    assert stats.compiled == ['page.html']
+    assert env.get_template('page.html').render(value=1) == '<p>-1</p>'
+
+
+def test_environment_options(tmpdir, templates):
+    """Test that environments generating different code use own entries."""
+    cache_dir = str(tmpdir.join('cache'))
+    plain = _environment(templates, cache_dir)
+    escaping = _environment(templates, cache_dir, autoescape=True)
+    assert environment_fingerprint(plain) != \
+        environment_fingerprint(escaping)
+
+    precompile(plain)
+    assert sorted(precompile(escaping).compiled) == \
+        ['layout.html', 'page.html']
+    assert escaping.get_template('page.html').render(value='<b>') == \
+        '<p>&lt;b&gt;</p>'
+
+
+def test_corrupted_entry(tmpdir, templates):
+    """Test that unreadable entries are compiled again."""
+    cache_dir = str(tmpdir.join('cache'))
+    precompile(_environment(templates, cache_dir), names=['page.html'])
+    entry, = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, entry), 'r+b') as fp:
+        fp.truncate(20)
+
+    env = _environment(templates, cache_dir)
+    assert precompile(env, names=['page.html']).compiled == ['page.html']
+    assert env.get_template('page.html').render(value=2) == '<p>2</p>'
+
+
+def test_failed_and_prune(tmpdir, templates):
+    """Test that broken templates are reported and stale entries pruned."""
+    cache_dir = str(tmpdir.join('cache'))
+    precompile(_environment(templates, cache_dir))
+    os.remove(os.path.join(templates, 'layout.html'))
+    _write(templates, 'broken.html', '{% if %}')
+
+    stats = precompile(_environment(templates, cache_dir), prune=True)
+    assert [name for name, error in stats.failed] == ['broken.html']
+    assert stats.cached == ['page.html']
+    assert stats.removed == 1
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_extension(tmpdir):
+    """Test that the extension configures the bytecode cache."""
+    flask = pytest.importorskip('flask')
+    from invenio.templating.ext import InvenioTemplating
+
+    app = flask.Flask('testapp', instance_path=str(tmpdir))
+    InvenioTemplating(app)
+    cache = app.jinja_env.bytecode_cache
+    assert isinstance(cache, SharedBytecodeCache)
+    assert cache.directory == os.path.join(str(tmpdir), 'jinja-bytecode')
+
+    app = flask.Flask('testapp', instance_path=str(tmpdir))
+    app.config['TEMPLATING_BYTECODE_CACHE'] = False
+    InvenioTemplating(app)
+    assert app.jinja_env.bytecode_cache is None
+
+
+def test_preload_before_first_request(tmpdir, templates):
+    """Test that templates are loaded before the first request."""
+    flask = pytest.importorskip('flask')
+    from invenio.templating.ext import InvenioTemplating
+
+    app = flask.Flask('testapp', instance_path=str(tmpdir),
+                      template_folder=templates)
+    InvenioTemplating(app)
+    app.add_url_rule('/', 'index', lambda: 'ok')
+    assert len(app.jinja_env.cache) == 0
+    with app.test_client() as client:
+        client.get('/')
+    assert len(app.jinja_env.cache) == 2
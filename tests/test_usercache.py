@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""User cache tests."""
+
+from __future__ import absolute_import, print_function
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('invenio_accounts')
+
+
+@contextmanager
+def count_queries(engine):
+    """Count the statements executed on ``engine``."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_execute)
+
+
+@pytest.fixture()
+def accounts_app(app):
+    """Application with accounts and the user cache."""
+    from invenio_accounts import InvenioAccounts
+    from invenio_db import db
+
+    from invenio.usercache.ext import InvenioUserCache
+
+    app.config.update(SECRET_KEY='test', USERCACHE_SHARED_URL='memory://')
+    InvenioAccounts(app)
+    InvenioUserCache(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_load_user(accounts_app):
+    """Test that cached users and roles are loaded without queries."""
+    from invenio_accounts.models import Role, User
+    from invenio_db import db
+
+    with accounts_app.app_context():
+        role = Role(name='admins')
+        user = User(email='info@inveniosoftware.org', password='x',
+                    active=True, roles=[role])
+        db.session.add(user)
+        db.session.commit()
+        user_id = str(user.id)
+
+        load_user = accounts_app.login_manager.user_callback
+        assert load_user(user_id).email == 'info@inveniosoftware.org'
+        db.session.remove()
+
+        with count_queries(db.engine) as statements:
+            cached = load_user(user_id)
+            assert cached.email == 'info@inveniosoftware.org'
+            assert [r.name for r in cached.roles] == ['admins']
+        assert statements == []
+        assert cached.password == 'x'
+
+        Role.query.filter_by(name='admins').one().name = 'curators'
+        db.session.commit()
+        db.session.remove()
+        assert [r.name for r in load_user(user_id).roles] == ['curators']
+        assert load_user('12345') is None
+
+        db.session.delete(Role.query.filter_by(name='curators').one())
+        db.session.commit()
+        db.session.remove()
+        assert load_user(user_id).roles == []
+
+
+def test_requires_shared_tier(app):
+    """Test that users are not cached without a shared tier."""
+    from invenio_accounts import InvenioAccounts
+
+    from invenio.usercache.ext import InvenioUserCache
+
+    app.config.update(SECRET_KEY='test')
+    InvenioAccounts(app)
+    loader = app.login_manager.user_callback
+    InvenioUserCache(app)
+    assert app.login_manager.user_callback is loader
+
+
+def test_sweep_sessions(accounts_app):
+    """Test that expired sessions are deleted in chunks."""
+    from invenio_accounts.models import SessionActivity, User
+    from invenio_db import db
+
+    from invenio.usercache.sweeper import sweep_sessions
+
+    with accounts_app.app_context():
+        user = User(email='info@inveniosoftware.org', active=True)
+        db.session.add(user)
+        db.session.flush()
+        old = datetime.utcnow() - timedelta(days=2)
+        for i in range(5):
+            db.session.add(SessionActivity(
+                sid_s='old{0}'.format(i), user_id=user.id, created=old,
+                updated=old))
+        db.session.add(SessionActivity(sid_s='new', user_id=user.id))
+        db.session.commit()
+
+        stats = sweep_sessions(timedelta(days=1), batch_size=2)
+        assert stats == dict(deleted=5, chunks=3)
+        assert [a.sid_s for a in SessionActivity.query] == ['new']
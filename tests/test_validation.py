@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2015 CERN.
+#
+# Invenio is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# Invenio is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Invenio; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+#
+# In applying this license, CERN does not
+# waive the privileges and immunities granted to it by virtue of its status
+# as an Intergovernmental Organization or submit itself to any jurisdiction.
+
+"""Validator cache tests."""
+
+from __future__ import absolute_import, print_function
+
+import pytest
+
+jsonschema = pytest.importorskip('jsonschema')
+
+from invenio.validation.api import ValidatorCache, prefetch, validate_many \
+    # noqa
+
+BASE = 'http://localhost/schemas/'
+
+SCHEMAS = {
+    BASE + 'record.json': {
+        'type': 'object',
+        'properties': {
+            'title': {'type': 'string'},
+            'authors': {'type': 'array',
+                        'items': {'$ref': 'author.json'}},
+        },
+        'required': ['title'],
+    },
+    BASE + 'author.json': {
+        'type': 'object',
+        'properties': {'name': {'$ref': 'definitions.json#/name'}},
+    },
+    BASE + 'definitions.json': {'name': {'type': 'string'}},
+}
+
+
+class FakeFetch(object):
+    """Return schemas from a dictionary and count the fetches."""
+
+    def __init__(self, schemas):
+        self.schemas = dict(schemas)
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        return self.schemas[url]
+
+
+def test_prefetch():
+    """Test that referenced schemas are fetched recursively."""
+    fetch = FakeFetch(SCHEMAS)
+    store = prefetch(SCHEMAS[BASE + 'record.json'], BASE + 'record.json',
+                     fetch=fetch)
+    assert sorted(store) == [BASE + 'author.json', BASE + 'definitions.json']
+    assert sorted(fetch.calls) == sorted(store)
+
+
+def test_compiled_once():
+    """Test that schemas are fetched and compiled once."""
+    fetch = FakeFetch(SCHEMAS)
+    cache = ValidatorCache(fetch=fetch)
+    url = BASE + 'record.json'
+    cache.validate({'title': 'A', 'authors': [{'name': 'B'}]}, url)
+    with pytest.raises(jsonschema.ValidationError):
+        cache.validate({'title': 'A', 'authors': [{'name': 1}]}, url)
+    assert len(fetch.calls) == 3
+    assert cache.stats['compiled'] == 1
+
+    schema = {'type': 'object', 'required': ['title']}
+    assert cache.get(schema) is cache.get(dict(schema))
+    assert cache.stats['compiled'] == 2
+
+
+def test_ttl_refetch():
+    """Test that expired URLs are fetched again but compiled on change."""
+    fetch = FakeFetch(SCHEMAS)
+    cache = ValidatorCache(fetch=fetch, ttl=-1)
+    url = BASE + 'record.json'
+    compiled = cache.get(url)
+    assert cache.get(url) is compiled
+    assert len(fetch.calls) == 6
+    assert cache.stats['compiled'] == 1
+
+    fetch.schemas[BASE + 'definitions.json'] = {'name': {'type': 'integer'}}
+    assert cache.get(url) is not compiled
+    assert cache.stats['compiled'] == 2
+    cache.validate({'title': 'A', 'authors': [{'name': 1}]}, url)
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_validate_many(workers):
+    """Test that all errors of all records are returned in order."""
+    cache = ValidatorCache(fetch=FakeFetch(SCHEMAS))
+    records = [
+        {'title': 'A'},
+        {'authors': [{'name': 1}]},
+        {'title': 'C', 'authors': [{'name': 'D'}, {'name': 2}]},
+    ] * 3
+    results = validate_many(records, BASE + 'record.json', workers=workers,
+                            chunk_size=2, cache=cache)
+    assert len(results) == 9
+    assert results[0] == []
+    assert sorted(e['validator'] for e in results[1]) == ['required', 'type']
+    error, = results[2]
+    assert error['path'] == '/authors/1/name'
+    assert error['schema_path'].endswith('/type')
+    assert results[3:] == results[:3] * 2